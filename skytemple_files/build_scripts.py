@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+This is a Python CLI script that uses SkyTemple Files to compile the ExplorerScript sources of a
+SkyTemple project back into the SSB scripts of the ROM.
+
+Only scripts whose sources changed since the last build are compiled again, together with all scripts
+that include a changed file. Which scripts include which files is read from the inclusion maps
+(.exps.im files) of the project and the import statements of the sources.
+"""
+
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import PurePath, PurePosixPath
+from typing import Any
+
+from explorerscript.error import ParseError, SsbCompilerError
+from explorerscript.included_usage_map import IncludedUsageMap
+from explorerscript.source_map import SourceMap
+from ndspy.rom import NintendoDSRom
+
+from skytemple_files.common.ppmdu_config.data import Pmd2Data
+from skytemple_files.common.project_file_manager import ProjectFileManager
+from skytemple_files.common.script_util import SCRIPT_DIR, get_ssb_filenames, load_script_files
+from skytemple_files.common.types.file_types import FileType
+from skytemple_files.common.util import get_ppmdu_config_for_rom, get_rom_folder, open_utf8, write_file_atomically
+from skytemple_files.script.ssb.script_compiler import ScriptCompiler
+
+BUILD_STATE_NAME = "exps_build_state.json"
+# Bump this if the compiled scripts change for the same sources.
+BUILD_STATE_VERSION = 1
+
+REASON_FORCED = "forced"
+REASON_NEW = "not built yet"
+REASON_SOURCE = "source changed"
+REASON_INCLUDE = "included file changed"
+REASON_ROM = "changed in ROM"
+
+_IMPORT = re.compile(r'^\s*import\s+"([^"]*)"\s*;', re.MULTILINE)
+
+# State of the build in the worker processes, set up by init_build.
+loaded_rom_path: str | None = None
+rom_data: Pmd2Data | None = None
+
+
+@dataclass
+class ScriptBuildTask:
+    """A script to compile: The SSB file in the ROM, the absolute path of its source and why it is compiled."""
+
+    ssb_filename: str
+    exps_path: str
+    reason: str
+    source: str
+    source_hash: str
+
+
+class ScriptDependencyGraph:
+    """
+    The files each script of a project depends on, besides its own source: The files listed for it in the
+    inclusion maps of the project and all files imported by its source and by those files, recursively.
+    """
+
+    def __init__(self, inclusion_maps: dict[str, list[str]], lookup_paths: list[str]):
+        self.lookup_paths = lookup_paths
+        # SSB filename -> absolute paths of the files the inclusion maps list for it.
+        self._included: dict[str, set[str]] = {}
+        # Absolute path -> absolute paths of the files it imports.
+        self._imports: dict[str, list[str]] = {}
+        for included_file, ssb_filenames in inclusion_maps.items():
+            for ssb_filename in ssb_filenames:
+                self.add_usage(included_file, ssb_filename)
+
+    @classmethod
+    def from_project(cls, project_fm: ProjectFileManager, lookup_paths: list[str]) -> ScriptDependencyGraph:
+        return cls(
+            project_fm.explorerscript_inclusion_maps(*(p for p in lookup_paths if os.path.isdir(p))), lookup_paths
+        )
+
+    def add_usage(self, included_file: str, ssb_filename: str) -> None:
+        self._included.setdefault(ssb_filename, set()).add(os.path.realpath(included_file))
+
+    def remove_usage(self, included_file: str, ssb_filename: str) -> None:
+        self._included.get(ssb_filename, set()).discard(os.path.realpath(included_file))
+
+    def imports(self, exps_path: str) -> list[str]:
+        """
+        Returns the absolute paths of the files imported by an ExplorerScript file, resolved like the compiler does.
+        Imports that can not be resolved are left out, the compiler reports them.
+        """
+        exps_path = os.path.realpath(exps_path)
+        if exps_path not in self._imports:
+            try:
+                with open_utf8(exps_path, "r") as f:
+                    source = f.read()
+            except OSError:
+                source = ""
+            dir_name = os.path.dirname(exps_path)
+            imports = []
+            for import_file in _IMPORT.findall(source):
+                candidates: list[PurePath]
+                if import_file.startswith(".") or import_file.startswith("/"):
+                    candidates = [PurePosixPath(dir_name).joinpath(PurePosixPath(import_file))]
+                else:
+                    candidates = [
+                        PurePath(dir_name).joinpath(PurePosixPath(lp).joinpath(import_file)) for lp in self.lookup_paths
+                    ]
+                for candidate in candidates:
+                    abs_path = os.path.realpath(str(candidate))
+                    if os.path.exists(abs_path):
+                        imports.append(abs_path)
+                        break
+            self._imports[exps_path] = imports
+        return self._imports[exps_path]
+
+    def dependencies(self, ssb_filename: str, exps_path: str) -> set[str]:
+        """Returns the absolute paths of all files the script depends on, besides its source exps_path."""
+        exps_path = os.path.realpath(exps_path)
+        pending = self.imports(exps_path) + list(self._included.get(ssb_filename, ()))
+        dependencies: set[str] = set()
+        while pending:
+            path = pending.pop()
+            if path in dependencies or path == exps_path:
+                continue
+            dependencies.add(path)
+            pending += self.imports(path)
+        return dependencies
+
+
+class ScriptBuildState:
+    """
+    Records for each script of the project the hash of its source and of all files it depended on when it was
+    last compiled successfully. Paths inside the project directory are stored relative to it.
+    """
+
+    def __init__(self, project_dir: str):
+        self.project_dir = os.path.realpath(project_dir)
+        self.path = os.path.join(project_dir, BUILD_STATE_NAME)
+        self.entries: dict[str, dict[str, Any]] = {}
+        try:
+            with open_utf8(self.path, "r") as f:
+                state = json.load(f)
+            if state.get("version") == BUILD_STATE_VERSION:
+                self.entries = state["entries"]
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, AttributeError) as ex:
+            print(f"Ignoring invalid build state: {repr(ex)}", file=sys.stderr)
+
+    def dirty_reason(self, ssb_filename: str, source_hash: str, file_hashes: dict[str, str | None]) -> str | None:
+        """
+        Returns why the script must be compiled again, or None if it is up to date.
+        file_hashes contains the current hashes of the dependencies of the script (None if they don't exist).
+        """
+        entry = self.entries.get(ssb_filename)
+        if entry is None:
+            return REASON_NEW
+        if entry["source"] != source_hash:
+            return REASON_SOURCE
+        recorded = {self._resolve(path): h for path, h in entry["dependencies"].items()}
+        for path in recorded.keys() | file_hashes.keys():
+            if recorded.get(path) != file_hashes.get(path, _hash_file(path)):
+                return REASON_INCLUDE
+        return None
+
+    def record(self, ssb_filename: str, source_hash: str, file_hashes: dict[str, str | None]):
+        self.entries[ssb_filename] = {
+            "source": source_hash,
+            "dependencies": {self._relative(path): h for path, h in sorted(file_hashes.items())},
+        }
+
+    def save(self):
+        # Write atomically, so an interrupted build leaves a valid state behind.
+        write_file_atomically(
+            self.path, json.dumps({"version": BUILD_STATE_VERSION, "entries": self.entries}, indent=1).encode("utf-8")
+        )
+
+    def _relative(self, path: str) -> str:
+        if os.path.commonpath([self.project_dir, path]) == self.project_dir:
+            return os.path.relpath(path, self.project_dir)
+        return path
+
+    def _resolve(self, path: str) -> str:
+        return os.path.realpath(os.path.join(self.project_dir, path))
+
+
+class ScriptProjectBuilder:
+    """Compiles the ExplorerScript sources of a project into the SSB files of its ROM."""
+
+    def __init__(self, rom_path: str, rom: NintendoDSRom, config: Pmd2Data, lookup_paths: list[str] | None = None):
+        self.rom_path = rom_path
+        self.rom = rom
+        self.config = config
+        self.project_fm = ProjectFileManager(rom_path)
+        self.lookup_paths = [os.path.realpath(p) for p in lookup_paths or []]
+        self.graph = ScriptDependencyGraph.from_project(self.project_fm, self.lookup_paths)
+        self.state = ScriptBuildState(self.project_fm.dir())
+        self._file_hashes: dict[str, str | None] = {}
+
+    def scripts(self) -> dict[str, str]:
+        """Returns all SSB files of the ROM that have an ExplorerScript source, mapped to the absolute source path."""
+        script_folder = get_rom_folder(self.rom, SCRIPT_DIR)
+        if script_folder is None:
+            raise ValueError(f"The ROM has no {SCRIPT_DIR} directory.")
+        return {
+            ssb_filename: os.path.realpath(
+                os.path.join(self.project_fm.dir(), self.project_fm.explorerscript_get_path_for_ssb(ssb_filename))
+            )
+            for ssb_filename in get_ssb_filenames(load_script_files(script_folder))
+            if self.project_fm.explorerscript_exists(ssb_filename)
+        }
+
+    def plan(self, force: bool = False) -> tuple[list[ScriptBuildTask], int]:
+        """Returns the scripts that must be compiled and the number of scripts that are up to date."""
+        tasks = []
+        up_to_date = 0
+        for ssb_filename, exps_path in self.scripts().items():
+            with open_utf8(exps_path, "r") as f:
+                source = f.read()
+            source_hash = hashlib.sha256(source.encode("utf-8")).hexdigest()
+            reason: str | None = REASON_FORCED
+            if not force:
+                reason = self.state.dirty_reason(
+                    ssb_filename, source_hash, self._dependency_hashes(ssb_filename, exps_path)
+                )
+                if reason is None and not self.project_fm.explorerscript_hash_up_to_date(
+                    ssb_filename, hashlib.sha256(self.rom.getFileByName(ssb_filename)).hexdigest()
+                ):
+                    reason = REASON_ROM
+            if reason is None:
+                up_to_date += 1
+            else:
+                tasks.append(ScriptBuildTask(ssb_filename, exps_path, reason, source, source_hash))
+        return tasks, up_to_date
+
+    def build(self, tasks: list[ScriptBuildTask], jobs: int) -> dict[str, str]:
+        """
+        Compiles the scripts, in a pool of jobs worker processes if jobs > 1, and writes them to the ROM.
+        Returns the error messages of all scripts that failed to compile. Call save to write the ROM.
+        """
+        errors = {}
+
+        def done(i, task: ScriptBuildTask, result: tuple[bytes, str] | str):
+            if isinstance(result, str):
+                print(f"{i + 1}/{len(tasks)} - {task.ssb_filename}: FAILED ({task.reason})", file=sys.stderr)
+                errors[task.ssb_filename] = result
+            else:
+                print(f"{i + 1}/{len(tasks)} - {task.ssb_filename} ({task.reason})")
+                self._store(task, *result)
+
+        try:
+            if jobs <= 1:
+                init_build(self.rom_path, self.config)
+                for i, task in enumerate(tasks):
+                    done(i, task, compile_script(task.source, task.exps_path, self.lookup_paths))
+                return errors
+            with ProcessPoolExecutor(max_workers=jobs, initializer=init_build, initargs=(self.rom_path,)) as executor:
+                futures = {
+                    executor.submit(compile_script, task.source, task.exps_path, self.lookup_paths): task
+                    for task in tasks
+                }
+                for i, future in enumerate(as_completed(futures)):
+                    done(i, futures[future], future.result())
+            return errors
+        finally:
+            self.state.save()
+
+    def save(self, output_path: str):
+        self.rom.saveToFile(output_path)
+
+    def _store(self, task: ScriptBuildTask, ssb_data: bytes, source_map_data: str):
+        ssb_filename = task.ssb_filename
+        self.rom.setFileByName(ssb_filename, ssb_data)
+        self.project_fm.explorerscript_save_hash(ssb_filename, hashlib.sha256(ssb_data).hexdigest())
+
+        # Update the inclusion maps with the files the script includes now.
+        source_map = SourceMap.deserialize(source_map_data)
+        diff = IncludedUsageMap(source_map, task.exps_path) - IncludedUsageMap(
+            self.project_fm.explorerscript_load_sourcemap(ssb_filename), task.exps_path
+        )
+        for included_file in diff.removed:
+            self.project_fm.explorerscript_include_usage_remove(included_file, ssb_filename)
+            self.graph.remove_usage(included_file, ssb_filename)
+        for included_file in diff.added:
+            self.project_fm.explorerscript_include_usage_add(included_file, ssb_filename)
+            self.graph.add_usage(included_file, ssb_filename)
+        self.project_fm.explorerscript_save(ssb_filename, task.source, source_map)
+
+        self.state.record(ssb_filename, task.source_hash, self._dependency_hashes(ssb_filename, task.exps_path))
+
+    def _dependency_hashes(self, ssb_filename: str, exps_path: str) -> dict[str, str | None]:
+        hashes = {}
+        for path in self.graph.dependencies(ssb_filename, exps_path):
+            if path not in self._file_hashes:
+                self._file_hashes[path] = _hash_file(path)
+            hashes[path] = self._file_hashes[path]
+        return hashes
+
+
+def init_build(rom_path: str, config: Pmd2Data | None = None):
+    """
+    Loads the configuration for the ROM. This is the initializer of the worker processes.
+    Workers that were forked from the main process already have it loaded.
+    """
+    global loaded_rom_path, rom_data
+    if loaded_rom_path == rom_path:
+        return
+    rom_data = config if config is not None else get_ppmdu_config_for_rom(NintendoDSRom.fromFile(rom_path))
+    loaded_rom_path = rom_path
+
+
+def compile_script(source: str, exps_path: str, lookup_paths: list[str]) -> tuple[bytes, str] | str:
+    """
+    Compiles an ExplorerScript source. Returns the SSB file and the serialized source map,
+    or the error message if the source could not be compiled.
+    """
+    assert rom_data is not None
+    try:
+        ssb, source_map = ScriptCompiler(rom_data).compile_explorerscript(source, exps_path, lookup_paths=lookup_paths)
+        return FileType.SSB.serialize(ssb, static_data=rom_data), source_map.serialize()
+    except (ParseError, SsbCompilerError, ValueError, OSError) as ex:
+        return str(ex)
+
+
+def _hash_file(path: str) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def run_main(rom_path: str, output_path: str | None, lookup_paths: list[str], jobs: int, force: bool) -> int:
+    start = time.time()
+    rom = NintendoDSRom.fromFile(rom_path)
+    builder = ScriptProjectBuilder(rom_path, rom, get_ppmdu_config_for_rom(rom), lookup_paths)
+    tasks, up_to_date = builder.plan(force)
+    errors = builder.build(tasks, jobs)
+    if len(errors) < len(tasks):
+        builder.save(output_path or rom_path)
+
+    reasons = Counter(task.reason for task in tasks if task.ssb_filename not in errors)
+    print(
+        f"{up_to_date + len(tasks)} scripts: {up_to_date} up to date, {len(tasks) - len(errors)} compiled, "
+        f"{len(errors)} failed ({time.time() - start:.1f}s)."
+    )
+    for reason, count in reasons.most_common():
+        print(f"  {count} {reason}")
+    for ssb_filename, error in errors.items():
+        print(f"error for {ssb_filename}: {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def main():
+    # noinspection PyTypeChecker
+    parser = argparse.ArgumentParser(
+        description="""Compile the ExplorerScript sources of a SkyTemple project into the ROM.
+
+    The sources are read from the project directory of the ROM (ROM_PATH.skytemple). Only scripts
+    that changed since the last build are compiled, together with all scripts that include a
+    changed file. The state of the last build is stored in the project directory (exps_build_state.json).
+    Scripts whose SSB file in the ROM was changed by something else are compiled again as well.
+    Use --force to compile all scripts.
+
+    Scripts are compiled in parallel with --jobs.
+        """,
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument("rom_path", metavar="ROM_PATH", help="Path to the ROM file.")
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="output_path",
+        metavar="PATH",
+        required=False,
+        help="Path to save the ROM with the compiled scripts to. By default the ROM is overwritten.",
+    )
+    parser.add_argument(
+        "-l",
+        "--lookup",
+        dest="lookup_paths",
+        metavar="PATH",
+        action="append",
+        required=False,
+        default=[],
+        help="Lookup path for imports. Can be given multiple times.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        metavar="N",
+        type=int,
+        required=False,
+        default=1,
+        help="Number of processes to compile with.",
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        dest="force",
+        action="store_true",
+        required=False,
+        default=False,
+        help="If set, compile all scripts, even if they are unchanged since the last build.",
+    )
+
+    args = parser.parse_args()
+
+    sys.exit(run_main(args.rom_path, args.output_path, args.lookup_paths, args.jobs, args.force))
+
+
+if __name__ == "__main__":
+    main()
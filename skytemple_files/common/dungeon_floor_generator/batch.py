@@ -0,0 +1,312 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+from collections import Counter, deque
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from itertools import compress
+
+from dungeon_eos.DungeonAlgorithm import ReturnData, generate_floor
+
+from skytemple_files.common.dungeon_floor_generator.generator import (
+    FLOOR_TILES,
+    NO_ROOM,
+    SIZE_X,
+    SIZE_Y,
+    TERRAIN_FLAG_KECLEON_SHOP,
+    TERRAIN_FLAG_MONSTER_HOUSE,
+    TERRAIN_MASK,
+    FloorLayoutProperties,
+    GeneratedFloor,
+    RandomGenProperties,
+    generation_lock,
+    setup_generation,
+)
+from skytemple_files.dungeon_data.mappa_bin.protocol import MappaBinProtocol, MappaFloorLayoutProtocol
+
+# Distance to the stairs, if they can not be reached from the player spawn.
+UNREACHABLE = -1
+# Terrain flags -> 1 for floor tiles (and the room flags of floor tiles), 0 otherwise.
+_IS_FLOOR = bytes(int((x & TERRAIN_MASK) == 1) for x in range(256))
+_IS_MONSTER_HOUSE = bytes(int((x & TERRAIN_MASK) == 1 and (x & TERRAIN_FLAG_MONSTER_HOUSE) != 0) for x in range(256))
+_IS_KECLEON_SHOP = bytes(int((x & TERRAIN_MASK) == 1 and (x & TERRAIN_FLAG_KECLEON_SHOP) != 0) for x in range(256))
+# Moves on the floor (x, y). Diagonal moves are only possible if they don't cut the corner of a non-floor tile.
+_MOVES = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1))
+
+
+@dataclass
+class GeneratedFloors:
+    """
+    Floors generated for a list of seeds. For compactness the tile data of all floors is stored in one array per
+    kind of data, floor after floor (see GeneratedFloor and FLOOR_TILES). Floors that could not be generated
+    (invalid) are not valid, their tiles are all 0 and their spawn positions are (-1, -1).
+    """
+
+    seeds: list[int] = field(default_factory=list)
+    valid: list[bool] = field(default_factory=list)
+    terrain_flags: bytearray = field(default_factory=bytearray)
+    spawn_flags: bytearray = field(default_factory=bytearray)
+    room_index: bytearray = field(default_factory=bytearray)
+    player_spawns: list[tuple[int, int]] = field(default_factory=list)
+    stairs: list[tuple[int, int]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+    def append(self, seed: int, floor: GeneratedFloor | None) -> None:
+        self.seeds.append(seed)
+        self.valid.append(floor is not None)
+        if floor is None:
+            self.terrain_flags += bytes(FLOOR_TILES)
+            self.spawn_flags += bytes(FLOOR_TILES)
+            self.room_index += bytes(FLOOR_TILES)
+            self.player_spawns.append((-1, -1))
+            self.stairs.append((-1, -1))
+        else:
+            self.terrain_flags += floor.terrain_flags
+            self.spawn_flags += floor.spawn_flags
+            self.room_index += floor.room_index
+            self.player_spawns.append(floor.player_spawn)
+            self.stairs.append(floor.stairs)
+
+    def extend(self, other: GeneratedFloors) -> None:
+        self.seeds += other.seeds
+        self.valid += other.valid
+        self.terrain_flags += other.terrain_flags
+        self.spawn_flags += other.spawn_flags
+        self.room_index += other.room_index
+        self.player_spawns += other.player_spawns
+        self.stairs += other.stairs
+
+    def floor(self, n: int) -> GeneratedFloor | None:
+        """Returns the n-th floor, or None if it is not valid."""
+        if not self.valid[n]:
+            return None
+        start = n * FLOOR_TILES
+        end = start + FLOOR_TILES
+        return GeneratedFloor(
+            self.terrain_flags[start:end],
+            self.spawn_flags[start:end],
+            self.room_index[start:end],
+            self.player_spawns[n],
+            self.stairs[n],
+        )
+
+
+@dataclass
+class FloorStatistics:
+    """
+    Statistics over generated floors. The room counts and stairs distances are counted for the valid floors.
+    The stairs distance is the number of moves from the player spawn to the stairs (or UNREACHABLE).
+    """
+
+    floors: int = 0
+    invalid: int = 0
+    monster_houses: int = 0
+    kecleon_shops: int = 0
+    room_counts: Counter[int] = field(default_factory=Counter)
+    stairs_distances: Counter[int] = field(default_factory=Counter)
+
+    @property
+    def valid(self) -> int:
+        return self.floors - self.invalid
+
+    @property
+    def invalid_rate(self) -> float:
+        return self.invalid / self.floors if self.floors > 0 else 0.0
+
+    @property
+    def monster_house_rate(self) -> float:
+        return self.monster_houses / self.valid if self.valid > 0 else 0.0
+
+    @property
+    def kecleon_shop_rate(self) -> float:
+        return self.kecleon_shops / self.valid if self.valid > 0 else 0.0
+
+    @property
+    def mean_room_count(self) -> float:
+        return _mean(self.room_counts)
+
+    @property
+    def mean_stairs_distance(self) -> float:
+        """The mean distance to the stairs of the floors on which the stairs can be reached."""
+        return _mean(Counter({d: n for d, n in self.stairs_distances.items() if d != UNREACHABLE}))
+
+    def add(self, floor: GeneratedFloor | None) -> None:
+        """Adds a generated floor, or an invalid generation if floor is None."""
+        self.floors += 1
+        if floor is None:
+            self.invalid += 1
+            return
+        is_floor = floor.terrain_flags.translate(_IS_FLOOR)
+        if 1 in floor.terrain_flags.translate(_IS_MONSTER_HOUSE):
+            self.monster_houses += 1
+        if 1 in floor.terrain_flags.translate(_IS_KECLEON_SHOP):
+            self.kecleon_shops += 1
+        rooms = set(compress(floor.room_index, is_floor))
+        rooms.discard(NO_ROOM)
+        self.room_counts[len(rooms)] += 1
+        self.stairs_distances[stairs_distance(floor, is_floor)] += 1
+
+    def merge(self, other: FloorStatistics) -> None:
+        self.floors += other.floors
+        self.invalid += other.invalid
+        self.monster_houses += other.monster_houses
+        self.kecleon_shops += other.kecleon_shops
+        self.room_counts.update(other.room_counts)
+        self.stairs_distances.update(other.stairs_distances)
+
+
+def stairs_distance(floor: GeneratedFloor, is_floor: bytes | None = None) -> int:
+    """
+    Returns the number of moves needed to walk from the player spawn to the stairs on the floor tiles,
+    or UNREACHABLE.
+    """
+    if is_floor is None:
+        is_floor = floor.terrain_flags.translate(_IS_FLOOR)
+    start_x, start_y = floor.player_spawn
+    target = floor.stairs
+    if start_x < 0 or target[0] < 0:
+        return UNREACHABLE
+    distances = {floor.player_spawn: 0}
+    queue = deque([floor.player_spawn])
+    while queue:
+        pos = queue.popleft()
+        if pos == target:
+            return distances[pos]
+        x, y = pos
+        for dx, dy in _MOVES:
+            nx = x + dx
+            ny = y + dy
+            if not (0 <= nx < SIZE_Y and 0 <= ny < SIZE_X) or (nx, ny) in distances:
+                continue
+            if not is_floor[ny * SIZE_Y + nx]:
+                continue
+            if dx != 0 and dy != 0 and not (is_floor[y * SIZE_Y + nx] and is_floor[ny * SIZE_Y + x]):
+                continue
+            distances[(nx, ny)] = distances[pos] + 1
+            queue.append((nx, ny))
+    return UNREACHABLE
+
+
+class DungeonFloorBatchGenerator:
+    """
+    Generates floors for many seeds at once, see RandomGenProperties.from_seed for how the seeds are used.
+    A floor generated for a seed is the same as the one generated by DungeonFloorGenerator
+    with RandomGenProperties.from_seed(seed).
+
+    The generation can only run one floor at a time per process. To generate in parallel, pass a
+    ProcessPoolExecutor: The seeds are split into shards of shard_size seeds, which run on the executor.
+    """
+
+    def __init__(
+        self,
+        unknown_dungeon_chance_patch_applied=False,
+        fix_dead_end_error=False,
+        fix_outer_room_error=False,
+        *,
+        executor: Executor | None = None,
+        shard_size: int = 64,
+    ):
+        if shard_size < 1:
+            raise ValueError("The shard size must be at least 1.")
+        self.options = (unknown_dungeon_chance_patch_applied, fix_dead_end_error, fix_outer_room_error)
+        self.executor = executor
+        self.shard_size = shard_size
+
+    def generate(self, floor_layout: MappaFloorLayoutProtocol, seeds: Iterable[int]) -> GeneratedFloors:
+        """Generates a floor for every seed and returns them, in the order of the seeds."""
+        floors = GeneratedFloors()
+        for shard_floors, _ in self._run([FloorLayoutProperties.from_layout(floor_layout)], list(seeds), True)[0]:
+            floors.extend(shard_floors)
+        return floors
+
+    def statistics(self, floor_layout: MappaFloorLayoutProtocol, seeds: Iterable[int]) -> FloorStatistics:
+        """Generates a floor for every seed and returns the statistics over them."""
+        return self._statistics([FloorLayoutProperties.from_layout(floor_layout)], list(seeds))[0]
+
+    def mappa_statistics(self, mappa: MappaBinProtocol, seeds: Iterable[int]) -> list[list[FloorStatistics]]:
+        """
+        Generates a floor for every seed for each floor in the mappa file and returns the statistics,
+        in the same order as the floor lists of the mappa file.
+        Floors with the same layout settings are only generated once and share their statistics object.
+        """
+        properties = [[FloorLayoutProperties.from_layout(floor.layout) for floor in fl] for fl in mappa.floor_lists]
+        unique = list(dict.fromkeys(p for fl in properties for p in fl))
+        by_properties = dict(zip(unique, self._statistics(unique, list(seeds))))
+        return [[by_properties[p] for p in fl] for fl in properties]
+
+    def _statistics(self, properties: Sequence[FloorLayoutProperties], seeds: list[int]) -> list[FloorStatistics]:
+        result = []
+        for shards in self._run(properties, seeds, False):
+            statistics = FloorStatistics()
+            for _, shard_statistics in shards:
+                statistics.merge(shard_statistics)
+            result.append(statistics)
+        return result
+
+    def _run(
+        self, properties: Iterable[FloorLayoutProperties], seeds: list[int], keep_floors: bool
+    ) -> list[list[tuple[GeneratedFloors | None, FloorStatistics]]]:
+        """Returns the results of all shards, for every entry in properties."""
+        jobs = [
+            [
+                (self.options, p, seeds[i : i + self.shard_size], keep_floors)
+                for i in range(0, len(seeds), self.shard_size)
+            ]
+            for p in properties
+        ]
+        if self.executor is None:
+            return [[_generate_shard(*job) for job in shards] for shards in jobs]
+        futures = [[self.executor.submit(_generate_shard, *job) for job in shards] for shards in jobs]
+        try:
+            return [[future.result() for future in shards] for shards in futures]
+        except BaseException:
+            for shards in futures:
+                for future in shards:
+                    future.cancel()
+            raise
+
+
+def _generate_shard(
+    options: tuple[bool, bool, bool],
+    properties: FloorLayoutProperties,
+    seeds: list[int],
+    keep_floors: bool,
+) -> tuple[GeneratedFloors | None, FloorStatistics]:
+    """Generates the floors for a shard of seeds. May run in another process."""
+    floors = GeneratedFloors() if keep_floors else None
+    statistics = FloorStatistics()
+    with generation_lock:
+        for seed in seeds:
+            setup_generation(properties, RandomGenProperties.from_seed(seed), *options)
+            generate_floor()
+            floor = None if ReturnData.invalid_generation else GeneratedFloor.read()
+            statistics.add(floor)
+            if floors is not None:
+                floors.append(seed, floor)
+    return floors, statistics
+
+
+def _mean(counts: Counter[int]) -> float:
+    total = sum(counts.values())
+    if total == 0:
+        return 0.0
+    return sum(value * n for value, n in counts.items()) / total
@@ -17,14 +17,18 @@
 # mypy: ignore-errors
 from __future__ import annotations
 
+import copy
 import random
+from dataclasses import dataclass, fields
 from enum import Enum, auto
+from threading import Lock
 
 from dungeon_eos.DungeonAlgorithm import (
     DungeonData,
     Properties,
     ReturnData,
     StaticParam,
+    StatusData,
     generate_floor,
 )
 from dungeon_eos.RandomGen import RandomGenerator
@@ -61,6 +65,11 @@ class RandomGenProperties:
             [rng.randrange(1 << 32) for i in range(5)],
         )
 
+    @classmethod
+    def from_seed(cls, seed: int) -> RandomGenProperties:
+        """Returns the default properties, with the seeds of the game's RNG derived from the given seed."""
+        return cls.default(random.Random(seed))
+
 
 class TileType(Enum):
     GENERIC = auto()
@@ -119,116 +128,232 @@ class Tile:
 
 SIZE_X = 32
 SIZE_Y = 56
+# Number of tiles of a floor. The tiles of a floor are stored row by row (SIZE_X rows of SIZE_Y tiles).
+FLOOR_TILES = SIZE_X * SIZE_Y
+# Bits in the terrain and spawn flags of the tiles, as generated by the game.
+TERRAIN_MASK = 0x3
+TERRAIN_FLAG_KECLEON_SHOP = 0x20
+TERRAIN_FLAG_MONSTER_HOUSE = 0x40
+SPAWN_FLAG_ITEM = 0x2
+SPAWN_FLAG_TRAP = 0x4
+SPAWN_FLAG_ENEMY = 0x8
+# Room index of tiles that are not part of a room.
+NO_ROOM = 0xFF
 
+# dungeon_eos stores all of its state in module-level singletons, so only one floor can be generated at a time
+# in a process.
+generation_lock = Lock()
+# The initial state of the floor generation. dungeon_eos doesn't reset all of it between floors (the game does,
+# when a floor starts), so it is restored before generating a floor. This way a floor only depends on its settings.
+_INITIAL_STATE = [
+    (cls, name, value)
+    for cls in (Properties, StaticParam, DungeonData, StatusData, ReturnData)
+    for name, value in vars(cls).items()
+    if not name.startswith("__") and not callable(value)
+]
 
-class DungeonFloorGenerator:
-    def __init__(
-        self,
-        unknown_dungeon_chance_patch_applied=False,
-        fix_dead_end_error=False,
-        fix_outer_room_error=False,
-        gen_properties: RandomGenProperties | None = None,
-    ):
-        self.unknown_dungeon_chance_patch_applied = unknown_dungeon_chance_patch_applied
-        self.fix_dead_end_error = fix_dead_end_error
-        self.fix_outer_room_error = fix_outer_room_error
-        self.gen_properties = gen_properties
-        if self.gen_properties is None:
-            self.gen_properties = RandomGenProperties.default()
 
-    def generate(
-        self, floor_layout: MappaFloorLayoutProtocol, max_retries=1, flat=False
-    ) -> list[list[Tile]] | list[Tile] | None:
-        """
-        Returns a dungeon floor matrix (Tile matrix SIZE_Y x SIZE_X).
-        Returns None if no valid floor could be generated after max_retries attempts.
-        """
-        RandomGenerator.gen_type = self.gen_properties.gen_type
-        RandomGenerator.mul = self.gen_properties.mul
-        RandomGenerator.count = self.gen_properties.count
-        RandomGenerator.seed_old_t0 = self.gen_properties.seed_old_t0
-        RandomGenerator.seed_t0 = self.gen_properties.seed_t0
-        RandomGenerator.add_t1 = self.gen_properties.add_t1
-        RandomGenerator.use_seed_t1 = self.gen_properties.use_seed_t1
-        RandomGenerator.seeds_t1 = self.gen_properties.seeds_t1
-
-        Properties.layout = floor_layout.structure
-        Properties.mh_chance = floor_layout.monster_house_chance
-        Properties.kecleon_chance = floor_layout.kecleon_shop_chance
-        Properties.middle_room_secondary = floor_layout.secondary_terrain
-        Properties.nb_rooms = floor_layout.room_density
-        Properties.bit_flags = u8(
-            generate_bitfield(
-                (
-                    floor_layout.terrain_settings.unk7,
-                    floor_layout.terrain_settings.unk6,
-                    floor_layout.terrain_settings.unk5,
-                    floor_layout.terrain_settings.unk4,
-                    floor_layout.terrain_settings.unk3,
-                    floor_layout.terrain_settings.generate_imperfect_rooms,
-                    floor_layout.terrain_settings.unk1,
-                    floor_layout.terrain_settings.has_secondary_terrain,
+@dataclass(frozen=True)
+class FloorLayoutProperties:
+    """The settings of a floor layout that are used by the floor generation."""
+
+    layout: int
+    mh_chance: int
+    kecleon_chance: int
+    middle_room_secondary: int
+    nb_rooms: int
+    bit_flags: int
+    floor_connectivity: int
+    maze_chance: int
+    dead_end: int
+    extra_hallways: int
+    secondary_density: int
+    enemy_density: int
+    item_density: int
+    buried_item_density: int
+    trap_density: int
+
+    @classmethod
+    def from_layout(cls, floor_layout: MappaFloorLayoutProtocol) -> FloorLayoutProperties:
+        return cls(
+            layout=int(floor_layout.structure),
+            mh_chance=int(floor_layout.monster_house_chance),
+            kecleon_chance=int(floor_layout.kecleon_shop_chance),
+            middle_room_secondary=int(floor_layout.secondary_terrain),
+            nb_rooms=int(floor_layout.room_density),
+            bit_flags=u8(
+                generate_bitfield(
+                    (
+                        floor_layout.terrain_settings.unk7,
+                        floor_layout.terrain_settings.unk6,
+                        floor_layout.terrain_settings.unk5,
+                        floor_layout.terrain_settings.unk4,
+                        floor_layout.terrain_settings.unk3,
+                        floor_layout.terrain_settings.generate_imperfect_rooms,
+                        floor_layout.terrain_settings.unk1,
+                        floor_layout.terrain_settings.has_secondary_terrain,
+                    )
                 )
-            )
+            ),
+            floor_connectivity=int(floor_layout.floor_connectivity),
+            maze_chance=int(floor_layout.unused_chance),
+            dead_end=int(floor_layout.dead_ends),
+            extra_hallways=int(floor_layout.extra_hallway_density),
+            secondary_density=int(floor_layout.water_density),
+            enemy_density=int(floor_layout.initial_enemy_density),
+            item_density=int(floor_layout.item_density),
+            buried_item_density=int(floor_layout.buried_item_density),
+            trap_density=int(floor_layout.trap_density),
         )
-        Properties.floor_connectivity = floor_layout.floor_connectivity
-        Properties.maze_chance = floor_layout.unused_chance
-        Properties.dead_end = int(floor_layout.dead_ends)
-        Properties.extra_hallways = floor_layout.extra_hallway_density
-        Properties.secondary_density = floor_layout.water_density
-        Properties.enemy_density = floor_layout.initial_enemy_density
-        Properties.item_density = floor_layout.item_density
-        Properties.buried_item_density = floor_layout.buried_item_density
-        Properties.trap_density = floor_layout.trap_density
-        StaticParam.PATCH_APPLIED = int(self.unknown_dungeon_chance_patch_applied)
-        StaticParam.FIX_DEAD_END_ERROR = int(self.fix_dead_end_error)
-        StaticParam.FIX_OUTER_ROOM_ERROR = int(self.fix_outer_room_error)
-        StaticParam.SHOW_ERROR = 0
-
-        for x in range(max_retries):
-            generate_floor()
-            if ReturnData.invalid_generation:
-                print("Unsafe generation parameters")
-                break
 
-        if ReturnData.invalid_generation:
-            return None
+    def apply(self) -> None:
+        """Sets these as the floor properties of the floor generation."""
+        for field in fields(self):
+            setattr(Properties, field.name, getattr(self, field.name))
+
+
+@dataclass
+class GeneratedFloor:
+    """
+    A generated floor in a compact form, with the terrain flags, spawn flags and room index of each tile,
+    row by row (see FLOOR_TILES).
+    """
+
+    terrain_flags: bytearray
+    spawn_flags: bytearray
+    room_index: bytearray
+    player_spawn: tuple[int, int]
+    stairs: tuple[int, int]
+
+    @classmethod
+    def read(cls) -> GeneratedFloor:
+        """Reads the floor that was last generated."""
+        terrain_flags = bytearray(FLOOR_TILES)
+        spawn_flags = bytearray(FLOOR_TILES)
+        room_index = bytearray(FLOOR_TILES)
+        for x, column in enumerate(DungeonData.list_tiles):
+            terrain_flags[x::SIZE_Y] = bytes(tile.terrain_flags & 0xFF for tile in column)
+            spawn_flags[x::SIZE_Y] = bytes(tile.spawn_flags & 0xFF for tile in column)
+            room_index[x::SIZE_Y] = bytes(tile.room_index & 0xFF for tile in column)
+        return cls(
+            terrain_flags,
+            spawn_flags,
+            room_index,
+            (DungeonData.player_spawn_x, DungeonData.player_spawn_y),
+            (DungeonData.stairs_spawn_x, DungeonData.stairs_spawn_y),
+        )
 
+    def tiles(self, flat=False) -> list[list[Tile]] | list[Tile]:
+        """Returns the floor as a Tile matrix (SIZE_X x SIZE_Y) or a flat list of the rows, if flat is set."""
         tiles_grid = []
-        for y in range(32):
+        for y in range(SIZE_X):
             if not flat:
                 tiles_row = []
                 tiles_grid.append(tiles_row)
             else:
                 tiles_row = tiles_grid
-            for x in range(56):
-                terrain_idx = DungeonData.list_tiles[x][y].terrain_flags & 0x3
+            for x in range(SIZE_Y):
+                i = y * SIZE_Y + x
+                terrain_flags = self.terrain_flags[i]
+                spawn_flags = self.spawn_flags[i]
+                terrain_idx = terrain_flags & TERRAIN_MASK
                 if terrain_idx == 0:
                     dma_type = DmaType.WALL
                 if terrain_idx == 1:
                     dma_type = DmaType.FLOOR
                 if terrain_idx == 2:
                     dma_type = DmaType.WATER
-                tile = Tile(dma_type, DungeonData.list_tiles[x][y].room_index)
+                tile = Tile(dma_type, self.room_index[i])
                 tiles_row.append(tile)
-                if DungeonData.player_spawn_x == x and DungeonData.player_spawn_y == y:
+                if self.player_spawn == (x, y):
                     tile.typ = TileType.PLAYER_SPAWN
-                elif DungeonData.stairs_spawn_x == x and DungeonData.stairs_spawn_y == y:
+                elif self.stairs == (x, y):
                     tile.typ = TileType.STAIRS
-                elif DungeonData.list_tiles[x][y].spawn_flags & 0x8:
+                elif spawn_flags & SPAWN_FLAG_ENEMY:
                     tile.typ = TileType.ENEMY
-                elif DungeonData.list_tiles[x][y].spawn_flags & 0x4:
+                elif spawn_flags & SPAWN_FLAG_TRAP:
                     tile.typ = TileType.TRAP
-                elif DungeonData.list_tiles[x][y].spawn_flags & 0x2:
-                    if DungeonData.list_tiles[x][y].terrain_flags & 0x3 == 0:
+                elif spawn_flags & SPAWN_FLAG_ITEM:
+                    if terrain_idx == 0:
                         tile.typ = TileType.BURIED_ITEM
                     else:
                         tile.typ = TileType.ITEM
 
                 if terrain_idx == 1:
-                    if DungeonData.list_tiles[x][y].terrain_flags & 0x40:
+                    if terrain_flags & TERRAIN_FLAG_MONSTER_HOUSE:
                         tile.room_type = RoomType.MONSTER_HOUSE
-                    elif DungeonData.list_tiles[x][y].terrain_flags & 0x20:
+                    elif terrain_flags & TERRAIN_FLAG_KECLEON_SHOP:
                         tile.room_type = RoomType.KECLEON_SHOP
 
         return tiles_grid
+
+
+def setup_generation(
+    properties: FloorLayoutProperties,
+    gen_properties: RandomGenProperties,
+    unknown_dungeon_chance_patch_applied: bool,
+    fix_dead_end_error: bool,
+    fix_outer_room_error: bool,
+) -> None:
+    """Sets up the state of the floor generation. Hold the generation_lock while doing this and generating."""
+    for cls, name, value in _INITIAL_STATE:
+        setattr(cls, name, copy.deepcopy(value))
+    RandomGenerator.gen_type = gen_properties.gen_type
+    RandomGenerator.mul = gen_properties.mul
+    RandomGenerator.count = gen_properties.count
+    RandomGenerator.seed_old_t0 = gen_properties.seed_old_t0
+    RandomGenerator.seed_t0 = gen_properties.seed_t0
+    RandomGenerator.add_t1 = gen_properties.add_t1
+    RandomGenerator.use_seed_t1 = gen_properties.use_seed_t1
+    RandomGenerator.seeds_t1 = gen_properties.seeds_t1
+
+    properties.apply()
+    StaticParam.PATCH_APPLIED = int(unknown_dungeon_chance_patch_applied)
+    StaticParam.FIX_DEAD_END_ERROR = int(fix_dead_end_error)
+    StaticParam.FIX_OUTER_ROOM_ERROR = int(fix_outer_room_error)
+    StaticParam.SHOW_ERROR = 0
+
+
+class DungeonFloorGenerator:
+    def __init__(
+        self,
+        unknown_dungeon_chance_patch_applied=False,
+        fix_dead_end_error=False,
+        fix_outer_room_error=False,
+        gen_properties: RandomGenProperties | None = None,
+    ):
+        self.unknown_dungeon_chance_patch_applied = unknown_dungeon_chance_patch_applied
+        self.fix_dead_end_error = fix_dead_end_error
+        self.fix_outer_room_error = fix_outer_room_error
+        self.gen_properties = gen_properties
+        if self.gen_properties is None:
+            self.gen_properties = RandomGenProperties.default()
+
+    def generate(
+        self, floor_layout: MappaFloorLayoutProtocol, max_retries=1, flat=False
+    ) -> list[list[Tile]] | list[Tile] | None:
+        """
+        Returns a dungeon floor matrix (Tile matrix SIZE_Y x SIZE_X).
+        Returns None if no valid floor could be generated after max_retries attempts.
+        For generating many floors, see DungeonFloorBatchGenerator.
+        """
+        with generation_lock:
+            setup_generation(
+                FloorLayoutProperties.from_layout(floor_layout),
+                self.gen_properties,
+                self.unknown_dungeon_chance_patch_applied,
+                self.fix_dead_end_error,
+                self.fix_outer_room_error,
+            )
+
+            for x in range(max_retries):
+                generate_floor()
+                if ReturnData.invalid_generation:
+                    print("Unsafe generation parameters")
+                    break
+
+            if ReturnData.invalid_generation:
+                return None
+
+            floor = GeneratedFloor.read()
+        return floor.tiles(flat)
@@ -0,0 +1,272 @@
+"""Versioned on-disk and in-process cache for the parsed default ppmdu configuration."""
+
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import warnings
+from collections import Counter
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from appdirs import user_cache_dir
+
+from skytemple_files.common.i18n_util import LocaleManager, get_locales
+from skytemple_files.common.util import get_package_version, get_resources_dir, write_file_atomically
+from skytemple_files.common.warnings import ImplicitDefaultConfigWarning
+
+if TYPE_CHECKING:
+    from skytemple_files.common.ppmdu_config.data import Pmd2Data
+
+ENV_SKYTEMPLE_PPMDU_CACHE_DIR = "SKYTEMPLE_PPMDU_CACHE_DIR"
+ENV_SKYTEMPLE_DISABLE_PPMDU_CACHE = "SKYTEMPLE_DISABLE_PPMDU_CACHE"
+# Bump this if the pickled representation of Pmd2Data changes in a way the other key parts don't catch.
+CACHE_FORMAT_VERSION = 1
+CACHE_FILE_SUFFIX = ".pmd2data.pickle"
+# The modules that define what a parsed configuration looks like. Their source is part of the key,
+# so that development checkouts (which all share one package version) don't load stale caches.
+_MODEL_MODULES = ("data.py", "dungeon_data.py", "script_data.py", "xml_reader.py", "cache.py")
+logger = logging.getLogger(__name__)
+
+
+class Pmd2DataCache:
+    """
+    A cache for the default configuration returned by ``Pmd2XmlReader.load_default``.
+
+    Every edition is parsed from the XML at most once per cache key: The result is pickled
+    to disk (keyed by the hash of the resource XML files and the skytemple_files version) and
+    the pickled snapshot is also kept in memory.
+
+    The snapshot itself is never handed out. Every call to ``get`` returns a freshly unpickled copy,
+    so callers (like ``RomDataLoader.load_into``) can patch the returned configuration for
+    a single ROM without affecting other ROMs.
+    """
+
+    def __init__(self, cache_dir: str | None = None, *, use_disk: bool = True):
+        if cache_dir is None:
+            cache_dir = os.getenv(ENV_SKYTEMPLE_PPMDU_CACHE_DIR, None)
+        if cache_dir is None:
+            cache_dir = os.path.join(user_cache_dir("skytemple", False), "ppmdu_config")
+        self.cache_dir = cache_dir
+        self.use_disk = use_disk and not bool(int(os.getenv(ENV_SKYTEMPLE_DISABLE_PPMDU_CACHE, "0")))
+        self._memo: dict[str, bytes] = {}
+        self._lock = Lock()
+        self._resources_hash: str | None = None
+
+    def get(self, for_version: str = "EoS_EU", translate_strings: bool = True) -> Pmd2Data:
+        """Returns a private copy of the default configuration for the given edition."""
+        key = self.cache_key(for_version, translate_strings)
+        with self._lock:
+            snapshot = self._memo.get(key)
+            if snapshot is None:
+                # On a miss the object we just created or unpickled is not referenced by the snapshot,
+                # so it can be handed out directly.
+                loaded = self._load_from_disk(key)
+                if loaded is None:
+                    data = self._parse(for_version, translate_strings)
+                    snapshot = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+                    self._store_on_disk(key, snapshot)
+                else:
+                    snapshot, data = loaded
+                self._memo[key] = snapshot
+                return data
+        return pickle.loads(snapshot)
+
+    def cache_key(self, for_version: str, translate_strings: bool) -> str:
+        """
+        Returns the key under which the configuration for the edition is cached.
+        Changes if any of the resource XML files, the skytemple_files version or the active locale change.
+        """
+        if self._resources_hash is None:
+            self._resources_hash = self._hash_resources()
+        h = hashlib.sha256()
+        h.update(self._resources_hash.encode())
+        h.update(get_package_version().encode())
+        h.update(f"{CACHE_FORMAT_VERSION}:{sys.version_info[:2]}:{pickle.HIGHEST_PROTOCOL}".encode())
+        h.update(f"{for_version}:{translate_strings}".encode())
+        if translate_strings:
+            h.update(_locale_key().encode())
+        return f"{for_version}-{h.hexdigest()[:32]}"
+
+    def clear(self, for_version: str | None = None, *, memory_only: bool = False) -> None:
+        """
+        Drops the in-memory snapshots and, unless ``memory_only`` is set, the cache files on disk.
+        If ``for_version`` is given, only the entries for that edition are dropped.
+        """
+        prefix = "" if for_version is None else f"{for_version}-"
+        with self._lock:
+            for key in [k for k in self._memo.keys() if k.startswith(prefix)]:
+                del self._memo[key]
+            self._resources_hash = None
+            if memory_only or not os.path.isdir(self.cache_dir):
+                return
+            for name in os.listdir(self.cache_dir):
+                if name.startswith(prefix) and name.endswith(CACHE_FILE_SUFFIX):
+                    try:
+                        os.unlink(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_FILE_SUFFIX)
+
+    @staticmethod
+    def _parse(for_version: str, translate_strings: bool) -> Pmd2Data:
+        from skytemple_files.common.ppmdu_config.xml_reader import Pmd2XmlReader
+
+        return Pmd2XmlReader.load_default(for_version, translate_strings)
+
+    def _load_from_disk(self, key: str) -> tuple[bytes, Pmd2Data] | None:
+        if not self.use_disk:
+            return None
+        try:
+            with open(self.path_for(key), "rb") as f:
+                snapshot = f.read()
+            return snapshot, pickle.loads(snapshot)
+        except FileNotFoundError:
+            return None
+        except Exception as ex:
+            logger.warning(f"Ignoring unreadable ppmdu config cache file for {key}.", exc_info=ex)
+            return None
+
+    def _store_on_disk(self, key: str, snapshot: bytes) -> None:
+        if not self.use_disk:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write atomically, multiple processes may race on a cold cache.
+            write_file_atomically(self.path_for(key), snapshot)
+        except OSError as ex:
+            logger.warning(f"Could not write ppmdu config cache file for {key}.", exc_info=ex)
+
+    @staticmethod
+    def _hash_resources() -> str:
+        h = hashlib.sha256()
+        res_dir = os.path.join(get_resources_dir(), "ppmdu_config")
+        for name in sorted(os.listdir(res_dir)):
+            if name.endswith(".xml"):
+                h.update(name.encode())
+                with open(os.path.join(res_dir, name), "rb") as f:
+                    h.update(f.read())
+        module_dir = os.path.dirname(__file__)
+        for name in _MODEL_MODULES:
+            with open(os.path.join(module_dir, name), "rb") as f:
+                h.update(f.read())
+        return h.hexdigest()
+
+
+def _locale_key() -> str:
+    locales = get_locales()
+    if isinstance(locales, LocaleManager):
+        return f"{locales.domain}:{','.join(locales.main_languages)}"
+    return ""
+
+
+_default_cache: Pmd2DataCache | None = None
+_default_cache_lock = Lock()
+
+
+def get_default_cache() -> Pmd2DataCache:
+    """Returns the process-wide configuration cache."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = Pmd2DataCache()
+        return _default_cache
+
+
+def load_default_cached(for_version: str = "EoS_EU", translate_strings: bool = True) -> Pmd2Data:
+    """
+    Like ``Pmd2XmlReader.load_default``, but served from the process-wide cache.
+    The returned configuration is a private copy and may be freely modified.
+    """
+    return get_default_cache().get(for_version, translate_strings)
+
+
+class DefaultConfigRegistry:
+    """
+    Process-wide registry of the default configurations, for code that only needs to read them,
+    such as handlers that are called without the configuration for the ROM.
+
+    Unlike ``Pmd2DataCache.get`` the same instance is returned for every lookup, so the returned
+    configurations must not be modified. The registry is thread-safe. ``invalidate`` drops the
+    registered configurations, they are reloaded on the next lookup.
+    """
+
+    def __init__(self, cache: Pmd2DataCache | None = None):
+        self._cache = cache
+        self._configs: dict[tuple[str, bool], Pmd2Data] = {}
+        self._fallback_counts: Counter[str] = Counter()
+        self._lock = Lock()
+
+    def get(self, for_version: str = "EoS_EU", translate_strings: bool = True) -> Pmd2Data:
+        """Returns the shared default configuration for the edition. Do not modify it."""
+        key = (for_version, translate_strings)
+        with self._lock:
+            config = self._configs.get(key)
+            if config is None:
+                cache = self._cache if self._cache is not None else get_default_cache()
+                config = cache.get(for_version, translate_strings)
+                self._configs[key] = config
+            return config
+
+    def fallback(self, consumer: str, for_version: str = "EoS_EU") -> Pmd2Data:
+        """
+        Like ``get``, but for callers that only use the default configuration because they weren't given
+        the configuration for the ROM. This is counted per consumer and an ``ImplicitDefaultConfigWarning``
+        is emitted, so callers that rely on this can be found.
+        """
+        with self._lock:
+            self._fallback_counts[consumer] += 1
+        warnings.warn(
+            ImplicitDefaultConfigWarning(
+                f"{consumer} was called without a ppmdu configuration, the default configuration for "
+                f"{for_version} is used. Pass the configuration for the ROM instead."
+            ),
+            stacklevel=3,
+        )
+        return self.get(for_version)
+
+    def fallback_counts(self) -> dict[str, int]:
+        """Returns how often each consumer had to fall back to the default configuration."""
+        with self._lock:
+            return dict(self._fallback_counts)
+
+    def reset_fallback_counts(self) -> None:
+        with self._lock:
+            self._fallback_counts.clear()
+
+    def invalidate(self, for_version: str | None = None) -> None:
+        """Drops the registered configuration for the edition, or all of them if ``for_version`` is None."""
+        with self._lock:
+            for key in [k for k in self._configs.keys() if for_version is None or k[0] == for_version]:
+                del self._configs[key]
+            cache = self._cache if self._cache is not None else get_default_cache()
+            cache.clear(for_version, memory_only=True)
+
+
+_default_config_registry = DefaultConfigRegistry()
+
+
+def get_default_config_registry() -> DefaultConfigRegistry:
+    """Returns the process-wide registry of default configurations."""
+    return _default_config_registry
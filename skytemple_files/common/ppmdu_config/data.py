@@ -276,6 +276,9 @@ class Pmd2Data(AutoString):
         self.dungeon_data = dungeon_data
         self.string_encoding = string_encoding
         self.animation_names: dict[int, Pmd2Sprite] = {k: animation_names[k] for k in sorted(animation_names)}
+        self._init_bin_sections()
+
+    def _init_bin_sections(self) -> None:
         self.bin_sections: pmdsky_debug_py.AllSymbolsProtocol
         if self.game_region == GAME_REGION_US:
             self.bin_sections = pmdsky_debug_py.na
@@ -294,6 +297,17 @@ class Pmd2Data(AutoString):
         if self.game_region == GAME_REGION_JP:
             self.extra_bin_sections = ExtraJpSections  # type: ignore
 
+    def __getstate__(self) -> dict[str, Any]:
+        # The symbol sections are modules / classes and are not picklable. They only depend on the region.
+        state = self.__dict__.copy()
+        state.pop("bin_sections", None)
+        state.pop("extra_bin_sections", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_bin_sections()
+
     @staticmethod
     def get_region_constant_for_region_name(region: str) -> str:
         if region == "NorthAmerica":
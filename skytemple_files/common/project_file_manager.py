@@ -123,6 +123,23 @@ class ProjectFileManager:
             entries.append(ssb_filename_that_is_included)
         self._explorerscript_save_inclusion_map(filename, entries)
 
+    def explorerscript_inclusion_maps(self, *directories: str) -> dict[str, list[str]]:
+        """
+        Returns all inclusion maps in the project directory and the given additional directories (eg. lookup paths):
+        The absolute path of each included ExplorerScript file mapped to the SSB files that include it.
+        """
+        suffix = EXPLORERSCRIPT_EXT + EXPLORERSCRIPT_INCLUSION_MAP_SUFFIX
+        maps = {}
+        for directory in (self.directory_name,) + directories:
+            for dirpath, _dirnames, filenames in os.walk(directory):
+                for filename in filenames:
+                    if filename.endswith(suffix):
+                        path = os.path.join(dirpath, filename)
+                        maps[os.path.realpath(path[: -len(EXPLORERSCRIPT_INCLUSION_MAP_SUFFIX)])] = (
+                            self._explorerscript_get_inclusion_map(path)
+                        )
+        return maps
+
     def explorerscript_get_path_for_ssb(self, ssb_filename):
         """
         Returns a relative path (relative to project dir) to an exps file for a given ssb file.
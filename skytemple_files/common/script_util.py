@@ -122,3 +122,15 @@ def load_script_files(script_folder: Folder, level_list: LevelListBin | None = N
                 )
 
     return script_files
+
+
+def get_ssb_filenames(script_files: ScriptFiles) -> list[str]:
+    """Returns the paths in the ROM of all SSB files in the output of load_script_files."""
+    ssb_filenames = [f"{SCRIPT_DIR}/{COMMON_DIR}/{name}" for name in script_files["common"] if name.endswith(SSB_EXT)]
+    for script_map in script_files["maps"].values():
+        names = list(script_map["enter_ssbs"])
+        names += [ssb for _, ssb in script_map["ssas"]]
+        for ssbs in script_map["subscripts"].values():
+            names += ssbs
+        ssb_filenames += [f"{SCRIPT_DIR}/{script_map['name']}/{name}" for name in names]
+    return ssb_filenames
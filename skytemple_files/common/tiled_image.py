@@ -18,18 +18,19 @@
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 from __future__ import annotations
 
+import functools
 import logging
 import math
 import typing
 from itertools import chain
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 
 from PIL import Image
 from range_typed_integers import u16
 
 from skytemple_files.common.i18n_util import _, f
 from skytemple_files.common.protocol import TilemapEntryProtocol
-from skytemple_files.common.util import ByteReadable, iter_bytes_4bit_le
+from skytemple_files.common.util import ByteReadable
 from skytemple_files.user_error import UserValueError
 
 logger = logging.getLogger(__name__)
@@ -115,52 +116,29 @@ def to_pil(
 
     tiling_width/height control how many tiles form a chunk.
     """
-    if bpp == 8:
-        iter_fn = iter
-    elif bpp == 4:
-        iter_fn = iter_bytes_4bit_le  # type: ignore
-    else:
+    if bpp != 4 and bpp != 8:
         raise ValueError(_("Only 4bpp and 8bpp images are supported."))
     pil_img_data = bytearray(img_width * img_height)
     img_width_in_tiles = int(img_width / tile_dim)
     number_tiles = len(tilemap)
     number_of_cols_per_pal = int(len(palettes[0]) / 3)
+    tiles_in_chunks = tiling_width * tiling_height
+    renderer = _TileRenderer(tiles, tile_dim, bpp, number_of_cols_per_pal, ignore_flip_bits)
+    len_last_row = (tile_dim - 1) * img_width + tile_dim
 
     for i in range(0, number_tiles):
-        tiles_in_chunks = tiling_width * tiling_height
         chunk_x = math.floor(math.floor(i / tiles_in_chunks) % (img_width_in_tiles / tiling_width))
         chunk_y = math.floor(math.floor(i / tiles_in_chunks) / (img_width_in_tiles / tiling_width))
 
         tile_x = (chunk_x * tiling_width) + (i % tiling_width)
         tile_y = (chunk_y * tiling_height) + (math.floor(i / tiling_width) % tiling_height)
-        tile_mapping = tilemap[i]
-        try:
-            tile_data = tiles[tile_mapping.idx]
-        except IndexError:
-            # This happens when exporting a BPCs chunk without "loading" the BPAs, because the BPA tiles
-            # take up slots after the BPC slots.
-            logger.warning(
-                f"TiledImage: TileMappingEntry {tile_mapping} contains invalid tile reference. Replaced with 0."
-            )
-            tile_data = tiles[0]
-        # Since our PIL image has one big flat palette, we need to calculate the offset to that
-        pal_start_offset = number_of_cols_per_pal * tile_mapping.pal_idx
-        for idx, pal in enumerate(iter_fn(tile_data)):
-            real_pal = pal_start_offset + pal
-            x_in_tile, y_in_tile = _px_pos_flipped(
-                idx % tile_dim,
-                math.floor(idx / tile_dim),
-                tile_dim,
-                tile_dim,
-                tile_mapping.flip_x and not ignore_flip_bits,
-                tile_mapping.flip_y and not ignore_flip_bits,
-            )
-            real_x = tile_x * tile_dim + x_in_tile
-            real_y = tile_y * tile_dim + y_in_tile
-            nidx = real_y * img_width + real_x
-            # print(f"{i} : {tile_x}x{tile_y} -- {x_in_tile}x{y_in_tile} -> {real_x}x{real_y}={nidx}")
-            pil_img_data[nidx] = real_pal
-    # assert len(pil_img_data) == dim_w * dim_h * 8
+        # Copy the tile row by row into the image.
+        nidx = tile_y * tile_dim * img_width + tile_x * tile_dim
+        if nidx + len_last_row > len(pil_img_data):
+            raise IndexError(f"Tile {i} is outside of the image.")
+        for row in renderer.render(tilemap[i]):
+            pil_img_data[nidx : nidx + tile_dim] = row
+            nidx += img_width
 
     im = Image.frombuffer("P", (img_width, img_height), pil_img_data, "raw", "P", 0, 1)
 
@@ -182,22 +160,12 @@ def to_pil_tiled(
     """
     tiles = []
     number_tiles = len(tilemap)
+    # The palette is applied to each image, so the pixels are not offset.
+    renderer = _TileRenderer(in_tiles, tile_dim, 4, 0, ignore_flip_bits, replace_invalid=False)
 
     for i in range(0, number_tiles):
-        pil_img_data = bytearray(tile_dim * tile_dim)
         tile_mapping = tilemap[i]
-        tile_data = in_tiles[tile_mapping.idx]
-        for idx, pal in enumerate(iter_bytes_4bit_le(tile_data)):
-            real_x, real_y = _px_pos_flipped(
-                idx % tile_dim,
-                math.floor(idx / tile_dim),
-                tile_dim,
-                tile_dim,
-                tile_mapping.flip_x and not ignore_flip_bits,
-                tile_mapping.flip_y and not ignore_flip_bits,
-            )
-            nidx = real_y * tile_dim + real_x
-            pil_img_data[nidx] = pal
+        pil_img_data = b"".join(renderer.render(tile_mapping))
 
         im = Image.frombuffer("P", (tile_dim, tile_dim), pil_img_data, "raw", "P", 0, 1)
         im.putpalette(palettes[tile_mapping.pal_idx])
@@ -206,6 +174,100 @@ def to_pil_tiled(
     return tiles
 
 
+# Lookup tables to unpack the two 4bpp pixels stored in each byte (little endian: low nibble first)
+_LOW_NIBBLES = bytes(i & 0x0F for i in range(256))
+_HIGH_NIBBLES = bytes(i >> 4 for i in range(256))
+
+
+class _TileRenderer:
+    """
+    Renders tiles for a tilemap into rows of pixel values (palette indices) for the merged palette of the image.
+
+    Tiles are unpacked with byte lookup tables, flips are done by reversing rows / the row order and every
+    combination of tile, palette and flips is only rendered once.
+    """
+
+    def __init__(
+        self,
+        tiles: Sequence[ByteReadable],
+        tile_dim: int,
+        bpp: int,
+        number_of_cols_per_pal: int,
+        ignore_flip_bits: bool,
+        replace_invalid: bool = True,
+    ):
+        self.tiles = tiles
+        self.tile_dim = tile_dim
+        self.bpp = bpp
+        self.number_of_cols_per_pal = number_of_cols_per_pal
+        self.ignore_flip_bits = ignore_flip_bits
+        self.replace_invalid = replace_invalid
+        self._unpacked: dict[int, bytes] = {}
+        self._rendered: dict[tuple[int, int, bool, bool], list[bytes]] = {}
+
+    def render(self, tile_mapping: TilemapEntryProtocol) -> list[bytes]:
+        """Returns the pixel rows of the tile referenced by the tile mapping."""
+        flip_x = tile_mapping.flip_x and not self.ignore_flip_bits
+        flip_y = tile_mapping.flip_y and not self.ignore_flip_bits
+        tile_idx = tile_mapping.idx
+        if tile_idx >= len(self.tiles) and self.replace_invalid:
+            # This happens when exporting a BPCs chunk without "loading" the BPAs, because the BPA tiles
+            # take up slots after the BPC slots.
+            logger.warning(
+                f"TiledImage: TileMappingEntry {tile_mapping} contains invalid tile reference. Replaced with 0."
+            )
+            tile_idx = 0
+        key = (tile_idx, tile_mapping.pal_idx, flip_x, flip_y)
+        rows = self._rendered.get(key)
+        if rows is None:
+            rows = self._render(tile_idx, tile_mapping.pal_idx, flip_x, flip_y)
+            self._rendered[key] = rows
+        return rows
+
+    def _render(self, tile_idx: int, pal_idx: int, flip_x: bool, flip_y: bool) -> list[bytes]:
+        dim = self.tile_dim
+        pixels = self._unpack(tile_idx)
+        # Since our PIL image has one big flat palette, we need to calculate the offset to that
+        pal_start_offset = self.number_of_cols_per_pal * pal_idx
+        if pal_start_offset != 0:
+            if max(pixels) + pal_start_offset > 255:
+                raise ValueError(f"Palette {pal_idx} is outside of the merged palette.")
+            pixels = pixels.translate(_offset_table(pal_start_offset))
+        if flip_x and flip_y:
+            pixels = pixels[::-1]
+        rows = [pixels[y * dim : (y + 1) * dim] for y in range(dim)]
+        if flip_x and not flip_y:
+            rows = [row[::-1] for row in rows]
+        elif flip_y and not flip_x:
+            rows.reverse()
+        return rows
+
+    def _unpack(self, tile_idx: int) -> bytes:
+        pixels = self._unpacked.get(tile_idx)
+        if pixels is None:
+            data = self.tiles[tile_idx]
+            if not isinstance(data, bytes):
+                data = bytes(data)
+            if self.bpp == 4:
+                unpacked = bytearray(len(data) * 2)
+                unpacked[0::2] = data.translate(_LOW_NIBBLES)
+                unpacked[1::2] = data.translate(_HIGH_NIBBLES)
+                pixels = bytes(unpacked)
+            else:
+                pixels = data
+            # Pixels missing at the end of short tiles stay 0.
+            len_tile = self.tile_dim * self.tile_dim
+            if len(pixels) != len_tile:
+                pixels = pixels[:len_tile].ljust(len_tile, b"\x00")
+            self._unpacked[tile_idx] = pixels
+        return pixels
+
+
+@functools.lru_cache(maxsize=64)
+def _offset_table(offset: int) -> bytes:
+    return bytes(min(i + offset, 0xFF) for i in range(256))
+
+
 @typing.no_type_check
 def from_pil(
     pil: Image.Image,
@@ -285,7 +347,7 @@ def from_pil(
     # Set inside the loop:
     tile_palette_indices = [None for __ in range(0, number_of_tiles)]
 
-    already_initialised_tiles = []
+    already_initialised_tiles = set()
 
     for idx, pix in enumerate(raw_pil_image):
         pix = pix + palette_offset * single_palette_size
@@ -312,7 +374,7 @@ def from_pil(
             #      f"{tile_x}x{tile_y} -- {idx_in_tile} : {in_tile_x}x{in_tile_y} = {nidx}")
 
             if tile_id not in already_initialised_tiles:
-                already_initialised_tiles.append(tile_id)
+                already_initialised_tiles.add(tile_id)
                 # Begin a new tile
                 tiles_with_sum[tile_id] = [0, bytearray(int(tile_dim * tile_dim / 2))]
                 # Get the palette index from the first pixel
@@ -360,21 +422,21 @@ def from_pil(
             tiles_with_sum[tile_id][0] += the_two_px_to_write[0] + the_two_px_to_write[1]
             tiles_with_sum[tile_id][1][nidx] = the_two_px_to_write[0] + (the_two_px_to_write[1] << 4)
 
-    final_tiles_with_sum: list[tuple[int, bytearray]] = []
-    len_final_tiles = 0
+    final_tiles: list[bytearray] = []
+    tile_index = TileIndex(tile_dim)
     # Create tilemap and optimize tiles list
     for tile_id, tile_with_sum in enumerate(tiles_with_sum):
+        tile = tile_with_sum[1]
         reusable_tile_idx = None
         flip_x = False
         flip_y = False
         if optimize:
-            reusable_tile_idx, flip_x, flip_y = search_for_tile_with_sum(final_tiles_with_sum, tile_with_sum, tile_dim)
+            reusable_tile_idx, flip_x, flip_y = tile_index.find(tile)
         if reusable_tile_idx is not None:
             tile_id_to_use = reusable_tile_idx
         else:
-            final_tiles_with_sum.append(tile_with_sum)
-            tile_id_to_use = len_final_tiles
-            len_final_tiles += 1
+            final_tiles.append(tile)
+            tile_id_to_use = tile_index.add(tile)
         tilemap[tile_id] = TilemapEntry(
             idx=tile_id_to_use,
             pal_idx=tile_palette_indices[tile_id],
@@ -382,6 +444,7 @@ def from_pil(
             flip_y=flip_y,
             ignore_too_large=True,
         )
+    len_final_tiles = len(final_tiles)
     if len_final_tiles > 1024:
         raise UserValueError(
             f(
@@ -393,9 +456,6 @@ def from_pil(
                 )
             )
         )
-    final_tiles: list[bytearray] = []
-    for s, tile in final_tiles_with_sum:
-        final_tiles.append(tile)
     return final_tiles, tilemap, palettes
 
 
@@ -404,6 +464,8 @@ def search_for_chunk(chunk: list[TilemapEntryProtocol], tile_mappings: list[Tile
     In the provided list of tile mappings, find an existing chunk.
     Returns the position of the first tile of the chunk or None if not found.
     The chunk dimensions are derived from the passed chunk.
+
+    This scans all tile mappings, use a ChunkIndex to search for many chunks.
     """
     tiles_in_chunk = len(chunk)
     for chk_fst_tile_idx in range(0, len(tile_mappings), tiles_in_chunk):
@@ -420,6 +482,8 @@ def search_for_tile_with_sum(
     """
     Search for the tile, or a flipped version of it, in tiles and return the index and flipped state
     Increases performance by comparing the bytes sum of each tile before actually compare them
+
+    This scans all tiles, use a TileIndex to search for many tiles.
     """
     s = tile_with_sum[0]
     tile = tile_with_sum[1]
@@ -442,6 +506,8 @@ def search_for_tile_with_sum(
 def search_for_tile(tiles: list[bytes], tile: bytes, tile_dim: int) -> tuple[int | None, bool, bool]:
     """
     Search for the tile, or a flipped version of it, in tiles and return the index and flipped state
+
+    This scans all tiles, use a TileIndex to search for many tiles.
     """
     for i, tile_in_tiles in enumerate(tiles):
         if tile_in_tiles == tile:
@@ -456,24 +522,84 @@ def search_for_tile(tiles: list[bytes], tile: bytes, tile_dim: int) -> tuple[int
     return None, False, False
 
 
+class TileIndex:
+    """
+    Hash index of 4bpp tiles, to find a tile, or a flipped version of it, in constant time.
+
+    All four orientations of each added tile are stored. Results are the same as for search_for_tile
+    on the list of added tiles: The first matching tile is returned, preferring no flip over x, y and xy flips.
+    """
+
+    def __init__(self, tile_dim: int, tiles: Iterable[bytes] = ()):
+        self.tile_dim = tile_dim
+        self._orientations: dict[bytes, tuple[int, bool, bool]] = {}
+        self._len = 0
+        for tile in tiles:
+            self.add(tile)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, tile: bytes) -> int:
+        """Adds the tile and returns its index."""
+        idx = self._len
+        self._len += 1
+        tile = bytes(tile)
+        x_flipped = _flip_tile_x(tile, self.tile_dim)
+        self._orientations.setdefault(tile, (idx, False, False))
+        self._orientations.setdefault(x_flipped, (idx, True, False))
+        self._orientations.setdefault(_flip_tile_y(tile, self.tile_dim), (idx, False, True))
+        self._orientations.setdefault(_flip_tile_y(x_flipped, self.tile_dim), (idx, True, True))
+        return idx
+
+    def find(self, tile: bytes) -> tuple[int | None, bool, bool]:
+        """Returns the index and flipped state of the tile, or None if neither it nor a flipped version was added."""
+        return self._orientations.get(bytes(tile), (None, False, False))
+
+
+class ChunkIndex:
+    """
+    Hash index of chunks (lists of tile mappings of the same length), to find a chunk in constant time.
+
+    Chunks are stored one after another, like in the tile mappings of a BPC or DPC. Results are the
+    same as for search_for_chunk on the concatenated tile mappings of the added chunks.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: dict[tuple[int, ...], int] = {}
+        self._len_tile_mappings = 0
+
+    def add(self, chunk: Sequence[TilemapEntryProtocol]) -> int:
+        """Adds the chunk and returns the position of its first tile."""
+        position = self._len_tile_mappings
+        self._chunks.setdefault(self._key(chunk), position)
+        self._len_tile_mappings += len(chunk)
+        return position
+
+    def find(self, chunk: Sequence[TilemapEntryProtocol]) -> int | None:
+        """Returns the position of the first tile of the chunk or None if not found."""
+        return self._chunks.get(self._key(chunk))
+
+    @staticmethod
+    def _key(chunk: Sequence[TilemapEntryProtocol]) -> tuple[int, ...]:
+        return tuple(entry.to_int() for entry in chunk)
+
+
+# Swaps the two 4bpp pixels stored in a byte
+_SWAPPED_NIBBLES = bytes(((i & 0x0F) << 4) | ((i & 0xF0) >> 4) for i in range(256))
+
+
 def _flip_tile_x(tile: bytes, tile_dim: int) -> bytes:
     """Flip all pixels in tile on the x-axis"""
-    tile_flipped = bytearray(len(tile))
-    for i, b in enumerate(tile):
-        row_idx = (i * 2) % tile_dim
-        col_idx = math.floor((i * 2) / tile_dim)
-        tile_flipped[int((col_idx * tile_dim + (tile_dim - 1 - row_idx)) / 2)] = (b & 0x0F) << 4 | (b & 0xF0) >> 4
-    return tile_flipped
+    row_len = tile_dim // 2
+    swapped = bytes(tile).translate(_SWAPPED_NIBBLES)
+    return b"".join(swapped[i : i + row_len][::-1] for i in range(0, len(swapped), row_len))
 
 
 def _flip_tile_y(tile: bytes, tile_dim: int) -> bytes:
     """Flip all pixels in tile on the y-axis"""
-    tile_flipped = bytearray(len(tile))
-    for i, b in enumerate(tile):
-        row_idx = (i * 2) % tile_dim
-        col_idx = math.floor((i * 2) / tile_dim)
-        tile_flipped[int(((tile_dim - 1 - col_idx) * tile_dim + row_idx) / 2)] = b
-    return tile_flipped
+    row_len = tile_dim // 2
+    return b"".join(tile[i - row_len : i] for i in range(len(tile), 0, -row_len))
 
 
 def _px_pos_flipped(x: int, y: int, w: int, h: int, flip_x: bool, flip_y: bool) -> tuple[int, int]:
@@ -17,189 +17,294 @@
 
 from __future__ import annotations
 
-from skytemple_files.compression.bma_collision_rle.handler import BmaCollisionRleHandler
-from skytemple_files.compression.bma_layer_nrl.handler import BmaLayerNrlHandler
-from skytemple_files.compression.bpc_image.handler import BpcImageHandler
-from skytemple_files.compression.bpc_tilemap.handler import BpcTilemapHandler
-from skytemple_files.compression.generic_nrl.handler import GenericNrlHandler
-from skytemple_files.compression_container.pkdpx.handler import PkdpxHandler
-from skytemple_files.container.bin_pack.handler import BinPackHandler
-from skytemple_files.container.dungeon_bin.handler import DungeonBinHandler
-from skytemple_files.container.dungeon_bin.sub.at4px_dpc import DbinAt4pxDpcHandler
-from skytemple_files.container.dungeon_bin.sub.at4px_dpci import DbinAt4pxDpciHandler
-from skytemple_files.container.dungeon_bin.sub.sir0_at4px import DbinSir0At4pxHandler
-from skytemple_files.container.dungeon_bin.sub.sir0_at4px_dma import (
-    DbinSir0At4pxDmaHandler,
-)
-from skytemple_files.container.dungeon_bin.sub.sir0_pkdpx import DbinSir0PkdpxHandler
-from skytemple_files.container.dungeon_bin.sub.sir0_image_1033 import (
-    DbinSir0Image1033Handler,
-)
-from skytemple_files.container.dungeon_bin.sub.sir0_pkdpx_dbg import (
-    DbinSir0PkdpxDbgHandler,
-)
-from skytemple_files.container.dungeon_bin.sub.sir0_weird_data_file import (
-    DbinSir0WeirdDataFileHandler,
-)
-from skytemple_files.container.sir0.handler import Sir0Handler
-from skytemple_files.data.item_s_p.handler import ItemSPHandler
-from skytemple_files.data.level_bin_entry.handler import LevelBinEntryHandler
-from skytemple_files.data.md.handler import MdHandler
-from skytemple_files.data.str.handler import StrHandler
-from skytemple_files.data.waza_p.handler import WazaPHandler
-from skytemple_files.data.item_p.handler import ItemPHandler
-from skytemple_files.data.md_evo.handler import MdEvoHandler
-from skytemple_files.data.sprconf.handler import SprconfHandler
-from skytemple_files.data.tbl_talk.handler import TblTalkHandler
-from skytemple_files.dungeon_data.fixed_bin.handler import FixedBinHandler
-from skytemple_files.dungeon_data.mappa_bin.handler import MappaBinHandler
-from skytemple_files.dungeon_data.mappa_g_bin.handler import MappaGBinHandler
-from skytemple_files.graphics.bgp.handler import BgpHandler
-from skytemple_files.graphics.bma.handler import BmaHandler
-from skytemple_files.graphics.bpa.handler import BpaHandler
-from skytemple_files.graphics.bpc.handler import BpcHandler
-from skytemple_files.graphics.bpl.handler import BplHandler
-from skytemple_files.graphics.dbg.handler import DbgHandler
-from skytemple_files.graphics.dma.handler import DmaHandler
-from skytemple_files.graphics.dpc.handler import DpcHandler
-from skytemple_files.graphics.dpci.handler import DpciHandler
-from skytemple_files.graphics.dpl.handler import DplHandler
-from skytemple_files.graphics.dpla.handler import DplaHandler
-from skytemple_files.graphics.img_itm.handler import ImgItmHandler
-from skytemple_files.graphics.img_trp.handler import ImgTrpHandler
-from skytemple_files.graphics.kao.handler import KaoHandler
-from skytemple_files.compression_container.common_at.handler import CommonAtHandler
-from skytemple_files.compression_container.at3px.handler import At3pxHandler
-from skytemple_files.compression_container.at4px.handler import At4pxHandler
-from skytemple_files.compression_container.atupx.handler import AtupxHandler
-from skytemple_files.compression_container.at4pn.handler import At4pnHandler
-from skytemple_files.compression.px.handler import PxHandler
-from skytemple_files.compression.custom_999.handler import Custom999Handler
-from skytemple_files.compression.rle_nibble.handler import RleNibbleHandler
-from skytemple_files.graphics.bg_list_dat.handler import BgListDatHandler
-from skytemple_files.graphics.sma.handler import SmaHandler
-from skytemple_files.graphics.w16.handler import W16Handler
-from skytemple_files.graphics.effect_screen.handler import ScreenEffectHandler
-from skytemple_files.graphics.wan_wat.handler import WanHandler
-from skytemple_files.graphics.wte.handler import WteHandler
-from skytemple_files.graphics.wtu.handler import WtuHandler
-from skytemple_files.graphics.chr.handler import ChrHandler
-from skytemple_files.graphics.colvec.handler import ColvecHandler
-from skytemple_files.graphics.zmappat.handler import ZMappaTHandler
-from skytemple_files.graphics.fonts.font_dat.handler import FontDatHandler
-from skytemple_files.graphics.fonts.font_sir0.handler import FontSir0Handler
-from skytemple_files.graphics.fonts.banner_font.handler import BannerFontHandler
-from skytemple_files.graphics.fonts.graphic_font.handler import GraphicFontHandler
-from skytemple_files.graphics.pal.handler import PalHandler
-from skytemple_files.list.actor.handler import ActorListBinHandler
-from skytemple_files.list.level.handler import LevelListBinHandler
-from skytemple_files.list.object.handler import ObjectListBinHandler
-from skytemple_files.script.lsd.handler import LsdHandler
-from skytemple_files.script.ssa_sse_sss.handler import SsaHandler
-from skytemple_files.script.ssb.handler import SsbHandler
-
-
-class FileType:
-    """A list of supported file types. Values are their data handlers."""
+import importlib
+import re
+from typing import TYPE_CHECKING, Any, ClassVar
+
+if TYPE_CHECKING:
+    from skytemple_files.compression.bma_collision_rle.handler import BmaCollisionRleHandler
+    from skytemple_files.compression.bma_layer_nrl.handler import BmaLayerNrlHandler
+    from skytemple_files.compression.bpc_image.handler import BpcImageHandler
+    from skytemple_files.compression.bpc_tilemap.handler import BpcTilemapHandler
+    from skytemple_files.compression.generic_nrl.handler import GenericNrlHandler
+    from skytemple_files.compression_container.pkdpx.handler import PkdpxHandler
+    from skytemple_files.container.bin_pack.handler import BinPackHandler
+    from skytemple_files.container.dungeon_bin.handler import DungeonBinHandler
+    from skytemple_files.container.dungeon_bin.sub.at4px_dpc import DbinAt4pxDpcHandler
+    from skytemple_files.container.dungeon_bin.sub.at4px_dpci import DbinAt4pxDpciHandler
+    from skytemple_files.container.dungeon_bin.sub.sir0_at4px import DbinSir0At4pxHandler
+    from skytemple_files.container.dungeon_bin.sub.sir0_at4px_dma import DbinSir0At4pxDmaHandler
+    from skytemple_files.container.dungeon_bin.sub.sir0_pkdpx import DbinSir0PkdpxHandler
+    from skytemple_files.container.dungeon_bin.sub.sir0_pkdpx_dbg import DbinSir0PkdpxDbgHandler
+    from skytemple_files.container.sir0.handler import Sir0Handler
+    from skytemple_files.data.item_s_p.handler import ItemSPHandler
+    from skytemple_files.data.level_bin_entry.handler import LevelBinEntryHandler
+    from skytemple_files.data.md.handler import MdHandler
+    from skytemple_files.data.str.handler import StrHandler
+    from skytemple_files.data.waza_p.handler import WazaPHandler
+    from skytemple_files.data.item_p.handler import ItemPHandler
+    from skytemple_files.data.md_evo.handler import MdEvoHandler
+    from skytemple_files.data.sprconf.handler import SprconfHandler
+    from skytemple_files.data.tbl_talk.handler import TblTalkHandler
+    from skytemple_files.dungeon_data.fixed_bin.handler import FixedBinHandler
+    from skytemple_files.dungeon_data.mappa_bin.handler import MappaBinHandler
+    from skytemple_files.dungeon_data.mappa_g_bin.handler import MappaGBinHandler
+    from skytemple_files.graphics.bgp.handler import BgpHandler
+    from skytemple_files.graphics.bma.handler import BmaHandler
+    from skytemple_files.graphics.bpa.handler import BpaHandler
+    from skytemple_files.graphics.bpc.handler import BpcHandler
+    from skytemple_files.graphics.bpl.handler import BplHandler
+    from skytemple_files.graphics.dbg.handler import DbgHandler
+    from skytemple_files.graphics.dma.handler import DmaHandler
+    from skytemple_files.graphics.dpc.handler import DpcHandler
+    from skytemple_files.graphics.dpci.handler import DpciHandler
+    from skytemple_files.graphics.dpl.handler import DplHandler
+    from skytemple_files.graphics.dpla.handler import DplaHandler
+    from skytemple_files.graphics.img_itm.handler import ImgItmHandler
+    from skytemple_files.graphics.img_trp.handler import ImgTrpHandler
+    from skytemple_files.graphics.kao.handler import KaoHandler
+    from skytemple_files.compression_container.common_at.handler import CommonAtHandler
+    from skytemple_files.compression_container.at3px.handler import At3pxHandler
+    from skytemple_files.compression_container.at4px.handler import At4pxHandler
+    from skytemple_files.compression_container.atupx.handler import AtupxHandler
+    from skytemple_files.compression_container.at4pn.handler import At4pnHandler
+    from skytemple_files.compression.px.handler import PxHandler
+    from skytemple_files.compression.custom_999.handler import Custom999Handler
+    from skytemple_files.compression.rle_nibble.handler import RleNibbleHandler
+    from skytemple_files.graphics.bg_list_dat.handler import BgListDatHandler
+    from skytemple_files.graphics.sma.handler import SmaHandler
+    from skytemple_files.graphics.w16.handler import W16Handler
+    from skytemple_files.graphics.effect_screen.handler import ScreenEffectHandler
+    from skytemple_files.graphics.wan_wat.handler import WanHandler
+    from skytemple_files.graphics.wte.handler import WteHandler
+    from skytemple_files.graphics.wtu.handler import WtuHandler
+    from skytemple_files.graphics.chr.handler import ChrHandler
+    from skytemple_files.graphics.colvec.handler import ColvecHandler
+    from skytemple_files.graphics.zmappat.handler import ZMappaTHandler
+    from skytemple_files.graphics.fonts.font_dat.handler import FontDatHandler
+    from skytemple_files.graphics.fonts.font_sir0.handler import FontSir0Handler
+    from skytemple_files.graphics.fonts.banner_font.handler import BannerFontHandler
+    from skytemple_files.graphics.fonts.graphic_font.handler import GraphicFontHandler
+    from skytemple_files.graphics.pal.handler import PalHandler
+    from skytemple_files.list.actor.handler import ActorListBinHandler
+    from skytemple_files.list.level.handler import LevelListBinHandler
+    from skytemple_files.list.object.handler import ObjectListBinHandler
+    from skytemple_files.script.lsd.handler import LsdHandler
+    from skytemple_files.script.ssa_sse_sss.handler import SsaHandler
+    from skytemple_files.script.ssb.handler import SsbHandler
+
+# The modules the handlers are defined in. FileType only references handlers by their class name.
+_HANDLER_MODULES: dict[str, str] = {
+    "BmaCollisionRleHandler": "skytemple_files.compression.bma_collision_rle.handler",
+    "BmaLayerNrlHandler": "skytemple_files.compression.bma_layer_nrl.handler",
+    "BpcImageHandler": "skytemple_files.compression.bpc_image.handler",
+    "BpcTilemapHandler": "skytemple_files.compression.bpc_tilemap.handler",
+    "GenericNrlHandler": "skytemple_files.compression.generic_nrl.handler",
+    "PkdpxHandler": "skytemple_files.compression_container.pkdpx.handler",
+    "BinPackHandler": "skytemple_files.container.bin_pack.handler",
+    "DungeonBinHandler": "skytemple_files.container.dungeon_bin.handler",
+    "DbinAt4pxDpcHandler": "skytemple_files.container.dungeon_bin.sub.at4px_dpc",
+    "DbinAt4pxDpciHandler": "skytemple_files.container.dungeon_bin.sub.at4px_dpci",
+    "DbinSir0At4pxHandler": "skytemple_files.container.dungeon_bin.sub.sir0_at4px",
+    "DbinSir0At4pxDmaHandler": "skytemple_files.container.dungeon_bin.sub.sir0_at4px_dma",
+    "DbinSir0PkdpxHandler": "skytemple_files.container.dungeon_bin.sub.sir0_pkdpx",
+    "DbinSir0Image1033Handler": "skytemple_files.container.dungeon_bin.sub.sir0_image_1033",
+    "DbinSir0PkdpxDbgHandler": "skytemple_files.container.dungeon_bin.sub.sir0_pkdpx_dbg",
+    "DbinSir0WeirdDataFileHandler": "skytemple_files.container.dungeon_bin.sub.sir0_weird_data_file",
+    "Sir0Handler": "skytemple_files.container.sir0.handler",
+    "ItemSPHandler": "skytemple_files.data.item_s_p.handler",
+    "LevelBinEntryHandler": "skytemple_files.data.level_bin_entry.handler",
+    "MdHandler": "skytemple_files.data.md.handler",
+    "StrHandler": "skytemple_files.data.str.handler",
+    "WazaPHandler": "skytemple_files.data.waza_p.handler",
+    "ItemPHandler": "skytemple_files.data.item_p.handler",
+    "MdEvoHandler": "skytemple_files.data.md_evo.handler",
+    "SprconfHandler": "skytemple_files.data.sprconf.handler",
+    "TblTalkHandler": "skytemple_files.data.tbl_talk.handler",
+    "FixedBinHandler": "skytemple_files.dungeon_data.fixed_bin.handler",
+    "MappaBinHandler": "skytemple_files.dungeon_data.mappa_bin.handler",
+    "MappaGBinHandler": "skytemple_files.dungeon_data.mappa_g_bin.handler",
+    "BgpHandler": "skytemple_files.graphics.bgp.handler",
+    "BmaHandler": "skytemple_files.graphics.bma.handler",
+    "BpaHandler": "skytemple_files.graphics.bpa.handler",
+    "BpcHandler": "skytemple_files.graphics.bpc.handler",
+    "BplHandler": "skytemple_files.graphics.bpl.handler",
+    "DbgHandler": "skytemple_files.graphics.dbg.handler",
+    "DmaHandler": "skytemple_files.graphics.dma.handler",
+    "DpcHandler": "skytemple_files.graphics.dpc.handler",
+    "DpciHandler": "skytemple_files.graphics.dpci.handler",
+    "DplHandler": "skytemple_files.graphics.dpl.handler",
+    "DplaHandler": "skytemple_files.graphics.dpla.handler",
+    "ImgItmHandler": "skytemple_files.graphics.img_itm.handler",
+    "ImgTrpHandler": "skytemple_files.graphics.img_trp.handler",
+    "KaoHandler": "skytemple_files.graphics.kao.handler",
+    "CommonAtHandler": "skytemple_files.compression_container.common_at.handler",
+    "At3pxHandler": "skytemple_files.compression_container.at3px.handler",
+    "At4pxHandler": "skytemple_files.compression_container.at4px.handler",
+    "AtupxHandler": "skytemple_files.compression_container.atupx.handler",
+    "At4pnHandler": "skytemple_files.compression_container.at4pn.handler",
+    "PxHandler": "skytemple_files.compression.px.handler",
+    "Custom999Handler": "skytemple_files.compression.custom_999.handler",
+    "RleNibbleHandler": "skytemple_files.compression.rle_nibble.handler",
+    "BgListDatHandler": "skytemple_files.graphics.bg_list_dat.handler",
+    "SmaHandler": "skytemple_files.graphics.sma.handler",
+    "W16Handler": "skytemple_files.graphics.w16.handler",
+    "ScreenEffectHandler": "skytemple_files.graphics.effect_screen.handler",
+    "WanHandler": "skytemple_files.graphics.wan_wat.handler",
+    "WteHandler": "skytemple_files.graphics.wte.handler",
+    "WtuHandler": "skytemple_files.graphics.wtu.handler",
+    "ChrHandler": "skytemple_files.graphics.chr.handler",
+    "ColvecHandler": "skytemple_files.graphics.colvec.handler",
+    "ZMappaTHandler": "skytemple_files.graphics.zmappat.handler",
+    "FontDatHandler": "skytemple_files.graphics.fonts.font_dat.handler",
+    "FontSir0Handler": "skytemple_files.graphics.fonts.font_sir0.handler",
+    "BannerFontHandler": "skytemple_files.graphics.fonts.banner_font.handler",
+    "GraphicFontHandler": "skytemple_files.graphics.fonts.graphic_font.handler",
+    "PalHandler": "skytemple_files.graphics.pal.handler",
+    "ActorListBinHandler": "skytemple_files.list.actor.handler",
+    "LevelListBinHandler": "skytemple_files.list.level.handler",
+    "ObjectListBinHandler": "skytemple_files.list.object.handler",
+    "LsdHandler": "skytemple_files.script.lsd.handler",
+    "SsaHandler": "skytemple_files.script.ssa_sse_sss.handler",
+    "SsbHandler": "skytemple_files.script.ssb.handler",
+}
+_HANDLER_ANNOTATION = re.compile(r"ClassVar\[type\[(\w+)\]\]")
+
+
+class _LazyHandlerRegistry(type):
+    """
+    Metaclass for ``FileType``. File types are declared as annotated class variables, without a value. The handler
+    is imported on first access and then stored on the class, so all later accesses are regular attribute lookups.
+    """
+
+    def __new__(mcs, name: str, bases: tuple[type, ...], namespace: dict[str, Any]):
+        cls = super().__new__(mcs, name, bases, namespace)
+        cls._lazy_handlers: dict[str, str] = {}  # type: ignore
+        for attr, annotation in namespace.get("__annotations__", {}).items():
+            match = _HANDLER_ANNOTATION.fullmatch(str(annotation))
+            if match:
+                cls._lazy_handlers[attr] = match.group(1)  # type: ignore
+        return cls
+
+    def __getattr__(cls, name: str) -> Any:
+        try:
+            handler_name = cls._lazy_handlers[name]  # type: ignore
+        except KeyError:
+            raise AttributeError(f"type object '{cls.__name__}' has no attribute '{name}'") from None
+        handler = getattr(importlib.import_module(_HANDLER_MODULES[handler_name]), handler_name)
+        setattr(cls, name, handler)
+        return handler
+
+    def __dir__(cls):
+        return sorted(set(super().__dir__()) | set(cls._lazy_handlers.keys()))  # type: ignore
+
+
+class FileType(metaclass=_LazyHandlerRegistry):
+    """
+    A list of supported file types. Values are their data handlers.
+
+    The handler modules are only imported when a file type is first accessed.
+    """
 
     UNKNOWN = None
 
-    KAO = KaoHandler
-
-    COMMON_AT = CommonAtHandler
-    AT3PX = At3pxHandler
-    AT4PX = At4pxHandler
-    ATUPX = AtupxHandler
-    PKDPX = PkdpxHandler
-    AT4PN = At4pnHandler
-
-    PX = PxHandler
-    CUSTOM_999 = Custom999Handler
-    GENERIC_NRL = GenericNrlHandler
-
-    RLE_NIBBLE = RleNibbleHandler
-
-    BGP = BgpHandler
-
-    BG_LIST_DAT = BgListDatHandler
-    BPL = BplHandler
-    BPC = BpcHandler
-    BPC_IMAGE = BpcImageHandler
-    BPC_TILEMAP = BpcTilemapHandler
-    BMA = BmaHandler
-    BMA_LAYER_NRL = BmaLayerNrlHandler
-    BMA_COLLISION_RLE = BmaCollisionRleHandler
-    BPA = BpaHandler
-
-    DUNGEON_BIN = DungeonBinHandler
-    DPL = DplHandler
-    DPLA = DplaHandler
-    DPC = DpcHandler
-    DPCI = DpciHandler
-    DMA = DmaHandler
-    DBG = DbgHandler
-
-    FONT_DAT = FontDatHandler
-    FONT_SIR0 = FontSir0Handler
-    BANNER_FONT = BannerFontHandler
-    GRAPHIC_FONT = GraphicFontHandler
-
-    CHR = ChrHandler
-
-    WTE = WteHandler
-    WTU = WtuHandler
-
-    SCREEN_FX = ScreenEffectHandler
-    WAN = WanHandler
-    WAT = WanHandler
-
-    W16 = W16Handler
-    STR = StrHandler
-    LSD = LsdHandler
-
-    SMA = SmaHandler
-    SSA = SsaHandler
-    SSE = SsaHandler
-    SSS = SsaHandler
-    SSB = SsbHandler
-
-    PAL = PalHandler
-
-    SIR0 = Sir0Handler
-    BIN_PACK = BinPackHandler
-
-    MD = MdHandler
-    LEVEL_BIN_ENTRY = LevelBinEntryHandler
-    WAZA_P = WazaPHandler
-    ITEM_P = ItemPHandler
-    ITEM_SP = ItemSPHandler
-    TBL_TALK = TblTalkHandler
-    MD_EVO = MdEvoHandler
+    KAO: ClassVar[type[KaoHandler]]
+
+    COMMON_AT: ClassVar[type[CommonAtHandler]]
+    AT3PX: ClassVar[type[At3pxHandler]]
+    AT4PX: ClassVar[type[At4pxHandler]]
+    ATUPX: ClassVar[type[AtupxHandler]]
+    PKDPX: ClassVar[type[PkdpxHandler]]
+    AT4PN: ClassVar[type[At4pnHandler]]
+
+    PX: ClassVar[type[PxHandler]]
+    CUSTOM_999: ClassVar[type[Custom999Handler]]
+    GENERIC_NRL: ClassVar[type[GenericNrlHandler]]
+
+    RLE_NIBBLE: ClassVar[type[RleNibbleHandler]]
+
+    BGP: ClassVar[type[BgpHandler]]
+
+    BG_LIST_DAT: ClassVar[type[BgListDatHandler]]
+    BPL: ClassVar[type[BplHandler]]
+    BPC: ClassVar[type[BpcHandler]]
+    BPC_IMAGE: ClassVar[type[BpcImageHandler]]
+    BPC_TILEMAP: ClassVar[type[BpcTilemapHandler]]
+    BMA: ClassVar[type[BmaHandler]]
+    BMA_LAYER_NRL: ClassVar[type[BmaLayerNrlHandler]]
+    BMA_COLLISION_RLE: ClassVar[type[BmaCollisionRleHandler]]
+    BPA: ClassVar[type[BpaHandler]]
+
+    DUNGEON_BIN: ClassVar[type[DungeonBinHandler]]
+    DPL: ClassVar[type[DplHandler]]
+    DPLA: ClassVar[type[DplaHandler]]
+    DPC: ClassVar[type[DpcHandler]]
+    DPCI: ClassVar[type[DpciHandler]]
+    DMA: ClassVar[type[DmaHandler]]
+    DBG: ClassVar[type[DbgHandler]]
+
+    FONT_DAT: ClassVar[type[FontDatHandler]]
+    FONT_SIR0: ClassVar[type[FontSir0Handler]]
+    BANNER_FONT: ClassVar[type[BannerFontHandler]]
+    GRAPHIC_FONT: ClassVar[type[GraphicFontHandler]]
+
+    CHR: ClassVar[type[ChrHandler]]
+
+    WTE: ClassVar[type[WteHandler]]
+    WTU: ClassVar[type[WtuHandler]]
+
+    SCREEN_FX: ClassVar[type[ScreenEffectHandler]]
+    WAN: ClassVar[type[WanHandler]]
+    WAT: ClassVar[type[WanHandler]]
+
+    W16: ClassVar[type[W16Handler]]
+    STR: ClassVar[type[StrHandler]]
+    LSD: ClassVar[type[LsdHandler]]
+
+    SMA: ClassVar[type[SmaHandler]]
+    SSA: ClassVar[type[SsaHandler]]
+    SSE: ClassVar[type[SsaHandler]]
+    SSS: ClassVar[type[SsaHandler]]
+    SSB: ClassVar[type[SsbHandler]]
+
+    PAL: ClassVar[type[PalHandler]]
+
+    SIR0: ClassVar[type[Sir0Handler]]
+    BIN_PACK: ClassVar[type[BinPackHandler]]
+
+    MD: ClassVar[type[MdHandler]]
+    LEVEL_BIN_ENTRY: ClassVar[type[LevelBinEntryHandler]]
+    WAZA_P: ClassVar[type[WazaPHandler]]
+    ITEM_P: ClassVar[type[ItemPHandler]]
+    ITEM_SP: ClassVar[type[ItemSPHandler]]
+    TBL_TALK: ClassVar[type[TblTalkHandler]]
+    MD_EVO: ClassVar[type[MdEvoHandler]]
 
     # These handlers assume the content to be Sir0 wrapped by default:
-    MAPPA_BIN = MappaBinHandler
-    MAPPA_G_BIN = MappaGBinHandler
-    FIXED_BIN = FixedBinHandler
+    MAPPA_BIN: ClassVar[type[MappaBinHandler]]
+    MAPPA_G_BIN: ClassVar[type[MappaGBinHandler]]
+    FIXED_BIN: ClassVar[type[FixedBinHandler]]
 
     # dungeon.bin sub file handlers
-    DBIN_SIR0_DPLA = DplaHandler
-    DBIN_SIR0_AT4PX_DMA = DbinSir0At4pxDmaHandler
-    DBIN_AT4PX_DPC = DbinAt4pxDpcHandler
-    DBIN_AT4PX_DPCI = DbinAt4pxDpciHandler
-    DBIN_SIR0_AT4PX = DbinSir0At4pxHandler
-    DBIN_SIR0_PKDPX = DbinSir0PkdpxHandler
-    DBIN_SIR0_PKDPX_DBG = DbinSir0PkdpxDbgHandler
-    DBIN_SIR0_WEIRD_DATA_FILE = DbinSir0WeirdDataFileHandler
-    DBIN_SIR0_IMAGE_1033 = DbinSir0Image1033Handler
-    DBIN_SIR0_COLVEC = ColvecHandler
-    DBIN_SIR0_IMG_ITM = ImgItmHandler
-    DBIN_SIR0_IMG_TRP = ImgTrpHandler
-    DBIN_SIR0_ZMAPPAT = ZMappaTHandler
-
-    SPRCONF = SprconfHandler
+    DBIN_SIR0_DPLA: ClassVar[type[DplaHandler]]
+    DBIN_SIR0_AT4PX_DMA: ClassVar[type[DbinSir0At4pxDmaHandler]]
+    DBIN_AT4PX_DPC: ClassVar[type[DbinAt4pxDpcHandler]]
+    DBIN_AT4PX_DPCI: ClassVar[type[DbinAt4pxDpciHandler]]
+    DBIN_SIR0_AT4PX: ClassVar[type[DbinSir0At4pxHandler]]
+    DBIN_SIR0_PKDPX: ClassVar[type[DbinSir0PkdpxHandler]]
+    DBIN_SIR0_PKDPX_DBG: ClassVar[type[DbinSir0PkdpxDbgHandler]]
+    # Not implemented yet, these are None:
+    DBIN_SIR0_WEIRD_DATA_FILE = None
+    DBIN_SIR0_IMAGE_1033 = None
+    DBIN_SIR0_COLVEC: ClassVar[type[ColvecHandler]]
+    DBIN_SIR0_IMG_ITM: ClassVar[type[ImgItmHandler]]
+    DBIN_SIR0_IMG_TRP: ClassVar[type[ImgTrpHandler]]
+    DBIN_SIR0_ZMAPPAT: ClassVar[type[ZMappaTHandler]]
+
+    SPRCONF: ClassVar[type[SprconfHandler]]
 
     # Please don't use these directly, use them via the ppmdu_config instead!
     # (skytemple_files.common.util.get_ppmdu_config_for_rom).
-    ACTOR_LIST_BIN = ActorListBinHandler
-    LEVEL_LIST_BIN = LevelListBinHandler
-    OBJECT_LIST_BIN = ObjectListBinHandler
+    ACTOR_LIST_BIN: ClassVar[type[ActorListBinHandler]]
+    LEVEL_LIST_BIN: ClassVar[type[LevelListBinHandler]]
+    OBJECT_LIST_BIN: ClassVar[type[ObjectListBinHandler]]
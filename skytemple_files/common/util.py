@@ -23,6 +23,7 @@ import logging
 import os
 import re
 import stat
+import tempfile
 import unicodedata
 import warnings
 from abc import abstractmethod
@@ -61,6 +62,7 @@ from skytemple_files.common.i18n_util import _, f
 from skytemple_files.common.ppmdu_config.rom_data.loader import RomDataLoader
 from skytemple_files.user_error import UserValueError
 
+import importlib.metadata as importlib_metadata
 import importlib.resources as importlib_resources
 
 if TYPE_CHECKING:
@@ -167,6 +169,29 @@ def open_utf8(file: str, mode="r", *args, **kwargs):  # type: ignore
     return open(file, mode, *args, encoding="utf-8", **kwargs)  # type: ignore
 
 
+def write_file_atomically(path: str, data: bytes) -> None:
+    """
+    Writes the file through a temporary file in the same directory, which then replaces it.
+    Readers, also in other processes, see either the old or the complete new file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def get_package_version(package: str = "skytemple-files") -> str:
+    """Returns the installed version of the package, or "unknown" if it is not installed."""
+    try:
+        return importlib_metadata.version(package)
+    except importlib_metadata.PackageNotFoundError:
+        return "unknown"
+
+
 def add_extension_if_missing(fn: str, ext: str) -> str:
     """Adds a default file extension if it is missing."""
     if "." not in os.path.basename(fn):
@@ -483,10 +508,14 @@ def get_ppmdu_config_for_rom(rom: NintendoDSRom) -> Pmd2Data:
 
     Additionally supported data from the ROM is loaded and replaces the data loaded from the XML, if possible.
     See the README.rst for the package ``skytemple_files.common.ppmdu_config.rom_data`` for more information.
+
+    The XML is only parsed once per edition, the result is kept in the cache of
+    ``skytemple_files.common.ppmdu_config.cache``. The returned configuration is a private copy for this ROM.
     """
-    from skytemple_files.common.ppmdu_config.xml_reader import Pmd2XmlReader
+    from skytemple_files.common.ppmdu_config.cache import get_default_cache
 
-    data_general = Pmd2XmlReader.load_default()
+    cache = get_default_cache()
+    data_general = cache.get()
     try:
         game_code = rom.idCode.decode("ascii")
         arm9off14 = read_u16(rom.arm9[0xE:0x10], 0)
@@ -502,8 +531,10 @@ def get_ppmdu_config_for_rom(rom: NintendoDSRom) -> Pmd2Data:
     if not matched_edition:
         raise UserValueError(_("This ROM is not supported by SkyTemple."))
 
-    # TODO: This is a bit silly. There should be a better check than to parse the XML twice.
-    config = Pmd2XmlReader.load_default(matched_edition)
+    if matched_edition == data_general.game_edition:
+        config = data_general
+    else:
+        config = cache.get(matched_edition)
 
     # Patch the config with real data from the ROM
     RomDataLoader(rom).load_into(config)
@@ -596,11 +627,91 @@ def is_binary_in_rom(rom: NintendoDSRom, binary: SectionProtocol | None) -> bool
     """Returns true if the specified binary is present in the rom"""
     if binary is None:
         return False
-    try:
-        get_binary_from_rom(rom, binary)
+    if binary.name in ("arm9", "arm7"):
         return True
-    except ValueError:
-        return False
+    if binary.name.startswith("overlay"):
+        match = OVERLAY_RE.match(binary.name)
+        if match is not None:
+            # Only look at the overlay table, loading the overlay itself would decompress and copy it.
+            ov_id = int(match.group(1))
+            table = rom.arm9OverlayTable
+            return any(read_u32(table, i) == ov_id for i in range(0, len(table) - 0x1F, 0x20))
+    return False
+
+
+class BinaryWorkspace:
+    """
+    Loads the binaries of a ROM (arm9, arm7 and overlays) at most once and hands out the same mutable
+    buffer for every access, so that many hardcoded tables can be read and edited without copying
+    the binary each time.
+
+    Binaries that were changed must be marked with ``mark_modified`` (``edit`` does this automatically).
+    Only those are written back to the ROM by ``commit``. Used as a context manager, the workspace
+    commits when the block exits without an exception.
+    """
+
+    def __init__(self, rom: NintendoDSRom):
+        self.rom = rom
+        self._binaries: dict[str, bytearray] = {}
+        self._sections: dict[str, SectionProtocol] = {}
+        self._modified: set[str] = set()
+
+    def get(self, binary: SectionProtocol) -> bytearray:
+        """
+        Returns the buffer for the binary, loading it from the ROM on first access.
+        Changes to the returned buffer are only saved, if the binary is marked as modified.
+        """
+        data = self._binaries.get(binary.name)
+        if data is None:
+            data = get_binary_from_rom(self.rom, binary)
+            self._binaries[binary.name] = data
+            self._sections[binary.name] = binary
+        return data
+
+    def edit(self, binary: SectionProtocol) -> bytearray:
+        """Same as ``get``, but also marks the binary as modified."""
+        data = self.get(binary)
+        self._modified.add(binary.name)
+        return data
+
+    def set(self, binary: SectionProtocol, data: bytes) -> None:
+        """Replaces the content of the binary and marks it as modified."""
+        self._binaries[binary.name] = bytearray(data)
+        self._sections[binary.name] = binary
+        self._modified.add(binary.name)
+
+    def mark_modified(self, binary: SectionProtocol) -> None:
+        if binary.name not in self._binaries:
+            raise ValueError(f(_("Binary {binary.name} was not loaded.")))
+        self._modified.add(binary.name)
+
+    def is_modified(self, binary: SectionProtocol) -> bool:
+        return binary.name in self._modified
+
+    def contains(self, binary: SectionProtocol | None) -> bool:
+        """Returns true if the specified binary is present in the rom, without loading it."""
+        if binary is not None and binary.name in self._binaries:
+            return True
+        return is_binary_in_rom(self.rom, binary)
+
+    def commit(self) -> None:
+        """Writes all modified binaries back to the ROM."""
+        for name in sorted(self._modified):
+            set_binary_in_rom(self.rom, self._sections[name], bytes(self._binaries[name]))
+        self._modified.clear()
+
+    def discard(self) -> None:
+        """Drops all loaded binaries and pending modifications. The next access reloads from the ROM."""
+        self._binaries.clear()
+        self._sections.clear()
+        self._modified.clear()
+
+    def __enter__(self) -> BinaryWorkspace:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.commit()
 
 
 def delete_file_in_rom(rom: NintendoDSRom, path: str, should_delete_empty_dir: bool) -> None:
@@ -41,3 +41,10 @@ class DeprecatedToBeRemovedWarning(DeprecationWarning):
             f"expected_removal={repr(self.expected_removal)}"
             f")"
         )
+
+
+class ImplicitDefaultConfigWarning(UserWarning):
+    """
+    Emitted when a handler had to fall back to the default ppmdu configuration, because
+    the caller did not pass the configuration for the ROM.
+    """
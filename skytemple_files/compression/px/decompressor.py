@@ -17,10 +17,12 @@
 
 from __future__ import annotations
 
-from skytemple_files.common.util import read_bytes, read_u8, iter_bits
 from skytemple_files.compression.px import PX_MIN_MATCH_SEQLEN
 
-DEBUG = False
+# The number of control flags.
+PX_NB_CTRL_FLAGS = 9
+# Bits of the command byte, highest bit first.
+_COMMAND_BITS = (0x80, 0x40, 0x20, 0x10, 0x08, 0x04, 0x02, 0x01)
 
 
 def compute_four_nibbles_pattern(idx_ctrl_flags, low_nibble) -> bytes:
@@ -51,103 +53,257 @@ def compute_four_nibbles_pattern(idx_ctrl_flags, low_nibble) -> bytes:
     return bytes([byte1, byte2])
 
 
+def _build_pattern_table() -> list[list[bytes | None]]:
+    """
+    The two bytes for every control flag index and low nibble, see compute_four_nibbles_pattern.
+    None if the pattern is not valid (nibbles out of range).
+    """
+    table: list[list[bytes | None]] = []
+    for idx_ctrl_flags in range(0, PX_NB_CTRL_FLAGS):
+        row: list[bytes | None] = []
+        for low_nibble in range(0, 0x10):
+            try:
+                row.append(compute_four_nibbles_pattern(idx_ctrl_flags, low_nibble))
+            except ValueError:
+                row.append(None)
+        table.append(row)
+    return table
+
+
+_PATTERNS = _build_pattern_table()
+
+
 class PxDecompressor:
-    def __init__(self, compressed_data: bytes, flags: bytes):
-        self.compressed_data = compressed_data
-        self.flags = flags
-        self.reset()
+    """
+    Decompresses PX data.
+
+    If the length of the decompressed data is known (it's stored in the PKDPX and AT4PX containers), pass it as
+    ``length_decompressed``, otherwise it is determined by a first pass over the compressed data.
+    Output is written into a preallocated buffer, ``decompress_into`` can be used to write it into a buffer owned
+    by the caller.
+    """
 
-    # noinspection PyAttributeOutsideInit
-    def reset(self):
-        self.cursor = 0
-        self.uncompressed_data = bytearray()
+    def __init__(self, compressed_data: bytes, flags: bytes, length_decompressed: int | None = None):
+        self.compressed_data = bytes(compressed_data)
+        self.flags = flags
+        self.length_decompressed = length_decompressed
 
     def decompress(self) -> bytes:
-        self.reset()
-        # Let's get started!
-        if DEBUG:
-            print("Starting PX decomp.")
-        c_data_len = len(self.compressed_data)
-        if DEBUG:
-            print(f"Bytes in input: {c_data_len}")
-        while self.cursor < c_data_len:
-            self._handle_control_byte(c_data_len)
-        return self.uncompressed_data
-
-    def _handle_control_byte(self, c_data_len):
-        ctrl_byte = self._read_next_byte()
-        if DEBUG:
-            print(f"HANDLE CONTROL BYTE: {ctrl_byte:>08b}")
-
-        for ctrl_bit in iter_bits(ctrl_byte):
-            if self.cursor >= c_data_len:
-                break
-            if ctrl_bit == 1:
-                if DEBUG:
-                    print("> Handling uncompressed.")
-                self.uncompressed_data.append(self._read_next_byte())
+        length = self.length_decompressed
+        if length is None:
+            length = self.decompressed_size()
+        buffer = bytearray(length)
+        self._decompress_into(memoryview(buffer))
+        return buffer
+
+    def decompressed_size(self) -> int:
+        """Returns the length of the decompressed data, without decompressing it."""
+        data = self.compressed_data
+        data_len = len(data)
+        byte_ops = self._build_byte_ops()
+        cursor = 0
+        size = 0
+        try:
+            while cursor < data_len:
+                ctrl_byte = data[cursor]
+                cursor += 1
+                for bit in _COMMAND_BITS:
+                    if cursor >= data_len:
+                        break
+                    if ctrl_byte & bit:
+                        cursor += 1
+                        size += 1
+                        continue
+                    next_byte = data[cursor]
+                    cursor += 1
+                    if byte_ops[next_byte] is not None:
+                        size += 2
+                        continue
+                    offset = (-0x1000 + ((next_byte & 0xF) << 8)) | data[cursor]
+                    cursor += 1
+                    if offset < -size:
+                        raise self._out_of_bound(size, offset)
+                    # Sequences can not overlap the position they are copied to.
+                    length = (next_byte >> 4) + PX_MIN_MATCH_SEQLEN
+                    size += length if length < -offset else -offset
+        except IndexError as ex:
+            raise ValueError("PX Decompression: The compressed data ends in the middle of an operation.") from ex
+        return size
+
+    def decompress_into(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Decompresses the data into the writable buffer, starting at offset, and returns the number of bytes written.
+        Raises a ValueError if the buffer is too small.
+        """
+        length = self.length_decompressed
+        if length is None:
+            length = self.decompressed_size()
+        out = memoryview(buffer).cast("B")
+        if offset < 0 or len(out) - offset < length:
+            raise ValueError(
+                f"PX Decompression: The buffer is too small, {length} bytes are needed after offset {offset}."
+            )
+        self._decompress_into(out[offset : offset + length])
+        return length
+
+    def _decompress_into(self, out: memoryview) -> None:
+        """Decompresses into out, which must have exactly the length of the decompressed data."""
+        data = self.compressed_data
+        _cursor, out_pos = _decode(data, 0, len(data), self._build_byte_ops(), out, 0)
+        if out_pos != len(out):
+            raise ValueError(f"PX Decompression: Expected {len(out)} bytes of decompressed data, but got {out_pos}.")
+
+    def _build_byte_ops(self) -> list[bytes | None]:
+        """
+        For every byte after a cleared command bit: The two bytes to insert, if its high nibble matches
+        a control flag, b"" if the pattern is invalid, or None if a sequence is copied.
+        """
+        high_nibble_ops: list[list[bytes | None] | None] = [None] * 0x10
+        for idx, flag in enumerate(self.flags):
+            # The game compares with the entire byte, not just the lower nibble of the flag
+            if flag < 0x10 and high_nibble_ops[flag] is None:
+                if idx < len(_PATTERNS):
+                    high_nibble_ops[flag] = [b"" if p is None else p for p in _PATTERNS[idx]]
+                else:
+                    high_nibble_ops[flag] = [b""] * 0x10
+        byte_ops: list[bytes | None] = []
+        for high_nibble in range(0, 0x10):
+            patterns = high_nibble_ops[high_nibble]
+            if patterns is None:
+                byte_ops += [None] * 0x10
             else:
-                if DEBUG:
-                    print("> Handling special case.")
-                self._handle_special_case()
+                byte_ops += patterns
+        return byte_ops
 
-    def _handle_special_case(self):
-        next_byte = self._read_next_byte()
-        high_nibble = (next_byte >> 4) & 0xF
-        low_nibble = next_byte & 0xF
+    @staticmethod
+    def _out_of_bound(out_pos: int, offset: int) -> ValueError:
+        return ValueError(
+            f"Sequence to copy out of bound! Expected max. {-out_pos} but got {offset}. "
+            f"Either the data to decompress is not valid PX compressed data, or "
+            f"something happened with our cursor that made us read the wrong bytes.."
+        )
 
-        idx_ctrl_flags = self._matches_flags(high_nibble)
-        if DEBUG:
-            print(f"> High nibble matches flag: {idx_ctrl_flags}")
+    @staticmethod
+    def _too_long(length: int) -> ValueError:
+        return ValueError(f"PX Decompression: The decompressed data is longer than the expected {length} bytes.")
 
-        if idx_ctrl_flags is not False:
-            self._insert_byte_pattern(idx_ctrl_flags, low_nibble)
-        else:
-            self._copy_sequence(low_nibble, high_nibble)
 
-    def _read_next_byte(self):
-        b = read_u8(self.compressed_data, self.cursor)
-        if DEBUG:
-            print(f"IDX {int(self.cursor)} - READING BYTE: {b:>08b}")
-        self.cursor += 1
-        return b
+class PxStreamDecompressor:
+    """
+    Decompresses PX data incrementally, while it is fed in chunks (eg. as it is read from a file).
+
+    The length of the decompressed data must be known up front, the output is written into a preallocated buffer,
+    or into ``buffer`` starting at ``offset`` if given. After each ``feed`` all complete commands are decompressed,
+    and ``output[:written]`` can be read. ``finish`` must be called after the last chunk.
+    """
+
+    def __init__(
+        self,
+        flags: bytes,
+        length_decompressed: int,
+        buffer: bytearray | memoryview | None = None,
+        offset: int = 0,
+    ):
+        if buffer is None:
+            buffer = bytearray(length_decompressed)
+        out = memoryview(buffer).cast("B")
+        if offset < 0 or len(out) - offset < length_decompressed:
+            raise ValueError(
+                f"PX Decompression: The buffer is too small, "
+                f"{length_decompressed} bytes are needed after offset {offset}."
+            )
+        self.output = out[offset : offset + length_decompressed]
+        self.written = 0
+        self._byte_ops = PxDecompressor(b"", flags)._build_byte_ops()
+        self._pending = bytearray()
+        self._finished = False
 
-    def _matches_flags(self, high_nibble):
+    def feed(self, chunk: bytes | bytearray | memoryview) -> int:
         """
-        Check if the passed nibble matches any of the control flags.
-        The flags are assumed to be in the lower half of each self.flags byte.
-        Returns index or False
+        Decompresses all commands of the chunk and the data fed before, that are complete.
+        Returns the number of bytes decompressed so far.
         """
-        for idx, byte in enumerate(self.flags):
-            # The game compares with the entire byte, not just the lower nibble of the flag
-            nbl = byte
-            if nbl == high_nibble:
-                return idx
-        return False
-
-    def _insert_byte_pattern(self, idx_ctrl_flags, low_nibble):
-        # Based on the control flag, build two new bytes from the low_nibble data
-        two_bytes = compute_four_nibbles_pattern(idx_ctrl_flags, low_nibble)
-        if DEBUG:
-            print(f"> Inserting by byte pattern: {two_bytes}")  # type: ignore
-        self.uncompressed_data += two_bytes
-
-    def _copy_sequence(self, low_nibble, high_nibble):
-        # In this case, we append a a sequence from a previous position in the decompressed data.
-        # High half-byte is length of sequence copied over
-        # Low half-byte is part of the position of the sequence
-        offset = (-0x1000 + (low_nibble << 8)) | self._read_next_byte()
-        outcurbyte = len(self.uncompressed_data)
-        if offset < -outcurbyte:
+        if self._finished:
+            raise ValueError("PX Decompression: The decompression is already finished.")
+        pending = self._pending
+        pending += chunk
+        # A command is at most a command byte and 8 operations of 2 bytes.
+        cursor, self.written = _decode(pending, 0, len(pending) - 16, self._byte_ops, self.output, self.written)
+        del pending[:cursor]
+        return self.written
+
+    def finish(self) -> int:
+        """
+        Decompresses the rest of the data fed and returns the number of bytes decompressed.
+        Raises a ValueError if the data did not decompress to exactly the expected length.
+        """
+        if not self._finished:
+            pending = self._pending
+            _cursor, self.written = _decode(pending, 0, len(pending), self._byte_ops, self.output, self.written)
+            pending.clear()
+            self._finished = True
+        if self.written != len(self.output):
             raise ValueError(
-                f"Sequence to copy out of bound! Expected max. {-self.cursor} but got {offset}. "
-                f"Either the data to decompress is not valid PX compressed data, or "
-                f"something happened with our cursor that made us read the wrong bytes.."
+                f"PX Decompression: Expected {len(self.output)} bytes of decompressed data, but got {self.written}."
             )
+        return self.written
+
 
-        # Copy data sequence
-        copy_pos = outcurbyte + offset
-        bytes_to_copy = high_nibble + PX_MIN_MATCH_SEQLEN
-        if DEBUG:
-            print(f"> Copying {bytes_to_copy} from offset: {offset}")
-        self.uncompressed_data += read_bytes(self.uncompressed_data, copy_pos, bytes_to_copy)
+def _decode(
+    data: bytes | bytearray, cursor: int, stop: int, byte_ops: list[bytes | None], out: memoryview, out_pos: int
+) -> tuple[int, int]:
+    """
+    Decodes the command bytes in data from cursor, as long as the cursor is before stop, into out from out_pos.
+    The last command may end before all of its bits are used, if data ends. Returns the new cursor and out_pos.
+    """
+    data_len = len(data)
+    out_len = len(out)
+    try:
+        while cursor < stop:
+            ctrl_byte = data[cursor]
+            cursor += 1
+            if ctrl_byte == 0xFF and cursor + 8 <= data_len and out_pos + 8 <= out_len:
+                # Copy the next 8 bytes as-is
+                out[out_pos : out_pos + 8] = data[cursor : cursor + 8]
+                cursor += 8
+                out_pos += 8
+                continue
+            for bit in _COMMAND_BITS:
+                if cursor >= data_len:
+                    break
+                if ctrl_byte & bit:
+                    # Copy the byte as-is
+                    out[out_pos] = data[cursor]
+                    cursor += 1
+                    out_pos += 1
+                    continue
+                next_byte = data[cursor]
+                cursor += 1
+                pattern = byte_ops[next_byte]
+                if pattern is not None:
+                    if not pattern:
+                        raise ValueError(f"PX Decompression: Invalid nibble pattern {next_byte:02x} at {cursor - 1}.")
+                    if out_pos + 2 > out_len:
+                        raise PxDecompressor._too_long(out_len)
+                    out[out_pos : out_pos + 2] = pattern
+                    out_pos += 2
+                    continue
+                # Copy a sequence from the data decompressed so far. The high nibble is the length of the
+                # sequence, the low nibble is the high part of the (negative) offset.
+                copy_pos = out_pos + ((-0x1000 + ((next_byte & 0xF) << 8)) | data[cursor])
+                cursor += 1
+                if copy_pos < 0:
+                    raise PxDecompressor._out_of_bound(out_pos, copy_pos - out_pos)
+                copy_end = copy_pos + (next_byte >> 4) + PX_MIN_MATCH_SEQLEN
+                if copy_end > out_pos:
+                    # Sequences can not overlap the position they are copied to.
+                    copy_end = out_pos
+                if out_pos + copy_end - copy_pos > out_len:
+                    raise PxDecompressor._too_long(out_len)
+                out[out_pos : out_pos + copy_end - copy_pos] = out[copy_pos:copy_end]
+                out_pos += copy_end - copy_pos
+    except IndexError as ex:
+        if out_pos >= out_len:
+            raise PxDecompressor._too_long(out_len) from ex
+        raise ValueError("PX Decompression: The compressed data ends in the middle of an operation.") from ex
+    return cursor, out_pos
@@ -0,0 +1,206 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+from skytemple_files.compression.px import (
+    PX_LOOKBACK_BUFFER_SIZE,
+    PX_MAX_MATCH_SEQLEN,
+    PX_MIN_MATCH_SEQLEN,
+    PX_NB_POSSIBLE_SEQUENCES_LEN,
+)
+from skytemple_files.compression.px.compressor import Operation
+
+
+def _build_nibble_ops_table() -> bytearray:
+    """
+    For every pair of bytes, the operation (ctrl flag index) and low nybble to store them as a single byte,
+    as (index << 4 | low nybble) + 1, or 0 if the pair can't be stored as a single byte.
+    This is the result of PxCompressor._can_compress_to_2_in_1_byte(_with_manipulation) for every pair.
+    """
+    table = bytearray(0x10000)
+
+    def add(nibbles: list[int], operation: Operation, low_nybble: int):
+        table[nibbles[0] << 12 | nibbles[1] << 8 | nibbles[2] << 4 | nibbles[3]] = (
+            int(operation) << 4 | low_nybble
+        ) + 1
+
+    for n in range(0, 0x10):
+        # All four nybbles are the same.
+        add([n, n, n, n], Operation.COPY_NYBBLE_4TIMES, n)
+    for n in range(0, 0xF):
+        for i in range(0, 4):
+            # One nybble is one smaller than the other three: Ctrl flag index 1 to 4.
+            nibbles = [n + 1] * 4
+            nibbles[i] = n
+            add(
+                nibbles, Operation(i + int(Operation.COPY_NYBBLE_4TIMES_EX_INCRALL_DECRNYBBLE0)), n if i == 0 else n + 1
+            )
+            # One nybble is one larger than the other three: Ctrl flag index 5 to 8.
+            nibbles = [n] * 4
+            nibbles[i] = n + 1
+            add(
+                nibbles, Operation(i + int(Operation.COPY_NYBBLE_4TIMES_EX_DECRALL_INCRNYBBLE0)), n + 1 if i == 0 else n
+            )
+    return table
+
+
+_NIBBLE_OPS = _build_nibble_ops_table()
+
+
+class PxFastCompressor:
+    """
+    Compresses data with PX, with the same output as PxCompressor with LEVEL_3 and should_search_first.
+
+    The match finder keeps a hash table of 3 byte prefixes to their first occurrence in the lookback window,
+    which only has to be updated once that occurrence leaves the window. From there, longer matches are searched
+    with bytes.find. Operations are written into the preallocated output directly, only the bytes of operations
+    using control flags are patched once the control flags are known.
+    """
+
+    def __init__(self, uncompressed_data: bytes):
+        self.uncompressed_data = bytes(uncompressed_data)
+        self.input_size = len(self.uncompressed_data)
+
+    def compress(self) -> tuple[bytes, bytes]:
+        """Compresses the input data"""
+        if self.input_size > 2147483647:
+            raise ValueError(
+                f"PX Compression: The input data is too long {self.input_size}. Max size: 2147483647 [max 32bit int]"
+            )
+        data = self.uncompressed_data
+        size = self.input_size
+        # Worst case: Every byte is copied as-is, plus one command byte per 8 bytes.
+        out = bytearray(size + (size + 7) // 8)
+        out_cursor = 0
+        # The possible sequence lengths (minus PX_MIN_MATCH_SEQLEN), see PxCompressor.
+        high_nibble_lengths_possible = [0, 0xF]
+        # Positions in out of operations that use a control flag.
+        ctrl_flag_operations = []
+        # The 3 byte prefix at each position and the position of the first occurrence of each prefix that may still
+        # be in the lookback window. Starts with the first occurrence in the data and is moved forward as the window
+        # moves past it. If there was no occurrence in the window of the last search, ~(end of that search) is stored.
+        prefixes = list(zip(data, data[1:], data[2:]))
+        first_positions = dict(zip(reversed(prefixes), range(len(prefixes) - 1, -1, -1)))
+
+        find = data.find
+        cursor = 0
+        while cursor < size:
+            command_byte_pos = out_cursor
+            out_cursor += 1
+            command_byte = 0
+            for i in range(0, 8):
+                if cursor >= size:
+                    break
+                seq_end = cursor + PX_MAX_MATCH_SEQLEN if cursor + PX_MAX_MATCH_SEQLEN < size else size
+                max_len = seq_end - cursor
+                match_len = 0
+                match_pos = 0
+                if max_len >= PX_MIN_MATCH_SEQLEN:
+                    prefix = prefixes[cursor]
+                    first_pos = first_positions[prefix]
+                    lb_buffer_begin = cursor - PX_LOOKBACK_BUFFER_SIZE if cursor > PX_LOOKBACK_BUFFER_SIZE else 0
+                    if first_pos >= 0 and first_pos + PX_MIN_MATCH_SEQLEN > cursor:
+                        # No occurrence that ends before the cursor.
+                        pos = -1
+                    elif first_pos >= lb_buffer_begin:
+                        # Still the first occurrence in the lookback window.
+                        pos = first_pos
+                    else:
+                        # Positions before the last known occurrence or the end of the last search
+                        # don't need to be searched again.
+                        search_start = first_pos if first_pos >= 0 else ~first_pos
+                        if search_start < lb_buffer_begin:
+                            search_start = lb_buffer_begin
+                        # Sequences must end before the cursor.
+                        pos = find(data[cursor : cursor + PX_MIN_MATCH_SEQLEN], search_start, cursor)
+                        if pos != -1:
+                            first_positions[prefix] = pos
+                        else:
+                            first_positions[prefix] = ~(cursor - PX_MIN_MATCH_SEQLEN + 1)
+                    # The first of the longest matches is used. A longer match can only be after the first
+                    # match found so far, the next one is searched with find.
+                    while pos != -1:
+                        limit = cursor - pos if cursor - pos < max_len else max_len
+                        length = match_len + 1 if match_len else PX_MIN_MATCH_SEQLEN
+                        while length < limit and data[pos + length] == data[cursor + length]:
+                            length += 1
+                        match_len = length
+                        match_pos = pos
+                        if length == max_len:
+                            break
+                        pos = find(data[cursor : cursor + length + 1], pos + 1, cursor)
+
+                if match_len >= PX_MIN_MATCH_SEQLEN:
+                    high_nibble = match_len - PX_MIN_MATCH_SEQLEN
+                    if high_nibble not in high_nibble_lengths_possible:
+                        if len(high_nibble_lengths_possible) < PX_NB_POSSIBLE_SEQUENCES_LEN:
+                            high_nibble_lengths_possible.append(high_nibble)
+                            high_nibble_lengths_possible.sort()
+                        else:
+                            # Shorten the sequence to the longest allowed length.
+                            for length_possible in high_nibble_lengths_possible:
+                                if length_possible + PX_MIN_MATCH_SEQLEN < match_len:
+                                    high_nibble = length_possible
+                    signed_offset = match_pos - cursor
+                    out[out_cursor] = high_nibble << 4 | (signed_offset >> 8) & 0x0F
+                    out[out_cursor + 1] = signed_offset & 0xFF
+                    out_cursor += 2
+                    cursor += high_nibble + PX_MIN_MATCH_SEQLEN
+                    continue
+
+                if cursor + 1 < size:
+                    nibble_op = _NIBBLE_OPS[data[cursor] << 8 | data[cursor + 1]]
+                    if nibble_op != 0:
+                        out[out_cursor] = nibble_op - 1
+                        ctrl_flag_operations.append(out_cursor)
+                        out_cursor += 1
+                        cursor += 2
+                        continue
+
+                # Copy the byte as-is
+                out[out_cursor] = data[cursor]
+                out_cursor += 1
+                command_byte |= 1 << (7 - i)
+                cursor += 1
+            out[command_byte_pos] = command_byte
+
+        if out_cursor > 65536:
+            raise ValueError(f"PX Compression: Compressed size {out_cursor} overflows 16 bits unsigned integer!")
+
+        control_flags = self._build_ctrl_flags_list(high_nibble_lengths_possible)
+        for pos in ctrl_flag_operations:
+            out[pos] = control_flags[out[pos] >> 4] << 4 | out[pos] & 0x0F
+        del out[out_cursor:]
+        return bytes(control_flags), bytes(out)
+
+    @staticmethod
+    def _build_ctrl_flags_list(high_nibble_lengths_possible: list[int]) -> bytearray:
+        """The control flags are all nybbles not reserved for sequence lengths, see PxCompressor."""
+        lengths = list(high_nibble_lengths_possible)
+        for nybbleval in range(0, 0xF):
+            if len(lengths) >= PX_NB_POSSIBLE_SEQUENCES_LEN:
+                break
+            if nybbleval not in lengths:
+                lengths.append(nybbleval)
+        control_flags = bytearray(9)
+        itctrlflaginsert = 0
+        for flagval in range(0, 0xF):
+            if flagval not in lengths and itctrlflaginsert < len(control_flags):
+                control_flags[itctrlflaginsert] = flagval
+                itctrlflaginsert += 1
+        return control_flags
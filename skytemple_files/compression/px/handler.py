@@ -18,8 +18,8 @@
 from __future__ import annotations
 
 
-from skytemple_files.compression.px.compressor import PxCompressor
-from skytemple_files.compression.px.decompressor import PxDecompressor
+from skytemple_files.compression.px.decompressor import PxDecompressor, PxStreamDecompressor
+from skytemple_files.compression.px.fast_compressor import PxFastCompressor
 
 
 class PxHandler:
@@ -30,11 +30,46 @@ class PxHandler:
     """
 
     @classmethod
-    def decompress(cls, compressed_data: bytes, flags: bytes) -> bytes:
-        """Decompresses data stored as PX."""
-        return PxDecompressor(compressed_data, flags).decompress()
+    def decompress(cls, compressed_data: bytes, flags: bytes, length_decompressed: int | None = None) -> bytes:
+        """
+        Decompresses data stored as PX.
+        If the length of the decompressed data is known, pass it, so it doesn't need to be determined first.
+        """
+        return PxDecompressor(compressed_data, flags, length_decompressed).decompress()
+
+    @classmethod
+    def decompress_into(
+        cls,
+        compressed_data: bytes,
+        flags: bytes,
+        buffer: bytearray | memoryview,
+        offset: int = 0,
+        length_decompressed: int | None = None,
+    ) -> int:
+        """
+        Decompresses data stored as PX into the writable buffer, starting at offset.
+        Returns the number of bytes written.
+        """
+        return PxDecompressor(compressed_data, flags, length_decompressed).decompress_into(buffer, offset)
+
+    @classmethod
+    def decompress_stream(
+        cls,
+        flags: bytes,
+        length_decompressed: int,
+        buffer: bytearray | memoryview | None = None,
+        offset: int = 0,
+    ) -> PxStreamDecompressor:
+        """
+        Returns a decompressor that decompresses data stored as PX incrementally, while it is fed in chunks.
+        See PxStreamDecompressor.
+        """
+        return PxStreamDecompressor(flags, length_decompressed, buffer, offset)
 
     @classmethod
     def compress(cls, uncompressed_data: bytes) -> tuple[bytes, bytes]:
-        """Compresses data as PX and returns the control flags (0) and data (1)."""
-        return PxCompressor(uncompressed_data).compress()
+        """
+        Compresses data as PX and returns the control flags (0) and data (1).
+        The output is the same as the one of PxCompressor with the default settings.
+        """
+        return PxFastCompressor(uncompressed_data).compress()
@@ -44,6 +44,7 @@ class At4px(CommonAt):
         data = FileType.PX.decompress(
             self.compressed_data[: self.length_compressed - 0x12],
             self.compression_flags,
+            self.length_decompressed,
         )
         # Sanity assertion, if everything is implemented correctly this doesn't fail.
         assert len(data) == self.length_decompressed
@@ -0,0 +1,205 @@
+"""Opt-in on-disk cache for the containers produced by CommonAtHandler.compress."""
+
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING, Sequence
+
+from appdirs import user_cache_dir
+
+from skytemple_files.common.impl_cfg import get_implementation_type
+from skytemple_files.common.util import get_package_version, write_file_atomically
+
+if TYPE_CHECKING:
+    from skytemple_files.compression_container.common_at.handler import CommonAtType
+
+ENV_SKYTEMPLE_AT_CACHE = "SKYTEMPLE_AT_CACHE"
+ENV_SKYTEMPLE_AT_CACHE_DIR = "SKYTEMPLE_AT_CACHE_DIR"
+# Bump this if the compressors change in a way that changes their output.
+CACHE_FORMAT_VERSION = 1
+CACHE_FILE_SUFFIX = ".at"
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompressionCacheStats:
+    hits: int
+    misses: int
+    stores: int
+    evictions: int
+    # Number and total size in bytes of the cached containers.
+    entries: int
+    size: int
+
+
+class CompressionCache:
+    """
+    A cache for compressed AT containers, keyed by the hash of the uncompressed data, the list of
+    compression algorithms, the size budget, the implementation type and the skytemple_files version.
+    Compressing the same data with the same settings always produces the same container, so unchanged
+    assets don't need to be compressed again.
+
+    Every container is stored in its own file. If the total size of the files exceeds ``max_size``, the
+    least recently used ones are deleted.
+    """
+
+    def __init__(self, cache_dir: str | None = None, max_size: int = DEFAULT_MAX_SIZE):
+        if cache_dir is None:
+            cache_dir = os.getenv(ENV_SKYTEMPLE_AT_CACHE_DIR, None)
+        if cache_dir is None:
+            cache_dir = os.path.join(user_cache_dir("skytemple", False), "common_at")
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        # Key -> size of the cached container, least recently used first. Loaded on first use.
+        self._index: OrderedDict[str, int] | None = None
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._lock = Lock()
+
+    @staticmethod
+    def key(data: bytes, compression_types: Sequence[CommonAtType], size_budget: int | None = None) -> str:
+        """Returns the key under which the container for data compressed with the given settings is cached."""
+        h = hashlib.sha256()
+        h.update(f"{CACHE_FORMAT_VERSION}:{get_package_version()}:{get_implementation_type().value}:".encode())
+        h.update(f"{','.join(t.name for t in compression_types)}:{size_budget}:".encode())
+        h.update(data)
+        return h.hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        """Returns the cached container for the key, if there is one."""
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                try:
+                    with open(self.path_for(key), "rb") as f:
+                        cont_bytes = f.read()
+                    # Keep track of the last use across processes.
+                    os.utime(self.path_for(key))
+                except OSError:
+                    # Deleted by another process.
+                    self._size -= index.pop(key)
+                else:
+                    index.move_to_end(key)
+                    self._hits += 1
+                    return cont_bytes
+            self._misses += 1
+            return None
+
+    def put(self, key: str, cont_bytes: bytes) -> None:
+        """Caches the container for the key and evicts the least recently used containers, if needed."""
+        if len(cont_bytes) > self.max_size:
+            return
+        with self._lock:
+            index = self._load_index()
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # Write atomically, multiple processes may store the same container.
+                write_file_atomically(self.path_for(key), cont_bytes)
+            except OSError as ex:
+                logger.warning(f"Could not write compression cache file for {key}.", exc_info=ex)
+                return
+            if key in index:
+                self._size -= index.pop(key)
+            index[key] = len(cont_bytes)
+            self._size += len(cont_bytes)
+            self._stores += 1
+            while self._size > self.max_size:
+                evicted_key, evicted_size = index.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+                try:
+                    os.unlink(self.path_for(evicted_key))
+                except OSError:
+                    pass
+
+    def stats(self) -> CompressionCacheStats:
+        with self._lock:
+            index = self._load_index()
+            return CompressionCacheStats(
+                self._hits, self._misses, self._stores, self._evictions, len(index), self._size
+            )
+
+    def clear(self) -> None:
+        """Deletes all cached containers and resets the statistics."""
+        with self._lock:
+            self._index = OrderedDict()
+            self._size = self._hits = self._misses = self._stores = self._evictions = 0
+            if not os.path.isdir(self.cache_dir):
+                return
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(CACHE_FILE_SUFFIX):
+                    try:
+                        os.unlink(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_FILE_SUFFIX)
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._index is None:
+            entries = []
+            if os.path.isdir(self.cache_dir):
+                for entry in os.scandir(self.cache_dir):
+                    if entry.name.endswith(CACHE_FILE_SUFFIX):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime, entry.name[: -len(CACHE_FILE_SUFFIX)], stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._size = sum(self._index.values())
+        return self._index
+
+
+_compression_cache: CompressionCache | None = None
+_compression_cache_initialized = False
+_compression_cache_lock = Lock()
+
+
+def get_compression_cache() -> CompressionCache | None:
+    """
+    Returns the process-wide compression cache used by CommonAtHandler.compress, or None if it is disabled.
+    It is disabled unless enabled with set_compression_cache or the environment variable SKYTEMPLE_AT_CACHE=1.
+    """
+    global _compression_cache, _compression_cache_initialized
+    with _compression_cache_lock:
+        if not _compression_cache_initialized:
+            if bool(int(os.getenv(ENV_SKYTEMPLE_AT_CACHE, "0"))):
+                _compression_cache = CompressionCache()
+            _compression_cache_initialized = True
+        return _compression_cache
+
+
+def set_compression_cache(cache: CompressionCache | None) -> None:
+    """Sets the process-wide compression cache used by CommonAtHandler.compress. None disables it."""
+    global _compression_cache, _compression_cache_initialized
+    with _compression_cache_lock:
+        _compression_cache = cache
+        _compression_cache_initialized = True
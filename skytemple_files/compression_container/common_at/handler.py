@@ -17,6 +17,9 @@
 from __future__ import annotations
 
 import os
+import time
+from concurrent.futures import Executor, Future, as_completed
+from dataclasses import dataclass, field
 from enum import Enum, auto
 
 from skytemple_files.common.types.data_handler import DataHandler
@@ -28,6 +31,7 @@ from skytemple_files.compression_container.atupx.handler import AtupxHandler
 from skytemple_files.compression_container.base_handler import (
     CompressionContainerHandler,
 )
+from skytemple_files.compression_container.common_at.cache import get_compression_cache
 from skytemple_files.compression_container.pkdpx.handler import PkdpxHandler
 from skytemple_files.compression_container.protocol import CompressionContainerProtocol
 
@@ -70,6 +74,33 @@ COMMON_AT_PKD = [CommonAtType.PKDPX]
 DEBUG = False
 
 
+@dataclass
+class CommonAtCompressionResult:
+    """The result of CommonAtHandler.compress_best."""
+
+    container: CompressionContainerProtocol
+    compression_type: CommonAtType
+    # Size of the serialized container.
+    size: int
+    # Seconds spent compressing and serializing, for every algorithm that was tried.
+    # Algorithms that were skipped because of the size budget are missing.
+    timings: dict[CommonAtType, float] = field(default_factory=dict)
+
+
+def _compress_timed(compression_type: CommonAtType, data: bytes) -> tuple[CompressionContainerProtocol, bytes, float]:
+    """Compresses data with one algorithm and returns the container, the serialized container and the time it took."""
+    start = time.perf_counter()
+    cont = compression_type.handler.compress(data)  # pylint: disable=no-member
+    cont_bytes = cont.to_bytes()
+    return cont, cont_bytes, time.perf_counter() - start
+
+
+def _compress_timed_serialized(compression_type: CommonAtType, data: bytes) -> tuple[bytes, float]:
+    """Like _compress_timed, for running in other processes (the containers may not be picklable)."""
+    _, cont_bytes, elapsed = _compress_timed(compression_type, data)
+    return cont_bytes, elapsed
+
+
 class CommonAtHandler(DataHandler[CompressionContainerProtocol]):
     allowed_types = set()
     for t in CommonAtType:
@@ -118,31 +149,108 @@ class CommonAtHandler(DataHandler[CompressionContainerProtocol]):
         return data.to_bytes()
 
     @classmethod
-    def compress(cls, data: bytes, compression_type: list[CommonAtType] | None = None) -> CompressionContainerProtocol:
-        """Turn uncompressed data into a new AT container"""
+    def compress(
+        cls,
+        data: bytes,
+        compression_type: list[CommonAtType] | None = None,
+        *,
+        executor: Executor | None = None,
+        size_budget: int | None = None,
+    ) -> CompressionContainerProtocol:
+        """Turn uncompressed data into a new AT container. See compress_best for the keyword arguments."""
+        return cls.compress_best(data, compression_type, executor=executor, size_budget=size_budget).container
+
+    @classmethod
+    def compress_best(
+        cls,
+        data: bytes,
+        compression_type: list[CommonAtType] | None = None,
+        *,
+        executor: Executor | None = None,
+        size_budget: int | None = None,
+    ) -> CommonAtCompressionResult:
+        """
+        Compresses the data with every allowed algorithm in compression_type and returns the smallest container,
+        with the time each algorithm took.
+
+        If an executor (eg. a ProcessPoolExecutor) is given, the algorithms run on it concurrently.
+        If a size budget is given, the algorithms are tried in order and the smallest container is returned as soon
+        as one is not larger than the budget. The remaining algorithms are skipped (or cancelled, if they didn't
+        start yet). The returned container is the same with and without an executor.
+
+        If the compression cache is enabled (see common_at.cache), containers are looked up there first.
+        For containers from the cache no timings are returned.
+        """
         if compression_type is None:
             compression_type = COMMON_AT_BEST_4
-        new_data: CompressionContainerProtocol | None = None
-        new_size = -1
+        candidates = [t for t in compression_type if t in CommonAtHandler.allowed_types]
+        cache = get_compression_cache()
+        cache_key = None
+        if cache is not None and len(candidates) > 0:
+            cache_key = cache.key(data, candidates, size_budget)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                for t in candidates:
+                    if t.handler.matches(cached):
+                        return CommonAtCompressionResult(t.handler.deserialize(cached), t, len(cached))
+        # size, index in candidates, serialized container, container (if not compressed in another process)
+        best: tuple[int, int, bytes, CompressionContainerProtocol | None] | None = None
+        timings: dict[CommonAtType, float] = {}
         if DEBUG:
             print("*** COMMON AT DEBUG: Compress Start")
-        for t in compression_type:
-            if t in CommonAtHandler.allowed_types:
+
+        def done(idx: int, cont: CompressionContainerProtocol | None, cont_bytes: bytes, elapsed: float) -> bool:
+            nonlocal best
+            t = candidates[idx]
+            timings[t] = elapsed
+            if DEBUG:
+                print("*** COMMON AT DEBUG: Compress", t, "size", len(cont_bytes), "time", elapsed)
+            # On equal size the algorithm listed first wins, like when running them one after another.
+            if best is None or (len(cont_bytes), idx) < best[:2]:
+                best = (len(cont_bytes), idx, cont_bytes, cont)
+            return size_budget is not None and best[0] <= size_budget
+
+        if executor is None:
+            for idx, t in enumerate(candidates):
                 try:
-                    cont = t.handler.compress(data)  # pylint: disable=no-member
-                    size = len(cont.to_bytes())
-                    if DEBUG:
-                        print("*** COMMON AT DEBUG: Compress", t, "size", size)
-                    if new_data is None or size < new_size:
-                        new_data = cont
-                        new_size = size
+                    if done(idx, *_compress_timed(t, data)):
+                        break
                 except Exception:
                     pass
+        else:
+            futures: dict[Future, int] = {
+                executor.submit(_compress_timed_serialized, t, data): idx for idx, t in enumerate(candidates)
+            }
+            finished: dict[int, tuple[bytes, float] | None] = {}
+            next_idx = 0
+            fits = False
+            for future in as_completed(futures):
+                try:
+                    finished[futures[future]] = future.result()
+                except Exception:
+                    finished[futures[future]] = None
+                # Results are only taken in the order of the candidates, so that a container that fits the budget
+                # is only accepted once all algorithms before it are done, like when running them one after another.
+                while not fits and next_idx in finished:
+                    result = finished.pop(next_idx)
+                    if result is not None:
+                        fits = done(next_idx, None, *result)
+                    next_idx += 1
+                if fits:
+                    for other in futures:
+                        other.cancel()
+                    break
         if DEBUG:
             print("*** COMMON AT DEBUG: Compress End")
-        if new_data is None:
+        if best is None:
             raise ValueError("No useable compression algorithm.")
-        return new_data
+        size, idx, cont_bytes, cont = best
+        t = candidates[idx]
+        if cont is None:
+            cont = t.handler.deserialize(cont_bytes)
+        if cache is not None and cache_key is not None:
+            cache.put(cache_key, cont_bytes)
+        return CommonAtCompressionResult(cont, t, size, timings)
 
     @classmethod
     def cont_size(cls, data: bytes, byte_offset=0):
@@ -25,8 +25,12 @@ from skytemple_files.container.bin_pack.writer import BinPackWriter
 
 class BinPackHandler(DataHandler[BinPack]):
     @classmethod
-    def deserialize(cls, data: bytes, **kwargs: OptionalKwargs) -> BinPack:
-        return BinPack(data)
+    def deserialize(cls, data: bytes, *, lazy: OptionalKwargs = False, **kwargs: OptionalKwargs) -> BinPack:
+        """
+        Load the bin pack. If lazy is set, sub files are only copied out of data when they are accessed,
+        see ``BinPack``.
+        """
+        return BinPack(data, lazy=bool(lazy))
 
     @classmethod
     def serialize(cls, data: BinPack, fixed_header_len=0, **kwargs: OptionalKwargs) -> bytes:
@@ -16,6 +16,9 @@
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 from __future__ import annotations
 
+import mmap
+import os
+from typing import Any
 
 from range_typed_integers import u32
 
@@ -46,30 +49,99 @@ class BinPackHeader:
 
 
 class BinPack:
-    def __init__(self, data: bytes):
+    def __init__(self, data: bytes | memoryview, *, lazy: bool = False):
+        """
+        Loads a bin pack from data.
+
+        If ``lazy`` is set, only the header is read. The sub files stay slices (memoryviews) of ``data`` until they are
+        accessed or replaced, unchanged files are then also written directly from these slices.
+        ``data`` must not be modified while the pack is in use in this case.
+        """
         if not isinstance(data, memoryview):
             data = memoryview(data)
         # The header is read-only, only used during deserialization and
         # fully regenerated by the Writer. It is NOT updated during
         # the lifetime of the model.
         self._header = BinPackHeader(data)
-        self._files: list[bytes] = []
+        self._files: list[bytes | memoryview] = []
+        # Set for packs loaded with from_file, see close.
+        self._mapped: mmap.mmap | None = None
+        self._mapped_view: memoryview | None = None
         for toc_entry in self._header.toc:
-            self._files.append(self._read_file(data, toc_entry))
+            if lazy:
+                self._files.append(self._slice_file(data, toc_entry))
+            else:
+                self._files.append(self._read_file(data, toc_entry))
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs: Any) -> BinPack:
+        """
+        Lazily loads a bin pack from an extracted file on disk, by mapping it into memory.
+        The file must not be modified while the pack is in use. Close the pack (or use it as a
+        context manager) to unmap the file.
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("Empty file.")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        pack = cls(view, lazy=True, **kwargs)
+        pack._mapped = mapped
+        pack._mapped_view = view
+        return pack
+
+    def close(self) -> None:
+        """
+        Unmaps the file of a pack loaded with from_file. Files that were not accessed or replaced yet
+        can not be read anymore after this. Does nothing for packs not loaded with from_file.
+        """
+        if self._mapped is None:
+            return
+        for f in self._files:
+            if isinstance(f, memoryview):
+                f.release()
+        assert self._mapped_view is not None
+        self._mapped_view.release()
+        self._mapped.close()
+        self._mapped = None
+        self._mapped_view = None
+
+    def __enter__(self) -> BinPack:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
 
     def _read_file(self, data: memoryview, toc_entry: BinPackTocEntry):
         s = toc_entry.pointer
         return data[s : s + toc_entry.length].tobytes()
 
-    def get_files_bytes(self):
-        """Returns the binary representation of the files (or a copy), for writing."""
+    def _slice_file(self, data: memoryview, toc_entry: BinPackTocEntry):
+        s = toc_entry.pointer
+        return data[s : s + toc_entry.length]
+
+    def _file_bytes(self, index: int) -> bytes:
+        """Returns the bytes of a file, copying them out of the source data if that has not happened yet."""
+        f = self._files[index]
+        if isinstance(f, memoryview):
+            f = f.tobytes()
+            self._files[index] = f
+        return f
+
+    def get_files_bytes(self) -> list[bytes | memoryview]:
+        """
+        Returns the binary representation of the files (or a copy), for writing.
+        For lazily loaded packs this contains memoryviews for all files that were not accessed yet.
+        """
         return self._files
 
     def __len__(self):
         return len(self._files)
 
     def __getitem__(self, key):
-        return self._files[key]
+        if isinstance(key, slice):
+            return [self._file_bytes(i) for i in range(*key.indices(len(self._files)))]
+        return self._file_bytes(key)
 
     def __setitem__(self, key, value):
         self._files[key] = value
@@ -78,7 +150,8 @@ class BinPack:
         del self._files[key]
 
     def __iter__(self):
-        return iter(self._files)
+        for i in range(0, len(self._files)):
+            yield self._file_bytes(i)
 
     def append(self, item):
         return self._files.append(item)
@@ -18,10 +18,13 @@
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 from __future__ import annotations
 
+from collections.abc import Sequence
+from typing import BinaryIO
+
 from range_typed_integers import u32_checked, u32
 
 from skytemple_files.common.util import write_u32
-from skytemple_files.container.bin_pack.model import BinPack
+from skytemple_files.container.bin_pack.model import PADDING, BinPack
 
 
 class BinPackWriter:
@@ -31,32 +34,64 @@ class BinPackWriter:
 
     def write(self) -> bytes:
         files = self.model.get_files_bytes()
-        len_header = (len(self.model.get_files_bytes()) + 1) * 8 + 16  # 16 is a row of padding
+        len_header, header = self._build_header(files)
+        # Allocated once, unchanged files of lazily loaded packs are copied straight from their source.
+        out_buffer = bytearray(b"\xff") * (
+            # Header len:
+            max(self.fixed_header_len, len_header)
+            +
+            # File data:
+            self._get_file_sizes(files)
+        )
+        out_buffer[0 : len(header)] = header
+
+        data_cursor = len_header
+        for file in files:
+            out_buffer[data_cursor : data_cursor + len(file)] = file
+            data_cursor += len(file)
+            # If the cursor is not aligned with 16 bytes, we pad.
+            if data_cursor % 16 != 0:
+                data_cursor += 16 - (data_cursor % 16)
+
+        return out_buffer
+
+    def write_to(self, fileobj: BinaryIO) -> int:
+        """
+        Like ``write``, but streams the pack into the file-like object, without building it in memory first.
+        Returns the number of bytes written.
+        """
+        files = self.model.get_files_bytes()
+        len_header, header = self._build_header(files)
+        written = fileobj.write(header)
+        written += fileobj.write(b"\xff" * (len_header - len(header)))
+        for file in files:
+            written += fileobj.write(file)
+            if len(file) % 16 != 0:
+                written += fileobj.write(PADDING[: 16 - (len(file) % 16)])
+        if self.fixed_header_len > len_header:
+            written += fileobj.write(b"\xff" * (self.fixed_header_len - len_header))
+        return written
+
+    def _build_header(self, files: Sequence[bytes | memoryview]) -> tuple[int, bytearray]:
+        """
+        Returns the length of the header area (the position of the first file) and the header itself (TOC + zero
+        padding to 16 bytes). The rest of the header area is filled with 0xFF.
+        """
+        len_header = (len(files) + 1) * 8 + 16  # 16 is a row of padding
         if len_header % 16 != 0:
             len_header += 16 - (len_header % 16)
-        out_buffer = bytearray(
-            b"\xff"
-            * (
-                # Header len:
-                max(self.fixed_header_len, len_header)
-                +
-                # File data:
-                self._get_file_sizes(files)
-            )
-        )
 
-        write_u32(out_buffer, u32(0), 0x00)
-        write_u32(out_buffer, u32_checked(len(files)), 0x04)
+        toc_curosr = 8
+        header = bytearray(toc_curosr + len(files) * 8)
+        write_u32(header, u32(0), 0x00)
+        write_u32(header, u32_checked(len(files)), 0x04)
 
         data_cursor = len_header
-        toc_curosr = 8
         for file in files:
             # toc pointer
-            write_u32(out_buffer, u32_checked(data_cursor), toc_curosr)
+            write_u32(header, u32_checked(data_cursor), toc_curosr)
             # toc length
-            write_u32(out_buffer, u32_checked(len(file)), toc_curosr + 0x04)
-            # file
-            out_buffer[data_cursor : data_cursor + len(file)] = file
+            write_u32(header, u32_checked(len(file)), toc_curosr + 0x04)
 
             data_cursor += len(file)
             # If the cursor is not aligned with 16 bytes, we pad.
@@ -67,10 +102,9 @@ class BinPackWriter:
 
         # If the toc cursor is not aligned with 16 bytes, we will with zeros
         if toc_curosr % 16 != 0:
-            pad = 16 - (toc_curosr % 16)
-            out_buffer[toc_curosr : toc_curosr + pad] = b"\x00" * pad
+            header += b"\x00" * (16 - (toc_curosr % 16))
 
-        return out_buffer
+        return len_header, header
 
     def _get_file_sizes(self, files):
         size = 0
@@ -26,14 +26,22 @@ from skytemple_files.container.dungeon_bin.model import DungeonBinPack
 class DungeonBinHandler(DataHandler[DungeonBinPack]):
     @classmethod
     def deserialize(  # type: ignore
-        cls, data: bytes, static_data: Pmd2Data, **kwargs: OptionalKwargs
+        cls, data: bytes, static_data: Pmd2Data, lazy: bool = False, **kwargs: OptionalKwargs
     ) -> DungeonBinPack:
-        return DungeonBinPack(data, static_data.dungeon_data.dungeon_bin_files)
+        """
+        Load the dungeon.bin. If lazy is set, sub files are only copied out of data when they are accessed,
+        see ``BinPack``.
+        """
+        return DungeonBinPack(data, static_data.dungeon_data.dungeon_bin_files, lazy=lazy)
 
     @classmethod
-    def serialize(cls, data: DungeonBinPack, **kwargs: OptionalKwargs) -> bytes:
+    def serialize(
+        cls, data: DungeonBinPack, *, only_modified: OptionalKwargs = False, **kwargs: OptionalKwargs
+    ) -> bytes:
         """
         Serialize the bin pack.
+        If only_modified is set, only the files that were replaced or marked as modified are serialized again,
+        see ``DungeonBinPack.serialize_subfiles``.
         """
-        data.serialize_subfiles()
+        data.serialize_subfiles(bool(only_modified))
         return BinPackWriter(data, 0).write()
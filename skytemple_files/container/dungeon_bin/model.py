@@ -32,54 +32,79 @@ T = TypeVar("T")
 
 
 class DungeonBinPack(BinPack):
-    def __init__(self, data: bytes, files_def: Pmd2DungeonBinFiles):
-        super().__init__(data)
+    """
+    The dungeon.bin pack. Files can be accessed by index or by file name (see ``files_def``) and are returned as
+    models, loaded with the handler for their type.
+
+    When saving, all models that were loaded are serialized again, since they may have been modified in place.
+    Callers that replace files with ``set`` (or by index) and report models modified in place with
+    ``mark_modified`` can serialize only those, see ``serialize_subfiles``.
+    """
+
+    def __init__(self, data: bytes, files_def: Pmd2DungeonBinFiles, *, lazy: bool = False):
+        super().__init__(data, lazy=lazy)
         self.files_def = files_def
         self._loaded_models: dict[int, Any] = {}
+        self._modified: set[int] = set()
+        self._filenames: list[str] = []
+        self._index_by_name: dict[str, int] = {}
+        self._indices_by_ext: dict[str, list[int]] = {}
+        for i in range(0, len(self)):
+            self._add_to_index(i)
 
     def get(self, filename: str) -> T:  # type: ignore
         """Returns a file by name."""
-        for i in range(0, len(self)):
-            if filename == self.get_filename(i):
-                return self[i]
-        raise KeyError(f"File {filename} not found.")
+        return self[self._get_index(filename)]
 
     def get_raw(self, filename: str) -> bytes:
         """Returns the bytes of a file by name."""
-        for i in range(0, len(self)):
-            if filename == self.get_filename(i):
-                return self._files[i]
-        raise KeyError(f"File {filename} not found.")
+        return self._file_bytes(self._get_index(filename))
 
     def set(self, filename, data):
         """Sets a file by name."""
-        for i in range(0, len(self)):
-            if filename == self.get_filename(i):
-                self[i] = data
-                return
-        raise KeyError(f"File {filename} not found.")
+        self[self._get_index(filename)] = data
+
+    def mark_modified(self, filename: str):
+        """
+        Marks a file, that was modified in place, as modified. It will then also be serialized again when saving
+        with only_modified set.
+        """
+        index = self._get_index(filename)
+        if index not in self._loaded_models:
+            raise ValueError(f"File {filename} was never loaded.")
+        self._modified.add(index)
+
+    def is_modified(self, filename: str) -> bool:
+        return self._get_index(filename) in self._modified
 
     def get_filename(self, index):
         """Returns the filename for a file at a given index."""
-        fdef = self.files_def.get(index)
-        return fdef.name.replace("%d", str(index)).replace("%i", str(index - fdef.idxfirst))
+        return self._filenames[index]
 
     def get_files_with_ext(self, ext):
-        files = []
-        for idx in range(0, len(self)):
-            fn = self.get_filename(idx)
-            if fn.endswith("." + ext):
-                files.append(fn)
-        return files
-
-    def serialize_subfiles(self):
-        """Serializes all loaded modules and updates self._files again."""
-        for idx, model in self._loaded_models.items():
+        if "." in ext:
+            return [fn for fn in self._filenames if fn.endswith("." + ext)]
+        return [self._filenames[idx] for idx in self._indices_by_ext.get(ext, [])]
+
+    def serialize_subfiles(self, only_modified: bool = False):
+        """
+        Serializes all models that were ever loaded and updates self._files again.
+        If only_modified is set, only models that were replaced or marked with ``mark_modified`` are serialized,
+        all other files are written back from their original bytes.
+        """
+        indices = sorted(self._modified) if only_modified else list(self._loaded_models.keys())
+        for idx in indices:
+            model = self._loaded_models[idx]
             handler = self._get_handler(self.files_def.get(idx).type)
             if handler is None:
                 self._files[idx] = model
             else:
                 self._files[idx] = handler.serialize(model)
+        self._modified.clear()
+
+    def append(self, item):
+        super().append(item)
+        self._add_to_index(len(self) - 1)
 
     def __getitem__(self, index):
         return self._get_model(index)
@@ -94,13 +119,33 @@ class DungeonBinPack(BinPack):
         for i in range(0, len(self)):
             yield self._get_model(i)
 
+    def _add_to_index(self, index: int):
+        fdef = self.files_def.get(index)
+        filename = fdef.name.replace("%d", str(index)).replace("%i", str(index - fdef.idxfirst))
+        self._filenames.append(filename)
+        # If names are ever duplicated, the first file wins, like with a linear search.
+        self._index_by_name.setdefault(filename, index)
+        if "." in filename:
+            self._indices_by_ext.setdefault(filename.rsplit(".", 1)[1], []).append(index)
+
+    def _get_index(self, filename: str) -> int:
+        try:
+            return self._index_by_name[filename]
+        except KeyError:
+            raise KeyError(f"File {filename} not found.") from None
+
     def _get_model(self, index):
+        if index < 0:
+            index += len(self)
         if index not in self._loaded_models:
-            self._loaded_models[index] = self._load_model(self._files[index], self.files_def.get(index))
+            self._loaded_models[index] = self._load_model(self._file_bytes(index), self.files_def.get(index))
         return self._loaded_models[index]
 
     def _set_model(self, index, value):
+        if index < 0:
+            index += len(self)
         self._loaded_models[index] = value
+        self._modified.add(index)
 
     def _load_model(self, file_bytes: bytes, file_def: Pmd2BinPackFile):
         handler = self._get_handler(file_def.type)
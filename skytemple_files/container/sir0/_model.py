@@ -20,10 +20,13 @@ from collections.abc import Sequence
 
 from range_typed_integers import u32_checked, u32
 
-from skytemple_files.common.util import read_u32, write_u32
+from skytemple_files.common.util import read_u32
 from skytemple_files.container.sir0 import HEADER_LEN
 from skytemple_files.container.sir0.protocol import Sir0Protocol
-from skytemple_files.container.sir0.sir0_util import decode_sir0_pointer_offsets
+from skytemple_files.container.sir0.sir0_util import (
+    decode_sir0_pointer_offsets,
+    relocate_sir0_pointers,
+)
 
 
 class Sir0(Sir0Protocol):
@@ -45,26 +48,21 @@ class Sir0(Sir0Protocol):
 
     @classmethod
     def from_bin(cls, data: bytes) -> Sir0:
-        data = memoryview(bytearray(data))
         data_pointer = read_u32(data, 0x04)
         pointer_offset_list_pointer = read_u32(data, 0x08)
 
         pointer_offsets = cls._decode_pointer_offsets(data, pointer_offset_list_pointer)
 
-        # Correct pointers by subtracting the header
-        for pnt_off in pointer_offsets:
-            write_u32(
-                data,  # type: ignore
-                u32_checked(read_u32(data, pnt_off) - HEADER_LEN),
-                pnt_off,
-            )
-
         # The first two are for the pointers in the header, we remove them now, they are not
         # part of the content pointers
         content_pointer_offsets: list[u32] = [u32_checked(pnt - HEADER_LEN) for pnt in pointer_offsets[2:]]
 
+        # Correct pointers by subtracting the header
+        content = bytearray(memoryview(data)[HEADER_LEN:pointer_offset_list_pointer])
+        relocate_sir0_pointers(content, content_pointer_offsets, -HEADER_LEN)
+
         return cls(
-            bytes(data[HEADER_LEN:pointer_offset_list_pointer]),
+            bytes(content),
             content_pointer_offsets,
             data_pointer - HEADER_LEN,
         )
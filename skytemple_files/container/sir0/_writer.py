@@ -18,17 +18,15 @@
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 from __future__ import annotations
 
-from collections.abc import Sequence
-
 from range_typed_integers import u32_checked, u32
 
-from skytemple_files.common.util import (
-    write_u32,
-    read_u32,
-)
+from skytemple_files.common.util import write_u32
 from skytemple_files.container.sir0 import HEADER_LEN
 from skytemple_files.container.sir0._model import Sir0
-from skytemple_files.container.sir0.sir0_util import encode_sir0_pointer_offsets
+from skytemple_files.container.sir0.sir0_util import (
+    encode_sir0_pointer_offset_list,
+    relocate_sir0_pointers,
+)
 
 
 class Sir0Writer:
@@ -37,34 +35,22 @@ class Sir0Writer:
         self.bytes_written = 0
 
     def write(self, model: Sir0) -> bytes:
-        model = Sir0(
-            bytearray(model.content),
-            list(model.content_pointer_offsets),
-            model.data_pointer,
-        )
         # Correct all pointers in content by HEADER_LEN
-        if not isinstance(model.content, bytearray):
-            model.content = bytearray(model.content)
-        for i, pnt_off in enumerate(model.content_pointer_offsets):
-            model.content_pointer_offsets[i] = u32_checked(pnt_off + HEADER_LEN)
-            write_u32(
-                model.content,
-                u32(read_u32(model.content, pnt_off) + HEADER_LEN),
-                pnt_off,
-            )
+        content_pointer_offsets = [u32_checked(pnt_off + HEADER_LEN) for pnt_off in model.content_pointer_offsets]
 
         # Also add the two header pointers
-        pointer_offsets = [u32(4), u32(8)] + model.content_pointer_offsets
+        pointer_offsets = [u32(4), u32(8)] + content_pointer_offsets
 
         # Pointer offsets list
-        pol = bytearray(4 * len(pointer_offsets))
-        pol_cursor = self._encode_pointer_offsets(pol, pointer_offsets)
-        pol = pol[:pol_cursor]
+        pol = encode_sir0_pointer_offset_list(pointer_offsets) + b"\0"
 
-        len_content_padding = self._len_pad(len(model.content))
+        len_content = len(model.content)
+        if len(content_pointer_offsets) > 0 and max(model.content_pointer_offsets) + 4 > len_content:
+            raise ValueError("A pointer offset is outside of the content.")
+        len_content_padding = self._len_pad(len_content)
         len_eof_padding = self._len_pad(len(pol))
 
-        pointer_pol = HEADER_LEN + len(model.content) + len_content_padding
+        pointer_pol = HEADER_LEN + len_content + len_content_padding
         self.bytes_written = 0
         self.data = bytearray(pointer_pol + len(pol) + len_eof_padding)
 
@@ -76,6 +62,7 @@ class Sir0Writer:
 
         assert self.bytes_written == HEADER_LEN
         self._append(model.content)
+        relocate_sir0_pointers(self.data, model.content_pointer_offsets, HEADER_LEN, HEADER_LEN)
         self._pad(len_content_padding)
 
         assert self.bytes_written == pointer_pol
@@ -90,7 +77,7 @@ class Sir0Writer:
         self.bytes_written += len(data)
 
     def _pad(self, padding_length):
-        self._append(bytes(0xAA for _ in range(0, padding_length)))
+        self._append(b"\xaa" * padding_length)
 
     def _len_pad(self, cur_len):
         if cur_len % 16 == 0:
@@ -100,8 +87,3 @@ class Sir0Writer:
     def _write_u32(self, val: u32):
         write_u32(self.data, val, self.bytes_written)
         self.bytes_written += 4
-
-    # Based on C++ algorithm by psy_commando from
-    # https://projectpokemon.org/docs/mystery-dungeon-nds/sir0siro-format-r46/
-    def _encode_pointer_offsets(self, buffer: bytearray, pointer_offsets: Sequence[int]) -> u32:
-        return encode_sir0_pointer_offsets(buffer, pointer_offsets)
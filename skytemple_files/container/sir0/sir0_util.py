@@ -17,77 +17,132 @@
 
 from __future__ import annotations
 
+import functools
+import itertools
+import re
+import struct
+import sys
 from typing import cast
 from collections.abc import Sequence
 
 from range_typed_integers import u32
 
+# A complete pointer offset list: encoded offsets until the first 0 byte, that does not end an offset.
+_POINTER_OFFSET_LIST = re.compile(rb"(?:[\x80-\xff]*[\x01-\x7f]|[\x80-\xff]+\x00)*")
+# A single encoded offset.
+_POINTER_OFFSET = re.compile(rb"[\x80-\xff]*[\x00-\x7f]")
+_U32 = struct.Struct("<I")
+
 
 # Based on C++ algorithm by psy_commando from
 # https://projectpokemon.org/docs/mystery-dungeon-nds/sir0siro-format-r46/
 def decode_sir0_pointer_offsets(data: bytes, pointer_offset_list_pointer: u32, relative=True) -> Sequence[u32]:
-    decoded = []
-    # This is used to sum up all offsets and obtain the offset relative to the file, and not the last offset
-    offsetsum = 0
-    # temp buffer to assemble longer offsets
+    # Each offset is encoded in 7-bit groups, highest first. The first bit of a byte is set,
+    # if the next byte also belongs to the offset. The list ends with a 0 byte.
+    match = _POINTER_OFFSET_LIST.match(data, pointer_offset_list_pointer)
+    assert match is not None
+    encoded = match.group()
+    values: Sequence[int]
+    if len(encoded) < 1 or max(encoded) < 0x80:
+        # Fast path: all offsets are stored in a single byte.
+        values = encoded
+    else:
+        values = [
+            offset[0] if len(offset) == 1 else _decode_pointer_offset(offset)
+            for offset in _POINTER_OFFSET.findall(encoded)
+        ]
+    if relative:
+        # The offsets are relative to the last offset.
+        return cast(list[u32], list(itertools.accumulate(values)))
+    return cast(list[u32], list(values))
+
+
+def _decode_pointer_offset(encoded: bytes) -> int:
     buffer = 0
-    # This contains whether the byte read on the previous turn of the loop had the bit flag
-    # indicating to append the next byte!
-    last_had_bit_flag = False
-    for curbyte in data[pointer_offset_list_pointer : len(data)]:
-        if not last_had_bit_flag and curbyte == 0:
-            break
-        # Ignore the first bit, using the 0x7F bitmask, as its reserved.
-        # And append or assign the next byte's value to the buffer.
-        buffer |= curbyte & 0x7F
-
-        if (0x80 & curbyte) != 0:
-            last_had_bit_flag = True
-            # If first bit is 1, bitshift left the current buffer, to append the next byte.
-            buffer <<= 7
-        else:
-            last_had_bit_flag = False
-            # If we don't need to append, add the value of the current buffer to the offset sum this far,
-            # and add that value to the output vector. Then clear the buffer.
-            if relative:
-                offsetsum += buffer
-                decoded.append(offsetsum)
-            else:
-                decoded.append(buffer)
-            buffer = 0
-
-    return cast(list[u32], decoded)
+    for curbyte in encoded:
+        buffer = (buffer << 7) | (curbyte & 0x7F)
+    return buffer
 
 
 # Based on C++ algorithm by psy_commando from
 # https://projectpokemon.org/docs/mystery-dungeon-nds/sir0siro-format-r46/
 def encode_sir0_pointer_offsets(buffer: bytearray, pointer_offsets: Sequence[int], relative=True) -> u32:
-    cursor = 0
-    # used to add up the sum of all the offsets up to the current one
-    offset_so_far = 0
-    for offset in pointer_offsets:
-        if relative:
-            offset_to_encode = offset - offset_so_far
-        else:
-            # If we are not working relative, we can just use the offset directly.
-            offset_to_encode = offset
-        # This tells the loop whether it needs to encode null bytes, if at least one higher byte was non-zero
-        has_higher_non_zero = False
-        # Set the value to the latest offset, so we can properly subtract it from the next offset.
-        offset_so_far = offset
-
-        # Encode every bytes of the 4 bytes integer we have to
-        for i in range(4, 0, -1):
-            currentbyte = (offset_to_encode >> (7 * (i - 1))) & 0x7F
-            # the lowest byte to encode is special
-            if i == 1:
-                # If its the last byte to append, leave the highest bit to 0 !
-                buffer[cursor] = currentbyte
-                cursor += 1
-            elif currentbyte != 0 or has_higher_non_zero:
-                # if any bytes but the lowest one! If not null OR if we have encoded a higher non-null byte before!
-                buffer[cursor] = currentbyte | 0x80
-                cursor += 1
-                has_higher_non_zero = True
-
-    return u32(cursor + 1)
+    """
+    Encodes the pointer offsets into the buffer. Returns the length of the encoded list,
+    including the 0 byte at the end (which is not written, the buffer is expected to be zeroed).
+    """
+    encoded = encode_sir0_pointer_offset_list(pointer_offsets, relative)
+    if len(encoded) > len(buffer):
+        raise IndexError("The buffer is too small for the encoded pointer offsets.")
+    buffer[0 : len(encoded)] = encoded
+    return u32(len(encoded) + 1)
+
+
+def encode_sir0_pointer_offset_list(pointer_offsets: Sequence[int], relative=True) -> bytes:
+    """
+    Returns the encoded pointer offsets, without the 0 byte that ends the list.
+    See encode_sir0_pointer_offsets.
+    """
+    if relative:
+        # Each offset is encoded relative to the previous one.
+        values = [
+            offset - previous for previous, offset in zip(itertools.chain((0,), pointer_offsets), pointer_offsets)
+        ]
+    else:
+        values = list(pointer_offsets)
+    if len(values) < 1:
+        return b""
+    if min(values) >= 0 and max(values) < 0x80:
+        # Fast path: all offsets fit in a single byte.
+        return bytes(values)
+    return b"".join([_encode_pointer_offset(value) for value in values])
+
+
+@functools.lru_cache(maxsize=4096)
+def _encode_pointer_offset(offset_to_encode: int) -> bytes:
+    encoded = bytearray()
+    # This tells the loop whether it needs to encode null bytes, if at least one higher byte was non-zero
+    has_higher_non_zero = False
+    # Encode every bytes of the 4 bytes integer we have to
+    for i in range(4, 0, -1):
+        currentbyte = (offset_to_encode >> (7 * (i - 1))) & 0x7F
+        # the lowest byte to encode is special
+        if i == 1:
+            # If its the last byte to append, leave the highest bit to 0 !
+            encoded.append(currentbyte)
+        elif currentbyte != 0 or has_higher_non_zero:
+            # if any bytes but the lowest one! If not null OR if we have encoded a higher non-null byte before!
+            encoded.append(currentbyte | 0x80)
+            has_higher_non_zero = True
+    return bytes(encoded)
+
+
+def relocate_sir0_pointers(buffer: bytearray, pointer_offsets: Sequence[int], delta: int, base: int = 0) -> None:
+    """
+    Adds delta to all pointers (u32) in the buffer, at the offsets relative to base.
+    Raises a ValueError if a pointer is outside of the buffer or would not fit in an u32 anymore.
+    """
+    if len(pointer_offsets) < 1:
+        return
+    if min(pointer_offsets) < 0 or max(pointer_offsets) + 4 > len(buffer) - base:
+        raise ValueError("A pointer offset is outside of the buffer.")
+    if sys.byteorder == "little" and base % 4 == 0 and all(offset % 4 == 0 for offset in pointer_offsets):
+        # All pointers are aligned: Access the buffer as an array of u32.
+        with (
+            memoryview(buffer) as view,
+            view[base : base + (len(buffer) - base) // 4 * 4] as aligned,
+            aligned.cast("I") as words,
+        ):
+            try:
+                for offset in pointer_offsets:
+                    words[offset >> 2] += delta
+            except (ValueError, OverflowError) as ex:
+                raise ValueError(f"Pointer at {offset} is out of range after relocation.") from ex
+        return
+    unpack_from = _U32.unpack_from
+    pack_into = _U32.pack_into
+    try:
+        for offset in pointer_offsets:
+            pack_into(buffer, base + offset, unpack_from(buffer, base + offset)[0] + delta)
+    except struct.error as ex:
+        raise ValueError(f"Pointer at {offset} is out of range after relocation.") from ex
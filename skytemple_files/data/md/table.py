@@ -0,0 +1,196 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import struct
+from array import array
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from range_typed_integers import u32
+
+from skytemple_files.common.util import read_u32
+from skytemple_files.data.md._model import Md, MdEntry
+from skytemple_files.data.md.protocol import MD_ENTRY_LEN, MdEntryProtocol, MdProtocol
+
+# Name and struct format of all fields of an entry, in the order they are stored in.
+MD_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("entid", "H"),
+    ("unk31", "H"),
+    ("national_pokedex_number", "H"),
+    ("base_movement_speed", "H"),
+    ("pre_evo_index", "H"),
+    ("evo_method", "H"),
+    ("evo_param1", "H"),
+    ("evo_param2", "H"),
+    ("sprite_index", "h"),
+    ("gender", "B"),
+    ("body_size", "B"),
+    ("type_primary", "B"),
+    ("type_secondary", "B"),
+    ("movement_type", "B"),
+    ("iq_group", "B"),
+    ("ability_primary", "B"),
+    ("ability_secondary", "B"),
+    ("bitflag1", "H"),
+    ("exp_yield", "H"),
+    ("recruit_rate1", "h"),
+    ("base_hp", "H"),
+    ("recruit_rate2", "h"),
+    ("base_atk", "B"),
+    ("base_sp_atk", "B"),
+    ("base_def", "B"),
+    ("base_sp_def", "B"),
+    ("weight", "h"),
+    ("size", "h"),
+    ("unk17", "B"),
+    ("unk18", "B"),
+    ("shadow_size", "b"),
+    ("chance_spawn_asleep", "b"),
+    ("hp_regeneration", "B"),
+    ("unk21_h", "b"),
+    ("base_form_index", "h"),
+    ("exclusive_item1", "h"),
+    ("exclusive_item2", "h"),
+    ("exclusive_item3", "h"),
+    ("exclusive_item4", "h"),
+    ("unk27", "h"),
+    ("unk28", "h"),
+    ("unk29", "h"),
+    ("unk30", "h"),
+)
+MD_ENTRY_STRUCT = struct.Struct("<" + "".join(fmt for _, fmt in MD_COLUMNS))
+assert MD_ENTRY_STRUCT.size == MD_ENTRY_LEN
+
+# The flags that are stored in bitflag1, lowest bit first.
+_BITFLAG1_FIELDS = (
+    "bitfield1_0",
+    "bitfield1_1",
+    "bitfield1_2",
+    "bitfield1_3",
+    "can_move",
+    "bitfield1_5",
+    "can_evolve",
+    "item_required_for_spawning",
+)
+
+
+class MdTable:
+    """
+    Columnar view of the monster.md entries: every field is stored in one array over all entries
+    (see MD_COLUMNS for the names; the bit flags are stored combined in the ``bitflag1`` column).
+
+    This is meant for analysing or bulk editing all entries, without creating an MdEntry per entry.
+    Columns can be modified in place. Entries are only created on request, with ``entry``, and are
+    copies: use ``set_entry`` to store changes to them in the table.
+    Use ``to_md`` to get a model that can be written with the MdWriter, or ``to_bytes`` to directly
+    get the monster.md file.
+    """
+
+    def __init__(self, columns: dict[str, array]):
+        self._columns = columns
+        self._length = len(columns[MD_COLUMNS[0][0]])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> MdTable:
+        """Reads the table from a monster.md file."""
+        number_entries = read_u32(data, 4)
+        view = memoryview(data)[8 : 8 + number_entries * MD_ENTRY_LEN]
+        return cls._from_rows(MD_ENTRY_STRUCT.iter_unpack(view), number_entries)
+
+    @classmethod
+    def from_md(cls, md: MdProtocol) -> MdTable:
+        """Builds the table from the entries of a loaded model."""
+        return cls._from_rows((cls._entry_to_row(entry) for entry in md.entries), len(md.entries))
+
+    @classmethod
+    def _from_rows(cls, rows: Iterable[tuple[int, ...]], number_entries: int) -> MdTable:
+        if number_entries == 0:
+            return cls({name: array(fmt) for name, fmt in MD_COLUMNS})
+        return cls({name: array(fmt, col) for (name, fmt), col in zip(MD_COLUMNS, zip(*rows))})
+
+    @staticmethod
+    def _entry_to_row(entry: MdEntryProtocol) -> tuple[int, ...]:
+        bitflag1 = 0
+        for i, flag in enumerate(_BITFLAG1_FIELDS):
+            bitflag1 |= int(getattr(entry, flag)) << i
+        return tuple(bitflag1 if name == "bitflag1" else getattr(entry, name) for name, _ in MD_COLUMNS)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def column_names(self) -> list[str]:
+        return [name for name, _ in MD_COLUMNS]
+
+    def column(self, name: str) -> array:
+        """Returns the values of a field for all entries. Changes to the returned array change the table."""
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise KeyError(f"Unknown column: {name}") from None
+
+    def filter(self, predicate: Callable[..., Any], *names: str) -> list[int]:
+        """
+        Returns the indices of all entries for which predicate returns true.
+        predicate is called with the values of the given columns for each entry.
+        """
+        columns = [self.column(name) for name in names]
+        if len(columns) == 1:
+            return [i for i, v in enumerate(columns[0]) if predicate(v)]
+        return [i for i, values in enumerate(zip(*columns)) if predicate(*values)]
+
+    def sort(self, name: str, indices: Iterable[int] | None = None, reverse: bool = False) -> list[int]:
+        """
+        Returns the indices of the entries (or the given subset of indices, eg. from ``filter``),
+        sorted by the value of a column. The sort is stable.
+        """
+        column = self.column(name)
+        if indices is None:
+            indices = range(self._length)
+        return sorted(indices, key=column.__getitem__, reverse=reverse)
+
+    def entry(self, index: int) -> MdEntry:
+        """Creates the entry at the index. The entry is a copy, changes to it don't change the table."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Entry index out of range.")
+        return MdEntry(
+            md_index=u32(index),
+            **{name: column[index] for name, column in self._columns.items()},  # type: ignore
+        )
+
+    def set_entry(self, index: int, entry: MdEntryProtocol) -> None:
+        """Stores the values of the entry in the table at the index."""
+        for (name, _), value in zip(MD_COLUMNS, self._entry_to_row(entry)):
+            self._columns[name][index] = value
+
+    def to_bytes(self) -> bytes:
+        """Returns the table as monster.md file."""
+        data = bytearray(8 + self._length * MD_ENTRY_LEN)
+        data[0:4] = b"MD\0\0"
+        data[4:8] = self._length.to_bytes(4, "little", signed=False)
+        pack_into = MD_ENTRY_STRUCT.pack_into
+        columns = [self._columns[name] for name, _ in MD_COLUMNS]
+        for i, row in enumerate(zip(*columns)):
+            pack_into(data, 8 + i * MD_ENTRY_LEN, *row)
+        return bytes(data)
+
+    def to_md(self) -> Md:
+        """Returns the table as a (Python) model."""
+        return Md(self.to_bytes())
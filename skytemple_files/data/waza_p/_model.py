@@ -32,7 +32,7 @@ from skytemple_files.common.util import (
 from skytemple_files.container.sir0.sir0_serializable import Sir0Serializable
 from skytemple_files.container.sir0.sir0_util import (
     decode_sir0_pointer_offsets,
-    encode_sir0_pointer_offsets,
+    encode_sir0_pointer_offset_list,
 )
 from skytemple_files.data.waza_p import WAZA_MOVE_ENTRY_LEN
 from skytemple_files.data.waza_p.protocol import (
@@ -302,23 +302,17 @@ class WazaP(WazaPProtocol[WazaMove, MoveLearnset], Sir0Serializable, AutoString)
         for learnset in self.learnsets:
             # Level Up
             pnt_lvlup = len(data)
-            buff = bytearray(8 * (len(learnset.level_up_moves) + 1))
             lvl_up_move_list = []
             for lvl_up_move in learnset.level_up_moves:
                 lvl_up_move_list.append(lvl_up_move.move_id)
                 lvl_up_move_list.append(lvl_up_move.level_id)
-            c = encode_sir0_pointer_offsets(buff, lvl_up_move_list, False)
-            data += buff[:c]
+            data += encode_sir0_pointer_offset_list(lvl_up_move_list, False) + b"\0"
             # TM/HM
             pnt_tm_hm = len(data)
-            buff = bytearray(4 * (len(learnset.tm_hm_moves) + 1))
-            c = encode_sir0_pointer_offsets(buff, learnset.tm_hm_moves, False)
-            data += buff[:c]
+            data += encode_sir0_pointer_offset_list(learnset.tm_hm_moves, False) + b"\0"
             # Egg
             pnt_egg = len(data)
-            buff = bytearray(4 * (len(learnset.egg_moves) + 1))
-            c = encode_sir0_pointer_offsets(buff, learnset.egg_moves, False)
-            data += buff[:c]
+            data += encode_sir0_pointer_offset_list(learnset.egg_moves, False) + b"\0"
 
             learnset_pointers.append((u32_checked(pnt_lvlup), u32_checked(pnt_tm_hm), u32_checked(pnt_egg)))
         # Padding
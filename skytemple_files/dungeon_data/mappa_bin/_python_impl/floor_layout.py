@@ -83,6 +83,19 @@ class MappaFloorTerrainSettings(MappaFloorTerrainSettingsProtocol, AutoString):
             and self.unk7 == other.unk7
         )
 
+    def canonical_key(self) -> tuple[bool, ...]:
+        """Returns a hashable key, that is equal for two terrain settings if they are equal."""
+        return (
+            self.has_secondary_terrain,
+            self.unk1,
+            self.generate_imperfect_rooms,
+            self.unk3,
+            self.unk4,
+            self.unk5,
+            self.unk6,
+            self.unk7,
+        )
+
     def to_mappa(self):
         return u8(
             generate_bitfield(
@@ -269,6 +282,41 @@ class MappaFloorLayout(MappaFloorLayoutProtocol[MappaFloorTerrainSettings], Auto
 
         return data
 
+    def canonical_key(self) -> tuple[object, ...]:
+        """Returns a hashable key, that is equal for two floor layouts if they are equal."""
+        return (
+            self.structure,
+            self.room_density,
+            self.tileset_id,
+            self.music_id,
+            self.weather,
+            self.floor_connectivity,
+            self.initial_enemy_density,
+            self.kecleon_shop_chance,
+            self.monster_house_chance,
+            self.unused_chance,
+            self.sticky_item_chance,
+            self.dead_ends,
+            self.secondary_terrain,
+            self.terrain_settings.canonical_key(),
+            self.unk_e,
+            self.item_density,
+            self.trap_density,
+            self.floor_number,
+            self.fixed_floor_id,
+            self.extra_hallway_density,
+            self.buried_item_density,
+            self.water_density,
+            self.darkness_level,
+            self.max_coin_amount,
+            self.kecleon_shop_item_positions,
+            self.empty_monster_house_chance,
+            self.unk_hidden_stairs,
+            self.hidden_stairs_spawn_chance,
+            self.enemy_iq,
+            self.iq_booster_boost,
+        )
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, MappaFloorLayout):
             return False
@@ -117,6 +117,10 @@ class MappaItemList(MappaItemListProtocol, AutoString):
     def to_bytes(self) -> bytes:
         return self.to_mappa()
 
+    def canonical_key(self) -> tuple[tuple[tuple[int, int], ...], tuple[tuple[int, int], ...]]:
+        """Returns a hashable key, that is equal for two item lists if they are equal."""
+        return tuple(sorted(self.categories.items())), tuple(sorted(self.items.items()))
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, MappaItemList):
             return False
@@ -18,7 +18,7 @@ from __future__ import annotations
 
 from itertools import chain
 
-from range_typed_integers import u32_checked, u32
+from range_typed_integers import u16, u32_checked, u32
 
 from skytemple_files.common.util import (
     AutoString,
@@ -275,36 +275,50 @@ class MappaBin(MappaBinProtocol[MappaFloor], Sir0Serializable, AutoString):
         """
         Collects a list of floors, that references indices in other lists, like stored in the mappa files.
         If two floors use the same exact data for something, they will be pointing to the same index in the lists,
-        there are no duplicates.
+        there are no duplicates. Equal data is found by the canonical keys of the entries.
         Returned are all lists.
-        TODO: Performance could be improved here, by using more efficient lookup mechanisms.
         """
         floor_lists: list[list[StubMappaFloor]] = []
         floor_layouts: list[MappaFloorLayout] = []
         monster_lists: list[list[MappaMonster]] = []
         trap_lists: list[MappaTrapList] = []
         item_lists: list[MappaItemList] = []
+        # Canonical key -> index in the list
+        layout_indices: dict[tuple, int] = {}
+        monster_indices: dict[tuple, int] = {}
+        trap_indices: dict[tuple, int] = {}
+        item_indices: dict[tuple, int] = {}
+
+        def add_item_list(item_list: MappaItemList) -> u16:
+            return u16(self._find_if_not_exists_insert(item_lists, item_indices, item_list, item_list.canonical_key()))
+
         for floor_list in self.floor_lists:
             stub_floor_list = []
             for floor in floor_list:
                 # Layout
-                layout_idx = self._find_if_not_exists_insert(floor_layouts, floor.layout)
+                layout_idx = self._find_if_not_exists_insert(
+                    floor_layouts, layout_indices, floor.layout, floor.layout.canonical_key()
+                )
                 # Monsters
-                monsters_idx = self._find_if_not_exists_insert(monster_lists, floor.monsters)
+                monsters_idx = self._find_if_not_exists_insert(
+                    monster_lists, monster_indices, floor.monsters, MappaMonster.list_canonical_key(floor.monsters)
+                )
                 # Traps
-                traps_idx = self._find_if_not_exists_insert(trap_lists, floor.traps)
+                traps_idx = self._find_if_not_exists_insert(
+                    trap_lists, trap_indices, floor.traps, floor.traps.canonical_key()
+                )
                 # Floor items
-                floor_items_idx = self._find_if_not_exists_insert(item_lists, floor.floor_items)
+                floor_items_idx = add_item_list(floor.floor_items)
                 # Shop items
-                shop_items_idx = self._find_if_not_exists_insert(item_lists, floor.shop_items)
+                shop_items_idx = add_item_list(floor.shop_items)
                 # Monster house items
-                monster_house_items_idx = self._find_if_not_exists_insert(item_lists, floor.monster_house_items)
+                monster_house_items_idx = add_item_list(floor.monster_house_items)
                 # Buried items
-                buried_items_idx = self._find_if_not_exists_insert(item_lists, floor.buried_items)
+                buried_items_idx = add_item_list(floor.buried_items)
                 # Unk items 1
-                unk_items1_idx = self._find_if_not_exists_insert(item_lists, floor.unk_items1)
+                unk_items1_idx = add_item_list(floor.unk_items1)
                 # Unk items 2
-                unk_items2_idx = self._find_if_not_exists_insert(item_lists, floor.unk_items2)
+                unk_items2_idx = add_item_list(floor.unk_items2)
 
                 stub_floor_list.append(
                     StubMappaFloor(
@@ -325,11 +339,11 @@ class MappaBin(MappaBinProtocol[MappaFloor], Sir0Serializable, AutoString):
         return floor_lists, floor_layouts, monster_lists, trap_lists, item_lists
 
     @staticmethod
-    def _find_if_not_exists_insert(lst, elem):
-        try:
-            index = lst.index(elem)
-        except ValueError:
+    def _find_if_not_exists_insert(lst, indices, elem, key):
+        index = indices.get(key)
+        if index is None:
             index = len(lst)
+            indices[key] = index
             lst.append(elem)
         return index
 
@@ -81,6 +81,15 @@ class MappaMonster(MappaMonsterProtocol, AutoString):
     def _is_end_of_entries(cls, data: bytes, pointer):
         return read_u16(data, pointer + 6) == 0
 
+    def canonical_key(self) -> tuple[int, int, int, int]:
+        """Returns a hashable key, that is equal for two monster entries if they are equal."""
+        return self.md_index, self.level, self.main_spawn_weight, self.monster_house_spawn_weight
+
+    @classmethod
+    def list_canonical_key(cls, monsters: list[MappaMonster]) -> tuple[tuple[int, int, int, int], ...]:
+        """Returns a hashable key, that is equal for two monster lists if they are equal."""
+        return tuple(monster.canonical_key() for monster in monsters)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, MappaMonster):
             return False
@@ -62,6 +62,10 @@ class MappaTrapList(MappaTrapListProtocol, AutoString):
             write_u16(data, self.weights[u8(i)], i * 2)
         return data
 
+    def canonical_key(self) -> tuple[tuple[int, int], ...]:
+        """Returns a hashable key, that is equal for two trap lists if they are equal."""
+        return tuple(sorted(self.weights.items()))
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, MappaTrapList):
             return False
@@ -39,25 +39,43 @@ This is also an example on how to use the following file handlers:
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
 import json
 import os
 import sys
 import traceback
 import warnings
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any
 
 from PIL import Image, ImageDraw
 from ndspy.rom import NintendoDSRom
 
-from skytemple_files.common.ppmdu_config.script_data import Pmd2ScriptData
+from skytemple_files.common.ppmdu_config.data import Pmd2Data
+from skytemple_files.common.ppmdu_config.rom_data.loader import (
+    FILENAME_ACTOR_LIST,
+    FILENAME_LEVEL_LIST,
+    FILENAME_OBJECT_LIST,
+)
 from skytemple_files.common.script_util import load_script_files, SCRIPT_DIR
 from skytemple_files.common.types.file_types import FileType
 from skytemple_files.common.util import (
     get_binary_from_rom,
+    get_package_version,
     get_ppmdu_config_for_rom,
     get_rom_folder,
+    write_file_atomically,
 )
 from skytemple_files.container.bin_pack.model import BinPack
+from skytemple_files.container.dungeon_bin.model import DungeonBinPack
+from skytemple_files.data.sprconf.handler import SPRCONF_FILENAME
 from skytemple_files.data.md.protocol import MdProtocol
+from skytemple_files.graphics.bg_list_dat import BMA_EXT, BPA_EXT, BPC_EXT, BPL_EXT, DIR
+from skytemple_files.graphics.bg_list_dat.protocol import BgListEntryProtocol, BgListProtocol
 from skytemple_files.graphics.bma.protocol import BmaProtocol
 from skytemple_files.graphics.bpc import BPC_TILE_DIM
 from skytemple_files.graphics.dma.dma_drawer import DmaDrawer
@@ -66,6 +84,7 @@ from skytemple_files.graphics.dpc.protocol import DpcProtocol
 from skytemple_files.graphics.dpci.protocol import DpciProtocol
 from skytemple_files.graphics.dpl.protocol import DplProtocol
 from skytemple_files.graphics.dpla.protocol import DplaProtocol
+from skytemple_files.graphics.wan_wat.model import Wan
 from skytemple_files.hardcoded.dungeons import HardcodedDungeons
 from skytemple_files.hardcoded.ground_dungeon_tilesets import (
     HardcodedGroundDungeonTilesets,
@@ -81,60 +100,162 @@ COLOR_PERFORMER = (0, 255, 255, ALPHA_T)
 COLOR_EVENTS = (0, 0, 255, 100)
 BPC_TILE_DIM_H = int(BPC_TILE_DIM / 2)
 
+# Number of decoded sprites and rendered sprite frames kept per process, shared by all scenes.
+SPRITE_CACHE_SIZE = 256
+SPRITE_FRAME_CACHE_SIZE = 1024
+EXPORT_MANIFEST_NAME = "export_manifest.json"
+# Bump this if the exported files change for the same inputs.
+EXPORT_MANIFEST_VERSION = 1
+
+# State of the export, set up by init_export in the main process and in each worker process.
+loaded_rom_path: str | None = None
+rom: NintendoDSRom | None = None
+config: Pmd2Data | None = None
+bg_list: BgListProtocol | None = None
+dungeon_bin: DungeonBinPack | None = None
 monster_bin_pack_file: BinPack | None = None
 monster_md: MdProtocol | None = None
-map_bgs: dict[str, list[Image.Image]] = {}
-map_bg_durations: dict[str, int] = {}
 draw_invisible_actors_objects = False
 
 
-def draw_map_bgs(rom: NintendoDSRom, map_bg_dir):
-    global map_bgs, map_bg_durations
-    os.makedirs(map_bg_dir, exist_ok=True)
+@dataclass
+class ExportTask:
+    """
+    One independent part of the export. The function is called with the arguments in a worker
+    process and returns the paths of all files it wrote, relative to the export directory.
+    """
 
-    bin = rom.getFileByName("MAP_BG/bg_list.dat")
-    bg_list = FileType.BG_LIST_DAT.deserialize(bin)
+    key: str
+    func: Callable[..., list[str]]
+    args: tuple[Any, ...]
+    inputs_hash: str
 
-    count = len(bg_list.level)
-    for i, level in enumerate(bg_list.level):
+
+class ExportManifest:
+    """
+    Records for each task of an export the hash of its inputs and the files it wrote.
+    A task is skipped on the next export if its inputs haven't changed and all of its files still exist.
+    """
+
+    def __init__(self, export_dir: str):
+        self.export_dir = export_dir
+        self.path = os.path.join(export_dir, EXPORT_MANIFEST_NAME)
+        self.entries: dict[str, dict[str, Any]] = {}
         try:
-            bma = level.get_bma(rom)
-            print(f"{i + 1}/{count} - {level.bpl_name}")
-
-            bpas = level.get_bpas(rom)
-            non_none_bpas = [b for b in bpas if b is not None]
-            bpc = level.get_bpc(rom)
-            bpl = level.get_bpl(rom)
-
-            # Saving animated map!
-            bpa_duration = -1
-            pal_ani_duration = -1
-            if len(non_none_bpas) > 0:
-                bpa_duration = round(1000 / 60 * non_none_bpas[0].frame_info[0].duration_per_frame)
-            if bpl.has_palette_animation:
-                pal_ani_duration = round(1000 / 60 * max(spec.duration_per_frame for spec in bpl.animation_specs))
-            duration = max(bpa_duration, pal_ani_duration)
-            if duration == -1:
-                # Default for only one frame, doesn't really matter
-                duration = 1000
-            frames = bma.to_pil(
-                bpc,
-                bpl,
-                bpas,
-                include_collision=False,
-                include_unknown_data_block=False,
-            )
-            frames[0].save(
-                os.path.join(map_bg_dir, level.bpl_name + ".gif"),
-                save_all=True,
-                append_images=frames[1:],
-                duration=duration,
-                loop=0,
-                optimize=False,
-            )
-            frames[0].save(os.path.join(map_bg_dir, level.bpl_name + ".png"))
-            map_bgs[level.bpl_name] = frames
-            map_bg_durations[level.bpl_name] = duration
+            with open(self.path) as f:
+                manifest = json.load(f)
+            if manifest.get("version") == EXPORT_MANIFEST_VERSION:
+                self.entries = manifest["entries"]
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, AttributeError) as ex:
+            print(f"Ignoring invalid export manifest: {repr(ex)}", file=sys.stderr)
+
+    def is_up_to_date(self, task: ExportTask) -> bool:
+        entry = self.entries.get(task.key)
+        if entry is None or entry["inputs"] != task.inputs_hash:
+            return False
+        return all(os.path.exists(os.path.join(self.export_dir, output)) for output in entry["outputs"])
+
+    def record(self, task: ExportTask, outputs: list[str]):
+        self.entries[task.key] = {"inputs": task.inputs_hash, "outputs": outputs}
+        self.save()
+
+    def save(self):
+        # Write atomically, so an interrupted export leaves a valid manifest behind.
+        write_file_atomically(
+            self.path, json.dumps({"version": EXPORT_MANIFEST_VERSION, "entries": self.entries}, indent=1).encode()
+        )
+
+
+def init_export(rom_path: str, actor_mapping: dict[str, int] | None, opt_draw_invisible_actors_objects: bool):
+    """
+    Loads the ROM and the files shared by all tasks. This is the initializer of the worker processes.
+    Workers that were forked from the main process already have everything loaded.
+    """
+    global loaded_rom_path, rom, config, bg_list, dungeon_bin, monster_bin_pack_file, monster_md
+    global draw_invisible_actors_objects
+    draw_invisible_actors_objects = opt_draw_invisible_actors_objects
+    if loaded_rom_path == rom_path:
+        return
+
+    rom = NintendoDSRom.fromFile(rom_path)
+    config = get_ppmdu_config_for_rom(rom)
+    if actor_mapping:
+        for name, entid in actor_mapping.items():
+            config.script_data.level_entities__by_name[name].entid = entid
+
+    bg_list = FileType.BG_LIST_DAT.deserialize(rom.getFileByName("MAP_BG/bg_list.dat"))
+    dungeon_bin = None
+    load_sprite.cache_clear()
+    render_sprite_frame.cache_clear()
+    monster_bin_pack_file = FileType.BIN_PACK.deserialize(rom.getFileByName("MONSTER/monster.bin"))
+    monster_md = FileType.MD.deserialize(rom.getFileByName("BALANCE/monster.md"))
+    loaded_rom_path = rom_path
+
+
+def get_dungeon_bin() -> DungeonBinPack:
+    global dungeon_bin
+    if dungeon_bin is None:
+        dungeon_bin = FileType.DUNGEON_BIN.deserialize(rom.getFileByName("DUNGEON/dungeon.bin"), config, lazy=True)
+    return dungeon_bin
+
+
+def draw_map_bg(level: BgListEntryProtocol, map_bg_dir) -> tuple[list[Image.Image], int, list[str]]:
+    """Draws the map background of a level, returns the frames, the frame duration and the files written."""
+    bma = level.get_bma(rom)
+    bpas = level.get_bpas(rom)
+    non_none_bpas = [b for b in bpas if b is not None]
+    bpc = level.get_bpc(rom)
+    bpl = level.get_bpl(rom)
+
+    # Saving animated map!
+    bpa_duration = -1
+    pal_ani_duration = -1
+    if len(non_none_bpas) > 0:
+        bpa_duration = round(1000 / 60 * non_none_bpas[0].frame_info[0].duration_per_frame)
+    if bpl.has_palette_animation:
+        pal_ani_duration = round(1000 / 60 * max(spec.duration_per_frame for spec in bpl.animation_specs))
+    duration = max(bpa_duration, pal_ani_duration)
+    if duration == -1:
+        # Default for only one frame, doesn't really matter
+        duration = 1000
+    frames = bma.to_pil(
+        bpc,
+        bpl,
+        bpas,
+        include_collision=False,
+        include_unknown_data_block=False,
+    )
+    gif_name = os.path.join(map_bg_dir, level.bpl_name + ".gif")
+    png_name = os.path.join(map_bg_dir, level.bpl_name + ".png")
+    frames[0].save(
+        gif_name,
+        save_all=True,
+        append_images=frames[1:],
+        duration=duration,
+        loop=0,
+        optimize=False,
+    )
+    frames[0].save(png_name)
+    return frames, duration, [gif_name, png_name]
+
+
+def export_map(export_dir, map_name, level_ids: list[int], scenes: list[tuple[str, str]]) -> list[str]:
+    """
+    Exports the map backgrounds of the bg_list.dat levels with the BPL name map_name and all scenes
+    (scene name, path in the ROM) of the script map with that name. The scenes are drawn on the map
+    background of the last level.
+    """
+    map_bg_dir = os.path.join(export_dir, "MAP_BG")
+    os.makedirs(map_bg_dir, exist_ok=True)
+    outputs = []
+    map_bg = None
+    for level_id in level_ids:
+        level = bg_list.level[level_id]
+        try:
+            map_bg, duration, written = draw_map_bg(level, map_bg_dir)
+            outputs += written
         except (NotImplementedError, SystemError) as ex:
             print(f"error for {level.bma_name}: {repr(ex)}", file=sys.stderr)
             print(
@@ -142,11 +263,93 @@ def draw_map_bgs(rom: NintendoDSRom, map_bg_dir):
                 file=sys.stderr,
             )
 
-
-def draw_dungeon_map_bgs(rom, dungeon_map_bg_dir, config):
+    if len(scenes) > 0:
+        if map_bg is None:
+            print(f"error for {map_name}: No map background to draw the scenes on.", file=sys.stderr)
+        else:
+            for scene_name, file_name in scenes:
+                outputs += draw_scenes_for(
+                    os.path.join(export_dir, "MAP", map_name, scene_name),
+                    map_name,
+                    scene_name,
+                    file_name,
+                    map_bg,
+                    duration,
+                )
+    return [os.path.relpath(output, export_dir) for output in outputs]
+
+
+def export_dungeon_map_bg(export_dir, level_name, tileset_id, map_id) -> list[str]:
+    """Exports the map background of a level that is rendered with a dungeon tileset."""
+    dungeon_map_bg_dir = os.path.join(export_dir, "MAP_BG_DUNGEON_TILESET")
     os.makedirs(dungeon_map_bg_dir, exist_ok=True)
-    dungeon_bin = FileType.DUNGEON_BIN.deserialize(rom.getFileByName("DUNGEON/dungeon.bin"), config)
+    tilesets = get_dungeon_bin()
+    dma: DmaProtocol = tilesets.get(f"dungeon{tileset_id}.dma")
+    dpl: DplProtocol = tilesets.get(f"dungeon{tileset_id}.dpl")
+    dpla: DplaProtocol = tilesets.get(f"dungeon{tileset_id}.dpla")
+    dpci: DpciProtocol = tilesets.get(f"dungeon{tileset_id}.dpci")
+    dpc: DpcProtocol = tilesets.get(f"dungeon{tileset_id}.dpc")
+
+    bma: BmaProtocol = bg_list.level[map_id].get_bma(rom)
+
+    duration = round(1000 / 60 * max(16, min(dpla.durations_per_frame_for_colors)))
+
+    drawer = DmaDrawer(dma)
+    rules = drawer.rules_from_bma(bma)
+    mappings = drawer.get_mappings_for_rules(rules, treat_outside_as_wall=True, variation_index=0)
+    frames = drawer.draw(mappings, dpci, dpc, dpl, dpla)
+    gif_name = os.path.join(dungeon_map_bg_dir, level_name + ".gif")
+    png_name = os.path.join(dungeon_map_bg_dir, level_name + ".png")
+    frames[0].save(
+        gif_name,
+        save_all=True,
+        append_images=frames[1:],
+        duration=duration,
+        loop=0,
+        optimize=False,
+    )
+    frames[0].save(png_name)
+    return [os.path.relpath(gif_name, export_dir), os.path.relpath(png_name, export_dir)]
+
+
+def plan_map_tasks(export_dir, common_inputs_hash: str) -> list[ExportTask]:
+    """Returns one task per map background name, which also draws the scenes of the script map with that name."""
+    level_ids_by_name: dict[str, list[int]] = {}
+    for i, level in enumerate(bg_list.level):
+        level_ids_by_name.setdefault(level.bpl_name, []).append(i)
 
+    script_info = load_script_files(get_rom_folder(rom, SCRIPT_DIR))
+    scenes_by_name: dict[str, list[tuple[str, str]]] = {}
+    for script_map in script_info["maps"].values():
+        scene_names = []
+        if script_map["enter_sse"] is not None:
+            scene_names.append(script_map["enter_sse"])
+        scene_names += [ssa for ssa, _ in script_map["ssas"]]
+        scene_names += list(script_map["subscripts"].keys())
+        scenes_by_name[script_map["name"]] = [
+            (scene_name, SCRIPT_DIR + "/" + script_map["name"] + "/" + scene_name) for scene_name in scene_names
+        ]
+        if script_map["name"] not in level_ids_by_name and len(scene_names) > 0:
+            print(f"error for {script_map['name']}: No map background to draw the scenes on.", file=sys.stderr)
+
+    tasks = []
+    for map_name, level_ids in level_ids_by_name.items():
+        scenes = scenes_by_name.get(map_name, [])
+        h = hashlib.sha256(common_inputs_hash.encode())
+        for level_id in level_ids:
+            level = bg_list.level[level_id]
+            file_names = [level.bma_name + BMA_EXT, level.bpc_name + BPC_EXT, level.bpl_name + BPL_EXT]
+            file_names += [bpa_name + BPA_EXT for bpa_name in level.bpa_names if bpa_name is not None]
+            _hash_rom_files(h, [f"{DIR}/{file_name.lower()}" for file_name in file_names])
+        _hash_rom_files(h, [file_name for _, file_name in scenes])
+        tasks.append(
+            ExportTask(f"MAP/{map_name}", export_map, (export_dir, map_name, level_ids, scenes), h.hexdigest())
+        )
+    return tasks
+
+
+def plan_dungeon_map_bg_tasks(export_dir, config_inputs_hash: str) -> list[ExportTask]:
+    """Returns one task per level that is rendered with a dungeon tileset (rest rooms, boss rooms, ...)."""
     ground_dungeon_tilesets = HardcodedGroundDungeonTilesets.get_ground_dungeon_tilesets(
         get_binary_from_rom(rom, config.bin_sections.overlay11),
         config,
@@ -156,15 +359,11 @@ def draw_dungeon_map_bgs(rom, dungeon_map_bg_dir, config):
 
     levels_by_id = config.script_data.level_list__by_id
 
-    bg_list_bin = rom.getFileByName("MAP_BG/bg_list.dat")
-    bg_list = FileType.BG_LIST_DAT.deserialize(bg_list_bin)
-
-    for i, entry in enumerate(ground_dungeon_tilesets):
+    tasks = []
+    for entry in ground_dungeon_tilesets:
         if entry.ground_level >= 0xFFFF:
             continue
         level = levels_by_id[entry.ground_level]
-        print(f"{i + 1}/{len(ground_dungeon_tilesets) - 1} - {level.name}")
-        print(entry)
 
         mappa_idx = dungeons[entry.dungeon_id].mappa_index
         start_offset = dungeons[entry.dungeon_id].start_after
@@ -180,86 +379,145 @@ def draw_dungeon_map_bgs(rom, dungeon_map_bg_dir, config):
             raise ValueError("Unknown unk2")
         if tileset_id == 170:
             tileset_id = 1
-        dma: DmaProtocol = dungeon_bin.get(f"dungeon{tileset_id}.dma")
-        dpl: DplProtocol = dungeon_bin.get(f"dungeon{tileset_id}.dpl")
-        dpla: DplaProtocol = dungeon_bin.get(f"dungeon{tileset_id}.dpla")
-        dpci: DpciProtocol = dungeon_bin.get(f"dungeon{tileset_id}.dpci")
-        dpc: DpcProtocol = dungeon_bin.get(f"dungeon{tileset_id}.dpc")
-
-        bma: BmaProtocol = bg_list.level[level.mapid].get_bma(rom)
-
-        duration = round(1000 / 60 * max(16, min(dpla.durations_per_frame_for_colors)))
-
-        drawer = DmaDrawer(dma)
-        rules = drawer.rules_from_bma(bma)
-        mappings = drawer.get_mappings_for_rules(rules, treat_outside_as_wall=True, variation_index=0)
-        frames = drawer.draw(mappings, dpci, dpc, dpl, dpla)
-        frames[0].save(
-            os.path.join(dungeon_map_bg_dir, level.name + ".gif"),
-            save_all=True,
-            append_images=frames[1:],
-            duration=duration,
-            loop=0,
-            optimize=False,
+
+        h = hashlib.sha256(config_inputs_hash.encode())
+        for ext in ("dma", "dpl", "dpla", "dpci", "dpc"):
+            h.update(get_dungeon_bin().get_raw(f"dungeon{tileset_id}.{ext}"))
+        _hash_rom_files(h, [f"{DIR}/{bg_list.level[level.mapid].bma_name.lower()}{BMA_EXT}"])
+        tasks.append(
+            ExportTask(
+                f"MAP_BG_DUNGEON_TILESET/{level.name}",
+                export_dungeon_map_bg,
+                (export_dir, level.name, tileset_id, level.mapid),
+                h.hexdigest(),
+            )
         )
-        frames[0].save(os.path.join(dungeon_map_bg_dir, level.name + ".png"))
+    return tasks
+
+
+def hash_config_inputs() -> str:
+    """
+    Hashes the inputs used by all tasks: The binaries with the hardcoded tables and the ROM files
+    the configuration is loaded from, so patching the ROM re-exports everything.
+    """
+    h = hashlib.sha256(f"{EXPORT_MANIFEST_VERSION}:{get_package_version()}".encode())
+    h.update(rom.arm9)
+    h.update(get_binary_from_rom(rom, config.bin_sections.overlay11))
+    file_names = [
+        FILENAME_ACTOR_LIST,
+        FILENAME_LEVEL_LIST,
+        FILENAME_OBJECT_LIST,
+        "BALANCE/item_p.bin",
+        "BALANCE/mappa_s.bin",
+        SPRCONF_FILENAME,
+    ]
+    _hash_rom_files(h, [file_name for file_name in file_names if file_name in rom.filenames])
+    return h.hexdigest()
+
+
+def hash_common_inputs(config_inputs_hash: str, actor_mapping: dict[str, int] | None) -> str:
+    """Hashes the inputs used by all scenes: The configuration, options, actor and object sprites."""
+    h = hashlib.sha256(f"{config_inputs_hash}:{draw_invisible_actors_objects}".encode())
+    h.update(json.dumps(actor_mapping, sort_keys=True).encode())
+    _hash_rom_files(h, ["BALANCE/monster.md", "MONSTER/monster.bin"])
+    ground = get_rom_folder(rom, "GROUND")
+    if ground is not None:
+        _hash_rom_files(h, [f"GROUND/{name}" for name in ground.files if name.endswith(".wan")])
+    return h.hexdigest()
+
+
+def run_tasks(
+    tasks: list[ExportTask], manifest: ExportManifest | None, jobs: int, init_args: tuple[Any, ...]
+) -> Counter[str]:
+    """
+    Runs all tasks that are not up to date, in a pool of jobs worker processes if jobs > 1.
+    Returns the sprite cache statistics of all tasks run.
+    """
+    if manifest is not None:
+        pending = [task for task in tasks if not manifest.is_up_to_date(task)]
+        if len(pending) < len(tasks):
+            print(f"Skipping {len(tasks) - len(pending)} unchanged.")
+    else:
+        pending = tasks
+    stats: Counter[str] = Counter()
+
+    def done(i, task, result):
+        outputs, task_stats = result
+        print(f"{i + 1}/{len(pending)} - {task.key}")
+        stats.update(task_stats)
+        if manifest is not None:
+            manifest.record(task, outputs)
+
+    if jobs <= 1:
+        for i, task in enumerate(pending):
+            done(i, task, _run_task(task))
+        return stats
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_export, initargs=init_args) as executor:
+        futures = {executor.submit(_run_task, task): task for task in pending}
+        for i, future in enumerate(as_completed(futures)):
+            done(i, futures[future], future.result())
+    return stats
+
+
+@functools.lru_cache(maxsize=SPRITE_CACHE_SIZE)
+def load_sprite(kind: str, key: int | str) -> Wan:
+    """
+    Decodes the sprite of an actor (kind "actor", the key is the sprite index) or object (kind "object",
+    the key is the object name).
+    """
+    if kind == "actor":
+        return FileType.WAN.deserialize(FileType.COMMON_AT.deserialize(monster_bin_pack_file[key]).decompress())
+    return FileType.WAN.deserialize(rom.getFileByName(f"GROUND/{key}.wan"))
+
+
+@functools.lru_cache(maxsize=SPRITE_FRAME_CACHE_SIZE)
+def render_sprite_frame(kind: str, key: int | str, mfg_id: int) -> tuple[Image.Image, tuple[int, int]]:
+    """Renders a frame of a sprite loaded with load_sprite. The returned image must not be modified."""
+    sprite = load_sprite(kind, key)
+    return sprite.render_frame(sprite.frames[mfg_id])
+
+
+def sprite_cache_stats() -> Counter[str]:
+    """Returns the hits and misses of the sprite caches of this process."""
+    sprites = load_sprite.cache_info()
+    frames = render_sprite_frame.cache_info()
+    return Counter(
+        sprite_hits=sprites.hits,
+        sprite_misses=sprites.misses,
+        frame_hits=frames.hits,
+        frame_misses=frames.misses,
+    )
 
 
-def draw_maps(rom: NintendoDSRom, map_dir, scriptdata: Pmd2ScriptData):
-    script_info = load_script_files(get_rom_folder(rom, SCRIPT_DIR))
-    count = len(script_info["maps"])
-    for i, script_map in enumerate(script_info["maps"].values()):
-        if script_map["enter_sse"] is not None:
-            draw_scenes_for(
-                rom,
-                i,
-                count,
-                os.path.join(map_dir, script_map["name"], script_map["enter_sse"]),
-                script_map["name"],
-                script_map["enter_sse"],
-                SCRIPT_DIR + "/" + script_map["name"] + "/" + script_map["enter_sse"],
-                scriptdata,
-            )
-        for ssa, _ in script_map["ssas"]:
-            draw_scenes_for(
-                rom,
-                i,
-                count,
-                os.path.join(map_dir, script_map["name"], ssa),
-                script_map["name"],
-                ssa,
-                SCRIPT_DIR + "/" + script_map["name"] + "/" + ssa,
-                scriptdata,
-            )
-        for sss in script_map["subscripts"].keys():
-            draw_scenes_for(
-                rom,
-                i,
-                count,
-                os.path.join(map_dir, script_map["name"], sss),
-                script_map["name"],
-                sss,
-                SCRIPT_DIR + "/" + script_map["name"] + "/" + sss,
-                scriptdata,
-            )
+def _run_task(task: ExportTask) -> tuple[list[str], Counter[str]]:
+    stats_before = sprite_cache_stats()
+    outputs = task.func(*task.args)
+    return outputs, sprite_cache_stats() - stats_before
+
 
+def _hash_rom_files(h, file_names: list[str]):
+    for file_name in file_names:
+        h.update(file_name.encode())
+        h.update(rom.getFileByName(file_name))
 
-def draw_scene_for__objects(rom: NintendoDSRom, file_name, dim_w, dim_h, layer: SsaLayer) -> Image.Image:
+
+def draw_scene_for__objects(file_name, dim_w, dim_h, layer: SsaLayer, outputs: list[str]) -> Image.Image:
     img = Image.new("RGBA", (dim_w, dim_h), (255, 0, 0, 0))
     draw = ImageDraw.Draw(img, "RGBA")
     has_written_something = False
     # Objects
     for i, object in enumerate(layer.objects):
         has_written_something = True
-        draw_object(img, draw, object, rom)
+        draw_object(img, draw, object)
 
     if has_written_something:
         img.save(file_name)
+        outputs.append(file_name)
 
     return img
 
 
-def draw_scene_for__actors(rom: NintendoDSRom, file_name, dim_w, dim_h, layer: SsaLayer) -> Image.Image:
+def draw_scene_for__actors(file_name, dim_w, dim_h, layer: SsaLayer, outputs: list[str]) -> Image.Image:
     img = Image.new("RGBA", (dim_w, dim_h), (255, 0, 0, 0))
     draw = ImageDraw.Draw(img, "RGBA")
     has_written_something = False
@@ -270,11 +528,12 @@ def draw_scene_for__actors(rom: NintendoDSRom, file_name, dim_w, dim_h, layer: S
 
     if has_written_something:
         img.save(file_name)
+        outputs.append(file_name)
 
     return img
 
 
-def draw_scene_for__rest(rom: NintendoDSRom, file_name, dim_w, dim_h, layer: SsaLayer) -> Image.Image:
+def draw_scene_for__rest(file_name, dim_w, dim_h, layer: SsaLayer, outputs: list[str]) -> Image.Image:
     img = Image.new("RGBA", (dim_w, dim_h), (255, 0, 0, 0))
     draw = ImageDraw.Draw(img, "RGBA")
     has_written_something = False
@@ -305,6 +564,7 @@ def draw_scene_for__rest(rom: NintendoDSRom, file_name, dim_w, dim_h, layer: Ssa
 
     if has_written_something:
         img.save(file_name)
+        outputs.append(file_name)
 
     return img
 
@@ -325,9 +585,7 @@ def draw_actor(img: Image.Image, draw, actor: SsaActor):
     actor_sprite_id = monster_md[actor.actor.entid].sprite_index  # type: ignore
 
     try:
-        sprite = FileType.WAN.deserialize(
-            FileType.COMMON_AT.deserialize(monster_bin_pack_file[actor_sprite_id]).decompress()  # type: ignore
-        )
+        sprite = load_sprite("actor", actor_sprite_id)
         ani_group = sprite.anim_groups[0]
     except (ValueError, TypeError) as e:
         warnings.warn(f"Failed to render a sprite, replaced with placeholder ({actor}, {actor_sprite_id}): {e}")
@@ -344,13 +602,13 @@ def draw_actor(img: Image.Image, draw, actor: SsaActor):
     frame_id = actor.pos.direction.id - 1 if actor.pos.direction.id > 0 else 0  # type: ignore
     mfg_id = ani_group[frame_id].frames[0].frame_id
 
-    sprite_img, (cx, cy) = sprite.render_frame(sprite.frames[mfg_id])
+    sprite_img, (cx, cy) = render_sprite_frame("actor", actor_sprite_id, mfg_id)
     render_x = actor.pos.x_absolute - cx
     render_y = actor.pos.y_absolute - cy
     img.paste(sprite_img, (render_x, render_y), sprite_img)
 
 
-def draw_object(img: Image.Image, draw, obj: SsaObject, rom: NintendoDSRom):
+def draw_object(img: Image.Image, draw, obj: SsaObject):
     """Draws the sprite for an object"""
     if obj.object.name == "NULL":
         if draw_invisible_actors_objects:
@@ -372,7 +630,7 @@ def draw_object(img: Image.Image, draw, obj: SsaObject, rom: NintendoDSRom):
         return
 
     try:
-        sprite = FileType.WAN.deserialize(rom.getFileByName(f"GROUND/{obj.object.name}.wan"))
+        sprite = load_sprite("object", obj.object.name)
         ani_group = sprite.anim_groups[0]
     except (ValueError, TypeError) as e:
         warnings.warn(f"Failed to render a sprite, replaced with placeholder ({obj}): {e}")
@@ -391,7 +649,7 @@ def draw_object(img: Image.Image, draw, obj: SsaObject, rom: NintendoDSRom):
         frame_id = 0
     mfg_id = ani_group[frame_id].frames[0].frame_id
 
-    sprite_img, (cx, cy) = sprite.render_frame(sprite.frames[mfg_id])
+    sprite_img, (cx, cy) = render_sprite_frame("object", obj.object.name, mfg_id)
     render_x = obj.pos.x_absolute - cx
     render_y = obj.pos.y_absolute - cy
     img.paste(sprite_img, (render_x, render_y), sprite_img)
@@ -422,40 +680,43 @@ def draw_scene__merged(
     )
 
 
-def draw_scenes_for(rom, i, count, dir_name, map_name, scene_name, file_name, scriptdata: Pmd2ScriptData):
+def draw_scenes_for(dir_name, map_name, scene_name, file_name, map_bg: list[Image.Image], duration) -> list[str]:
+    """Draws the layers of a scene and the merged scene, returns the files written."""
     os.makedirs(os.path.join(dir_name, "ACTORS"), exist_ok=True)
     os.makedirs(os.path.join(dir_name, "OBJECTS"), exist_ok=True)
     os.makedirs(os.path.join(dir_name, "PERF_TRIGGER"), exist_ok=True)
-    print(f"{i + 1}/{count} - {map_name} - {scene_name}")
-    ssa = FileType.SSA.deserialize(rom.getFileByName(file_name), scriptdata=scriptdata)
+    ssa = FileType.SSA.deserialize(rom.getFileByName(file_name), scriptdata=config.script_data)
 
-    map_bg = map_bgs[map_name]
     dim_w, dim_h = map_bg[0].width, map_bg[0].height
 
+    outputs: list[str] = []
     imgs = []
     for layer_id, layer in enumerate(ssa.layer_list):
         # OBJECTS
         # -> .png
         png_name_actobjs = os.path.join(dir_name, "OBJECTS", f"layer_{layer_id}.png")
-        imgs.append(draw_scene_for__objects(rom, png_name_actobjs, dim_w, dim_h, layer))
+        imgs.append(draw_scene_for__objects(png_name_actobjs, dim_w, dim_h, layer, outputs))
         # ACTORS_
         # -> .png
         png_name_actobjs = os.path.join(dir_name, "ACTORS", f"layer_{layer_id}.png")
-        imgs.append(draw_scene_for__actors(rom, png_name_actobjs, dim_w, dim_h, layer))
+        imgs.append(draw_scene_for__actors(png_name_actobjs, dim_w, dim_h, layer, outputs))
         # PERF_TRIGGER
         # -> .png
         png_name_perftrgs = os.path.join(dir_name, "PERF_TRIGGER", f"layer_{layer_id}.png")
-        imgs.append(draw_scene_for__rest(rom, png_name_perftrgs, dim_w, dim_h, layer))
+        imgs.append(draw_scene_for__rest(png_name_perftrgs, dim_w, dim_h, layer, outputs))
 
     # {map_name}_{scene_name}_all_merged.webp
+    merged_name = os.path.join(dir_name, f"{map_name}_{scene_name}_all_merged.webp")
     draw_scene__merged(
         map_bg,
-        map_bg_durations[map_name],
+        duration,
         imgs,
-        os.path.join(dir_name, f"{map_name}_{scene_name}_all_merged.webp"),
+        merged_name,
         dim_w,
         dim_h,
     )
+    outputs.append(merged_name)
+    return outputs
 
 
 def triangle(draw, x, y, fill, direction):
@@ -534,33 +795,30 @@ def run_main(
     export_dir,
     actor_mapping_path=None,
     opt_draw_invisible_actors_objects=True,
+    jobs=1,
+    force=False,
 ):
-    global monster_bin_pack_file, monster_md, draw_invisible_actors_objects, ground_dungeon_tilesets
-    draw_invisible_actors_objects = opt_draw_invisible_actors_objects
-
     print("Loading ROM and core files...")
     os.makedirs(export_dir, exist_ok=True)
-    rom = NintendoDSRom.fromFile(rom_path)
-    config = get_ppmdu_config_for_rom(rom)
-
-    scriptdata = config.script_data
+    actor_mapping = None
     if actor_mapping_path:
         with open(actor_mapping_path) as f:
             actor_mapping = json.load(f)
-            for name, entid in actor_mapping.items():
-                scriptdata.level_entities__by_name[name].entid = entid
-
-    monster_bin_pack_file = FileType.BIN_PACK.deserialize(rom.getFileByName("MONSTER/monster.bin"))
-    monster_md = FileType.MD.deserialize(rom.getFileByName("BALANCE/monster.md"))
-
-    map_bg_dir = os.path.join(export_dir, "MAP_BG")
-    dungeon_map_bg_dir = os.path.join(export_dir, "MAP_BG_DUNGEON_TILESET")
-    print("-- DRAWING BACKGROUNDS --")
-    draw_map_bgs(rom, map_bg_dir)
+    init_args = (rom_path, actor_mapping, opt_draw_invisible_actors_objects)
+    init_export(*init_args)
+    manifest = None if force else ExportManifest(export_dir)
+
+    print("-- DRAWING BACKGROUNDS AND MAP ENTITIES --")
+    config_inputs_hash = hash_config_inputs()
+    stats = run_tasks(
+        plan_map_tasks(export_dir, hash_common_inputs(config_inputs_hash, actor_mapping)), manifest, jobs, init_args
+    )
     print("-- DRAWING REST ROOM AND BOSS ROOM BACKGROUNDS --")
-    draw_dungeon_map_bgs(rom, dungeon_map_bg_dir, config)
-    print("-- DRAWING MAP ENTITIES --")
-    draw_maps(rom, os.path.join(export_dir, "MAP"), scriptdata)
+    run_tasks(plan_dungeon_map_bg_tasks(export_dir, config_inputs_hash), manifest, jobs, init_args)
+    print(
+        f"Sprite cache: {stats['sprite_hits']} hits, {stats['sprite_misses']} misses. "
+        f"Sprite frame cache: {stats['frame_hits']} hits, {stats['frame_misses']} misses."
+    )
 
 
 def main():
@@ -570,8 +828,9 @@ def main():
 
     The maps are exported into the directory EXPORT_DIR. If the directory doesn't exist, it's created.
 
-    Please note, that the script keeps the map bgs in memory to draw the merged maps, this requires up
-    to 2GB of RAM.
+    Maps are exported in parallel with --jobs. A manifest (export_manifest.json) records the inputs of
+    everything exported, when exporting into the same directory again, maps whose inputs haven't changed
+    are skipped. Use --force to export everything again.
 
     The export directory will contain the following subdirs:
     - MAP_BG                 - Map backgrounds of all maps in the game, as static PNG files and animated GIF files.
@@ -614,10 +873,29 @@ def main():
         default=False,
         help="If set, hide invisible actors and objects.",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        metavar="N",
+        type=int,
+        required=False,
+        default=1,
+        help="Number of processes to export with.",
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        dest="force",
+        action="store_true",
+        required=False,
+        default=False,
+        help="If set, export everything, even if it is unchanged since the last export.",
+    )
 
     args = parser.parse_args()
 
-    run_main(args.rom_path, args.export_dir, args.actor_maping, not args.hide_invisble)
+    run_main(args.rom_path, args.export_dir, args.actor_maping, not args.hide_invisble, args.jobs, args.force)
 
 
 if __name__ == "__main__":
@@ -21,20 +21,19 @@ import itertools
 import math
 from collections.abc import Sequence
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 from range_typed_integers import u16
 
 from skytemple_files.common.i18n_util import _, f
 from skytemple_files.common.protocol import TilemapEntryProtocol
-from skytemple_files.common.tiled_image import from_pil, search_for_chunk
+from skytemple_files.common.tiled_image import ChunkIndex, from_pil
 from skytemple_files.common.util import (
     read_u8,
     read_u16,
     iter_bytes,
-    lcm,
 )
-from skytemple_files.graphics.bma import MASK_PAL
 from skytemple_files.graphics.bma.protocol import BmaProtocol
+from skytemple_files.graphics.bma.renderer import BmaAnimationRenderer
 
 # noinspection PyProtectedMember
 from skytemple_files.graphics.bpa._model import Bpa
@@ -310,151 +309,21 @@ class Bma(BmaProtocol[Bpa, Bpc, Bpl]):
         The list of bpas must be the one contained in the bg_list. It needs to contain 8 slots, with empty
         slots being None.
 
-        TODO: The speed can be increased if we only re-render the changed animated tiles instead!
+        To render the frames one at a time, and to get their durations, use
+        skytemple_files.graphics.bma.renderer.BmaAnimationRenderer instead.
         """
-
-        chunk_width = BPC_TILE_DIM * self.tiling_width
-        chunk_height = BPC_TILE_DIM * self.tiling_height
-
-        width_map = self.map_width_chunks * chunk_width
-        height_map = self.map_height_chunks * chunk_height
-
-        final_images = []
-        lower_layer_bpc = 0 if bpc.number_of_layers == 1 else 1
-        chunks_lower = bpc.chunks_animated_to_pil(lower_layer_bpc, bpl.palettes, bpas, 1)
-        for img in chunks_lower:
-            fimg = Image.new("P", (width_map, height_map))
-            fimg.putpalette(img.getpalette())  # type: ignore
-
-            # yes. self.layer0 is always the LOWER layer! It's the opposite from BPC
-            for i, mt_idx in enumerate(self.layer0):
-                x = i % self.map_width_chunks
-                y = math.floor(i / self.map_width_chunks)
-                fimg.paste(
-                    img.crop(
-                        (
-                            0,
-                            mt_idx * chunk_width,
-                            chunk_width,
-                            mt_idx * chunk_width + chunk_height,
-                        )
-                    ),
-                    (x * chunk_width, y * chunk_height),
-                )
-
-            final_images.append(fimg)
-            if single_frame:
-                break
-
-        if bpc.number_of_layers > 1:
-            # Overlay higher layer tiles
-            chunks_higher = bpc.chunks_animated_to_pil(0, bpl.palettes, bpas, 1)
-            len_lower = len(chunks_lower)
-            len_higher = len(chunks_higher)
-            if len_higher != len_lower and not single_frame:
-                # oh fun! We are missing animations for one of the layers, let's stretch to the lowest common multiple
-                lm = lcm(len_higher, len_lower)
-                for i in range(len_lower, lm):
-                    final_images.append(final_images[i % len_lower].copy())
-                for i in range(len_higher, lm):
-                    chunks_higher.append(chunks_higher[i % len_higher].copy())
-
-            for j, img in enumerate(chunks_higher):
-                fimg = final_images[j]
-                assert self.layer1 is not None
-                for i, mt_idx in enumerate(self.layer1):
-                    x = i % self.map_width_chunks
-                    y = math.floor(i / self.map_width_chunks)
-
-                    cropped_img = img.crop(
-                        (
-                            0,
-                            mt_idx * chunk_width,
-                            chunk_width,
-                            mt_idx * chunk_width + chunk_height,
-                        )
-                    )
-                    cropped_img_mask = cropped_img.copy()
-                    cropped_img_mask.putpalette(MASK_PAL)
-                    fimg.paste(
-                        cropped_img,
-                        (x * chunk_width, y * chunk_height),
-                        mask=cropped_img_mask.convert("1"),
-                    )
-                if single_frame:
-                    break
-
-        final_images_were_rgb_converted = False
-        if include_collision and self.number_of_collision_layers > 0:
-            for i, img in enumerate(final_images):
-                final_images_were_rgb_converted = True
-                # time for some RGB action!
-                final_images[i] = img.convert("RGB")
-                img = final_images[i]
-                draw = ImageDraw.Draw(img, "RGBA")
-                assert self.collision is not None
-                for j, col in enumerate(self.collision):
-                    x = j % self.map_width_camera
-                    y = math.floor(j / self.map_width_camera)
-                    if col:
-                        draw.rectangle(
-                            (
-                                (x * BPC_TILE_DIM, y * BPC_TILE_DIM),
-                                ((x + 1) * BPC_TILE_DIM, (y + 1) * BPC_TILE_DIM),
-                            ),
-                            fill=(0xFF, 0x00, 0x00, 0x40),
-                        )
-                # Second collision layer
-                if self.number_of_collision_layers > 1:
-                    assert self.collision2 is not None
-                    for j, col in enumerate(self.collision2):
-                        x = j % self.map_width_camera
-                        y = math.floor(j / self.map_width_camera)
-                        if col:
-                            draw.ellipse(
-                                (
-                                    (x * BPC_TILE_DIM, y * BPC_TILE_DIM),
-                                    ((x + 1) * BPC_TILE_DIM, (y + 1) * BPC_TILE_DIM),
-                                ),
-                                fill=(0x00, 0x00, 0xFF, 0x40),
-                            )
-
-        if include_unknown_data_block and self.unk6 > 0:
-            fnt = ImageFont.load_default()
-            for i, img in enumerate(final_images):
-                if not final_images_were_rgb_converted:
-                    final_images[i] = img.convert("RGB")
-                    img = final_images[i]
-                draw = ImageDraw.Draw(img, "RGBA")
-                assert self.unknown_data_block is not None
-                for j, unk in enumerate(self.unknown_data_block):
-                    x = j % self.map_width_camera
-                    y = math.floor(j / self.map_width_camera)
-                    if unk > 0:
-                        draw.text(
-                            (x * BPC_TILE_DIM, y * BPC_TILE_DIM),
-                            str(unk),
-                            font=fnt,
-                            fill=(0x00, 0xFF, 0x00),
-                        )
-
-        # Apply palette animations
-        if pal_ani and bpl.has_palette_animation and len(bpl.animation_palette) > 0 and not single_frame:
-            old_images = final_images
-            old_images_i = 0
-            final_images = []
-
-            for ppal_ani in range(0, len(bpl.animation_palette)):
-                current_img = old_images[old_images_i].copy()
-                # Switch out the palette with that from the palette animation
-                pal_for_frame = itertools.chain.from_iterable(bpl.apply_palette_animations(ppal_ani))
-                current_img.putpalette(pal_for_frame)
-                final_images.append(current_img)
-                old_images_i += 1
-                if old_images_i >= len(old_images):
-                    old_images_i = 0
-
-        return final_images
+        return list(
+            BmaAnimationRenderer(
+                self,
+                bpc,
+                bpl,
+                bpas,
+                include_collision=include_collision,
+                include_unknown_data_block=include_unknown_data_block,
+                pal_ani=pal_ani,
+                single_frame=single_frame,
+            ).frames()
+        )
 
     def from_pil(
         self,
@@ -563,6 +432,7 @@ class Bma(BmaProtocol[Bpa, Bpc, Bpl]):
             chunk_mappings = []
             chunk_mappings_counter = 1
             tile_mappings: list[TilemapEntryProtocol] = []
+            chunk_index = ChunkIndex()
             tiles_in_chunk = self.tiling_width * self.tiling_height
             for chk_fst_tile_idx in range(
                 0,
@@ -570,10 +440,11 @@ class Bma(BmaProtocol[Bpa, Bpc, Bpl]):
                 tiles_in_chunk,
             ):
                 chunk = all_possible_tile_mappings[chk_fst_tile_idx : chk_fst_tile_idx + tiles_in_chunk]
-                start_of_existing_chunk = search_for_chunk(chunk, tile_mappings)
+                start_of_existing_chunk = chunk_index.find(chunk)
                 if start_of_existing_chunk is not None:
                     chunk_mappings.append(int(start_of_existing_chunk / tiles_in_chunk) + 1)
                 else:
+                    chunk_index.add(chunk)
                     tile_mappings += chunk
                     chunk_mappings.append(chunk_mappings_counter)
                     chunk_mappings_counter += 1
@@ -0,0 +1,297 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import itertools
+from collections.abc import Iterator, Sequence
+
+from PIL import Image, ImageDraw, ImageFont
+
+from skytemple_files.common.util import lcm
+from skytemple_files.graphics.bma import MASK_PAL
+from skytemple_files.graphics.bma.protocol import BmaProtocol
+from skytemple_files.graphics.bpa.protocol import BpaProtocol
+from skytemple_files.graphics.bpc import BPC_TILE_DIM
+from skytemple_files.graphics.bpc.protocol import BpcProtocol
+from skytemple_files.graphics.bpl.protocol import BplProtocol
+
+
+class _LayerFrames:
+    """The chunk images of one BMA layer, for all frames of the BPA animation of its BPC layer."""
+
+    def __init__(
+        self,
+        bpc: BpcProtocol,
+        bpc_layer: int,
+        palettes: Sequence[Sequence[int]],
+        bpas: Sequence[BpaProtocol | None],
+        bma_layer: Sequence[int],
+        chunk_width: int,
+        chunk_height: int,
+        single_frame: bool,
+    ):
+        atlases = bpc.chunks_animated_to_pil(bpc_layer, palettes, bpas, 1)
+        if single_frame:
+            atlases = atlases[:1]
+        self.number_of_frames = len(atlases)
+        self.palette: list[int] = atlases[0].getpalette()  # type: ignore
+
+        # frames[0] contains all chunks placed on the map, the other frames only the chunks that differ from it.
+        first = atlases[0]
+        self.frames: list[dict[int, Image.Image]] = [
+            {idx: first.crop(self._box(idx, chunk_width, chunk_height)) for idx in set(bma_layer)}
+        ]
+        first_data = {idx: chunk.tobytes() for idx, chunk in self.frames[0].items()}
+        self.animated_chunks: set[int] = set()
+        for atlas in atlases[1:]:
+            frame = {}
+            for idx, data in first_data.items():
+                chunk = atlas.crop(self._box(idx, chunk_width, chunk_height))
+                if chunk.tobytes() != data:
+                    frame[idx] = chunk
+                    self.animated_chunks.add(idx)
+            self.frames.append(frame)
+        self._masks: dict[tuple[int, int], Image.Image] = {}
+
+    @staticmethod
+    def _box(chunk_idx: int, chunk_width: int, chunk_height: int) -> tuple[int, int, int, int]:
+        return 0, chunk_idx * chunk_height, chunk_width, (chunk_idx + 1) * chunk_height
+
+    def chunk(self, frame: int, chunk_idx: int) -> Image.Image:
+        if chunk_idx in self.frames[frame]:
+            return self.frames[frame][chunk_idx]
+        return self.frames[0][chunk_idx]
+
+    def mask(self, frame: int, chunk_idx: int) -> Image.Image:
+        """Returns the mask for pasting the chunk over another layer. Palette index 0 is transparent."""
+        if chunk_idx not in self.frames[frame]:
+            frame = 0
+        key = (frame, chunk_idx)
+        if key not in self._masks:
+            mask = self.chunk(frame, chunk_idx).copy()
+            mask.putpalette(MASK_PAL)
+            self._masks[key] = mask.convert("1")
+        return self._masks[key]
+
+
+class BmaAnimationRenderer:
+    """
+    Renders the frames of a map, as returned by Bma.to_pil, one at a time.
+
+    The map is composed from all chunks once. For the following frames only the chunks containing
+    BPA tiles are drawn again. Palette animations only switch out the palette of the frames.
+
+    The list of bpas must be the one contained in the bg_list. It needs to contain 8 slots, with empty
+    slots being None.
+    """
+
+    def __init__(
+        self,
+        bma: BmaProtocol,
+        bpc: BpcProtocol,
+        bpl: BplProtocol,
+        bpas: Sequence[BpaProtocol | None],
+        include_collision: bool = True,
+        include_unknown_data_block: bool = True,
+        pal_ani: bool = True,
+        single_frame: bool = False,
+    ):
+        self.bma = bma
+        self.bpc = bpc
+        self.bpl = bpl
+        self.bpas = bpas
+        self.include_collision = include_collision
+        self.include_unknown_data_block = include_unknown_data_block
+        self.pal_ani = pal_ani and bpl.has_palette_animation and len(bpl.animation_palette) > 0 and not single_frame
+        self.single_frame = single_frame
+
+        self._chunk_width = BPC_TILE_DIM * bma.tiling_width
+        self._chunk_height = BPC_TILE_DIM * bma.tiling_height
+        self._lower: _LayerFrames | None = None
+        self._upper: _LayerFrames | None = None
+        self._base: Image.Image | None = None
+
+    def _load_layers(self) -> tuple[_LayerFrames, _LayerFrames | None]:
+        if self._lower is None:
+            # yes. self.layer0 is always the LOWER layer! It's the opposite from BPC
+            self._lower = _LayerFrames(
+                self.bpc,
+                0 if self.bpc.number_of_layers == 1 else 1,
+                self.bpl.palettes,
+                self.bpas,
+                self.bma.layer0,
+                self._chunk_width,
+                self._chunk_height,
+                self.single_frame,
+            )
+            if self.bpc.number_of_layers > 1:
+                assert self.bma.layer1 is not None
+                self._upper = _LayerFrames(
+                    self.bpc,
+                    0,
+                    self.bpl.palettes,
+                    self.bpas,
+                    self.bma.layer1,
+                    self._chunk_width,
+                    self._chunk_height,
+                    self.single_frame,
+                )
+        return self._lower, self._upper
+
+    @property
+    def number_of_frames(self) -> int:
+        """The number of frames returned by frames()."""
+        if self.pal_ani:
+            return len(self.bpl.animation_palette)
+        return self._number_of_map_frames()
+
+    def _number_of_map_frames(self) -> int:
+        lower, upper = self._load_layers()
+        if upper is None:
+            return lower.number_of_frames
+        return lcm(lower.number_of_frames, upper.number_of_frames)
+
+    def frame_durations(self) -> list[int]:
+        """
+        Returns the duration of each frame in milliseconds, based on the frame duration of the first BPA and the
+        longest palette animation. If neither is animated, the duration is 1000.
+        """
+        bpa = next((b for b in self.bpas if b is not None and len(b.frame_info) > 0), None)
+        pal_ani_duration = -1
+        if self.bpl.has_palette_animation and len(self.bpl.animation_specs) > 0:
+            pal_ani_duration = round(1000 / 60 * max(spec.duration_per_frame for spec in self.bpl.animation_specs))
+        durations = []
+        for frame in range(0, self.number_of_frames):
+            bpa_duration = -1
+            if bpa is not None:
+                frame_info = bpa.frame_info[frame % len(bpa.frame_info)]
+                bpa_duration = round(1000 / 60 * frame_info.duration_per_frame)
+            duration = max(bpa_duration, pal_ani_duration)
+            durations.append(1000 if duration == -1 else duration)
+        return durations
+
+    def frames(self) -> Iterator[Image.Image]:
+        """Yields the frames of the map. Each frame is a new image."""
+        number_of_map_frames = self._number_of_map_frames()
+        previous: Image.Image | None = None
+        for frame in range(0, self.number_of_frames):
+            map_frame = frame % number_of_map_frames
+            if previous is None or number_of_map_frames > 1:
+                previous = self._render_map_frame(map_frame)
+            img = previous.copy()
+            if self.pal_ani:
+                # Switch out the palette with that from the palette animation
+                img.putpalette(itertools.chain.from_iterable(self.bpl.apply_palette_animations(frame)))
+            yield self._draw_data_layers(img)
+
+    def _render_map_frame(self, map_frame: int) -> Image.Image:
+        lower, upper = self._load_layers()
+        frame_lower = map_frame % lower.number_of_frames
+        frame_upper = map_frame % upper.number_of_frames if upper is not None else 0
+
+        base = self._base_image()
+        if map_frame == 0:
+            return base
+        img = base.copy()
+        assert self.bma.layer1 is not None or upper is None
+        for i, chunk_lower in enumerate(self.bma.layer0):
+            chunk_upper = self.bma.layer1[i] if upper is not None else None  # type: ignore
+            if chunk_lower not in lower.animated_chunks and (upper is None or chunk_upper not in upper.animated_chunks):
+                continue
+            pos = self._position(i)
+            img.paste(lower.chunk(frame_lower, chunk_lower), pos)
+            if upper is not None:
+                img.paste(
+                    upper.chunk(frame_upper, chunk_upper),  # type: ignore
+                    pos,
+                    mask=upper.mask(frame_upper, chunk_upper),  # type: ignore
+                )
+        return img
+
+    def _base_image(self) -> Image.Image:
+        """The first frame of the map, without collision and data layers."""
+        if self._base is None:
+            lower, upper = self._load_layers()
+            width_map = self.bma.map_width_chunks * self._chunk_width
+            height_map = self.bma.map_height_chunks * self._chunk_height
+            img = Image.new("P", (width_map, height_map))
+            img.putpalette(lower.palette)
+            for i, chunk_idx in enumerate(self.bma.layer0):
+                img.paste(lower.chunk(0, chunk_idx), self._position(i))
+            if upper is not None:
+                assert self.bma.layer1 is not None
+                for i, chunk_idx in enumerate(self.bma.layer1):
+                    img.paste(upper.chunk(0, chunk_idx), self._position(i), mask=upper.mask(0, chunk_idx))
+            self._base = img
+        return self._base
+
+    def _position(self, i: int) -> tuple[int, int]:
+        return (
+            (i % self.bma.map_width_chunks) * self._chunk_width,
+            (i // self.bma.map_width_chunks) * self._chunk_height,
+        )
+
+    def _draw_data_layers(self, img: Image.Image) -> Image.Image:
+        bma = self.bma
+        if self.include_collision and bma.number_of_collision_layers > 0:
+            # time for some RGB action!
+            img = img.convert("RGB")
+            draw = ImageDraw.Draw(img, "RGBA")
+            assert bma.collision is not None
+            for j, col in enumerate(bma.collision):
+                x = j % bma.map_width_camera
+                y = j // bma.map_width_camera
+                if col:
+                    draw.rectangle(
+                        (
+                            (x * BPC_TILE_DIM, y * BPC_TILE_DIM),
+                            ((x + 1) * BPC_TILE_DIM, (y + 1) * BPC_TILE_DIM),
+                        ),
+                        fill=(0xFF, 0x00, 0x00, 0x40),
+                    )
+            # Second collision layer
+            if bma.number_of_collision_layers > 1:
+                assert bma.collision2 is not None
+                for j, col in enumerate(bma.collision2):
+                    x = j % bma.map_width_camera
+                    y = j // bma.map_width_camera
+                    if col:
+                        draw.ellipse(
+                            (
+                                (x * BPC_TILE_DIM, y * BPC_TILE_DIM),
+                                ((x + 1) * BPC_TILE_DIM, (y + 1) * BPC_TILE_DIM),
+                            ),
+                            fill=(0x00, 0x00, 0xFF, 0x40),
+                        )
+
+        if self.include_unknown_data_block and bma.unk6 > 0:
+            fnt = ImageFont.load_default()
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            draw = ImageDraw.Draw(img, "RGBA")
+            assert bma.unknown_data_block is not None
+            for j, unk in enumerate(bma.unknown_data_block):
+                x = j % bma.map_width_camera
+                y = j // bma.map_width_camera
+                if unk > 0:
+                    draw.text(
+                        (x * BPC_TILE_DIM, y * BPC_TILE_DIM),
+                        str(unk),
+                        font=fnt,
+                        fill=(0x00, 0xFF, 0x00),
+                    )
+        return img
@@ -17,6 +17,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import itertools
 import math
 from collections.abc import Sequence
 
@@ -31,9 +33,13 @@ from skytemple_files.common.util import (
 )
 from skytemple_files.graphics.bpa.protocol import BpaProtocol
 from skytemple_files.graphics.bpc import BPC_TILE_DIM, BPC_TILEMAP_BYTELEN
+from skytemple_files.graphics.bpc.atlas_cache import chunk_atlas_cache
 from skytemple_files.graphics.bpc.protocol import BpcLayerProtocol, BpcProtocol
 from skytemple_files.graphics.bpl import BPL_IMG_PAL_LEN, BPL_MAX_PAL
 
+# Versions of the BPC models, for the keys of the chunk atlas cache. Unique over all models.
+_atlas_versions = itertools.count()
+
 
 class BpcLayer(BpcLayerProtocol):
     def __init__(
@@ -77,6 +83,7 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
 
         self.tiling_width = tiling_width
         self.tiling_height = tiling_height
+        self._atlas_version = next(_atlas_versions)
 
         # Only stored for debug. They are not updated, only regenerated when serialized:
         self._upper_layer_pointer = read_u16(data, 0)
@@ -190,11 +197,20 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
         The mapping to BPA tiles has to be done programmatically using set_tile or set_chunk.
 
         """
+        return self._chunks_to_pil(layer, self.layers[layer].tiles, palettes, width_in_mtiles)
+
+    def _chunks_to_pil(
+        self,
+        layer: int,
+        tiles: Sequence[bytes],
+        palettes: Sequence[Sequence[int]],
+        width_in_mtiles: int,
+    ) -> Image.Image:
         width = width_in_mtiles * self.tiling_width * BPC_TILE_DIM
         height = math.ceil(self.layers[layer].chunk_tilemap_len / width_in_mtiles) * self.tiling_height * BPC_TILE_DIM
         return to_pil(
             self.layers[layer].tilemap,
-            self.layers[layer].tiles,
+            tiles,
             palettes,
             BPC_TILE_DIM,
             width,
@@ -289,39 +305,10 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
         The list of bpas must be the one contained in the bg_list. It needs to contain 8 slots, with empty
         slots being None.
 
-        TODO: The speed can be increased if we only re-render the changed animated tiles instead!
+        The images are cached (see the atlas_cache module), repeated calls for the same layer, palettes and BPAs
+        only return copies of the images rendered by the first call.
         """
-        ldata = self.layers[layer]
-        # First check if we even have BPAs to use
-        is_using_bpa = len(bpas) > 0 and any(x > 0 for x in ldata.bpas)
-        if not is_using_bpa:
-            # Simply build the single chunks frame
-            return [self.chunks_to_pil(layer, palettes, width_in_mtiles)]
-
-        bpa_animation_indices = [0, 0, 0, 0]
-        frames = []
-
-        orig_len = len(ldata.tiles)
-        while True:  # Ended by check at end (do while)
-            previous_end_of_tiles = orig_len
-            # For each frame: Insert all BPA current frame tiles into their slots
-            for bpaidx, bpa in enumerate(self.get_bpas_for_layer(layer, bpas)):
-                # Add the BPA tiles for this frame to the set of BPC tiles:
-                new_end_of_tiles = previous_end_of_tiles + bpa.number_of_tiles
-                ldata.tiles[previous_end_of_tiles:new_end_of_tiles] = bpa.tiles_for_frame(bpa_animation_indices[bpaidx])
-
-                previous_end_of_tiles = new_end_of_tiles
-                bpa_animation_indices[bpaidx] += 1
-                bpa_animation_indices[bpaidx] %= bpa.number_of_frames
-
-            frames.append(self.chunks_to_pil(layer, palettes, width_in_mtiles))
-            # All animations have been played, we are done!
-            if bpa_animation_indices == [0, 0, 0, 0]:
-                break
-
-        # RESET the layer's tiles to NOT include the BPA tiles!
-        ldata.tiles = ldata.tiles[:orig_len]
-        return frames
+        return [img.copy() for img in self._chunk_atlases(layer, palettes, bpas, width_in_mtiles)]
 
     def single_chunk_animated_to_pil(
         self,
@@ -334,7 +321,7 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
         Exports a single chunk. For general notes see chunks_to_pil. For notes regarding the animation see
         chunks_animated_to_pil.
 
-        TODO: Code duplication with chunks_animated_to_pil. Could probably be refactored.
+        The chunk is cut from the cached images of chunks_animated_to_pil.
         """
         ldata = self.layers[layer]
         # First check if we even have BPAs to use
@@ -350,31 +337,86 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
             # Simply build the single chunks frame
             return [self.single_chunk_to_pil(layer, chunk_idx, palettes)]
 
-        bpa_animation_indices = [0, 0, 0, 0]
-        frames = []
+        chunk_width = BPC_TILE_DIM * self.tiling_width
+        chunk_height = BPC_TILE_DIM * self.tiling_height
+        return [
+            atlas.crop((0, chunk_idx * chunk_height, chunk_width, (chunk_idx + 1) * chunk_height))
+            for atlas in self._chunk_atlases(layer, palettes, bpas, 1)
+        ]
 
-        orig_len = len(ldata.tiles)
+    def _chunk_atlases(
+        self,
+        layer: int,
+        palettes: Sequence[Sequence[int]],
+        bpas: Sequence[BpaProtocol | None],
+        width_in_mtiles: int,
+    ) -> list[Image.Image]:
+        """Returns the (cached) chunk images for all frames of the animation. They must not be modified."""
+        ldata = self.layers[layer]
+        # First check if we even have BPAs to use
+        is_using_bpa = len(bpas) > 0 and any(x > 0 for x in ldata.bpas)
+        layer_bpas = self.get_bpas_for_layer(layer, bpas) if is_using_bpa else []
+        palettes_key = tuple(tuple(palette) for palette in palettes)
+        return [
+            self._chunk_atlas(layer, palettes, palettes_key, layer_bpas, frames, width_in_mtiles)
+            for frames in self._bpa_frame_vectors(layer_bpas)
+        ]
+
+    def _chunk_atlas(
+        self,
+        layer: int,
+        palettes: Sequence[Sequence[int]],
+        palettes_key: tuple[tuple[int, ...], ...],
+        bpas: Sequence[BpaProtocol],
+        frames: tuple[int, ...],
+        width_in_mtiles: int,
+    ) -> Image.Image:
+        """Returns the chunk image for one frame of each BPA. The image is cached and must not be modified."""
+        ldata = self.layers[layer]
+        bpa_tiles = [bpa.tiles_for_frame(frame) for bpa, frame in zip(bpas, frames)]
+        key = (
+            self._atlas_version,
+            layer,
+            # Replacing the lists of the layer also invalidates the cache
+            id(ldata.tiles),
+            len(ldata.tiles),
+            id(ldata.tilemap),
+            len(ldata.tilemap),
+            width_in_mtiles,
+            palettes_key,
+            # BPAs are keyed by the content of the frames, they can be changed without invalidating the cache
+            tuple(hashlib.sha256(b"".join(tiles)).digest() for tiles in bpa_tiles),
+        )
+        img = chunk_atlas_cache.get(key)
+        if img is None:
+            # Insert the BPA tiles of the frames after the BPC tiles
+            tiles = list(ldata.tiles)
+            end_of_tiles = len(tiles)
+            for bpa, frame_tiles in zip(bpas, bpa_tiles):
+                new_end_of_tiles = end_of_tiles + bpa.number_of_tiles
+                tiles[end_of_tiles:new_end_of_tiles] = frame_tiles
+                end_of_tiles = new_end_of_tiles
+            img = self._chunks_to_pil(layer, tiles, palettes, width_in_mtiles)
+            chunk_atlas_cache.put(key, img)
+        return img
+
+    @staticmethod
+    def _bpa_frame_vectors(bpas: Sequence[BpaProtocol]) -> list[tuple[int, ...]]:
+        """
+        Returns the frame of each BPA for each step of the animation, until all animations have been played.
+        The number of steps is the lowest common multiple of the number of frames of the BPAs.
+        """
+        indices = [0] * len(bpas)
+        vectors = []
         while True:  # Ended by check at end (do while)
-            previous_end_of_tiles = orig_len
-            # For each frame: Insert all BPA current frame tiles into their slots
-            for bpaidx, bpa in enumerate(self.get_bpas_for_layer(layer, bpas)):
-                # Add the BPA tiles for this frame to the set of BPC tiles:
-                new_end_of_tiles = previous_end_of_tiles + bpa.number_of_tiles
-                ldata.tiles[previous_end_of_tiles:new_end_of_tiles] = bpa.tiles_for_frame(bpa_animation_indices[bpaidx])
-
-                previous_end_of_tiles = new_end_of_tiles
+            vectors.append(tuple(indices))
+            for bpaidx, bpa in enumerate(bpas):
                 if bpa.number_of_frames > 0:
-                    bpa_animation_indices[bpaidx] += 1
-                    bpa_animation_indices[bpaidx] %= bpa.number_of_frames
-
-            frames.append(self.single_chunk_to_pil(layer, chunk_idx, palettes))
+                    indices[bpaidx] = (indices[bpaidx] + 1) % bpa.number_of_frames
             # All animations have been played, we are done!
-            if bpa_animation_indices == [0, 0, 0, 0]:
+            if not any(indices):
                 break
-
-        # RESET the layer's tiles to NOT include the BPA tiles!
-        ldata.tiles = ldata.tiles[:orig_len]
-        return frames
+        return vectors
 
     def pil_to_tiles(self, layer: int, image: Image.Image) -> None:
         """
@@ -391,6 +433,7 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
             optimize=False,
         )
         self.layers[layer].number_tiles = u16_checked(len(self.layers[layer].tiles) - 1)
+        self.invalidate_chunk_atlases()
 
     def pil_to_chunks(self, layer: int, image: Image.Image, force_import: bool = True) -> list[list[int]]:
         """
@@ -422,6 +465,7 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
         self.layers[layer].chunk_tilemap_len = u16_checked(
             int(len(self.layers[layer].tilemap) / self.tiling_width / self.tiling_height)
         )
+        self.invalidate_chunk_atlases()
         return palettes  # type: ignore
 
     def get_tile(self, layer: int, index: int) -> TilemapEntryProtocol:
@@ -429,6 +473,7 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
 
     def set_tile(self, layer: int, index: int, tile_mapping: TilemapEntryProtocol) -> None:
         self.layers[layer].tilemap[index] = tile_mapping
+        self.invalidate_chunk_atlases()
 
     def get_chunk(self, layer: int, index: int) -> list[TilemapEntryProtocol]:
         mtidx = index * self.tiling_width * self.tiling_height
@@ -443,6 +488,7 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
             tiles = [bytes(int(BPC_TILE_DIM * BPC_TILE_DIM / 2))] + tiles
         self.layers[layer].tiles = tiles
         self.layers[layer].number_tiles = u16(len(tiles) - 1)
+        self.invalidate_chunk_atlases()
 
     def import_tile_mappings(
         self,
@@ -471,6 +517,7 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
         self.layers[layer].chunk_tilemap_len = u16_checked(
             int(len(tile_mappings) / self.tiling_width / self.tiling_height)
         )
+        self.invalidate_chunk_atlases()
 
     def get_bpas_for_layer(self, layer: int, bpas_from_bg_list: Sequence[BpaProtocol | None]) -> list[BpaProtocol]:
         """
@@ -498,6 +545,7 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
             )
         mtidx = index * self.tiling_width * self.tiling_height
         self.layers[layer].tilemap[mtidx : mtidx + 9] = new_tilemappings
+        self.invalidate_chunk_atlases()
 
     def remove_upper_layer(self) -> None:
         """Remove the upper layer. Silently does nothing when it doesn't exist."""
@@ -506,6 +554,7 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
         self.number_of_layers = 1
         self.layers[0] = self.layers[1]
         del self.layers[1]
+        self.invalidate_chunk_atlases()
 
     def add_upper_layer(self) -> None:
         """Add an upper layer. Silently does nothing when it already exists."""
@@ -529,6 +578,7 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
             [bytearray(int(BPC_TILE_DIM * BPC_TILE_DIM / 2))],
             tilemap,  # type: ignore
         )
+        self.invalidate_chunk_atlases()
 
     def process_bpa_change(self, bpa_index: int, tiles_bpa_new: u16) -> None:
         """
@@ -559,6 +609,15 @@ class Bpc(BpcProtocol[BpcLayer, BpaProtocol]):
 
         # Finally: Update layer entry.
         self.layers[layer_idx].bpas[bpa_layer_idx] = tiles_bpa_new
+        self.invalidate_chunk_atlases()
+
+    def invalidate_chunk_atlases(self) -> None:
+        """
+        Makes sure the chunk images of chunks_animated_to_pil are rendered again on the next call.
+        All methods of this model that change the layers already do this, it is only needed after
+        directly modifying the tiles or tile mappings of a layer.
+        """
+        self._atlas_version = next(_atlas_versions)
 
     def _get_palette_for_tile(self, layer: int, i: int) -> int:
         """Returns the first found palette of the tile with idx i. Or 0"""
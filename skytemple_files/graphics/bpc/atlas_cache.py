@@ -0,0 +1,96 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from PIL import Image
+
+# Default memory budget of the chunk atlas cache in bytes.
+DEFAULT_CHUNK_ATLAS_CACHE_BUDGET = 32 * 1024 * 1024
+
+
+class ChunkAtlasCache:
+    """
+    Least recently used cache for rendered chunk atlases (the images returned by
+    Bpc.chunks_animated_to_pil, one per animation frame).
+
+    The cache holds at most ``budget`` bytes of image data. When storing an atlas would exceed the
+    budget, the least recently used atlases are dropped. A budget of 0 disables the cache.
+
+    The images are stored as they are passed in and returned as they are stored: they must not be modified.
+    """
+
+    def __init__(self, budget: int = DEFAULT_CHUNK_ATLAS_CACHE_BUDGET):
+        self._entries: OrderedDict[Hashable, Image.Image] = OrderedDict()
+        self._size = 0
+        self._budget = budget
+
+    @property
+    def budget(self) -> int:
+        return self._budget
+
+    @budget.setter
+    def budget(self, value: int) -> None:
+        if value < 0:
+            raise ValueError("The budget of the chunk atlas cache can not be negative.")
+        self._budget = value
+        self._evict()
+
+    @property
+    def size(self) -> int:
+        """The number of bytes of image data currently held."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Image.Image | None:
+        img = self._entries.get(key)
+        if img is None:
+            return None
+        self._entries.move_to_end(key)
+        return img
+
+    def put(self, key: Hashable, img: Image.Image) -> None:
+        size = self._image_size(img)
+        if size > self._budget:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= self._image_size(old)
+        self._entries[key] = img
+        self._size += size
+        self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _evict(self) -> None:
+        while self._size > self._budget:
+            _, img = self._entries.popitem(last=False)
+            self._size -= self._image_size(img)
+
+    @staticmethod
+    def _image_size(img: Image.Image) -> int:
+        return img.width * img.height * len(img.getbands())
+
+
+# The cache used by all BPC models.
+chunk_atlas_cache = ChunkAtlasCache()
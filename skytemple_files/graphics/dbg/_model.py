@@ -24,7 +24,7 @@ from range_typed_integers import u16
 
 from skytemple_files.common.i18n_util import _, f
 from skytemple_files.common.protocol import TilemapEntryProtocol
-from skytemple_files.common.tiled_image import from_pil, search_for_chunk
+from skytemple_files.common.tiled_image import ChunkIndex, from_pil
 from skytemple_files.common.util import (
     chunks,
     read_u16,
@@ -144,6 +144,7 @@ class Dbg(DbgProtocol[Dpc, Dpci, Dpl]):
         chunk_mappings = []
         chunk_mappings_counter = 1
         tile_mappings: list[TilemapEntryProtocol] = []
+        chunk_index = ChunkIndex()
         tiles_in_chunk = DBG_TILING_DIM * DBG_TILING_DIM
         for chk_fst_tile_idx in range(
             0,
@@ -151,10 +152,11 @@ class Dbg(DbgProtocol[Dpc, Dpci, Dpl]):
             tiles_in_chunk,
         ):
             chunk = all_possible_tile_mappings[chk_fst_tile_idx : chk_fst_tile_idx + tiles_in_chunk]
-            start_of_existing_chunk = search_for_chunk(chunk, tile_mappings)
+            start_of_existing_chunk = chunk_index.find(chunk)
             if start_of_existing_chunk is not None:
                 chunk_mappings.append(u16(int(start_of_existing_chunk / tiles_in_chunk) + 1))
             else:
+                chunk_index.add(chunk)
                 tile_mappings += chunk
                 chunk_mappings.append(u16(chunk_mappings_counter))
                 chunk_mappings_counter += 1
@@ -17,16 +17,17 @@
 
 from __future__ import annotations
 
-import math
+import os
 import warnings
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import Executor
+from operator import itemgetter
 
 from PIL import Image
 from range_typed_integers import i32
 
 from skytemple_files.common.i18n_util import _, f
 from skytemple_files.common.util import (
-    iter_bytes_4bit_le,
     read_i32,
     read_bytes,
     write_i32,
@@ -52,6 +53,20 @@ from skytemple_files.graphics.kao.protocol import (
 )
 
 
+# Magic word and container length at the beginning of AT containers.
+AT_HEADER_LEN = 7
+
+
+def at_cont_size(data: bytes | memoryview, byte_offset: int) -> int:
+    """
+    Returns the size of the AT container at the offset.
+    Only the header is passed to the handler, which may copy the data.
+    """
+    from skytemple_files.common.types.file_types import FileType
+
+    return FileType.COMMON_AT.cont_size(bytes(data[byte_offset : byte_offset + AT_HEADER_LEN]))
+
+
 class KaoPropertiesState(_KaoPropertiesProtocol):
     _instance: KaoPropertiesState | None = None
     kao_image_limit: int
@@ -72,9 +87,7 @@ class KaoImage(KaoImageProtocol):
             whole_kao_data = memoryview(whole_kao_data)
 
         """Construct a KaoImage using a raw image buffer (16 color palette, followed by AT)"""
-        from skytemple_files.common.types.file_types import FileType
-
-        cont_len = FileType.COMMON_AT.cont_size(whole_kao_data, start_pnt + KAO_IMG_PAL_B_SIZE)
+        cont_len = at_cont_size(whole_kao_data, start_pnt + KAO_IMG_PAL_B_SIZE)
         # palette size + at container size
         self.original_size = KAO_IMG_PAL_B_SIZE + cont_len
         self.pal_data = read_bytes(whole_kao_data, start_pnt, KAO_IMG_PAL_B_SIZE)
@@ -166,31 +179,34 @@ class Kao(KaoProtocol[KaoImage]):
         from skytemple_files.graphics.kao._writer import KaoWriter
 
         # Write all changes
-        self.original_data = bytearray(KaoWriter().write(self))
+        written = KaoWriter().write(self)
 
         # Prepare for expanding
         expand_len = new_size - self.toc_len
         expand_size = expand_len * (SUBENTRIES * SUBENTRY_LEN)
         limit = self.first_toc + (self.toc_len * SUBENTRIES * SUBENTRY_LEN)
+        new_data = bytearray(len(written) + expand_size)
+        with memoryview(new_data) as new_data_view, memoryview(written) as written_view:
+            new_data_view[:limit] = written_view[:limit]
+            new_data_view[limit + expand_size :] = written_view[limit:]
         # Rewrite all pointers
         last_pnt = i32(0)
         for x in range(self.toc_len * SUBENTRIES):
             start = self.first_toc + x * SUBENTRY_LEN
-            pnt = read_i32(self.original_data, start)
+            pnt = read_i32(new_data, start)
             if pnt < 0:
                 pnt -= expand_size  # type: ignore
                 last_pnt = pnt
             elif pnt > 0:
-                last_pnt = -KaoImage(self.original_data, pnt).size() - expand_size  # type: ignore
+                last_pnt = -KaoImage(written, pnt).size() - expand_size  # type: ignore
                 pnt += expand_size  # type: ignore
-            write_i32(self.original_data, pnt, start)
+            write_i32(new_data, pnt, start)
 
         # Expand
         expand_pnt = bytearray(4)
         write_i32(expand_pnt, last_pnt, 0)
-        self.original_data = (
-            self.original_data[:limit] + (expand_pnt * (expand_len * SUBENTRIES)) + self.original_data[limit:]
-        )
+        new_data[limit : limit + expand_size] = expand_pnt * (expand_len * SUBENTRIES)
+        self.original_data = new_data
         self.toc_len = new_size
         self.reset(new_size)
 
@@ -262,6 +278,54 @@ class Kao(KaoProtocol[KaoImage]):
             kao.empty = True
             kao.modified = True
 
+    def import_many(
+        self,
+        sheets: str | Mapping[int, str],
+        *,
+        executor: Executor | None = None,
+        portrait_name_fn: Callable[[int], str] = str,
+    ) -> dict[int, list[int]]:
+        """
+        Imports the SpriteBot portrait sheets (see sprite_bot_sheet) of many entries at once.
+        Returns the subindices of the imported portraits for each entry.
+
+        sheets is either a mapping of entry indices to sheet files or a directory, that contains the sheets
+        named after the index of their entry (eg. "0025.png"). Other files in the directory are ignored.
+        All portraits of an entry are replaced by the portraits in its sheet.
+
+        Converting and compressing the portraits is by far the most expensive part of this. If an executor
+        (eg. a ProcessPoolExecutor) is given, the sheets are processed on it in parallel. In that case
+        portrait_name_fn, which names the portraits in error messages, must be picklable.
+        If any of the sheets is invalid, an error is raised and none of the portraits are changed.
+        """
+        if isinstance(sheets, str):
+            sheets = _find_sprite_bot_sheets(sheets)
+        for index in sheets.keys():
+            if index >= self.toc_len or index < 0:
+                raise ValueError(f"The index requested must be between 0 and {self.toc_len}")
+        limit = KaoPropertiesState.instance().kao_image_limit
+        args = [(index, fn, portrait_name_fn, limit) for index, fn in sorted(sheets.items())]
+
+        if executor is None:
+            results = [_convert_sprite_bot_sheet(*a) for a in args]
+        else:
+            futures = [executor.submit(_convert_sprite_bot_sheet, *a) for a in args]
+            try:
+                results = [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        imported: dict[int, list[int]] = {}
+        for index, portraits in results:
+            for subindex in range(SUBENTRIES):
+                self.delete(index, subindex)
+            for subindex, pal, cimg in portraits:
+                self.set(index, subindex, KaoImage.create_from_raw(cimg, pal))
+            imported[index] = [subindex for subindex, _pal, _cimg in portraits]
+        return imported
+
     def has_loaded(self, index: int, subindex: int) -> bool:
         """Returns whether or not a kao image at the specified index was loaded"""
         return self.loaded_kaos[index][subindex] is not None
@@ -300,6 +364,33 @@ class KaoIterator(Iterator):  # type: ignore
             raise StopIteration
 
 
+def _find_sprite_bot_sheets(directory: str) -> dict[int, str]:
+    """Returns the PNG files in the directory that are named after an entry index, by index."""
+    sheets: dict[int, str] = {}
+    for name in os.listdir(directory):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() == ".png" and stem.isdigit():
+            sheets[int(stem)] = os.path.join(directory, name)
+    return sheets
+
+
+def _convert_sprite_bot_sheet(
+    index: int, fn: str, portrait_name_fn: Callable[[int], str], kao_image_limit: int
+) -> tuple[int, list[tuple[int, bytes, bytes]]]:
+    """
+    Loads a SpriteBot sheet and converts its portraits. Returns the index and the subindex,
+    palette and compressed image data of each portrait. May run in another process.
+    """
+    from skytemple_files.graphics.kao.sprite_bot_sheet import SpriteBotSheet
+
+    KaoPropertiesState.instance().kao_image_limit = kao_image_limit
+    portraits: list[tuple[int, bytes, bytes]] = []
+    for subindex, image in SpriteBotSheet.load(fn, portrait_name_fn):
+        pal, cimg = pil_to_kao(image)
+        portraits.append((subindex, bytes(pal), bytes(cimg)))
+    return index, portraits
+
+
 def kao_to_pil(kao: KaoImage) -> Image.Image:
     """Converts the data in Kao image to a PIL image"""
     from skytemple_files.common.types.file_types import FileType
@@ -310,27 +401,46 @@ def kao_to_pil(kao: KaoImage) -> Image.Image:
     return uncompressed_kao_to_pil(kao.pal_data, uncompressed_image_data)
 
 
-def uncompressed_kao_to_pil(pal_data: bytes, uncompressed_image_data: bytes) -> Image.Image:
-    # The images are made up of 25 8x8 tiles stored linearly in the data, but to be arranged
-    # as 5x5 "meta-pixels".
+def _build_swizzle_table() -> tuple[int, ...]:
+    """
+    Returns, for every pixel of the kao image data, the index of that pixel in the image.
+    The image data is made up of 25 8x8 tiles stored linearly, to be arranged as 5x5 "meta-pixels".
+    """
     img_dim = KAO_IMG_METAPIXELS_DIM * KAO_IMG_IMG_DIM
-    pil_img_data = bytearray(img_dim * img_dim)
+    tile_size = KAO_IMG_METAPIXELS_DIM * KAO_IMG_METAPIXELS_DIM
+    table = []
+    for idx in range(img_dim * img_dim):
+        tile_y, tile_x = divmod(idx // tile_size, KAO_IMG_IMG_DIM)
+        in_tile_y, in_tile_x = divmod(idx % tile_size, KAO_IMG_METAPIXELS_DIM)
+        result_x = tile_x * KAO_IMG_METAPIXELS_DIM + in_tile_x
+        result_y = tile_y * KAO_IMG_METAPIXELS_DIM + in_tile_y
+        table.append(result_y * img_dim + result_x)
+    return tuple(table)
 
-    for idx, pix in enumerate(iter_bytes_4bit_le(uncompressed_image_data)):
-        # yikes... the mappings below can probably be simplified a lot
-        tile_id = math.floor(idx / (KAO_IMG_METAPIXELS_DIM * KAO_IMG_METAPIXELS_DIM))
-        tile_x = tile_id % KAO_IMG_IMG_DIM
-        tile_y = math.floor(tile_id / KAO_IMG_IMG_DIM)
 
-        idx_in_tile = idx - (KAO_IMG_METAPIXELS_DIM * KAO_IMG_METAPIXELS_DIM) * tile_id
-        in_tile_x = idx_in_tile % KAO_IMG_METAPIXELS_DIM
-        in_tile_y = math.floor(idx_in_tile / KAO_IMG_METAPIXELS_DIM)
+def _invert_table(table: tuple[int, ...]) -> tuple[int, ...]:
+    inverse = [0] * len(table)
+    for idx, nidx in enumerate(table):
+        inverse[nidx] = idx
+    return tuple(inverse)
 
-        result_x = tile_x * KAO_IMG_METAPIXELS_DIM + in_tile_x
-        result_y = tile_y * KAO_IMG_METAPIXELS_DIM + in_tile_y
-        nidx = result_y * img_dim + result_x
-        # print(f"{tile_id} : {tile_x}x{tile_y} -- {idx_in_tile} : {in_tile_x}x{in_tile_y} -> {result_x}x{result_y}={nidx}")
-        pil_img_data[nidx] = pix
+
+# Picks the pixels of the tiled kao image data in image order (row by row) and vice versa.
+_KAO_TILED_TO_IMG = itemgetter(*_invert_table(_build_swizzle_table()))
+_KAO_IMG_TO_TILED = itemgetter(*_build_swizzle_table())
+# Splits the bytes of the image data into their low and high nibble (4 bit little endian).
+_LOW_NIBBLES = bytes(x & 0x0F for x in range(256))
+_HIGH_NIBBLES = bytes(x >> 4 for x in range(256))
+_KAO_IMG_DATA_SIZE = KAO_IMG_METAPIXELS_DIM * KAO_IMG_IMG_DIM * KAO_IMG_METAPIXELS_DIM * KAO_IMG_IMG_DIM // 2
+
+
+def uncompressed_kao_to_pil(pal_data: bytes, uncompressed_image_data: bytes) -> Image.Image:
+    img_dim = KAO_IMG_METAPIXELS_DIM * KAO_IMG_IMG_DIM
+    data = bytes(uncompressed_image_data[:_KAO_IMG_DATA_SIZE]).ljust(_KAO_IMG_DATA_SIZE, b"\0")
+    tiled = bytearray(img_dim * img_dim)
+    tiled[0::2] = data.translate(_LOW_NIBBLES)
+    tiled[1::2] = data.translate(_HIGH_NIBBLES)
+    pil_img_data = bytes(_KAO_TILED_TO_IMG(tiled))
 
     assert len(pil_img_data) == img_dim * img_dim
     im = Image.frombuffer("P", (img_dim, img_dim), pil_img_data, "raw", "P", 0, 1)
@@ -355,30 +465,9 @@ def pil_to_kao(pil: Image.Image, allowed_compressions: list[CommonAtType] | None
     new_palette = bytearray(pil.palette.palette)
 
     # We have to cut the image back into this annoying tiling format :(
-    new_img_size = int(img_dim * img_dim / 2)
-    new_img = bytearray(new_img_size)
-    raw_pil_image = pil.tobytes("raw", "P")
-    the_two_px_to_write = [0, 0]
-    for idx, pix in enumerate(raw_pil_image):
-        # We store 2 bytes as one... in LE
-        the_two_px_to_write[idx % 2] = pix
-        if idx % 2 == 1:
-            # -1 because we are always processing 2 px at the same time
-            x = (idx - 1) % img_dim
-            y = int((idx - 1) / img_dim)
-
-            tile_x = math.floor(x / KAO_IMG_METAPIXELS_DIM) % KAO_IMG_METAPIXELS_DIM
-            tile_y = math.floor(y / KAO_IMG_METAPIXELS_DIM) % KAO_IMG_METAPIXELS_DIM
-            tile_id = tile_y * KAO_IMG_IMG_DIM + tile_x
-
-            in_tile_x = x - KAO_IMG_METAPIXELS_DIM * tile_x
-            in_tile_y = y - KAO_IMG_METAPIXELS_DIM * tile_y
-            idx_in_tile = in_tile_y * KAO_IMG_METAPIXELS_DIM + in_tile_x
-
-            nidx = int((tile_id * KAO_IMG_METAPIXELS_DIM * KAO_IMG_METAPIXELS_DIM + idx_in_tile) / 2)
-            # print(f"{idx}@{x}x{y}: {tile_id} : {tile_x}x{tile_y} -- {idx_in_tile} : {in_tile_x}x{in_tile_y} = {nidx}")
-            # Little endian:
-            new_img[nidx] = the_two_px_to_write[0] + (the_two_px_to_write[1] << 4)
+    tiled = _KAO_IMG_TO_TILED(pil.tobytes("raw", "P"))
+    # We store 2 pixels as one byte... in LE. This fails for pixels outside the 16 color palette.
+    new_img = bytearray(map(_pack_4bit_le, tiled[0::2], tiled[1::2]))
     # Palette reordering algorithm
     # Tries to reorder the palette to have a more favorable data
     # configuration for the PX algorithm
@@ -431,10 +520,9 @@ def pil_to_kao(pil: Image.Image, allowed_compressions: list[CommonAtType] | None
     for x in range(16):
         if x not in new_order:
             new_order.append(x)
-    new_img_new = bytearray(800)
-    for i, v in enumerate(new_img):
-        new_v = (new_order.index(v % 16)) + (new_order.index(v // 16)) * 16
-        new_img_new[i] = new_v
+    positions = [new_order.index(x) for x in range(16)]
+    reorder_table = [positions[v % 16] + positions[v // 16] * 16 for v in range(256)]
+    new_img_new = bytearray(map(reorder_table.__getitem__, new_img))
     new_palette_new = bytearray(KAO_IMG_PAL_B_SIZE)
     if len(new_palette) < 256:
         new_palette.extend([0] * (256 - len(new_palette)))
@@ -468,3 +556,7 @@ def pil_to_kao(pil: Image.Image, allowed_compressions: list[CommonAtType] | None
     # >>> uncompressed_kao_to_pil(new_palette, unc).show()
 
     return new_palette[:KAO_IMG_PAL_B_SIZE], new_img_compressed
+
+
+def _pack_4bit_le(lower: int, upper: int) -> int:
+    return lower + (upper << 4)
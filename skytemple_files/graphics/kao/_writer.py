@@ -20,6 +20,7 @@ from __future__ import annotations
 # Creates BitStreams from KAO models.
 # file is 16-bytes aligned!
 from sys import maxsize
+from typing import BinaryIO
 
 from skytemple_files.common.util import read_i32
 from skytemple_files.graphics.kao import (
@@ -28,7 +29,7 @@ from skytemple_files.graphics.kao import (
     SUBENTRIES,
     SUBENTRY_LEN,
 )
-from skytemple_files.graphics.kao._model import Kao
+from skytemple_files.graphics.kao._model import Kao, at_cont_size
 
 DEBUG = False
 
@@ -49,12 +50,49 @@ class KaoWriter:
         This also updates the data representation of the original kao, unless
         update_kao is False.
         """
+        segments = self._build_segments(kao, self.update_kao)
+        if segments is None:
+            if DEBUG:
+                print("KaoWriter: Nothing changed, returning original")
+            return kao.original_data
+
+        new_data = bytearray(sum(len(segment) for segment in segments))
+        # Assigning to slices of the bytearray itself would copy the segments first.
+        new_data_view = memoryview(new_data)
+        pos = 0
+        for segment in segments:
+            new_data_view[pos : pos + len(segment)] = segment
+            pos += len(segment)
+        new_data_view.release()
 
-        from skytemple_files.common.types.file_types import FileType
+        if self.update_kao:
+            kao.original_data = memoryview(new_data)  # type: ignore
+
+        return new_data
+
+    def write_to(self, kao: Kao, fileobj: BinaryIO) -> int:
+        """
+        Like write, but writes the kao file to the file object, without building the whole file in memory.
+        Returns the number of bytes written.
 
-        # At worst all images are 848 bytes long - However assuming this would allocate over 300MB...
-        # Let's just use 10MB. We will enlarge if necessary.
-        self.new_data = bytearray(80000000)
+        The kao is never updated (since the new data is not kept), regardless of update_kao.
+        """
+        segments = self._build_segments(kao, False)
+        if segments is None:
+            segments = [kao.original_data]
+        written = 0
+        for segment in segments:
+            fileobj.write(segment)
+            written += len(segment)
+        return written
+
+    def _build_segments(self, kao: Kao, update_kao: bool) -> list[bytes | bytearray | memoryview] | None:
+        """
+        Returns the parts of the new kao file: The (updated) beginning of the file up to the first rebuilt image,
+        including the TOC, followed by the images and the padding.
+        Runs of unchanged images are views of the original data. Returns None if nothing was changed.
+        """
+        original_data = memoryview(kao.original_data)
 
         # To increase overall performance, first find the index of the first modified image, we will start from
         # there and just copy the rest
@@ -63,7 +101,7 @@ class KaoWriter:
             start_subindex = maxsize
             for i, si, k in kao.loaded_kaos_flat:
                 if k.modified:
-                    if self.update_kao:
+                    if update_kao:
                         k.modified = False
                     if i < start_index:
                         start_index = i
@@ -71,21 +109,23 @@ class KaoWriter:
                         start_subindex = si
 
             if start_index == maxsize:
-                if DEBUG:
-                    print("KaoWriter: Nothing changed, returning original")
                 # Nothing was changed
-                return kao.original_data
+                return None
             else:
                 # Copy image data from beginning to that point - this will also copy the old TOC but we will write over that
                 current_toc_offset = (
                     kao.first_toc + (start_index * SUBENTRIES * SUBENTRY_LEN) + start_subindex * SUBENTRY_LEN
                 )
-                pnt = read_i32(kao.original_data, current_toc_offset)
+                pnt = read_i32(original_data, current_toc_offset)
                 if pnt < 0:
                     current_image_offset = -pnt  # pylint: disable=invalid-unary-operand-type
                 else:
                     current_image_offset = pnt  # pylint: disable=invalid-unary-operand-type
-                self.new_data[0:current_image_offset] = kao.original_data[0:current_image_offset]
+                # Only the beginning of the file up to the end of the TOC is changed, the images before the
+                # first modified one are copied as-is.
+                toc_end = min(kao.first_toc + kao.toc_len * SUBENTRIES * SUBENTRY_LEN, current_image_offset)
+                head = bytearray(original_data[0:toc_end])
+                segments: list[bytes | bytearray | memoryview] = [head, original_data[toc_end:current_image_offset]]
                 if DEBUG:
                     print(
                         f"KaoWriter: First modified image: {start_index}, {start_subindex} "
@@ -96,11 +136,15 @@ class KaoWriter:
             size_toc = kao.toc_len * SUBENTRIES * SUBENTRY_LEN
             current_toc_offset = kao.first_toc
             current_image_offset = current_toc_offset + size_toc
+            head = bytearray(current_image_offset)
+            segments = [head]
 
-        current_null_pointer = (
-            -current_image_offset
-        )  # Always start at that null pointer!  # pylint: disable=invalid-unary-operand-type
+        # The run of images copied from the original data that is not yet in segments.
+        run_start = run_end = 0
+
+        # Always start at that null pointer!
         # Otherwise, stuff will break since a 0 pointer is considered as valid in the model!
+        current_null_pointer = -current_image_offset  # pylint: disable=invalid-unary-operand-type
 
         # Rebuild KAO
         for i in range(start_index, kao.toc_len):
@@ -109,18 +153,20 @@ class KaoWriter:
                     # Image is loaded, use image data for new pointer
                     kao_image = kao.get(i, si)
                     if kao_image is None:
-                        self._update_toc_entry(
-                            current_toc_offset,
-                            current_null_pointer.to_bytes(SUBENTRY_LEN, "little", signed=True),
+                        head[current_toc_offset : current_toc_offset + SUBENTRY_LEN] = current_null_pointer.to_bytes(
+                            SUBENTRY_LEN, "little", signed=True
                         )
                         current_toc_offset += SUBENTRY_LEN
                         continue
-                    image_data_bs = kao_image.get_internal()
-                    image_data_start = 0
-                    image_data_end = len(image_data_bs)
+                    image_data = kao_image.get_internal()
+                    image_size = len(image_data)
+                    if run_end > run_start:
+                        segments.append(original_data[run_start:run_end])
+                    run_start = run_end = 0
+                    segments.append(image_data)
                 else:
                     # Image is not loaded, get image data directly, is faster than building KaoImage first
-                    pnt = read_i32(kao.original_data, current_toc_offset)
+                    pnt = read_i32(original_data, current_toc_offset)
                     if pnt < 0:
                         # Null pointer, write new null pointer
                         if DEBUG:
@@ -129,35 +175,31 @@ class KaoWriter:
                                 f"Written NULL: {current_null_pointer}"
                             )
                         # Write NULL pointer
-                        self._update_toc_entry(
-                            current_toc_offset,
-                            current_null_pointer.to_bytes(SUBENTRY_LEN, "little", signed=True),
+                        head[current_toc_offset : current_toc_offset + SUBENTRY_LEN] = current_null_pointer.to_bytes(
+                            SUBENTRY_LEN, "little", signed=True
                         )
                         current_toc_offset += SUBENTRY_LEN
                         continue
-                    image_data_bs = kao.original_data
-                    image_data_start = pnt
-                    image_data_end = (
-                        image_data_start
-                        + KAO_IMG_PAL_B_SIZE
-                        + FileType.COMMON_AT.cont_size(image_data_bs, image_data_start + KAO_IMG_PAL_B_SIZE)
-                    )
+                    image_size = KAO_IMG_PAL_B_SIZE + at_cont_size(original_data, pnt + KAO_IMG_PAL_B_SIZE)
+                    # Extend the current run of unchanged images, if this image directly follows it.
+                    if run_end > run_start and run_end == pnt:
+                        run_end += image_size
+                    else:
+                        if run_end > run_start:
+                            segments.append(original_data[run_start:run_end])
+                        run_start = pnt
+                        run_end = pnt + image_size
                 # Update the TOC entry to point to the current image offset
-                self._update_toc_entry(
-                    current_toc_offset,
-                    current_image_offset.to_bytes(SUBENTRY_LEN, "little", signed=True),
+                head[current_toc_offset : current_toc_offset + SUBENTRY_LEN] = current_image_offset.to_bytes(
+                    SUBENTRY_LEN, "little", signed=True
                 )
-                # assert len(self.new_data) / 8 == current_size  # Size must not have changed
-                current_image_end = current_image_offset + (image_data_end - image_data_start)
-                # Write image data starting at current offset
-                self.new_data[current_image_offset:current_image_end] = image_data_bs[image_data_start:image_data_end]
-                # assert len(self.new_data) / 8 == current_size  # Size must not have changed
+                current_image_end = current_image_offset + image_size
                 # Update NULL pointer
                 current_null_pointer = -current_image_end
                 if DEBUG:
                     print(
                         f"KaoWriter:    Writing image {i},{si} at TOC {current_toc_offset}: "
-                        f"Image at {current_image_offset}, size {current_image_offset}. "
+                        f"Image at {current_image_offset}, size {image_size}. "
                         f"Resulting end: {current_image_end}. "
                         f"Resulting NULL pointer: {current_null_pointer}"
                     )
@@ -166,20 +208,12 @@ class KaoWriter:
 
             start_subindex = 0  # For all next passes always start with the first image of course!
 
-        # Cut off image buffer, but make sure it keeps being 16 byte aligned.
+        if run_end > run_start:
+            segments.append(original_data[run_start:run_end])
+
+        # Pad the file to keep it 16 byte aligned.
         remainder = current_image_offset % KAO_FILE_BYTE_ALIGNMENT
         if remainder > 0:
-            current_image_offset += KAO_FILE_BYTE_ALIGNMENT - remainder
-        current_size = len(self.new_data)
-        if current_image_offset > current_size:
-            self.new_data += bytearray(current_image_offset - current_size)
-        else:
-            self.new_data = self.new_data[:current_image_offset]
-
-        if self.update_kao:
-            kao.original_data = memoryview(self.new_data)  # type: ignore
-
-        return self.new_data
+            segments.append(bytes(KAO_FILE_BYTE_ALIGNMENT - remainder))
 
-    def _update_toc_entry(self, offs, bs: bytes):
-        self.new_data[offs : offs + SUBENTRY_LEN] = bs  # type: ignore
+        return segments
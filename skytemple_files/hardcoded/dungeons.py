@@ -25,21 +25,9 @@ from range_typed_integers import u8, i8, i16
 
 from skytemple_files.common.i18n_util import _
 from skytemple_files.common.ppmdu_config.data import Pmd2Data
-from skytemple_files.common.util import (
-    AutoString,
-    write_u32,
-    write_i8,
-    read_u8,
-    read_u16,
-    generate_bitfield,
-    read_i16,
-    write_u16,
-    write_i16,
-    read_u32,
-    write_u8,
-    read_i8,
-)
+from skytemple_files.common.util import AutoString
 from skytemple_files.data.md.protocol import PokeType
+from skytemple_files.hardcoded.table_layout import TableLayout
 
 DUNGEON_LIST_ENTRY_LEN = 4
 DUNGEON_RESTRICTIONS_ENTRY_LEN = 12
@@ -141,88 +129,73 @@ class DungeonRestriction(AutoString):
 
     @classmethod
     def from_bytes(cls, b: bytes) -> DungeonRestriction:
-        bitfield0 = read_u8(b, 0)
-        bitfield1 = read_u8(b, 1)
-        (
-            dir_bool,
-            enemies_evolve_when_team_member_koed,
-            enemies_grant_exp,
-            recruiting_allowed,
-            level_reset,
-            money_allowed,
-            leader_can_be_changed,
-            dont_save_before_entering,
-        ) = (bool(bitfield0 >> i & 1) for i in range(8))
-        (
-            iq_skills_disabled,
-            traps_remain_invisible_on_attack,
-            enemies_can_drop_chests,
-        ) = (bool(bitfield1 >> i & 1) for i in range(3))
-        assert read_u8(b, 2) == 0
-        assert read_u8(b, 3) == 0
+        return DUNGEON_RESTRICTIONS_LAYOUT.unpack(b)
+
+    def to_bytes(self) -> bytes:
+        return DUNGEON_RESTRICTIONS_LAYOUT.pack(self)
+
+    @classmethod
+    def _from_fields(
+        cls,
+        bitfield0: int,
+        bitfield1: int,
+        pad2: int,
+        pad3: int,
+        max_rescue_attempts: i8,
+        max_items_allowed: i8,
+        max_party_members: i8,
+        null7: i8,
+        turn_limit: i16,
+        random_movement_chance: i16,
+    ) -> DungeonRestriction:
+        assert pad2 == 0
+        assert pad3 == 0
         return cls(
-            DungeonRestrictionDirection(int(dir_bool)),
-            enemies_evolve_when_team_member_koed,
-            enemies_grant_exp,
-            recruiting_allowed,
-            level_reset,
-            money_allowed,
-            leader_can_be_changed,
-            dont_save_before_entering,
-            iq_skills_disabled,
-            traps_remain_invisible_on_attack,
-            enemies_can_drop_chests,
-            read_i8(b, 4),
-            read_i8(b, 5),
-            read_i8(b, 6),
-            read_i8(b, 7),
-            read_i16(b, 8),
-            read_i16(b, 10),
+            DungeonRestrictionDirection(bitfield0 & 1),
+            bool(bitfield0 >> 1 & 1),
+            bool(bitfield0 >> 2 & 1),
+            bool(bitfield0 >> 3 & 1),
+            bool(bitfield0 >> 4 & 1),
+            bool(bitfield0 >> 5 & 1),
+            bool(bitfield0 >> 6 & 1),
+            bool(bitfield0 >> 7 & 1),
+            bool(bitfield1 & 1),
+            bool(bitfield1 >> 1 & 1),
+            bool(bitfield1 >> 2 & 1),
+            max_rescue_attempts,
+            max_items_allowed,
+            max_party_members,
+            null7,
+            turn_limit,
+            random_movement_chance,
         )
 
-    def to_bytes(self) -> bytes:
-        bitfield0 = u8(
-            generate_bitfield(
-                (
-                    self.dont_save_before_entering,
-                    self.leader_can_be_changed,
-                    self.money_allowed,
-                    self.level_reset,
-                    self.recruiting_allowed,
-                    self.enemies_grant_exp,
-                    self.enemies_evolve_when_team_member_koed,
-                    bool(self.direction.value),
-                )
-            )
+    def _to_fields(self) -> tuple[int, ...]:
+        bitfield0 = (
+            self.direction.value
+            | self.enemies_evolve_when_team_member_koed << 1
+            | self.enemies_grant_exp << 2
+            | self.recruiting_allowed << 3
+            | self.level_reset << 4
+            | self.money_allowed << 5
+            | self.leader_can_be_changed << 6
+            | self.dont_save_before_entering << 7
+        )
+        bitfield1 = (
+            self.iq_skills_disabled | self.traps_remain_invisible_on_attack << 1 | self.enemies_can_drop_chests << 2
         )
-        bitfield1 = u8(
-            generate_bitfield(
-                (
-                    False,
-                    False,
-                    False,
-                    False,
-                    False,
-                    self.enemies_can_drop_chests,
-                    self.traps_remain_invisible_on_attack,
-                    self.iq_skills_disabled,
-                )
-            )
+        return (
+            bitfield0,
+            bitfield1,
+            0,
+            0,
+            self.max_rescue_attempts,
+            self.max_items_allowed,
+            self.max_party_members,
+            self.null7,
+            self.turn_limit,
+            self.random_movement_chance,
         )
-        bitfield2 = u8(0)
-        bitfield3 = u8(0)
-        buff = bytearray(DUNGEON_RESTRICTIONS_ENTRY_LEN)
-        write_u8(buff, bitfield0, 0)
-        write_u8(buff, bitfield1, 1)
-        write_u8(buff, bitfield2, 2)
-        write_u8(buff, bitfield3, 3)
-        write_i8(buff, self.max_rescue_attempts, 4)
-        write_i8(buff, self.max_items_allowed, 5)
-        write_i8(buff, self.max_party_members, 6)
-        write_i8(buff, self.null7, 7)
-        write_i16(buff, self.turn_limit, 8)
-        write_i16(buff, self.random_movement_chance, 10)
-        return buff
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, DungeonRestriction):
@@ -248,12 +221,22 @@ class DungeonRestriction(AutoString):
         )
 
 
+DUNGEON_RESTRICTIONS_LAYOUT: TableLayout[DungeonRestriction] = TableLayout(
+    "BBBBbbbbhh", DungeonRestriction._from_fields, DungeonRestriction._to_fields
+)
+
+
 class SecondaryTerrainTableEntry(Enum):
     WATER = 0
     LAVA = 1
     VOID = 2
 
 
+SECONDARY_TERRAINS_LAYOUT: TableLayout[SecondaryTerrainTableEntry] = TableLayout(
+    "B", SecondaryTerrainTableEntry, lambda e: (e.value,)
+)
+
+
 class MapMarkerPlacement(AutoString):
     level_id: i16
     reference_id: i16
@@ -268,15 +251,10 @@ class MapMarkerPlacement(AutoString):
 
     @classmethod
     def from_bytes(cls, b: bytes) -> MapMarkerPlacement:
-        return MapMarkerPlacement(read_i16(b, 0), read_i16(b, 2), read_i16(b, 4), read_i16(b, 6))
+        return MAP_MARKER_PLACEMENTS_LAYOUT.unpack(b)
 
     def to_bytes(self) -> bytes:
-        buff = bytearray(MAP_MARKER_PLACEMENTS_ENTRY_LEN)
-        write_i16(buff, self.level_id, 0)
-        write_i16(buff, self.reference_id, 2)
-        write_i16(buff, self.x, 4)
-        write_i16(buff, self.y, 6)
-        return buff
+        return MAP_MARKER_PLACEMENTS_LAYOUT.pack(self)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, MapMarkerPlacement):
@@ -289,6 +267,11 @@ class MapMarkerPlacement(AutoString):
         )
 
 
+MAP_MARKER_PLACEMENTS_LAYOUT: TableLayout[MapMarkerPlacement] = TableLayout(
+    "hhhh", MapMarkerPlacement, lambda e: (e.level_id, e.reference_id, e.x, e.y)
+)
+
+
 class TilesetBaseEnum(Enum):
     def __new__(cls, *args, **kwargs):  # type: ignore  # type: ignore
         obj = object.__new__(cls)
@@ -403,28 +386,44 @@ class TilesetProperties(AutoString):
         self.full_water_floor = full_water_floor
 
     @classmethod
-    @no_type_check
     def from_bytes(cls, b: bytes) -> TilesetProperties:
-        return TilesetProperties(
-            TilesetMapColor(read_u32(b, 0)),
-            TilesetStirringEffect(read_u8(b, 4)),
-            TilesetSecretPowerEffect(read_u8(b, 5)),
-            PokeType(read_u16(b, 6)),
-            TilesetNaturePowerMoveEntry(read_u16(b, 8)),
-            TilesetWeatherEffect(read_u8(b, 10)),
-            bool(read_u8(b, 11)),
-        )
+        return TILESET_PROPERTIES_LAYOUT.unpack(b)
 
     def to_bytes(self) -> bytes:
-        buff = bytearray(TILESET_PROPERTIES_ENTRY_LEN)
-        write_u32(buff, self.map_color.value, 0)
-        write_u8(buff, self.stirring_effect.value, 4)
-        write_u8(buff, self.secret_power_effect.value, 5)
-        write_u16(buff, self.camouflage_type.value, 6)
-        write_u16(buff, self.nature_power_move_entry.value, 8)
-        write_u8(buff, self.weather_effect.value, 10)
-        write_u8(buff, u8(int(self.full_water_floor)), 11)
-        return buff
+        return TILESET_PROPERTIES_LAYOUT.pack(self)
+
+    @classmethod
+    @no_type_check
+    def _from_fields(
+        cls,
+        map_color: int,
+        stirring_effect: int,
+        secret_power_effect: int,
+        camouflage_type: int,
+        nature_power_move_entry: int,
+        weather_effect: int,
+        full_water_floor: int,
+    ) -> TilesetProperties:
+        return cls(
+            TilesetMapColor(map_color),
+            TilesetStirringEffect(stirring_effect),
+            TilesetSecretPowerEffect(secret_power_effect),
+            PokeType(camouflage_type),
+            TilesetNaturePowerMoveEntry(nature_power_move_entry),
+            TilesetWeatherEffect(weather_effect),
+            bool(full_water_floor),
+        )
+
+    def _to_fields(self) -> tuple[int, ...]:
+        return (
+            self.map_color.value,
+            self.stirring_effect.value,
+            self.secret_power_effect.value,
+            self.camouflage_type.value,
+            self.nature_power_move_entry.value,
+            self.weather_effect.value,
+            int(self.full_water_floor),
+        )
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, TilesetProperties):
@@ -440,22 +439,23 @@ class TilesetProperties(AutoString):
         )
 
 
+TILESET_PROPERTIES_LAYOUT: TableLayout[TilesetProperties] = TableLayout(
+    "IBBHHBB", TilesetProperties._from_fields, TilesetProperties._to_fields
+)
+DUNGEON_LIST_LAYOUT: TableLayout[DungeonDefinition] = TableLayout(
+    "BBBB",
+    DungeonDefinition,
+    lambda e: (e.number_floors, e.mappa_index, e.start_after, e.number_floors_in_group),
+)
+
+
 class HardcodedDungeons:
     @staticmethod
     def get_dungeon_list(arm9bin: bytes, config: Pmd2Data) -> list[DungeonDefinition]:
         """Returns the list of dungeon definitions."""
         block = config.bin_sections.arm9.data.DUNGEON_DATA_LIST
-        lst = []
-        for i in range(block.address, block.address + block.length, DUNGEON_LIST_ENTRY_LEN):
-            lst.append(
-                DungeonDefinition(
-                    read_u8(arm9bin, i),
-                    read_u8(arm9bin, i + 1),
-                    read_u8(arm9bin, i + 2),
-                    read_u8(arm9bin, i + 3),
-                )
-            )
-        return lst
+        assert block.length is not None
+        return DUNGEON_LIST_LAYOUT.read(arm9bin, block.address, block.length)
 
     @staticmethod
     def set_dungeon_list(value: list[DungeonDefinition], arm9bin: bytearray, config: Pmd2Data) -> None:
@@ -465,29 +465,14 @@ class HardcodedDungeons:
         """
         block = config.bin_sections.arm9.data.DUNGEON_DATA_LIST
         assert block.length is not None
-        expected_length = int(block.length / DUNGEON_LIST_ENTRY_LEN)
-        if len(value) != expected_length:
-            raise ValueError(f"The list must have exactly the length of {expected_length} entries.")
-        for i, entry in enumerate(value):
-            arm9bin[block.address + i * DUNGEON_LIST_ENTRY_LEN : block.address + (i + 1) * DUNGEON_LIST_ENTRY_LEN] = (
-                bytes(
-                    [
-                        entry.number_floors,
-                        entry.mappa_index,
-                        entry.start_after,
-                        entry.number_floors_in_group,
-                    ]
-                )
-            )
+        DUNGEON_LIST_LAYOUT.write(value, arm9bin, block.address, block.length)
 
     @staticmethod
     def get_dungeon_restrictions(arm9bin: bytes, config: Pmd2Data) -> list[DungeonRestriction]:
         """Returns the list of dungeon restrictions."""
         block = config.bin_sections.arm9.data.DUNGEON_RESTRICTIONS
-        lst = []
-        for i in range(block.address, block.address + block.length, DUNGEON_RESTRICTIONS_ENTRY_LEN):
-            lst.append(DungeonRestriction.from_bytes(arm9bin[i : i + DUNGEON_RESTRICTIONS_ENTRY_LEN]))
-        return lst
+        assert block.length is not None
+        return DUNGEON_RESTRICTIONS_LAYOUT.read(arm9bin, block.address, block.length)
 
     @staticmethod
     def set_dungeon_restrictions(value: list[DungeonRestriction], arm9bin: bytearray, config: Pmd2Data) -> None:
@@ -497,29 +482,14 @@ class HardcodedDungeons:
         """
         block = config.bin_sections.arm9.data.DUNGEON_RESTRICTIONS
         assert block.length is not None
-        expected_length = int(block.length / DUNGEON_RESTRICTIONS_ENTRY_LEN)
-        if len(value) != expected_length:
-            raise ValueError(f"The list must have exactly the length of {expected_length} entries.")
-        for i, entry in enumerate(value):
-            start = block.address + (i * DUNGEON_RESTRICTIONS_ENTRY_LEN)
-            arm9bin[start : start + DUNGEON_RESTRICTIONS_ENTRY_LEN] = entry.to_bytes()
+        DUNGEON_RESTRICTIONS_LAYOUT.write(value, arm9bin, block.address, block.length)
 
     @staticmethod
     def get_secondary_terrains(arm9bin: bytes, config: Pmd2Data) -> list[SecondaryTerrainTableEntry]:
         """Returns the list of secondary terrains."""
         block = config.bin_sections.arm9.data.SECONDARY_TERRAIN_TYPES
-        lst = []
-        for i in range(block.address, block.address + block.length, SECONDARY_TERRAINS_ENTRY_LEN):
-            lst.append(
-                SecondaryTerrainTableEntry(
-                    int.from_bytes(
-                        arm9bin[i : i + SECONDARY_TERRAINS_ENTRY_LEN],
-                        "little",
-                        signed=False,
-                    )
-                )
-            )
-        return lst
+        assert block.length is not None
+        return SECONDARY_TERRAINS_LAYOUT.read(arm9bin, block.address, block.length)
 
     @staticmethod
     def set_secondary_terrains(value: list[SecondaryTerrainTableEntry], arm9bin: bytearray, config: Pmd2Data) -> None:
@@ -529,23 +499,14 @@ class HardcodedDungeons:
         """
         block = config.bin_sections.arm9.data.SECONDARY_TERRAIN_TYPES
         assert block.length is not None
-        expected_length = int(block.length / SECONDARY_TERRAINS_ENTRY_LEN)
-        if len(value) != expected_length:
-            raise ValueError(f"The list must have exactly the length of {expected_length} entries.")
-        for i, entry in enumerate(value):
-            start = block.address + (i * SECONDARY_TERRAINS_ENTRY_LEN)
-            arm9bin[start : start + SECONDARY_TERRAINS_ENTRY_LEN] = entry.value.to_bytes(
-                SECONDARY_TERRAINS_ENTRY_LEN, "little", signed=False
-            )
+        SECONDARY_TERRAINS_LAYOUT.write(value, arm9bin, block.address, block.length)
 
     @staticmethod
     def get_marker_placements(arm9bin: bytes, config: Pmd2Data) -> list[MapMarkerPlacement]:
         """Returns the list of secondary terrains."""
         block = config.bin_sections.arm9.data.MAP_MARKER_PLACEMENTS
-        lst = []
-        for i in range(block.address, block.address + block.length, MAP_MARKER_PLACEMENTS_ENTRY_LEN):
-            lst.append(MapMarkerPlacement.from_bytes(arm9bin[i : i + MAP_MARKER_PLACEMENTS_ENTRY_LEN]))
-        return lst
+        assert block.length is not None
+        return MAP_MARKER_PLACEMENTS_LAYOUT.read(arm9bin, block.address, block.length)
 
     @staticmethod
     def set_marker_placements(value: list[MapMarkerPlacement], arm9bin: bytearray, config: Pmd2Data) -> None:
@@ -555,28 +516,16 @@ class HardcodedDungeons:
         """
         block = config.bin_sections.arm9.data.MAP_MARKER_PLACEMENTS
         assert block.length is not None
-        expected_length = int(block.length / MAP_MARKER_PLACEMENTS_ENTRY_LEN)
-        if len(value) != expected_length:
-            raise ValueError(f"The list must have exactly the length of {expected_length} entries.")
-        for i, entry in enumerate(value):
-            start = block.address + (i * MAP_MARKER_PLACEMENTS_ENTRY_LEN)
-            arm9bin[start : start + MAP_MARKER_PLACEMENTS_ENTRY_LEN] = entry.to_bytes()
+        MAP_MARKER_PLACEMENTS_LAYOUT.write(value, arm9bin, block.address, block.length)
 
     @staticmethod
     def get_tileset_properties(ov10: bytes, config: Pmd2Data) -> list[TilesetProperties]:
         block = config.bin_sections.overlay10.data.TILESET_PROPERTIES
-        lst = []
-        for i in range(block.address, block.address + block.length, TILESET_PROPERTIES_ENTRY_LEN):
-            lst.append(TilesetProperties.from_bytes(ov10[i : i + TILESET_PROPERTIES_ENTRY_LEN]))
-        return lst
+        assert block.length is not None
+        return TILESET_PROPERTIES_LAYOUT.read(ov10, block.address, block.length)
 
     @staticmethod
     def set_tileset_properties(value: list[TilesetProperties], ov10: bytearray, config: Pmd2Data) -> None:
         block = config.bin_sections.overlay10.data.TILESET_PROPERTIES
         assert block.length is not None
-        expected_length = int(block.length / TILESET_PROPERTIES_ENTRY_LEN)
-        if len(value) != expected_length:
-            raise ValueError(f"The list must have exactly the length of {expected_length} entries.")
-        for i, entry in enumerate(value):
-            start = block.address + (i * TILESET_PROPERTIES_ENTRY_LEN)
-            ov10[start : start + TILESET_PROPERTIES_ENTRY_LEN] = entry.to_bytes()
+        TILESET_PROPERTIES_LAYOUT.write(value, ov10, block.address, block.length)
@@ -22,14 +22,13 @@ from range_typed_integers import u8_checked, u16_checked, i32, i16, u16, u8
 
 from skytemple_files.common.ppmdu_config.data import Pmd2Data
 from skytemple_files.common.util import (
-    read_i32,
     read_u8,
-    read_i16,
     read_u16,
     write_u16,
     read_dynamic,
     write_u8,
 )
+from skytemple_files.hardcoded.table_layout import TableLayout
 
 IQ_GAINS_TABLES = {False: (18, 2), True: (25, 1)}
 IQ_SKILL_ENTRY_LEN = 4
@@ -54,6 +53,11 @@ class IqSkill:
         return self.iq_required == other.iq_required and self.restriction_group == other.restriction_group
 
 
+# The IQ required and the restriction group of the skills are stored in two separate tables.
+IQ_SKILL_LAYOUT: TableLayout[i32] = TableLayout("i", i32, lambda v: (v,))
+IQ_SKILL_RESTR_LAYOUT: TableLayout[i16] = TableLayout("h", i16, lambda v: (v,))
+
+
 class HardcodedIq:
     @staticmethod
     def get_min_iq_for_exclusive_move_user(arm9: bytes, config: Pmd2Data) -> u16:
@@ -200,15 +204,13 @@ class HardcodedIq:
         assert block.length is not None
         assert block_restr.length is not None
         assert block.length // IQ_SKILL_ENTRY_LEN == block_restr.length // IQ_SKILL_RESTR_ENTRY_LEN
-        lst = []
-        for i in range(0, block.length // IQ_SKILL_ENTRY_LEN):
-            lst.append(
-                IqSkill(
-                    read_i32(arm9bin, block.address + (i * IQ_SKILL_ENTRY_LEN)),
-                    read_i16(arm9bin, block_restr.address + (i * IQ_SKILL_RESTR_ENTRY_LEN)),
-                )
+        return [
+            IqSkill(iq_required, restriction_group)
+            for iq_required, restriction_group in zip(
+                IQ_SKILL_LAYOUT.read(arm9bin, block.address, block.length),
+                IQ_SKILL_RESTR_LAYOUT.read(arm9bin, block_restr.address, block_restr.length),
             )
-        return lst
+        ]
 
     @staticmethod
     def set_iq_skills(value: list[IqSkill], arm9bin: bytearray, config: Pmd2Data) -> None:
@@ -217,17 +219,10 @@ class HardcodedIq:
         assert block.length is not None
         assert block_restr.length is not None
         assert block.length // IQ_SKILL_ENTRY_LEN == block_restr.length // IQ_SKILL_RESTR_ENTRY_LEN
-        expected_length = int(block.length / IQ_SKILL_ENTRY_LEN)
-        if len(value) != expected_length:
-            raise ValueError(f"The list must have exactly the length of {expected_length} entries.")
-        for i, entry in enumerate(value):
-            arm9bin[block.address + i * IQ_SKILL_ENTRY_LEN : block.address + (i + 1) * IQ_SKILL_ENTRY_LEN] = (
-                entry.iq_required.to_bytes(IQ_SKILL_ENTRY_LEN, byteorder="little", signed=True)
-            )
-            arm9bin[
-                block_restr.address + i * IQ_SKILL_RESTR_ENTRY_LEN : block_restr.address
-                + (i + 1) * IQ_SKILL_RESTR_ENTRY_LEN
-            ] = entry.restriction_group.to_bytes(IQ_SKILL_RESTR_ENTRY_LEN, byteorder="little", signed=True)
+        IQ_SKILL_LAYOUT.write([entry.iq_required for entry in value], arm9bin, block.address, block.length)
+        IQ_SKILL_RESTR_LAYOUT.write(
+            [entry.restriction_group for entry in value], arm9bin, block_restr.address, block_restr.length
+        )
 
 
 class IqGroupsSkills:
@@ -29,10 +29,8 @@ from range_typed_integers import u8
 
 from skytemple_files.common.i18n_util import _
 from skytemple_files.common.ppmdu_config.data import Pmd2Data
-from skytemple_files.common.util import (
-    AutoString,
-    read_u8,
-)
+from skytemple_files.common.util import AutoString
+from skytemple_files.hardcoded.table_layout import TableLayout
 
 ENTRY_LEN = 2
 
@@ -54,15 +52,18 @@ class MonsterSpriteDataTableEntry(AutoString):
         return self.sprite_tile_slots == other.sprite_tile_slots and self.unk1 == other.unk1
 
 
+MONSTER_SPRITE_DATA_LAYOUT: TableLayout[MonsterSpriteDataTableEntry] = TableLayout(
+    "BB", MonsterSpriteDataTableEntry, lambda e: (e.sprite_tile_slots, e.unk1)
+)
+
+
 class HardcodedMonsterSpriteDataTable:
     @classmethod
     def get(cls, arm9bin: bytes, config: Pmd2Data) -> list[MonsterSpriteDataTableEntry]:
         """Returns the list."""
         block = config.bin_sections.arm9.data.MONSTER_SPRITE_DATA
-        lst = []
-        for i in range(block.address, block.address + block.length, ENTRY_LEN):
-            lst.append(MonsterSpriteDataTableEntry(read_u8(arm9bin, i + 0x00), read_u8(arm9bin, i + 0x01)))
-        return lst
+        assert block.length is not None
+        return MONSTER_SPRITE_DATA_LAYOUT.read(arm9bin, block.address, block.length)
 
     @classmethod
     def set(
@@ -77,11 +78,7 @@ class HardcodedMonsterSpriteDataTable:
         """
         block = config.bin_sections.arm9.data.MONSTER_SPRITE_DATA
         assert block.length is not None
-        expected_length = int(block.length / ENTRY_LEN)
-        if len(value) != expected_length:
-            raise ValueError(f"The list must have exactly the length of {expected_length} entries.")
-        for i, entry in enumerate(value):
-            arm9bin[block.address + (i * ENTRY_LEN) : block.address + ((i + 1) * ENTRY_LEN)] = entry.to_bytes()
+        MONSTER_SPRITE_DATA_LAYOUT.write(value, arm9bin, block.address, block.length)
 
 
 class IdleAnimType(Enum):
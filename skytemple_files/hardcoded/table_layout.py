@@ -0,0 +1,72 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import struct
+from collections.abc import Callable, Sequence
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class TableLayout(Generic[T]):
+    """
+    Layout of the fixed-size entries of a hardcoded table.
+
+    The format of an entry (see the struct module, without byte order; all tables are little endian)
+    is compiled once, the whole table is then read and written with single bulk operations.
+    ``decode`` is called with the unpacked fields of an entry and returns the entry,
+    ``encode`` returns the fields of an entry, in the order of the format.
+    """
+
+    def __init__(
+        self,
+        fmt: str,
+        decode: Callable[..., T],
+        encode: Callable[[T], Sequence[Any]],
+    ):
+        self.fmt = fmt
+        self.struct = struct.Struct("<" + fmt)
+        self.size = self.struct.size
+        self._decode = decode
+        self._encode = encode
+
+    def unpack(self, data: bytes) -> T:
+        """Reads a single entry from the start of data."""
+        return self._decode(*self.struct.unpack_from(data))
+
+    def pack(self, entry: T) -> bytes:
+        """Returns the bytes of a single entry."""
+        return self.struct.pack(*self._encode(entry))
+
+    def read(self, data: bytes, address: int, length: int) -> list[T]:
+        """Returns all entries of the table of length bytes at address."""
+        decode = self._decode
+        end = address + length - length % self.size
+        return [decode(*fields) for fields in self.struct.iter_unpack(memoryview(data)[address:end])]
+
+    def write(self, values: Sequence[T], data: bytearray, address: int, length: int) -> None:
+        """
+        Writes the entries to the table of length bytes at address.
+        The number of entries must exactly match the number of entries in the table.
+        """
+        expected_length = length // self.size
+        if len(values) != expected_length:
+            raise ValueError(f"The list must have exactly the length of {expected_length} entries.")
+        pack = self.struct.pack
+        encode = self._encode
+        data[address : address + expected_length * self.size] = b"".join(pack(*encode(entry)) for entry in values)
@@ -16,7 +16,7 @@
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 from __future__ import annotations
 
-from skytemple_files.common.ppmdu_config.xml_reader import Pmd2XmlReader
+from skytemple_files.common.ppmdu_config.cache import get_default_config_registry
 from skytemple_files.common.types.data_handler import DataHandler
 from skytemple_files.common.util import OptionalKwargs
 from skytemple_files.script.ssa_sse_sss.model import Ssa
@@ -27,7 +27,7 @@ class SsaHandler(DataHandler[Ssa]):
     @classmethod
     def deserialize(cls, data: bytes, scriptdata=None, **kwargs: OptionalKwargs) -> Ssa:
         if scriptdata is None:
-            scriptdata = Pmd2XmlReader.load_default().script_data
+            scriptdata = get_default_config_registry().fallback("SsaHandler.deserialize").script_data
         return Ssa(scriptdata, data)
 
     @classmethod
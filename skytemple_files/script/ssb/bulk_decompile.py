@@ -0,0 +1,242 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from explorerscript import EXPLORERSCRIPT_EXT
+from explorerscript.source_map import SourceMap
+from ndspy.rom import NintendoDSRom
+
+from skytemple_files.common.ppmdu_config.data import Pmd2Data
+from skytemple_files.common.project_file_manager import EXPLORERSCRIPT_SOURCE_MAP_SUFFIX, ProjectFileManager
+from skytemple_files.common.script_util import SCRIPT_DIR, get_ssb_filenames, load_script_files
+from skytemple_files.common.types.file_types import FileType
+from skytemple_files.common.util import get_package_version, get_rom_folder, open_utf8, write_file_atomically
+
+DECOMPILE_CACHE_DIR_NAME = "exps_cache"
+# Bump this if the decompiled scripts change for the same SSB files.
+DECOMPILE_CACHE_VERSION = 1
+
+# The configuration used by decompile_ssb, set up by init_decompile in the main process and in each worker process.
+rom_data: Pmd2Data | None = None
+
+
+class SsbDecompileCache:
+    """
+    On-disk cache of decompiled SSB files: The ExplorerScript source and the serialized source map,
+    keyed by the hash of the SSB file, the configuration (see config_digest) and the versions of the decompiler.
+
+    The cache directory can be shared between projects and machines. Entries are written atomically.
+    """
+
+    def __init__(self, directory: str | None = None):
+        if directory is None:
+            directory = os.path.join(ProjectFileManager.shared_config_dir(), DECOMPILE_CACHE_DIR_NAME)
+        self.directory = directory
+
+    @staticmethod
+    def config_digest(config: Pmd2Data) -> str:
+        """
+        Hashes the parts of the configuration the decompiled scripts depend on: The game edition and the
+        script data (opcodes, game variables, actors, objects, levels and the other constants).
+        ROM hacks can change these, so the same SSB file may decompile differently.
+        """
+        script_data = config.script_data
+        h = hashlib.sha256(config.game_edition.encode())
+        for op_code in script_data.op_codes:
+            h.update(
+                repr(
+                    (
+                        op_code.id,
+                        op_code.name,
+                        op_code.params,
+                        op_code.stringidx,
+                        op_code.unk2,
+                        op_code.unk3,
+                        op_code.arguments,
+                        op_code.repeating_argument_group,
+                    )
+                ).encode()
+            )
+        for constants in (
+            script_data.game_variables,
+            script_data.objects,
+            script_data.face_names,
+            script_data.face_position_modes,
+            script_data.directions,
+            script_data.common_routine_info,
+            script_data.menus,
+            script_data.process_specials,
+            script_data.sprite_effects,
+            script_data.bgms,
+            script_data.level_list,
+            script_data.level_entities,
+            script_data.ground_state_structs,
+        ):
+            h.update(repr(constants).encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def key(ssb_data: bytes, config_digest: str) -> str:
+        """Returns the key of an SSB file, config_digest is the result of config_digest for the configuration."""
+        h = hashlib.sha256(f"{DECOMPILE_CACHE_VERSION}:{config_digest}:".encode())
+        h.update(f"{get_package_version()}:{get_package_version('explorerscript')}:".encode())
+        h.update(ssb_data)
+        return h.hexdigest()
+
+    def get(self, key: str) -> tuple[str, str] | None:
+        """Returns the source and the serialized source map for the key, or None if they are not cached."""
+        path = self._path(key)
+        try:
+            with open_utf8(path, "r") as f:
+                source = f.read()
+            with open_utf8(path + EXPLORERSCRIPT_SOURCE_MAP_SUFFIX, "r") as f:
+                source_map = f.read()
+        except FileNotFoundError:
+            return None
+        return source, source_map
+
+    def put(self, key: str, source: str, source_map: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # The source map is written last, get only returns entries that have both files.
+        write_file_atomically(path, source.encode("utf-8"))
+        write_file_atomically(path + EXPLORERSCRIPT_SOURCE_MAP_SUFFIX, source_map.encode("utf-8"))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + EXPLORERSCRIPT_EXT)
+
+
+@dataclass
+class BulkDecompileResult:
+    """How many scripts were already up to date in the project, taken from the cache or decompiled."""
+
+    up_to_date: int = 0
+    from_cache: int = 0
+    decompiled: int = 0
+    # SSB filename -> error message
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def decompile_all(
+    rom: NintendoDSRom,
+    config: Pmd2Data,
+    project_fm: ProjectFileManager,
+    cache: SsbDecompileCache | None = None,
+    jobs: int = 1,
+    force: bool = False,
+    progress: Callable[[int, int, str], None] | None = None,
+) -> BulkDecompileResult:
+    """
+    Decompiles all SSB files of the ROM to ExplorerScript and saves them in the project.
+
+    Scripts whose ExplorerScript source in the project is up to date with the SSB file in the ROM are
+    skipped, unless force is set. Everything else is taken from the cache if possible or decompiled,
+    in a pool of jobs worker processes if jobs > 1, and stored in the cache.
+    progress is called after each script with the number of scripts done, the number of scripts
+    to do and the SSB filename.
+    """
+    if cache is None:
+        cache = SsbDecompileCache()
+    script_folder = get_rom_folder(rom, SCRIPT_DIR)
+    if script_folder is None:
+        raise ValueError(f"The ROM has no {SCRIPT_DIR} directory.")
+    config_digest = SsbDecompileCache.config_digest(config)
+    result = BulkDecompileResult()
+    pending: dict[str, tuple[bytes, str, str]] = {}
+    for ssb_filename in get_ssb_filenames(load_script_files(script_folder)):
+        ssb_data = rom.getFileByName(ssb_filename)
+        ssb_hash = hashlib.sha256(ssb_data).hexdigest()
+        if (
+            not force
+            and project_fm.explorerscript_exists(ssb_filename)
+            and project_fm.explorerscript_hash_up_to_date(ssb_filename, ssb_hash)
+        ):
+            result.up_to_date += 1
+        else:
+            pending[ssb_filename] = (ssb_data, ssb_hash, cache.key(ssb_data, config_digest))
+
+    total = len(pending)
+    done = 0
+
+    def store(ssb_filename: str, source: str, source_map: str):
+        nonlocal done
+        project_fm.explorerscript_save(ssb_filename, source, SourceMap.deserialize(source_map))
+        project_fm.explorerscript_save_hash(ssb_filename, pending[ssb_filename][1])
+        done += 1
+        if progress:
+            progress(done, total, ssb_filename)
+
+    # Scripts with the same key (the same SSB file) are only decompiled once.
+    to_decompile: dict[str, list[str]] = {}
+    for ssb_filename, (_ssb_data, _ssb_hash, key) in pending.items():
+        cached = cache.get(key)
+        if cached is not None:
+            result.from_cache += 1
+            store(ssb_filename, *cached)
+        else:
+            to_decompile.setdefault(key, []).append(ssb_filename)
+
+    def decompiled(key: str, decompile_result: tuple[str, str] | str):
+        if isinstance(decompile_result, str):
+            for ssb_filename in to_decompile[key]:
+                result.errors[ssb_filename] = decompile_result
+            return
+        cache.put(key, *decompile_result)
+        for ssb_filename in to_decompile[key]:
+            result.decompiled += 1
+            store(ssb_filename, *decompile_result)
+
+    if jobs <= 1 or len(to_decompile) <= 1:
+        init_decompile(config)
+        for key, ssb_filenames in to_decompile.items():
+            decompiled(key, decompile_ssb(pending[ssb_filenames[0]][0]))
+        return result
+    # The configuration is read-only for decompiling. Forked workers share the memory of the main process,
+    # otherwise it is pickled once per worker.
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_decompile, initargs=(config,)) as executor:
+        futures = {
+            executor.submit(decompile_ssb, pending[ssb_filenames[0]][0]): key
+            for key, ssb_filenames in to_decompile.items()
+        }
+        for future in as_completed(futures):
+            decompiled(futures[future], future.result())
+    return result
+
+
+def init_decompile(config: Pmd2Data):
+    """Sets the configuration for decompile_ssb. This is the initializer of the worker processes."""
+    global rom_data
+    rom_data = config
+
+
+def decompile_ssb(ssb_data: bytes) -> tuple[str, str] | str:
+    """
+    Decompiles an SSB file. Returns the ExplorerScript source and the serialized source map,
+    or the error message if the file could not be decompiled.
+    """
+    assert rom_data is not None
+    try:
+        source, source_map = FileType.SSB.deserialize(ssb_data, static_data=rom_data).to_explorerscript()
+        return source, source_map.serialize()
+    except (ValueError, KeyError, IndexError) as ex:
+        return f"{type(ex).__name__}: {ex}"
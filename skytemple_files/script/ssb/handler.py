@@ -23,7 +23,7 @@ from skytemple_files.common.ppmdu_config.data import (
     GAME_REGION_US,
     Pmd2Data,
 )
-from skytemple_files.common.ppmdu_config.xml_reader import Pmd2XmlReader
+from skytemple_files.common.ppmdu_config.cache import get_default_config_registry
 from skytemple_files.common.types.data_handler import DataHandler
 from skytemple_files.common.util import OptionalKwargs
 from skytemple_files.script.ssb.header import (
@@ -40,7 +40,7 @@ class SsbHandler(DataHandler[Ssb]):
     @classmethod
     def deserialize(cls, data: bytes, static_data: Pmd2Data | None = None, **kwargs: OptionalKwargs) -> Ssb:  # type: ignore
         if static_data is None:
-            static_data = Pmd2XmlReader.load_default()
+            static_data = get_default_config_registry().fallback("SsbHandler.deserialize")
         ssb_header: AbstractSsbHeader
         if static_data.game_region == GAME_REGION_EU:
             ssb_header = SsbHeaderEu(data)
@@ -62,7 +62,7 @@ class SsbHandler(DataHandler[Ssb]):
     @classmethod
     def serialize(cls, data: Ssb, static_data: Pmd2Data | None = None, **kwargs: OptionalKwargs) -> bytes:  # type: ignore
         if static_data is None:
-            static_data = Pmd2XmlReader.load_default()
+            static_data = get_default_config_registry().fallback("SsbHandler.serialize")
 
         return SsbWriter(data, static_data).write()
 
@@ -70,7 +70,7 @@ class SsbHandler(DataHandler[Ssb]):
     def create(cls, static_data: Pmd2Data | None = None) -> Ssb:
         """Create a new empty script"""
         if static_data is None:
-            static_data = Pmd2XmlReader.load_default()
+            static_data = get_default_config_registry().fallback("SsbHandler.create")
 
         header_cls: type[AbstractSsbHeader]
         if static_data.game_region == GAME_REGION_US:
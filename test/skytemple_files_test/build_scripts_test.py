@@ -0,0 +1,97 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from skytemple_files.build_scripts import (
+    REASON_INCLUDE,
+    REASON_NEW,
+    REASON_SOURCE,
+    ScriptBuildState,
+    ScriptDependencyGraph,
+    _hash_file,
+)
+
+
+class BuildScriptsTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.realpath(self._tmp.name)
+        self.lib = os.path.join(self.dir, "lib")
+        os.makedirs(os.path.join(self.dir, "SCRIPT", "COMMON"))
+        os.makedirs(self.lib)
+        self.script = self._write("SCRIPT/COMMON/unionall.exps", 'import "../macros.exps";\nimport "shared.exps";\n')
+        self.macros = self._write("SCRIPT/macros.exps", 'import "./constants.exps";\n')
+        self.constants = self._write("SCRIPT/constants.exps", "const A = 1;\n")
+        self.shared = self._write("lib/shared.exps", "")
+        self.other = self._write("SCRIPT/other.exps", "")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, path: str, content: str) -> str:
+        path = os.path.join(self.dir, path)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_dependencies(self):
+        graph = ScriptDependencyGraph({self.other: ["SCRIPT/COMMON/unionall.ssb"]}, [self.lib])
+        self.assertEqual(
+            {self.macros, self.constants, self.shared, self.other},
+            graph.dependencies("SCRIPT/COMMON/unionall.ssb", self.script),
+        )
+        graph.remove_usage(self.other, "SCRIPT/COMMON/unionall.ssb")
+        self.assertEqual(
+            {self.macros, self.constants, self.shared}, graph.dependencies("SCRIPT/COMMON/unionall.ssb", self.script)
+        )
+
+    def test_dependencies_unresolved_import(self):
+        graph = ScriptDependencyGraph({}, [])
+        self.assertEqual({self.macros, self.constants}, graph.dependencies("SCRIPT/COMMON/unionall.ssb", self.script))
+
+    def test_dirty_reason(self):
+        graph = ScriptDependencyGraph({}, [self.lib])
+        deps = graph.dependencies("SCRIPT/COMMON/unionall.ssb", self.script)
+        hashes = {path: _hash_file(path) for path in deps}
+
+        state = ScriptBuildState(self.dir)
+        self.assertEqual(REASON_NEW, state.dirty_reason("SCRIPT/COMMON/unionall.ssb", "a", hashes))
+        state.record("SCRIPT/COMMON/unionall.ssb", "a", hashes)
+        state.save()
+
+        state = ScriptBuildState(self.dir)
+        self.assertIsNone(state.dirty_reason("SCRIPT/COMMON/unionall.ssb", "a", hashes))
+        self.assertEqual(REASON_SOURCE, state.dirty_reason("SCRIPT/COMMON/unionall.ssb", "b", hashes))
+
+        self._write("SCRIPT/constants.exps", "const A = 2;\n")
+        hashes = {path: _hash_file(path) for path in deps}
+        self.assertEqual(REASON_INCLUDE, state.dirty_reason("SCRIPT/COMMON/unionall.ssb", "a", hashes))
+
+    def test_dirty_reason_dependency_removed(self):
+        state = ScriptBuildState(self.dir)
+        state.record("SCRIPT/COMMON/unionall.ssb", "a", {self.shared: _hash_file(self.shared)})
+        self.assertIsNone(state.dirty_reason("SCRIPT/COMMON/unionall.ssb", "a", {}))
+        os.remove(self.shared)
+        self.assertEqual(REASON_INCLUDE, state.dirty_reason("SCRIPT/COMMON/unionall.ssb", "a", {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import struct
+import unittest
+from types import SimpleNamespace
+
+from skytemple_files.common.util import BinaryWorkspace, is_binary_in_rom
+
+
+class RomStub:
+    """Just enough of NintendoDSRom for the binary functions in util."""
+
+    def __init__(self):
+        self.arm9 = b"\x01\x02\x03\x04"
+        self.arm9PostData = b"\xff"
+        self.arm7 = b"\x07" * 4
+        # Overlay 10 in file 0
+        self.arm9OverlayTable = struct.pack("<8I", 10, 0, 0, 0, 0, 0, 0, 0)
+        self.files = [b"\x0a" * 8]
+        self.overlay_loads = 0
+
+    def loadArm9Overlays(self, ids):
+        self.overlay_loads += 1
+        if 10 not in ids:
+            return {}
+        return {10: SimpleNamespace(data=self.files[0], fileID=0)}
+
+
+def section(name):
+    return SimpleNamespace(name=name)
+
+
+ARM9 = section("arm9")
+ARM7 = section("arm7")
+OV10 = section("overlay10")
+OV11 = section("overlay11")
+
+
+class BinaryWorkspaceTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rom = RomStub()
+        self.workspace = BinaryWorkspace(self.rom)
+
+    def test_loads_once(self):
+        a = self.workspace.get(OV10)
+        b = self.workspace.get(OV10)
+        self.assertIs(a, b)
+        self.assertEqual(1, self.rom.overlay_loads)
+        self.assertEqual(b"\x01\x02\x03\x04\xff", self.workspace.get(ARM9))
+
+    def test_commit_only_modified(self):
+        self.workspace.get(ARM7)[0] = 0
+        self.workspace.edit(OV10)[0] = 0
+        arm9 = self.workspace.edit(ARM9)
+        arm9[1] = 0
+        arm9[2] = 0
+        self.workspace.commit()
+        self.assertEqual(b"\x07" * 4, self.rom.arm7)
+        self.assertEqual(b"\x00" + b"\x0a" * 7, self.rom.files[0])
+        self.assertEqual(b"\x01\x00\x00\x04\xff", self.rom.arm9)
+        self.assertFalse(self.workspace.is_modified(ARM9))
+
+    def test_context_manager(self):
+        with self.workspace as workspace:
+            workspace.set(ARM7, b"\x00")
+        self.assertEqual(b"\x00", self.rom.arm7)
+        with self.assertRaises(RuntimeError):
+            with BinaryWorkspace(self.rom) as workspace:
+                workspace.set(ARM7, b"\x01")
+                raise RuntimeError()
+        self.assertEqual(b"\x00", self.rom.arm7)
+
+    def test_mark_modified(self):
+        with self.assertRaises(ValueError):
+            self.workspace.mark_modified(ARM9)
+        self.workspace.get(ARM9)[0] = 0
+        self.workspace.mark_modified(ARM9)
+        self.workspace.commit()
+        self.assertEqual(0, self.rom.arm9[0])
+
+    def test_contains(self):
+        self.assertTrue(is_binary_in_rom(self.rom, ARM9))
+        self.assertTrue(is_binary_in_rom(self.rom, OV10))
+        self.assertFalse(is_binary_in_rom(self.rom, OV11))
+        self.assertFalse(is_binary_in_rom(self.rom, None))
+        self.assertTrue(self.workspace.contains(OV10))
+        self.assertFalse(self.workspace.contains(OV11))
+        self.assertEqual(0, self.rom.overlay_loads)
+        with self.assertRaises(ValueError):
+            self.workspace.get(OV11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from skytemple_files.common.dungeon_floor_generator.batch import (
+    UNREACHABLE,
+    DungeonFloorBatchGenerator,
+    FloorStatistics,
+    stairs_distance,
+)
+from skytemple_files.common.dungeon_floor_generator.generator import (
+    DungeonFloorGenerator,
+    RandomGenProperties,
+    RoomType,
+    TileType,
+)
+from skytemple_files.common.types.file_types import FileType
+
+FIX_MAPPA = os.path.join(os.path.dirname(__file__), "..", "dungeon_data", "mappa_bin", "fixtures", "fixture.bin")
+SEEDS = list(range(12))
+
+
+def _describe(tiles):
+    return [(str(t), t.terrain, t.room_index, t.typ, t.room_type) for t in tiles]
+
+
+class DungeonFloorBatchGeneratorTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(FIX_MAPPA, "rb") as f:
+            self.mappa = FileType.MAPPA_BIN.deserialize(f.read())
+        # Layouts with invalid generations, monster houses and kecleon shops.
+        fls = self.mappa.floor_lists
+        self.layouts = [fls[0][0].layout, fls[1][3].layout, fls[0][1].layout]
+
+    def test_matches_generator(self):
+        batch = DungeonFloorBatchGenerator(shard_size=5)
+        for layout in self.layouts:
+            floors = batch.generate(layout, SEEDS)
+            self.assertEqual(SEEDS, floors.seeds)
+            for n, seed in enumerate(SEEDS):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    expected = DungeonFloorGenerator(gen_properties=RandomGenProperties.from_seed(seed)).generate(
+                        layout, flat=True
+                    )
+                floor = floors.floor(n)
+                if expected is None:
+                    self.assertIsNone(floor)
+                else:
+                    self.assertEqual(_describe(expected), _describe(floor.tiles(flat=True)))
+
+    def test_statistics(self):
+        batch = DungeonFloorBatchGenerator()
+        totals = FloorStatistics()
+        for layout in self.layouts:
+            floors = batch.generate(layout, SEEDS)
+            statistics = batch.statistics(layout, SEEDS)
+            self.assertEqual(len(SEEDS), statistics.floors)
+            self.assertEqual(floors.valid.count(False), statistics.invalid)
+            self.assertEqual(statistics.valid, sum(statistics.room_counts.values()))
+            self.assertEqual(statistics.valid, sum(statistics.stairs_distances.values()))
+            monster_houses = 0
+            for n in range(len(floors)):
+                floor = floors.floor(n)
+                if floor is None:
+                    continue
+                tiles = floor.tiles(flat=True)
+                if any(t.room_type == RoomType.MONSTER_HOUSE for t in tiles):
+                    monster_houses += 1
+                distance = stairs_distance(floor)
+                if distance != UNREACHABLE:
+                    (px, py), (sx, sy) = floor.player_spawn, floor.stairs
+                    self.assertGreaterEqual(distance, max(abs(px - sx), abs(py - sy)))
+                    if (px, py) != (sx, sy):
+                        self.assertEqual(TileType.STAIRS, tiles[sy * 56 + sx].typ)
+            self.assertEqual(monster_houses, statistics.monster_houses)
+            totals.merge(statistics)
+        self.assertGreater(totals.invalid, 0)
+        self.assertGreater(totals.monster_houses, 0)
+        self.assertGreater(totals.kecleon_shops, 0)
+        self.assertEqual(totals.valid / totals.floors, 1 - totals.invalid_rate)
+
+    def test_merge(self):
+        batch = DungeonFloorBatchGenerator()
+        statistics = FloorStatistics()
+        statistics.merge(batch.statistics(self.layouts[0], SEEDS[:5]))
+        statistics.merge(batch.statistics(self.layouts[0], SEEDS[5:]))
+        self.assertEqual(batch.statistics(self.layouts[0], SEEDS), statistics)
+
+    def test_executor(self):
+        expected_floors = DungeonFloorBatchGenerator().generate(self.layouts[1], SEEDS)
+        expected_statistics = DungeonFloorBatchGenerator().statistics(self.layouts[1], SEEDS)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            batch = DungeonFloorBatchGenerator(executor=executor, shard_size=3)
+            self.assertEqual(expected_floors, batch.generate(self.layouts[1], SEEDS))
+            self.assertEqual(expected_statistics, batch.statistics(self.layouts[1], SEEDS))
+
+    def test_mappa_statistics(self):
+        floor_lists = [fl[:2] for fl in self.mappa.floor_lists[:2]]
+        floor_lists.append([floor_lists[0][1]])
+        mappa = type(self.mappa)(floor_lists)
+        result = DungeonFloorBatchGenerator().mappa_statistics(mappa, SEEDS[:4])
+        self.assertEqual([2, 2, 1], [len(fl) for fl in result])
+        self.assertIs(result[0][1], result[2][0])
+        self.assertEqual(DungeonFloorBatchGenerator().statistics(floor_lists[1][0].layout, SEEDS[:4]), result[1][0])
+
+    def test_invalid_shard_size(self):
+        with self.assertRaises(ValueError):
+            DungeonFloorBatchGenerator(shard_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import unittest
+
+from skytemple_files.common.types.file_types import FileType
+
+MODULE = "skytemple_files.common.types.file_types"
+# Number of skytemple_files modules a cold import of the file types module may pull in.
+# Importing all handlers eagerly imported close to 300.
+IMPORT_MODULE_BUDGET = 10
+# All file types FileType had while the handlers were imported eagerly.
+FILE_TYPE_NAMES = (
+    "UNKNOWN KAO COMMON_AT AT3PX AT4PX ATUPX PKDPX AT4PN PX CUSTOM_999 GENERIC_NRL RLE_NIBBLE BGP BG_LIST_DAT BPL BPC "
+    "BPC_IMAGE BPC_TILEMAP BMA BMA_LAYER_NRL BMA_COLLISION_RLE BPA DUNGEON_BIN DPL DPLA DPC DPCI DMA DBG FONT_DAT "
+    "FONT_SIR0 BANNER_FONT GRAPHIC_FONT CHR WTE WTU SCREEN_FX WAN WAT W16 STR LSD SMA SSA SSE SSS SSB PAL SIR0 "
+    "BIN_PACK MD LEVEL_BIN_ENTRY WAZA_P ITEM_P ITEM_SP TBL_TALK MD_EVO MAPPA_BIN MAPPA_G_BIN FIXED_BIN DBIN_SIR0_DPLA "
+    "DBIN_SIR0_AT4PX_DMA DBIN_AT4PX_DPC DBIN_AT4PX_DPCI DBIN_SIR0_AT4PX DBIN_SIR0_PKDPX DBIN_SIR0_PKDPX_DBG "
+    "DBIN_SIR0_WEIRD_DATA_FILE DBIN_SIR0_IMAGE_1033 DBIN_SIR0_COLVEC DBIN_SIR0_IMG_ITM DBIN_SIR0_IMG_TRP "
+    "DBIN_SIR0_ZMAPPAT SPRCONF ACTOR_LIST_BIN LEVEL_LIST_BIN OBJECT_LIST_BIN"
+).split()
+
+
+class FileTypesTestCase(unittest.TestCase):
+    def _run_cold(self, code: str, *options: str) -> subprocess.CompletedProcess:
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(sys.path)
+        return subprocess.run(
+            [sys.executable, *options, "-c", code],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+
+    def test_import_budget(self):
+        result = self._run_cold(f"import {MODULE}", "-X", "importtime")
+        imported = []
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip().startswith("skytemple_files"):
+                imported.append(parts[2].strip())
+        self.assertIn(MODULE, imported)
+        self.assertLessEqual(len(imported), IMPORT_MODULE_BUDGET, imported)
+
+    def test_handlers_not_imported(self):
+        result = self._run_cold(
+            f"import sys, {MODULE}\n"
+            f"print(len([m for m in sys.modules if m.startswith('skytemple_files.') and m.endswith('.handler')]))"
+        )
+        self.assertEqual("0", result.stdout.strip())
+
+    def test_lazy_access(self):
+        from skytemple_files.graphics.kao.handler import KaoHandler
+        from skytemple_files.graphics.wan_wat.handler import WanHandler
+
+        self.assertIs(KaoHandler, FileType.KAO)
+        self.assertIs(FileType.WAN, FileType.WAT)
+        self.assertIs(WanHandler, FileType.WAT)
+        self.assertIsNone(FileType.UNKNOWN)
+        self.assertTrue(hasattr(FileType, "DPL"))
+        self.assertFalse(hasattr(FileType, "NOT_A_FILE_TYPE"))
+        self.assertIn("BIN_PACK", dir(FileType))
+
+    def test_file_type_names(self):
+        self.assertLessEqual(set(FILE_TYPE_NAMES), set(dir(FileType)))
+        for name in FILE_TYPE_NAMES:
+            self.assertTrue(hasattr(FileType, name), name)
+        self.assertIsNone(FileType.DBIN_SIR0_WEIRD_DATA_FILE)
+        self.assertIsNone(FileType.DBIN_SIR0_IMAGE_1033)
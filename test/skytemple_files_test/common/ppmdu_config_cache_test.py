@@ -0,0 +1,151 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+import unittest
+import warnings
+
+from skytemple_files.common.ppmdu_config.cache import DefaultConfigRegistry, Pmd2DataCache
+from skytemple_files.common.ppmdu_config.xml_reader import Pmd2XmlReader
+from skytemple_files.common.warnings import ImplicitDefaultConfigWarning
+
+
+class Pmd2DataCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = Pmd2DataCache(self.tmp_dir.name)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_matches_xml(self):
+        for edition in ("EoS_NA", "EoS_EU", "EoS_JP"):
+            expected = Pmd2XmlReader.load_default(edition)
+            cached = self.cache.get(edition)
+            self.assertEqual(str(expected), str(cached))
+            self.assertIs(expected.bin_sections, cached.bin_sections)
+            self.assertIs(expected.extra_bin_sections, cached.extra_bin_sections)
+
+    def test_returns_private_copies(self):
+        a = self.cache.get("EoS_NA")
+        b = self.cache.get("EoS_NA")
+        self.assertIsNot(a, b)
+        a.game_constants["TEST"] = 123
+        with a.script_data.modify() as storage:
+            storage.game_variables = []
+        self.assertNotIn("TEST", b.game_constants)
+        self.assertNotEqual(0, len(b.script_data.game_variables))
+        self.assertNotIn("TEST", self.cache.get("EoS_NA").game_constants)
+
+    def test_disk_cache(self):
+        expected = str(self.cache.get("EoS_EU"))
+        key = self.cache.cache_key("EoS_EU", True)
+        self.assertTrue(os.path.exists(self.cache.path_for(key)))
+
+        # A new cache (like a new process) must not need to parse the XML again.
+        other_cache = Pmd2DataCache(self.tmp_dir.name)
+        other_cache._parse = None  # type: ignore
+        self.assertEqual(expected, str(other_cache.get("EoS_EU")))
+
+    def test_corrupt_disk_cache(self):
+        key = self.cache.cache_key("EoS_EU", True)
+        os.makedirs(self.cache.cache_dir, exist_ok=True)
+        with open(self.cache.path_for(key), "wb") as f:
+            f.write(b"not a pickle")
+        self.assertEqual(str(Pmd2XmlReader.load_default("EoS_EU")), str(self.cache.get("EoS_EU")))
+        with open(self.cache.path_for(key), "rb") as f:
+            pickle.loads(f.read())
+
+    def test_key(self):
+        self.assertNotEqual(self.cache.cache_key("EoS_EU", True), self.cache.cache_key("EoS_NA", True))
+        self.assertNotEqual(self.cache.cache_key("EoS_EU", True), self.cache.cache_key("EoS_EU", False))
+        other_cache = Pmd2DataCache(self.tmp_dir.name)
+        self.assertEqual(self.cache.cache_key("EoS_EU", True), other_cache.cache_key("EoS_EU", True))
+
+    def test_clear(self):
+        self.cache.get("EoS_EU")
+        key = self.cache.cache_key("EoS_EU", True)
+        self.cache.clear(memory_only=True)
+        self.assertTrue(os.path.exists(self.cache.path_for(key)))
+        self.cache.clear()
+        self.assertFalse(os.path.exists(self.cache.path_for(key)))
+
+    def test_clear_edition(self):
+        self.cache.get("EoS_EU")
+        self.cache.get("EoS_NA")
+        eu_key = self.cache.cache_key("EoS_EU", True)
+        na_key = self.cache.cache_key("EoS_NA", True)
+        self.cache.clear("EoS_NA", memory_only=True)
+        self.assertEqual([eu_key], list(self.cache._memo.keys()))
+        self.assertTrue(os.path.exists(self.cache.path_for(na_key)))
+        self.cache.clear("EoS_NA")
+        self.assertFalse(os.path.exists(self.cache.path_for(na_key)))
+        self.assertTrue(os.path.exists(self.cache.path_for(eu_key)))
+
+
+class DefaultConfigRegistryTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.registry = DefaultConfigRegistry(Pmd2DataCache(self.tmp_dir.name))
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_shared(self):
+        a = self.registry.get("EoS_NA")
+        self.assertIs(a, self.registry.get("EoS_NA"))
+        self.assertIsNot(a, self.registry.get("EoS_EU"))
+        self.assertEqual("EoS_NA", a.game_edition)
+
+    def test_invalidate(self):
+        na = self.registry.get("EoS_NA")
+        eu = self.registry.get("EoS_EU")
+        self.registry.invalidate("EoS_NA")
+        self.assertIsNot(na, self.registry.get("EoS_NA"))
+        self.assertIs(eu, self.registry.get("EoS_EU"))
+        self.registry.invalidate()
+        self.assertIsNot(eu, self.registry.get("EoS_EU"))
+
+    def test_invalidate_reloads_from_disk(self):
+        cache = Pmd2DataCache(self.tmp_dir.name)
+        registry = DefaultConfigRegistry(cache)
+        for edition in (None, "EoS_NA"):
+            config = registry.get("EoS_NA")
+            self.assertNotIn("TEST", config.game_constants)
+            config = cache.get("EoS_NA")
+            config.game_constants["TEST"] = 123
+            with open(cache.path_for(cache.cache_key("EoS_NA", True)), "wb") as f:
+                f.write(pickle.dumps(config))
+            registry.invalidate(edition)
+            self.assertEqual(123, registry.get("EoS_NA").game_constants["TEST"])
+            cache.clear()
+            registry.invalidate()
+
+    def test_fallback(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            a = self.registry.fallback("Test.a")
+            self.registry.fallback("Test.a")
+            self.registry.fallback("Test.b")
+        self.assertIs(a, self.registry.get())
+        self.assertEqual(3, len([w for w in caught if issubclass(w.category, ImplicitDefaultConfigWarning)]))
+        self.assertEqual({"Test.a": 2, "Test.b": 1}, self.registry.fallback_counts())
+        self.registry.reset_fallback_counts()
+        self.assertEqual({}, self.registry.fallback_counts())
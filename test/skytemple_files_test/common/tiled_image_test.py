@@ -0,0 +1,126 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import unittest
+
+from skytemple_files.common.tiled_image import (
+    ChunkIndex,
+    TileIndex,
+    TilemapEntry,
+    from_pil,
+    search_for_chunk,
+    search_for_tile,
+    to_pil,
+    to_pil_tiled,
+)
+
+# Two 2x2 4bpp tiles: pixels 1 2 / 3 4 and 5 6 / 7 8
+TILES = [bytes([0x21, 0x43]), bytes([0x65, 0x87])]
+PALETTES = [[0] * 48, [1] * 48]
+
+
+class TiledImageTestCase(unittest.TestCase):
+    def test_to_pil_flips(self):
+        tilemap = [
+            TilemapEntry(0, False, False, 0),
+            TilemapEntry(0, True, False, 0),
+            TilemapEntry(0, False, True, 0),
+            TilemapEntry(0, True, True, 0),
+        ]
+        img = to_pil(tilemap, TILES, PALETTES, 2, 4, 4)
+        # fmt: off
+        self.assertEqual(bytes([
+            1, 2, 2, 1,
+            3, 4, 4, 3,
+            3, 4, 4, 3,
+            1, 2, 2, 1,
+        ]), img.tobytes())
+        # fmt: on
+
+    def test_to_pil_ignore_flip_bits_and_palettes(self):
+        tilemap = [TilemapEntry(1, True, True, 0), TilemapEntry(0, True, False, 1)]
+        img = to_pil(tilemap, TILES, PALETTES, 2, 4, 2, ignore_flip_bits=True)
+        self.assertEqual(bytes([5, 6, 17, 18, 7, 8, 19, 20]), img.tobytes())
+        self.assertEqual(PALETTES[0] + PALETTES[1], img.getpalette()[:96])
+
+    def test_to_pil_chunks(self):
+        # With 2x1 chunks the second tile in the tilemap is to the right of the first.
+        tilemap = [TilemapEntry(0, False, False, 0), TilemapEntry(1, False, False, 0)] * 2
+        img = to_pil(tilemap, TILES, PALETTES, 2, 4, 4, tiling_width=2, tiling_height=1)
+        self.assertEqual(bytes([1, 2, 5, 6, 3, 4, 7, 8] * 2), img.tobytes())
+
+    def test_to_pil_8bpp(self):
+        tiles = [bytes([1, 2, 3, 4])]
+        palettes = [[0] * 768]
+        img = to_pil([TilemapEntry(0, True, False, 0)], tiles, palettes, 2, 2, 2, bpp=8)
+        self.assertEqual(bytes([2, 1, 4, 3]), img.tobytes())
+
+    def test_to_pil_invalid_tile_reference(self):
+        img = to_pil([TilemapEntry(5, False, False, 0)], TILES, PALETTES, 2, 2, 2)
+        self.assertEqual(bytes([1, 2, 3, 4]), img.tobytes())
+
+    def test_to_pil_tiled(self):
+        tilemap = [TilemapEntry(1, False, True, 1), TilemapEntry(0, True, True, 0)]
+        images = to_pil_tiled(tilemap, TILES, PALETTES, 2)
+        self.assertEqual(bytes([7, 8, 5, 6]), images[0].tobytes())
+        self.assertEqual(PALETTES[1], images[0].getpalette()[:48])
+        self.assertEqual(bytes([4, 3, 2, 1]), images[1].tobytes())
+
+    def test_tile_index(self):
+        # 4x4 4bpp tile: rows 1 2 3 4 / 5 6 7 8 / 9 A B C / D E F 0
+        tile = bytes([0x21, 0x43, 0x65, 0x87, 0xA9, 0xCB, 0xED, 0x0F])
+        tiles = [bytes(8), tile]
+        index = TileIndex(4, tiles)
+        self.assertEqual(2, len(index))
+        self.assertEqual((1, False, False), index.find(tile))
+        self.assertEqual((1, True, False), index.find(bytes([0x34, 0x12, 0x78, 0x56, 0xBC, 0x9A, 0xF0, 0xDE])))
+        self.assertEqual((1, False, True), index.find(bytes([0xED, 0x0F, 0xA9, 0xCB, 0x65, 0x87, 0x21, 0x43])))
+        self.assertEqual((1, True, True), index.find(bytes([0xF0, 0xDE, 0xBC, 0x9A, 0x78, 0x56, 0x34, 0x12])))
+        self.assertEqual((None, False, False), index.find(bytes([0x11] * 8)))
+        # The first matching tile wins, without flips if possible, like in search_for_tile.
+        self.assertEqual((0, False, False), index.find(bytes(8)))
+        self.assertEqual(search_for_tile(tiles, tile, 4), index.find(tile))
+        self.assertEqual(2, index.add(tile))
+        self.assertEqual((1, False, False), index.find(tile))
+
+    def test_chunk_index(self):
+        chunk_a = [TilemapEntry(0, False, False, 0), TilemapEntry(1, True, False, 0)]
+        chunk_b = [TilemapEntry(1, False, False, 0), TilemapEntry(1, True, False, 2)]
+        index = ChunkIndex()
+        tile_mappings: list = []
+        self.assertIsNone(index.find(chunk_a))
+        for chunk in (chunk_a, chunk_b):
+            self.assertEqual(len(tile_mappings), index.add(chunk))
+            tile_mappings += chunk
+        self.assertEqual(search_for_chunk(chunk_b, tile_mappings), index.find(chunk_b))
+        self.assertEqual(2, index.find([TilemapEntry(1, False, False, 0), TilemapEntry(1, True, False, 2)]))
+        self.assertIsNone(index.find([TilemapEntry(1, False, False, 0), TilemapEntry(1, False, False, 2)]))
+
+    def test_from_pil_reuses_flipped_tiles(self):
+        tiles = [bytes([0x21, 0x43]), bytes([0x11, 0x11])]
+        tilemap = [
+            TilemapEntry(0, False, False, 0),
+            TilemapEntry(0, True, True, 1),
+            TilemapEntry(1, False, False, 0),
+            TilemapEntry(0, False, True, 1),
+        ]
+        img = to_pil(tilemap, tiles, [list(range(48))] * 16, 2, 8, 2)
+        new_tiles, new_tilemap, _ = from_pil(img, 16, 16, 2, 8, 2)
+        self.assertEqual(tiles, [bytes(t) for t in new_tiles])
+        self.assertEqual(tilemap, new_tilemap)
+        self.assertEqual([0, 1, 0, 1], [entry.pal_idx for entry in new_tilemap])
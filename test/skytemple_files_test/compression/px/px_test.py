@@ -0,0 +1,144 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import os
+import random
+import unittest
+
+from parameterized import parameterized
+
+from skytemple_files.compression.px.compressor import PxCompressor
+from skytemple_files.compression.px.decompressor import PxDecompressor, PxStreamDecompressor
+from skytemple_files.compression.px.fast_compressor import PxFastCompressor
+
+FIX = (
+    b"Hello World. I am testing compression. 11111111111111111111111111111111111111111111111111111"
+    b"111111111111111111. 232323232323232323232323232323232323232323232323. 123456789. 11223344. 12121213."
+)
+CONTAINER_FIXTURES = os.path.join(os.path.dirname(__file__), "..", "..", "compression_container")
+
+
+def _load_fixture(*path: str) -> bytes:
+    with open(os.path.join(CONTAINER_FIXTURES, *path), "rb") as f:
+        return f.read()
+
+
+def _random_data(seed: int, size: int, alphabet: int) -> bytes:
+    rng = random.Random(seed)
+    return bytes(rng.randrange(alphabet) for _ in range(size))
+
+
+def _dataset():
+    yield "empty", b""
+    yield "short", b"\x01\x12"
+    yield "text", FIX
+    yield "zeroes", bytes(5000)
+    yield "nibbles", bytes(range(0x10)) * 64 + bytes(b"\x11\x12\x21\x22\x10\x01" * 100)
+    yield "random_small_alphabet", _random_data(1, 5000, 4)
+    yield "random", _random_data(2, 5000, 256)
+    yield "level_entry", _load_fixture("pkdpx", "fixtures", "level_entry.bin")
+    yield "portrait", _load_fixture("at4px", "fixtures", "portrait.bin")
+
+
+class PxFastCompressorTestCase(unittest.TestCase):
+    @parameterized.expand(_dataset())
+    def test_same_as_px_compressor(self, _, in_bytes):
+        flags, compressed = PxFastCompressor(in_bytes).compress()
+        expected_flags, expected_compressed = PxCompressor(in_bytes).compress()
+        self.assertEqual(bytes(expected_flags), bytes(flags))
+        self.assertEqual(bytes(expected_compressed), bytes(compressed))
+        self.assertEqual(in_bytes, bytes(PxDecompressor(compressed, flags).decompress()))
+
+    def test_overflow(self):
+        with self.assertRaises(ValueError):
+            PxFastCompressor(_random_data(3, 70000, 256)).compress()
+
+
+class PxDecompressorTestCase(unittest.TestCase):
+    @parameterized.expand(_dataset())
+    def test_decompress(self, _, in_bytes):
+        flags, compressed = PxCompressor(in_bytes).compress()
+        self.assertEqual(len(in_bytes), PxDecompressor(compressed, flags).decompressed_size())
+        self.assertEqual(in_bytes, bytes(PxDecompressor(compressed, flags).decompress()))
+        self.assertEqual(in_bytes, bytes(PxDecompressor(compressed, flags, len(in_bytes)).decompress()))
+
+    def test_decompress_into(self):
+        flags, compressed = PxCompressor(FIX).compress()
+        buffer = bytearray(b"\xff" * (len(FIX) + 20))
+        self.assertEqual(len(FIX), PxDecompressor(compressed, flags).decompress_into(buffer, 10))
+        self.assertEqual(b"\xff" * 10 + FIX + b"\xff" * 10, bytes(buffer))
+
+        buffer = bytearray(len(FIX))
+        self.assertEqual(len(FIX), PxDecompressor(compressed, flags, len(FIX)).decompress_into(memoryview(buffer)))
+        self.assertEqual(FIX, bytes(buffer))
+
+    def test_decompress_into_too_small(self):
+        flags, compressed = PxCompressor(FIX).compress()
+        with self.assertRaises(ValueError):
+            PxDecompressor(compressed, flags).decompress_into(bytearray(len(FIX)), 1)
+
+    def test_wrong_length(self):
+        flags, compressed = PxCompressor(FIX).compress()
+        with self.assertRaises(ValueError):
+            PxDecompressor(compressed, flags, len(FIX) - 1).decompress()
+        with self.assertRaises(ValueError):
+            PxDecompressor(compressed, flags, len(FIX) + 1).decompress()
+
+
+class PxStreamDecompressorTestCase(unittest.TestCase):
+    @parameterized.expand(_dataset())
+    def test_decompress(self, _, in_bytes):
+        flags, compressed = PxCompressor(in_bytes).compress()
+        for chunk_size in (1, 7, 100, max(len(compressed), 1)):
+            decompressor = PxStreamDecompressor(flags, len(in_bytes))
+            written = 0
+            for i in range(0, len(compressed), chunk_size):
+                new_written = decompressor.feed(compressed[i : i + chunk_size])
+                self.assertGreaterEqual(new_written, written)
+                self.assertEqual(in_bytes[:new_written], bytes(decompressor.output[:new_written]))
+                written = new_written
+            self.assertEqual(len(in_bytes), decompressor.finish())
+            self.assertEqual(in_bytes, bytes(decompressor.output))
+
+    def test_decompress_into(self):
+        flags, compressed = PxCompressor(FIX).compress()
+        buffer = bytearray(b"\xff" * (len(FIX) + 20))
+        decompressor = PxStreamDecompressor(flags, len(FIX), buffer, 10)
+        decompressor.feed(compressed[:10])
+        decompressor.feed(compressed[10:])
+        self.assertEqual(len(FIX), decompressor.finish())
+        self.assertEqual(b"\xff" * 10 + FIX + b"\xff" * 10, bytes(buffer))
+
+    def test_decompress_into_too_small(self):
+        flags, _ = PxCompressor(FIX).compress()
+        with self.assertRaises(ValueError):
+            PxStreamDecompressor(flags, len(FIX), bytearray(len(FIX)), 1)
+
+    def test_wrong_length(self):
+        flags, compressed = PxCompressor(FIX).compress()
+        decompressor = PxStreamDecompressor(flags, len(FIX) + 1)
+        decompressor.feed(compressed)
+        with self.assertRaises(ValueError):
+            decompressor.finish()
+        with self.assertRaises(ValueError):
+            decompressor.feed(compressed)
+        decompressor = PxStreamDecompressor(flags, len(FIX) - 1)
+        with self.assertRaises(ValueError):
+            decompressor.feed(compressed)
+            decompressor.finish()
@@ -0,0 +1,162 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from skytemple_files.compression_container.common_at.cache import CompressionCache, set_compression_cache
+
+from skytemple_files.compression_container.common_at.handler import (
+    COMMON_AT_BEST_3,
+    COMMON_AT_BEST_4,
+    CommonAtHandler,
+    CommonAtType,
+)
+
+FIX = (
+    b"Hello World. I am testing compression. 11111111111111111111111111111111111111111111111111111"
+    b"111111111111111111. 232323232323232323232323232323232323232323232323. 123456789. 11223344. 12121213."
+) * 4
+
+
+class SlowFirstExecutor(ThreadPoolExecutor):
+    """Runs the first submitted task last."""
+
+    def __init__(self):
+        super().__init__(max_workers=4)
+        self.submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        delay = 0.3 if self.submitted == 0 else 0
+        self.submitted += 1
+
+        def run():
+            time.sleep(delay)
+            return fn(*args, **kwargs)
+
+        return super().submit(run)
+
+
+class CommonAtTestCase(unittest.TestCase):
+    def test_compress_best(self):
+        result = CommonAtHandler.compress_best(FIX, COMMON_AT_BEST_4)
+        allowed = [t for t in COMMON_AT_BEST_4 if t in CommonAtHandler.allowed_types]
+        self.assertEqual(allowed, list(result.timings.keys()))
+        sizes = {t: len(t.handler.compress(FIX).to_bytes()) for t in allowed}
+        self.assertEqual(min(sizes.values()), result.size)
+        self.assertEqual(sizes[result.compression_type], result.size)
+        self.assertEqual(result.size, len(result.container.to_bytes()))
+        self.assertEqual(FIX, bytes(result.container.decompress()))
+        self.assertEqual(result.container.to_bytes(), CommonAtHandler.compress(FIX, COMMON_AT_BEST_4).to_bytes())
+
+    def test_compress_best_executor(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            for compression_type in (COMMON_AT_BEST_3, COMMON_AT_BEST_4):
+                result = CommonAtHandler.compress_best(FIX, compression_type, executor=executor)
+                expected = CommonAtHandler.compress_best(FIX, compression_type)
+                self.assertEqual(expected.compression_type, result.compression_type)
+                self.assertEqual(expected.container.to_bytes(), result.container.to_bytes())
+                self.assertEqual(set(expected.timings.keys()), set(result.timings.keys()))
+                self.assertEqual(FIX, bytes(result.container.decompress()))
+
+    def test_compress_best_size_budget(self):
+        result = CommonAtHandler.compress_best(FIX, [CommonAtType.AT4PN, CommonAtType.PKDPX], size_budget=len(FIX) * 2)
+        self.assertEqual(CommonAtType.AT4PN, result.compression_type)
+        self.assertEqual([CommonAtType.AT4PN], list(result.timings.keys()))
+
+        result = CommonAtHandler.compress_best(FIX, [CommonAtType.AT4PN, CommonAtType.PKDPX], size_budget=len(FIX) - 1)
+        self.assertEqual(CommonAtType.PKDPX, result.compression_type)
+
+    def test_compress_best_size_budget_executor(self):
+        candidates = [CommonAtType.AT4PN, CommonAtType.PKDPX]
+        for size_budget in (len(FIX) * 2, len(FIX) - 1):
+            expected = CommonAtHandler.compress_best(FIX, candidates, size_budget=size_budget)
+            with SlowFirstExecutor() as executor:
+                result = CommonAtHandler.compress_best(FIX, candidates, executor=executor, size_budget=size_budget)
+            self.assertEqual(expected.compression_type, result.compression_type)
+            self.assertEqual(expected.container.to_bytes(), result.container.to_bytes())
+
+    def test_compress_no_algorithm(self):
+        with self.assertRaises(ValueError):
+            CommonAtHandler.compress(FIX, [])
+
+
+class CompressionCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = CompressionCache(self.tmp_dir.name, max_size=250)
+
+    def tearDown(self):
+        set_compression_cache(None)
+        self.tmp_dir.cleanup()
+
+    def test_key(self):
+        key = CompressionCache.key(FIX, COMMON_AT_BEST_3)
+        self.assertEqual(key, CompressionCache.key(bytearray(FIX), COMMON_AT_BEST_3))
+        self.assertNotEqual(key, CompressionCache.key(FIX + b"a", COMMON_AT_BEST_3))
+        self.assertNotEqual(key, CompressionCache.key(FIX, COMMON_AT_BEST_4))
+        self.assertNotEqual(key, CompressionCache.key(FIX, COMMON_AT_BEST_3, 800))
+
+    def test_get_put(self):
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", b"1" * 100)
+        self.assertEqual(b"1" * 100, self.cache.get("a"))
+        # Another instance finds the entries on disk.
+        self.assertEqual(b"1" * 100, CompressionCache(self.tmp_dir.name).get("a"))
+        stats = self.cache.stats()
+        self.assertEqual(
+            (1, 1, 1, 0, 1, 100), (stats.hits, stats.misses, stats.stores, stats.evictions, stats.entries, stats.size)
+        )
+
+    def test_lru_eviction(self):
+        self.cache.put("a", b"1" * 100)
+        self.cache.put("b", b"2" * 100)
+        self.cache.get("a")
+        self.cache.put("c", b"3" * 100)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(b"1" * 100, self.cache.get("a"))
+        self.assertEqual(b"3" * 100, self.cache.get("c"))
+        self.assertFalse(os.path.exists(self.cache.path_for("b")))
+        stats = self.cache.stats()
+        self.assertEqual((1, 2, 200), (stats.evictions, stats.entries, stats.size))
+
+    def test_clear(self):
+        self.cache.put("a", b"1" * 100)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(0, self.cache.stats().entries)
+
+    def test_compress_cached(self):
+        cache = CompressionCache(self.tmp_dir.name)
+        set_compression_cache(cache)
+        result = CommonAtHandler.compress_best(FIX, COMMON_AT_BEST_4)
+        self.assertEqual((0, 1, 1), (cache.stats().hits, cache.stats().misses, cache.stats().stores))
+        cached_result = CommonAtHandler.compress_best(FIX, COMMON_AT_BEST_4)
+        self.assertEqual(1, cache.stats().hits)
+        self.assertEqual(result.compression_type, cached_result.compression_type)
+        self.assertEqual(result.size, cached_result.size)
+        self.assertEqual(result.container.to_bytes(), cached_result.container.to_bytes())
+        self.assertEqual({}, cached_result.timings)
+        self.assertEqual(FIX, bytes(cached_result.container.decompress()))
+        # Other algorithms are a different key.
+        CommonAtHandler.compress_best(FIX, COMMON_AT_BEST_3)
+        self.assertEqual(2, cache.stats().misses)
@@ -0,0 +1,102 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+
+from parameterized import parameterized
+
+from skytemple_files.container.bin_pack.handler import BinPackHandler
+from skytemple_files.container.bin_pack.model import BinPack
+from skytemple_files.container.bin_pack.writer import BinPackWriter
+from skytemple_files_test.case import SkyTempleFilesTestCase
+
+FILES = [bytes(range(i, i + 13 * i)) for i in range(0, 12)] + [b"\x01" * 16, b""]
+
+
+class BinPackTestCase(SkyTempleFilesTestCase[BinPackHandler, BinPack]):
+    handler = BinPackHandler
+
+    def setUp(self) -> None:
+        model = BinPack(bytes(8))
+        for f in FILES:
+            model.append(f)
+        self.raw = bytes(self.handler.serialize(model))
+
+    @parameterized.expand([(False,), (True,)])
+    def test_read(self, lazy):
+        model = self.handler.deserialize(self.raw, lazy=lazy)
+        self.assertEqual(len(FILES), len(model))
+        self.assertEqual(FILES, list(model))
+        self.assertEqual(FILES[2:5], model[2:5])
+        for f in model:
+            self.assertIsInstance(f, bytes)
+
+    def test_lazy_keeps_slices(self):
+        model = self.handler.deserialize(self.raw, lazy=True)
+        self.assertIsInstance(model.get_files_bytes()[3], memoryview)
+        self.assertEqual(FILES[3], model[3])
+        self.assertIsInstance(model.get_files_bytes()[3], bytes)
+        self.assertIsInstance(model.get_files_bytes()[4], memoryview)
+
+    @parameterized.expand([(False,), (True,)])
+    def test_write(self, lazy):
+        model = self.handler.deserialize(self.raw, lazy=lazy)
+        self.assertEqual(self.raw, self.handler.serialize(model))
+        model[4] = b"\x12\x34"
+        model.append(b"\x56")
+        model = self.handler.deserialize(self.handler.serialize(model), lazy=lazy)
+        self.assertEqual(FILES[:4] + [b"\x12\x34"] + FILES[5:] + [b"\x56"], list(model))
+
+    def test_write_fixed_header(self):
+        model = self.handler.deserialize(self.raw, lazy=True)
+        raw = self.handler.serialize(model, fixed_header_len=0x1300)
+        self.assertEqual(FILES, list(self.handler.deserialize(raw)))
+
+    @parameterized.expand([(0,), (0x1300,)])
+    def test_write_to(self, fixed_header_len):
+        model = self.handler.deserialize(self.raw, lazy=True)
+        model[1] = b"\x99" * 17
+        with io.BytesIO() as f:
+            written = BinPackWriter(model, fixed_header_len).write_to(f)
+            self.assertEqual(BinPackWriter(model, fixed_header_len).write(), f.getvalue())
+            self.assertEqual(len(f.getvalue()), written)
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "test.bin")
+            with open(path, "wb") as f:
+                f.write(self.raw)
+            model = BinPack.from_file(path)
+            self.assertIsInstance(model.get_files_bytes()[1], memoryview)
+            self.assertEqual(FILES, list(model))
+            self.assertEqual(self.raw, self.handler.serialize(model))
+            model.close()
+
+    def test_from_file_close(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "test.bin")
+            with open(path, "wb") as f:
+                f.write(self.raw)
+            with BinPack.from_file(path) as model:
+                self.assertEqual(FILES[2], model[2])
+            self.assertEqual(FILES[2], model[2])
+            with self.assertRaises(ValueError):
+                model[3]
+            model.close()
@@ -0,0 +1,122 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import unittest
+
+from skytemple_files.common.ppmdu_config.dungeon_data import Pmd2BinPackFile, Pmd2DungeonBinFiles
+from skytemple_files.container.bin_pack.model import BinPack
+from skytemple_files.container.bin_pack.writer import BinPackWriter
+from skytemple_files.container.dungeon_bin.handler import DungeonBinHandler
+from skytemple_files.container.dungeon_bin.model import DungeonBinPack
+
+FILES_DEF = Pmd2DungeonBinFiles(
+    [
+        Pmd2BinPackFile(0, 9, "COUNTED", "dungeon%i.cnt"),
+        Pmd2BinPackFile(10, 14, "COUNTED", "dungeon_bg%i.cnt"),
+        Pmd2BinPackFile(15, None, "UNKNOWN", "%d.bin"),
+        Pmd2BinPackFile(16, None, "UNKNOWN", "15.wtu"),
+    ]
+)
+
+
+class CountingHandler:
+    deserialized = 0
+    serialized = 0
+
+    @classmethod
+    def deserialize(cls, data):
+        cls.deserialized += 1
+        return bytearray(data)
+
+    @classmethod
+    def serialize(cls, data):
+        cls.serialized += 1
+        return bytes(data)
+
+
+class _TstDungeonBinPack(DungeonBinPack):
+    def _get_handler(self, type_name):
+        if type_name == "COUNTED":
+            return CountingHandler
+        return None
+
+
+class DungeonBinTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        CountingHandler.deserialized = 0
+        CountingHandler.serialized = 0
+        pack = BinPack(bytes(8))
+        for i in range(17):
+            pack.append(bytes([i] * (i + 1)))
+        self.raw = bytes(BinPackWriter(pack).write())
+        self.model = _TstDungeonBinPack(self.raw, FILES_DEF)
+
+    def test_filenames(self):
+        self.assertEqual("dungeon0.cnt", self.model.get_filename(0))
+        self.assertEqual("dungeon9.cnt", self.model.get_filename(9))
+        self.assertEqual("dungeon_bg4.cnt", self.model.get_filename(14))
+        self.assertEqual("15.bin", self.model.get_filename(15))
+        self.assertEqual("15.wtu", self.model.get_filename(16))
+        self.assertEqual(
+            [f"dungeon{i}.cnt" for i in range(10)] + [f"dungeon_bg{i}.cnt" for i in range(5)],
+            self.model.get_files_with_ext("cnt"),
+        )
+        self.assertEqual(["15.wtu"], self.model.get_files_with_ext("wtu"))
+        self.assertEqual([], self.model.get_files_with_ext("xyz"))
+
+    def test_get(self):
+        self.assertEqual(bytes([3] * 4), self.model.get("dungeon3.cnt"))
+        self.assertEqual(bytes([11] * 12), self.model.get_raw("dungeon_bg1.cnt"))
+        self.assertEqual(bytes([15] * 16), self.model.get("15.bin"))
+        self.assertRaises(KeyError, lambda: self.model.get("dungeon10.cnt"))
+        self.assertRaises(KeyError, lambda: self.model.get_raw("dungeon10.cnt"))
+        self.assertRaises(KeyError, lambda: self.model.set("dungeon10.cnt", b""))
+
+    def test_only_modified_serialized(self):
+        for i in range(10):
+            self.model.get(f"dungeon{i}.cnt")
+        self.model.set("dungeon2.cnt", bytearray(b"\x42"))
+        self.assertTrue(self.model.is_modified("dungeon2.cnt"))
+        self.assertFalse(self.model.is_modified("dungeon3.cnt"))
+        raw = DungeonBinHandler.serialize(self.model, only_modified=True)
+        self.assertEqual(1, CountingHandler.serialized)
+        self.assertFalse(self.model.is_modified("dungeon2.cnt"))
+
+        reloaded = _TstDungeonBinPack(raw, FILES_DEF)
+        self.assertEqual(b"\x42", reloaded.get_raw("dungeon2.cnt"))
+        self.assertEqual(bytes([3] * 4), reloaded.get_raw("dungeon3.cnt"))
+
+    def test_mark_modified(self):
+        self.model.get("dungeon5.cnt")[0] = 0x99
+        self.assertRaises(ValueError, lambda: self.model.mark_modified("dungeon6.cnt"))
+        self.model.mark_modified("dungeon5.cnt")
+        self.model.serialize_subfiles(only_modified=True)
+        self.assertEqual(1, CountingHandler.serialized)
+        self.assertEqual(bytes([0x99] + [5] * 5), self.model.get_raw("dungeon5.cnt"))
+
+    def test_serialize_all_loaded(self):
+        for i in range(4):
+            self.model.get(f"dungeon{i}.cnt")
+        self.model.serialize_subfiles()
+        self.assertEqual(4, CountingHandler.serialized)
+
+    def test_serialize_modified_in_place(self):
+        self.model.get("dungeon5.cnt")[0] = 0x99
+        raw = DungeonBinHandler.serialize(self.model)
+        self.assertEqual(1, CountingHandler.serialized)
+        self.assertEqual(bytes([0x99] + [5] * 5), _TstDungeonBinPack(raw, FILES_DEF).get_raw("dungeon5.cnt"))
@@ -0,0 +1,93 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import unittest
+
+from skytemple_files.container.sir0.sir0_util import (
+    decode_sir0_pointer_offsets,
+    encode_sir0_pointer_offset_list,
+    encode_sir0_pointer_offsets,
+    relocate_sir0_pointers,
+)
+
+# Offsets and their encoding (relative)
+OFFSETS = [4, 8, 0x20, 0x200, 0x4204, 0x204204]
+ENCODED = bytes([0x04, 0x04, 0x18, 0x83, 0x60, 0x81, 0x80, 0x04, 0x81, 0x80, 0x80, 0x00])
+
+
+class Sir0UtilTestCase(unittest.TestCase):
+    def test_encode(self):
+        self.assertEqual(ENCODED, encode_sir0_pointer_offset_list(OFFSETS))
+        self.assertEqual(b"", encode_sir0_pointer_offset_list([]))
+        self.assertEqual(bytes([0x01, 0x83, 0x7F]), encode_sir0_pointer_offset_list([1, 0x1FF], False))
+
+    def test_encode_into_buffer(self):
+        buffer = bytearray(4 * (len(OFFSETS) + 1))
+        self.assertEqual(len(ENCODED) + 1, encode_sir0_pointer_offsets(buffer, OFFSETS))
+        self.assertEqual(ENCODED + b"\0", buffer[: len(ENCODED) + 1])
+        with self.assertRaises(IndexError):
+            encode_sir0_pointer_offsets(bytearray(2), OFFSETS)
+
+    def test_decode(self):
+        data = b"\xaa\xaa" + ENCODED + b"\x00\x12\x34"
+        self.assertEqual(OFFSETS, list(decode_sir0_pointer_offsets(data, 2)))
+        self.assertEqual([1, 0x1FF], list(decode_sir0_pointer_offsets(bytes([0x01, 0x83, 0x7F, 0x00]), 0, False)))
+        # A 0 byte only ends the list, if it doesn't end an offset.
+        self.assertEqual([1, 1], list(decode_sir0_pointer_offsets(bytes([0x01, 0x80, 0x00, 0x00, 0x05]), 0)))
+        self.assertEqual([], list(decode_sir0_pointer_offsets(b"\x00\x01", 0)))
+
+    def test_roundtrip(self):
+        offsets = list(range(0x44, 0x10000, 0x44))
+        encoded = encode_sir0_pointer_offset_list(offsets) + b"\0"
+        self.assertEqual(offsets, list(decode_sir0_pointer_offsets(encoded, 0)))
+
+    def test_relocate_aligned(self):
+        buffer = bytearray(b"\x01\x00\x00\x00\x02\x00\x00\x00\x10\x00\x00\x00\xff")
+        relocate_sir0_pointers(buffer, [0, 8], 0x10)
+        self.assertEqual(bytearray(b"\x11\x00\x00\x00\x02\x00\x00\x00\x20\x00\x00\x00\xff"), buffer)
+
+    def test_relocate_unaligned(self):
+        buffer = bytearray(b"\xff\x01\x01\x00\x00\x02")
+        relocate_sir0_pointers(buffer, [1], 0x10)
+        self.assertEqual(bytearray(b"\xff\x11\x01\x00\x00\x02"), buffer)
+
+    def test_relocate_base(self):
+        buffer = bytearray(b"\x00\x00\x00\x00\x20\x00\x00\x00")
+        relocate_sir0_pointers(buffer, [0], -0x10, 4)
+        self.assertEqual(bytearray(b"\x00\x00\x00\x00\x10\x00\x00\x00"), buffer)
+
+    def test_relocate_out_of_range(self):
+        with self.assertRaises(ValueError):
+            relocate_sir0_pointers(bytearray(4), [0], -1)
+        with self.assertRaises(ValueError):
+            relocate_sir0_pointers(bytearray(5), [1], -1)
+
+    def test_relocate_outside_of_buffer(self):
+        # Aligned and unaligned pointers are checked the same way.
+        for offsets in ([8], [9], [-4], [-1], [0, 6]):
+            with self.assertRaises(ValueError):
+                relocate_sir0_pointers(bytearray(8), offsets, 1)
+        with self.assertRaises(ValueError):
+            relocate_sir0_pointers(bytearray(8), [4], 1, 4)
+        buffer = bytearray(8)
+        relocate_sir0_pointers(buffer, [0, 4], 1)
+        self.assertEqual(bytes([1, 0, 0, 0, 1, 0, 0, 0]), bytes(buffer))
+
+
+if __name__ == "__main__":
+    unittest.main()
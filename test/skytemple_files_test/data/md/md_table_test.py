@@ -0,0 +1,78 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import os
+import unittest
+
+from skytemple_files.data.md._model import Md
+from skytemple_files.data.md._writer import MdWriter
+from skytemple_files.data.md.table import MdTable
+
+FIX_MD = os.path.join(os.path.dirname(__file__), "fixtures", "fixture.md")
+
+
+class MdTableTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(FIX_MD, "rb") as f:
+            self.data = f.read()
+        self.md = Md(self.data)
+        self.table = MdTable.from_bytes(self.data)
+
+    def test_read(self):
+        self.assertEqual(len(self.md), len(self.table))
+        for i, entry in enumerate(self.md):
+            self.assertEqual(str(entry), str(self.table.entry(i)))
+        self.assertEqual([e.base_atk for e in self.md], list(self.table.column("base_atk")))
+
+    def test_from_md(self):
+        table = MdTable.from_md(self.md)
+        for name in table.column_names:
+            self.assertEqual(self.table.column(name), table.column(name))
+
+    def test_write(self):
+        self.assertEqual(self.data, self.table.to_bytes())
+        self.assertEqual(self.data, MdWriter().write(self.table.to_md()))
+
+    def test_modify(self):
+        self.table.column("base_atk")[1] = 123
+        entry = self.table.entry(2)
+        entry.can_evolve = not entry.can_evolve
+        entry.base_hp = 77
+        self.table.set_entry(2, entry)
+        md = self.table.to_md()
+        self.assertEqual(123, md[1].base_atk)
+        self.assertEqual(77, md[2].base_hp)
+        self.assertEqual(entry.can_evolve, md[2].can_evolve)
+        self.assertEqual(str(self.md[3]), str(md[3]))
+
+    def test_filter_sort(self):
+        expected = [i for i, e in enumerate(self.md) if e.type_primary == 18 and e.base_atk > 100]
+        indices = self.table.filter(lambda t, atk: t == 18 and atk > 100, "type_primary", "base_atk")
+        self.assertEqual([3], indices)
+        self.assertEqual(expected, indices)
+        by_hp = self.table.sort("base_hp", reverse=True)
+        self.assertEqual(
+            sorted(range(len(self.md)), key=lambda i: self.md[i].base_hp, reverse=True),
+            by_hp,
+        )
+        with self.assertRaises(KeyError):
+            self.table.column("unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
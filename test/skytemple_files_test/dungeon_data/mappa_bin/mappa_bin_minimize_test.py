@@ -0,0 +1,108 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import copy
+import os
+import unittest
+
+from skytemple_files.container.sir0.handler import Sir0Handler
+from skytemple_files.dungeon_data.mappa_bin._python_impl.model import MappaBin
+from skytemple_files.dungeon_data.mappa_bin._python_impl.monster import MappaMonster
+
+FIX_MAPPA = os.path.join(os.path.dirname(__file__), "fixtures", "fixture.bin")
+
+
+class MappaBinMinimizeTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(FIX_MAPPA, "rb") as f:
+            sir0 = Sir0Handler.load_python_model().from_bin(f.read())
+        self.mappa = MappaBin.sir0_unwrap(sir0.content, sir0.data_pointer)
+
+    def assertNoDuplicates(self, lst):
+        for i, a in enumerate(lst):
+            for b in lst[i + 1 :]:
+                self.assertNotEqual(a, b)
+
+    @staticmethod
+    def _stub_indices(stub):
+        return (
+            stub.layout_idx,
+            stub.monsters_idx,
+            stub.traps_idx,
+            stub.floor_items_idx,
+            stub.shop_items_idx,
+            stub.monster_house_items_idx,
+            stub.buried_items_idx,
+            stub.unk_items1_idx,
+            stub.unk_items2_idx,
+        )
+
+    def test_minimize(self):
+        floor_lists, layouts, monster_lists, trap_lists, item_lists = self.mappa.minimize()
+        self.assertNoDuplicates(layouts)
+        self.assertNoDuplicates(monster_lists)
+        self.assertNoDuplicates(trap_lists)
+        self.assertNoDuplicates(item_lists)
+        for floor_list, stub_floor_list in zip(self.mappa.floor_lists, floor_lists):
+            self.assertEqual(len(floor_list), len(stub_floor_list))
+            for floor, stub in zip(floor_list, stub_floor_list):
+                self.assertEqual(floor.layout, layouts[stub.layout_idx])
+                self.assertEqual(floor.monsters, monster_lists[stub.monsters_idx])
+                self.assertEqual(floor.traps, trap_lists[stub.traps_idx])
+                self.assertEqual(floor.floor_items, item_lists[stub.floor_items_idx])
+                self.assertEqual(floor.shop_items, item_lists[stub.shop_items_idx])
+                self.assertEqual(floor.monster_house_items, item_lists[stub.monster_house_items_idx])
+                self.assertEqual(floor.buried_items, item_lists[stub.buried_items_idx])
+                self.assertEqual(floor.unk_items1, item_lists[stub.unk_items1_idx])
+                self.assertEqual(floor.unk_items2, item_lists[stub.unk_items2_idx])
+
+    def test_minimize_copies(self):
+        # Equal data in different objects is stored once.
+        expected = self.mappa.sir0_serialize_parts()
+        self.mappa.floor_lists += copy.deepcopy(self.mappa.floor_lists)
+        floor_lists, *lists = self.mappa.minimize()
+        indices = [[self._stub_indices(stub) for stub in floor_list] for floor_list in floor_lists]
+        self.assertEqual(indices[: len(indices) // 2], indices[len(indices) // 2 :])
+        self.mappa.floor_lists = self.mappa.floor_lists[: len(floor_lists) // 2]
+        self.assertEqual(expected, self.mappa.sir0_serialize_parts())
+
+    def test_canonical_keys(self):
+        floor = self.mappa.floor_lists[0][0]
+        other = copy.deepcopy(floor)
+        self.assertEqual(floor.layout.canonical_key(), other.layout.canonical_key())
+        self.assertEqual(hash(floor.traps.canonical_key()), hash(other.traps.canonical_key()))
+        # Dict order doesn't matter.
+        other.floor_items.items = dict(reversed(list(other.floor_items.items.items())))
+        self.assertEqual(floor.floor_items.canonical_key(), other.floor_items.canonical_key())
+        self.assertEqual(
+            MappaMonster.list_canonical_key(floor.monsters), MappaMonster.list_canonical_key(other.monsters)
+        )
+
+        other.layout.terrain_settings.unk7 = not other.layout.terrain_settings.unk7
+        self.assertNotEqual(floor.layout.canonical_key(), other.layout.canonical_key())
+        other.traps.weights[3] += 1
+        self.assertNotEqual(floor.traps.canonical_key(), other.traps.canonical_key())
+        other.monsters[0].level += 1
+        self.assertNotEqual(
+            MappaMonster.list_canonical_key(floor.monsters), MappaMonster.list_canonical_key(other.monsters)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from skytemple_files import export_maps
+from skytemple_files.export_maps import (
+    EXPORT_MANIFEST_NAME,
+    ExportManifest,
+    ExportTask,
+    hash_config_inputs,
+    run_tasks,
+)
+
+
+class ExportMapsTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = self._tmp.name
+        self.calls: list[str] = []
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _export(self, name: str) -> list[str]:
+        self.calls.append(name)
+        with open(os.path.join(self.dir, name), "w") as f:
+            f.write(name)
+        return [name]
+
+    def _task(self, name: str, inputs_hash: str = "a") -> ExportTask:
+        return ExportTask(f"MAP/{name}", self._export, (name,), inputs_hash)
+
+    def test_manifest(self):
+        manifest = ExportManifest(self.dir)
+        task = self._task("a.png")
+        self.assertFalse(manifest.is_up_to_date(task))
+        self._export("a.png")
+        manifest.record(task, ["a.png"])
+        self.assertTrue(manifest.is_up_to_date(task))
+
+        manifest = ExportManifest(self.dir)
+        self.assertTrue(manifest.is_up_to_date(task))
+        self.assertFalse(manifest.is_up_to_date(self._task("a.png", "b")))
+        self.assertFalse(manifest.is_up_to_date(self._task("b.png")))
+        os.remove(os.path.join(self.dir, "a.png"))
+        self.assertFalse(manifest.is_up_to_date(task))
+
+    def test_manifest_version_mismatch(self):
+        with open(os.path.join(self.dir, EXPORT_MANIFEST_NAME), "w") as f:
+            json.dump(
+                {
+                    "version": export_maps.EXPORT_MANIFEST_VERSION + 1,
+                    "entries": {"MAP/a.png": {"inputs": "a", "outputs": []}},
+                },
+                f,
+            )
+        self.assertFalse(ExportManifest(self.dir).is_up_to_date(self._task("a.png")))
+
+    def test_manifest_invalid(self):
+        with open(os.path.join(self.dir, EXPORT_MANIFEST_NAME), "w") as f:
+            f.write("{")
+        self.assertEqual({}, ExportManifest(self.dir).entries)
+
+    def test_run_tasks_skips_unchanged(self):
+        tasks = [self._task("a.png"), self._task("b.png")]
+        run_tasks(tasks, ExportManifest(self.dir), 1, ())
+        self.assertEqual(["a.png", "b.png"], self.calls)
+
+        self.calls.clear()
+        run_tasks([self._task("a.png"), self._task("b.png", "b")], ExportManifest(self.dir), 1, ())
+        self.assertEqual(["b.png"], self.calls)
+
+        self.calls.clear()
+        os.remove(os.path.join(self.dir, "a.png"))
+        run_tasks([self._task("a.png"), self._task("b.png", "b")], ExportManifest(self.dir), 1, ())
+        self.assertEqual(["a.png"], self.calls)
+
+        self.calls.clear()
+        run_tasks([self._task("a.png"), self._task("b.png", "b")], None, 1, ())
+        self.assertEqual(["a.png", "b.png"], self.calls)
+
+    def test_hash_config_inputs(self):
+        files = {"BALANCE/actor_list.bin": b"\x01", "BALANCE/mappa_s.bin": b"\x02"}
+        rom = SimpleNamespace(arm9=b"arm9", filenames=files, getFileByName=files.__getitem__)
+        config = SimpleNamespace(bin_sections=SimpleNamespace(overlay11="overlay11"))
+        overlays = {"overlay11": b"overlay11"}
+
+        def config_hash():
+            with (
+                patch.object(export_maps, "rom", rom),
+                patch.object(export_maps, "config", config),
+                patch.object(export_maps, "get_binary_from_rom", lambda _rom, section: overlays[section]),
+            ):
+                return hash_config_inputs()
+
+        h = config_hash()
+        self.assertEqual(h, config_hash())
+        rom.arm9 = b"patched"
+        self.assertNotEqual(h, config_hash())
+        rom.arm9 = b"arm9"
+        overlays["overlay11"] = b"patched"
+        self.assertNotEqual(h, config_hash())
+        overlays["overlay11"] = b"overlay11"
+        files["BALANCE/mappa_s.bin"] = b"\x03"
+        self.assertNotEqual(h, config_hash())
+        files["BALANCE/mappa_s.bin"] = b"\x02"
+        files["BALANCE/level_list.bin"] = b"\x04"
+        self.assertNotEqual(h, config_hash())
+        del files["BALANCE/level_list.bin"]
+        self.assertEqual(h, config_hash())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,16 +16,54 @@
 #  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
 from __future__ import annotations
 
+import itertools
 import typing
 
+from PIL import Image
+
 from skytemple_files.graphics.bma.handler import BmaHandler
 from skytemple_files.graphics.bma.protocol import BmaProtocol
+from skytemple_files.graphics.bma.renderer import BmaAnimationRenderer
+from skytemple_files.graphics.bpc import BPC_TILE_DIM
 from skytemple_files_test.graphics.mocks.bpa_mock import BpaMock
 from skytemple_files_test.graphics.mocks.bpc_mock import BpcMock
 from skytemple_files_test.graphics.mocks.bpl_mock import BplMock
 from skytemple_files_test.case import SkyTempleFilesTestCase, fixpath, romtest
 
 
+class AnimatedBpcStub:
+    """
+    A BPC with two layers, whose chunk atlases are generated. The chunks in animated_chunks of a layer differ
+    in every frame. Palette index 0 is used in the upper layer (BPC layer 0), so it is transparent in parts.
+    """
+
+    number_of_layers = 2
+
+    def __init__(self, bma: BmaProtocol, frames_per_layer: tuple[int, int], animated_chunks: tuple[set, set]):
+        assert bma.layer1 is not None
+        self.chunk_width = bma.tiling_width * BPC_TILE_DIM
+        self.chunk_height = bma.tiling_height * BPC_TILE_DIM
+        self.number_of_chunks = max(itertools.chain(bma.layer0, bma.layer1)) + 1
+        self.frames_per_layer = frames_per_layer
+        self.animated_chunks = animated_chunks
+        self.palette = [(i * 37 + c * 11) % 256 for i in range(256) for c in range(3)]
+
+    def chunks_animated_to_pil(self, layer, palettes, bpas, width_in_mtiles=20) -> list[Image.Image]:
+        assert width_in_mtiles == 1
+        atlases = []
+        chunk_size = self.chunk_width * self.chunk_height
+        for frame in range(self.frames_per_layer[layer]):
+            data = bytearray()
+            for chunk_idx in range(self.number_of_chunks):
+                shift = frame * 5 if chunk_idx in self.animated_chunks[layer] else 0
+                for i in range(chunk_size):
+                    data.append(0 if layer == 0 and i % 3 == 0 else (chunk_idx + i + shift) % 15 + 1)
+            atlas = Image.frombytes("P", (self.chunk_width, self.chunk_height * self.number_of_chunks), bytes(data))
+            atlas.putpalette(self.palette)
+            atlases.append(atlas)
+        return atlases
+
+
 class BmaTestCase(SkyTempleFilesTestCase[BmaHandler, BmaProtocol[BpaMock, BpcMock, BplMock]]):
     handler = BmaHandler
 
@@ -262,6 +300,74 @@ class BmaTestCase(SkyTempleFilesTestCase[BmaHandler, BmaProtocol[BpaMock, BpcMoc
         for i, img in enumerate(imgs):
             self.assertImagesEqual(self._fix_path_expected(test_typ, f"{typ}/{i}.png"), img)
 
+    def test_renderer_frames(self) -> None:
+        # The lower layer (BPC layer 1) has 2 frames, the upper layer (BPC layer 0) 3.
+        bpc = AnimatedBpcStub(self.two_layers, (3, 2), ({0, 3, 4}, {1, 2}))
+        bpl = BplMock(bytes())
+        bpl._has_palette_animation = False
+        renderer = BmaAnimationRenderer(self.two_layers, bpc, bpl, self._bpas, False, False)  # type: ignore
+        self.assertEqual(6, renderer.number_of_frames)
+        frames = list(renderer.frames())
+        self.assertEqual(6, len(frames))
+        for frame, img in enumerate(frames):
+            self.assertRenderedFrame(bpc, frame, bpc.palette, img)
+        self.assertNotEqual(frames[0].tobytes(), frames[1].tobytes())
+        # The frame durations of the BPA: 5, 5, 10, 10, 5, 5 (1/60 seconds)
+        self.assertEqual([83, 83, 167, 167, 83, 83], renderer.frame_durations())
+
+    def test_renderer_frames_pal_ani(self) -> None:
+        bpc = AnimatedBpcStub(self.two_layers, (3, 2), ({0, 3, 4}, {1, 2}))
+        renderer = BmaAnimationRenderer(self.two_layers, bpc, self._bpl_mock, self._bpas, False, False)  # type: ignore
+        # One frame per palette animation frame, the map frames repeat.
+        self.assertEqual(len(self._bpl_mock.animation_palette), renderer.number_of_frames)
+        frames = list(renderer.frames())
+        self.assertEqual(renderer.number_of_frames, len(frames))
+        for frame, img in enumerate(frames):
+            palette = list(itertools.chain.from_iterable(self._bpl_mock.apply_palette_animations(frame)))
+            self.assertRenderedFrame(bpc, frame, palette, img)
+        # The longest palette animation is longer than all BPA frames: 20 (1/60 seconds)
+        self.assertEqual([333] * len(frames), renderer.frame_durations())
+
+    def test_renderer_single_frame(self) -> None:
+        bpc = AnimatedBpcStub(self.two_layers, (3, 2), ({0, 3, 4}, {1, 2}))
+        renderer = BmaAnimationRenderer(
+            self.two_layers,
+            bpc,  # type: ignore
+            self._bpl_mock,
+            self._bpas,
+            False,
+            False,
+            single_frame=True,
+        )
+        self.assertEqual(1, renderer.number_of_frames)
+        frames = list(renderer.frames())
+        self.assertEqual(1, len(frames))
+        self.assertRenderedFrame(bpc, 0, bpc.palette, frames[0])
+
+    def assertRenderedFrame(self, bpc: AnimatedBpcStub, frame: int, palette: list[int], img: Image.Image):
+        """Compares the frame with the map composed from all chunks of both layers of the frame."""
+        bma = self.two_layers
+        assert bma.layer1 is not None
+        lower_atlases = bpc.chunks_animated_to_pil(1, [], [], 1)
+        upper_atlases = bpc.chunks_animated_to_pil(0, [], [], 1)
+        lower = lower_atlases[frame % len(lower_atlases)]
+        upper = upper_atlases[frame % len(upper_atlases)]
+        expected = Image.new("P", (bma.map_width_chunks * bpc.chunk_width, bma.map_height_chunks * bpc.chunk_height))
+        expected.putpalette(palette)
+        for i, (chunk_lower, chunk_upper) in enumerate(zip(bma.layer0, bma.layer1)):
+            pos = ((i % bma.map_width_chunks) * bpc.chunk_width, (i // bma.map_width_chunks) * bpc.chunk_height)
+            expected.paste(lower.crop(self._chunk_box(bpc, chunk_lower)), pos)
+            chunk = upper.crop(self._chunk_box(bpc, chunk_upper))
+            mask = Image.frombytes("L", chunk.size, bytes(255 if p else 0 for p in chunk.tobytes()))
+            expected.paste(chunk, pos, mask=mask)
+        self.assertEqual(expected.size, img.size)
+        self.assertEqual(expected.tobytes(), img.tobytes(), f"frame {frame}")
+        self.assertEqual(expected.getpalette(), img.getpalette(), f"frame {frame}")
+
+    @staticmethod
+    def _chunk_box(bpc: AnimatedBpcStub, chunk_idx: int) -> tuple[int, int, int, int]:
+        return 0, chunk_idx * bpc.chunk_height, bpc.chunk_width, (chunk_idx + 1) * bpc.chunk_height
+
     def test_from_pil(self) -> None:
         self._bpc_mock.mock__enable_writing()
         self._bpl_mock.mock__enable_writing()
@@ -0,0 +1,84 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import unittest
+
+from PIL import Image
+
+from skytemple_files.graphics.bpc.atlas_cache import ChunkAtlasCache
+
+
+class ChunkAtlasCacheTestCase(unittest.TestCase):
+    def test_get_put(self):
+        cache = ChunkAtlasCache(1000)
+        img = Image.new("P", (10, 10))
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", img)
+        self.assertIs(img, cache.get("a"))
+        self.assertEqual(1, len(cache))
+        self.assertEqual(100, cache.size)
+
+    def test_replace(self):
+        cache = ChunkAtlasCache(1000)
+        cache.put("a", Image.new("P", (10, 10)))
+        img = Image.new("P", (10, 20))
+        cache.put("a", img)
+        self.assertIs(img, cache.get("a"))
+        self.assertEqual(200, cache.size)
+
+    def test_evicts_least_recently_used(self):
+        cache = ChunkAtlasCache(300)
+        cache.put("a", Image.new("P", (10, 10)))
+        cache.put("b", Image.new("P", (10, 10)))
+        cache.put("c", Image.new("P", (10, 10)))
+        cache.get("a")
+        cache.put("d", Image.new("P", (10, 10)))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertIsNotNone(cache.get("d"))
+        self.assertEqual(300, cache.size)
+
+    def test_too_large(self):
+        cache = ChunkAtlasCache(100)
+        cache.put("a", Image.new("RGB", (10, 10)))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, cache.size)
+
+    def test_budget(self):
+        cache = ChunkAtlasCache(1000)
+        cache.put("a", Image.new("P", (10, 10)))
+        cache.put("b", Image.new("P", (10, 10)))
+        cache.budget = 150
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("b"))
+        cache.budget = 0
+        self.assertEqual(0, len(cache))
+        with self.assertRaises(ValueError):
+            cache.budget = -1
+
+    def test_clear(self):
+        cache = ChunkAtlasCache(1000)
+        cache.put("a", Image.new("P", (10, 10)))
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, cache.size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,6 +23,7 @@ from range_typed_integers import u16
 from skytemple_files.common.tiled_image import TilemapEntry
 from skytemple_files.common.util import chunks
 from skytemple_files.graphics.bpc import BPC_TILE_DIM
+from skytemple_files.graphics.bpc.atlas_cache import chunk_atlas_cache
 from skytemple_files.graphics.bpc.handler import BpcHandler
 from skytemple_files.graphics.bpc.protocol import BpcLayerProtocol, BpcProtocol
 from skytemple_files_test.graphics.mocks.bpa_mock import BpaMock, bpa_lists_eq
@@ -17328,6 +17329,48 @@ class BpcTestCase(SkyTempleFilesTestCase[BpcHandler, BpcProtocol[BpcLayerProtoco
                 img,
             )
 
+    def test_chunks_animated_to_pil_after_change(self) -> None:
+        # Renders (and possibly caches) the chunks before the change.
+        self.two_layers1.chunks_animated_to_pil(0, SIMPLE_DUMMY_PALETTE, self._bpas, 1)
+        self.two_layers1.chunks_animated_to_pil(1, SIMPLE_DUMMY_PALETTE, self._bpas, 1)
+        entry = [
+            TilemapEntry(20, True, False, 1),
+            TilemapEntry(12, True, True, 2),
+            TilemapEntry(22, True, False, 3),
+            TilemapEntry(22, False, False, 4),
+            TilemapEntry(32, True, False, 5),
+            TilemapEntry(12, False, False, 6),
+            TilemapEntry(31, True, True, 7),
+            TilemapEntry(44, True, False, 8),
+            TilemapEntry(10, False, False, 9),
+        ]
+        self.two_layers1.set_chunk(1, 12, entry)
+
+        for img in self.two_layers1.chunks_animated_to_pil(1, SIMPLE_DUMMY_PALETTE, self._bpas, 1):
+            self.assertImagesEqual(self._fix_path_expected(["set_chunk_1.png"]), img)
+
+        self.two_layers1.import_tiles(1, [NULL_TILE] * 5, True)
+        for img in self.two_layers1.chunks_animated_to_pil(1, SIMPLE_DUMMY_PALETTE, self._bpas, 1):
+            self.assertImagesEqual(self.two_layers1.chunks_to_pil(1, SIMPLE_DUMMY_PALETTE, 1), img)
+
+    def test_chunks_animated_to_pil_after_bpa_change(self) -> None:
+        bpa = self._bpas[1]
+        assert bpa is not None
+        before = [
+            img.tobytes() for img in self.two_layers1.chunks_animated_to_pil(0, SIMPLE_DUMMY_PALETTE, self._bpas, 1)
+        ]
+        # Changing the tiles of the BPA in place must not return the cached chunks.
+        bpa.tiles[:] = [NULL_TILE] * len(bpa.tiles)
+        after = [
+            img.tobytes() for img in self.two_layers1.chunks_animated_to_pil(0, SIMPLE_DUMMY_PALETTE, self._bpas, 1)
+        ]
+        self.assertNotEqual(before, after)
+        chunk_atlas_cache.clear()
+        self.assertEqual(
+            after,
+            [img.tobytes() for img in self.two_layers1.chunks_animated_to_pil(0, SIMPLE_DUMMY_PALETTE, self._bpas, 1)],
+        )
+
     def test_single_chunk_animated_to_pil(self) -> None:
         for i in range(0, 810):
             for iimg, img in enumerate(
@@ -0,0 +1,126 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from skytemple_files.graphics.kao import SUBENTRIES
+from skytemple_files.graphics.kao._model import Kao, KaoImage, pil_to_kao, uncompressed_kao_to_pil
+from skytemple_files.graphics.kao.sprite_bot_sheet import SpriteBotSheet
+from skytemple_files.user_error import UserValueError
+
+FIX_KAO = os.path.join(os.path.dirname(__file__), "fixtures", "kaomado.kao")
+PALETTE = bytes(range(48))
+
+
+class KaoSwizzleTestCase(unittest.TestCase):
+    def test_unswizzle(self):
+        data = bytearray(800)
+        # The first pixel of the second tile and the last pixel of the last tile.
+        data[32] = 0x21
+        data[799] = 0xF0
+        pixels = uncompressed_kao_to_pil(PALETTE, data).load()
+        self.assertEqual(1, pixels[8, 0])
+        self.assertEqual(2, pixels[9, 0])
+        self.assertEqual(15, pixels[39, 39])
+        self.assertEqual(0, pixels[38, 39])
+
+    def test_unswizzle_short_data(self):
+        img = uncompressed_kao_to_pil(PALETTE, b"\x21")
+        self.assertEqual((40, 40), img.size)
+        self.assertEqual(bytes([1, 2]) + bytes(38), img.tobytes()[:40])
+
+    def test_roundtrip(self):
+        with open(FIX_KAO, "rb") as f:
+            kao = Kao(f.read())
+        img = kao.get(0, 0).get()
+        pal, cimg = pil_to_kao(img)
+        new_img = KaoImage.create_from_raw(cimg, pal).get()
+        self.assertEqual(img.convert("RGB").tobytes(), new_img.convert("RGB").tobytes())
+
+
+class KaoImportManyTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(FIX_KAO, "rb") as f:
+            self.data = f.read()
+        self.tmp = tempfile.TemporaryDirectory()
+        kao = Kao(self.data)
+        self.sheets = {}
+        for index in (0, 552):
+            fn = os.path.join(self.tmp.name, f"{index:04}.png")
+            SpriteBotSheet.create(kao, index).save(fn)
+            self.sheets[index] = fn
+        with open(os.path.join(self.tmp.name, "credits.txt"), "w") as f:
+            f.write("ignored")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _expected(self, index_map: dict[int, int]) -> Kao:
+        kao = Kao(self.data)
+        for target, source in index_map.items():
+            for subindex in range(SUBENTRIES):
+                kao.delete(target, subindex)
+            for subindex, image in SpriteBotSheet.load(self.sheets[source], str):
+                kao.set_from_img(target, subindex, image)
+        return kao
+
+    def assertKaosEqual(self, expected: Kao, kao: Kao):
+        for (i, si, expected_img), (_, _, img) in zip(expected, kao):
+            if expected_img is None:
+                self.assertIsNone(img, (i, si))
+            else:
+                self.assertEqual(expected_img.raw(), img.raw(), (i, si))
+
+    def test_import_directory(self):
+        kao = Kao(self.data)
+        imported = kao.import_many(self.tmp.name)
+        self.assertEqual([0, 552], sorted(imported.keys()))
+        self.assertEqual([0, 2, 4, 6, 8, 10], sorted(imported[552]))
+        self.assertKaosEqual(self._expected({0: 0, 552: 552}), kao)
+
+    def test_import_mapping_replaces(self):
+        kao = Kao(self.data)
+        kao.import_many({552: self.sheets[0], 1: self.sheets[552]})
+        self.assertIsNone(kao.get(1, 12))
+        self.assertKaosEqual(self._expected({552: 0, 1: 552}), kao)
+
+    def test_import_executor(self):
+        kao = Kao(self.data)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            kao.import_many(self.tmp.name, executor=executor)
+        self.assertKaosEqual(self._expected({0: 0, 552: 552}), kao)
+
+    def test_import_invalid(self):
+        fn = os.path.join(self.tmp.name, "0001.png")
+        Image.new("RGBA", (50, 40)).save(fn)
+        kao = Kao(self.data)
+        with self.assertRaises(UserValueError):
+            kao.import_many(self.tmp.name)
+        self.assertKaosEqual(Kao(self.data), kao)
+        with self.assertRaises(ValueError):
+            kao.import_many({kao.n_entries(): self.sheets[0]})
+
+
+if __name__ == "__main__":
+    unittest.main()
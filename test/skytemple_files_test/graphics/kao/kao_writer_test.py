@@ -0,0 +1,87 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import io
+import os
+import tracemalloc
+import unittest
+
+from skytemple_files.common.util import read_i32
+from skytemple_files.graphics.kao._model import Kao
+from skytemple_files.graphics.kao._writer import KaoWriter
+
+FIX_KAO = os.path.join(os.path.dirname(__file__), "fixtures", "kaomado.kao")
+
+
+class KaoWriterTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(FIX_KAO, "rb") as f:
+            self.data = f.read()
+
+    def _modified_kao(self) -> Kao:
+        kao = Kao(self.data)
+        kao.set(552, 8, kao.get(0, 2).clone())
+        kao.delete(552, 4)
+        return kao
+
+    def test_write_to(self):
+        expected = KaoWriter(update_kao=False).write(self._modified_kao())
+        kao = self._modified_kao()
+        f = io.BytesIO()
+        self.assertEqual(len(expected), KaoWriter().write_to(kao, f))
+        self.assertEqual(bytes(expected), f.getvalue())
+        # The kao itself is not updated, writing it again gives the same result.
+        self.assertEqual(bytes(expected), bytes(KaoWriter().write(kao)))
+
+    def test_write_to_unchanged(self):
+        f = io.BytesIO()
+        KaoWriter().write_to(Kao(self.data), f)
+        self.assertEqual(self.data, f.getvalue())
+
+    def test_write_reload(self):
+        kao = self._modified_kao()
+        new_data = KaoWriter().write(kao)
+        self.assertEqual(0, len(new_data) % 16)
+        new_kao = Kao(new_data)
+        self.assertEqual(kao.get(0, 2).raw(), new_kao.get(552, 8).raw())
+        self.assertIsNone(new_kao.get(552, 4))
+        self.assertEqual(Kao(self.data).get(1, 0).raw(), new_kao.get(1, 0).raw())
+        self.assertLess(read_i32(new_data, kao.first_toc + (552 * 40 + 4) * 4), 0)
+
+    def test_peak_allocation(self):
+        kao = self._modified_kao()
+        KaoWriter(update_kao=False).write(kao)
+        tracemalloc.start()
+        try:
+            KaoWriter(update_kao=False).write(kao)
+            _, peak_write = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            KaoWriter(update_kao=False).write_to(kao, _NullWriter())
+            _, peak_write_to = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        toc_size = kao.first_toc + kao.toc_len * 40 * 4
+        # The new file and a copy of the TOC.
+        self.assertLess(peak_write, len(self.data) + toc_size + 64 * 1024)
+        self.assertLess(peak_write_to, toc_size + 64 * 1024)
+
+
+class _NullWriter:
+    def write(self, b):
+        return len(b)
@@ -0,0 +1,82 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import unittest
+
+from skytemple_files.hardcoded.dungeons import (
+    DUNGEON_RESTRICTIONS_LAYOUT,
+    DungeonRestriction,
+    DungeonRestrictionDirection,
+    MapMarkerPlacement,
+    MAP_MARKER_PLACEMENTS_LAYOUT,
+    TilesetProperties,
+)
+from skytemple_files.hardcoded.monster_sprite_data_table import (
+    MONSTER_SPRITE_DATA_LAYOUT,
+    MonsterSpriteDataTableEntry,
+)
+
+RESTRICTION = bytes([0b10100101, 0b101, 0, 0, 0xFF, 4, 3, 0, 0x2C, 0x01, 0xFE, 0xFF])
+TILESET_PROPERTIES = bytes([2, 0, 0, 0, 1, 7, 0x0B, 0, 0x0E, 0, 3, 1])
+
+
+class TableLayoutTestCase(unittest.TestCase):
+    def test_read_write(self):
+        data = bytearray(b"\xaa\xaa\x01\x02\x03\x04\xaa")
+        entries = MONSTER_SPRITE_DATA_LAYOUT.read(data, 2, 4)
+        self.assertEqual([MonsterSpriteDataTableEntry(1, 2), MonsterSpriteDataTableEntry(3, 4)], entries)
+        entries[1].unk1 = 9
+        MONSTER_SPRITE_DATA_LAYOUT.write(entries, data, 2, 4)
+        self.assertEqual(b"\xaa\xaa\x01\x02\x03\x09\xaa", data)
+
+    def test_write_length(self):
+        data = bytearray(8)
+        with self.assertRaises(ValueError):
+            MONSTER_SPRITE_DATA_LAYOUT.write([MonsterSpriteDataTableEntry(1, 2)], data, 0, 4)
+        self.assertEqual(bytes(8), data)
+
+    def test_dungeon_restriction(self):
+        restriction = DungeonRestriction.from_bytes(RESTRICTION)
+        self.assertEqual(DungeonRestrictionDirection.UP, restriction.direction)
+        self.assertFalse(restriction.enemies_evolve_when_team_member_koed)
+        self.assertTrue(restriction.enemies_grant_exp)
+        self.assertTrue(restriction.money_allowed)
+        self.assertTrue(restriction.dont_save_before_entering)
+        self.assertTrue(restriction.iq_skills_disabled)
+        self.assertFalse(restriction.traps_remain_invisible_on_attack)
+        self.assertTrue(restriction.enemies_can_drop_chests)
+        self.assertEqual(-1, restriction.max_rescue_attempts)
+        self.assertEqual(300, restriction.turn_limit)
+        self.assertEqual(-2, restriction.random_movement_chance)
+        self.assertEqual(RESTRICTION, restriction.to_bytes())
+        self.assertEqual(12, DUNGEON_RESTRICTIONS_LAYOUT.size)
+
+    def test_marker_placement(self):
+        placement = MapMarkerPlacement.from_bytes(b"\x01\x00\xff\xff\x10\x00\x20\x00")
+        self.assertEqual(MapMarkerPlacement(1, -1, 16, 32), placement)
+        self.assertEqual(b"\x01\x00\xff\xff\x10\x00\x20\x00", placement.to_bytes())
+        self.assertEqual(8, MAP_MARKER_PLACEMENTS_LAYOUT.size)
+
+    def test_tileset_properties(self):
+        properties = TilesetProperties.from_bytes(TILESET_PROPERTIES)
+        self.assertTrue(properties.full_water_floor)
+        self.assertEqual(TILESET_PROPERTIES, properties.to_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
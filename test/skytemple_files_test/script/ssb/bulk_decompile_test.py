@@ -0,0 +1,79 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from skytemple_files.common.ppmdu_config.xml_reader import Pmd2XmlReader
+from skytemple_files.script.ssb.bulk_decompile import SsbDecompileCache
+
+
+class SsbDecompileCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = SsbDecompileCache(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_key(self):
+        key = SsbDecompileCache.key(b"\x01\x02", "a")
+        self.assertEqual(key, SsbDecompileCache.key(b"\x01\x02", "a"))
+        self.assertNotEqual(key, SsbDecompileCache.key(b"\x01\x03", "a"))
+        self.assertNotEqual(key, SsbDecompileCache.key(b"\x01\x02", "b"))
+
+    def test_config_digest(self):
+        config = Pmd2XmlReader.load_default("EoS_EU")
+        digest = SsbDecompileCache.config_digest(config)
+        self.assertEqual(digest, SsbDecompileCache.config_digest(Pmd2XmlReader.load_default("EoS_EU")))
+        self.assertNotEqual(digest, SsbDecompileCache.config_digest(Pmd2XmlReader.load_default("EoS_NA")))
+
+        # Changes to the script data of ROM hacks
+        config.script_data.level_entities[1].name = "RENAMED_ACTOR"
+        actor_digest = SsbDecompileCache.config_digest(config)
+        self.assertNotEqual(digest, actor_digest)
+        config.script_data.level_list[1].name = "RENAMED_LEVEL"
+        level_digest = SsbDecompileCache.config_digest(config)
+        self.assertNotEqual(actor_digest, level_digest)
+        config.script_data.objects[1].name = "RENAMED_OBJECT"
+        object_digest = SsbDecompileCache.config_digest(config)
+        self.assertNotEqual(level_digest, object_digest)
+        config.script_data.game_variables[1].name = "RENAMED_VARIABLE"
+        variable_digest = SsbDecompileCache.config_digest(config)
+        self.assertNotEqual(object_digest, variable_digest)
+        config.script_data.op_codes[1].params += 1
+        self.assertNotEqual(variable_digest, SsbDecompileCache.config_digest(config))
+
+    def test_get_put(self):
+        key = SsbDecompileCache.key(b"\x01\x02", "a")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "def 0 { end; }", '{"a": 1}')
+        self.assertEqual(("def 0 { end; }", '{"a": 1}'), self.cache.get(key))
+        self.assertEqual(("def 0 { end; }", '{"a": 1}'), SsbDecompileCache(self._tmp.name).get(key))
+
+    def test_put_replace(self):
+        key = SsbDecompileCache.key(b"\x01\x02", "a")
+        self.cache.put(key, "a", "b")
+        self.cache.put(key, "c", "d")
+        self.assertEqual(("c", "d"), self.cache.get(key))
+        self.assertEqual(2, sum(len(files) for _, _, files in os.walk(self._tmp.name)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Benchmarks eager and lazy loading of the bin packs MONSTER/monster.bin and DUNGEON/dungeon.bin:
+Time to open, time to read a few entries and save, and the peak memory allocated (tracemalloc).
+
+Usage: python bin_pack_lazy.py ROM_NAME
+"""
+
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from ndspy.rom import NintendoDSRom
+
+from skytemple_files.common.types.file_types import FileType
+from skytemple_files.common.util import DUNGEON_BIN, MONSTER_BIN, get_ppmdu_config_for_rom
+
+ACCESSED_ENTRIES = 5
+
+
+def measure(label, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<45} {elapsed * 1000:10.2f} ms {peak / 1024 / 1024:10.2f} MiB peak")
+
+
+def main(rom_file):
+    rom = NintendoDSRom.fromFile(rom_file)
+    static_data = get_ppmdu_config_for_rom(rom)
+
+    monster_bin = rom.getFileByName(MONSTER_BIN)
+    dungeon_bin = rom.getFileByName(DUNGEON_BIN)
+
+    for lazy in (False, True):
+        mode = "lazy" if lazy else "eager"
+        print(f"--- {mode} ---")
+
+        measure(f"{MONSTER_BIN} open", lambda: FileType.BIN_PACK.deserialize(monster_bin, lazy=lazy))
+
+        def monster_access_and_save():
+            pack = FileType.BIN_PACK.deserialize(monster_bin, lazy=lazy)
+            for i in range(ACCESSED_ENTRIES):
+                pack[i] = bytes(pack[i])
+            FileType.BIN_PACK.serialize(pack)
+
+        measure(f"{MONSTER_BIN} read {ACCESSED_ENTRIES} + save", monster_access_and_save)
+
+        measure(
+            f"{DUNGEON_BIN} open",
+            lambda: FileType.DUNGEON_BIN.deserialize(dungeon_bin, static_data, lazy=lazy),
+        )
+
+        def dungeon_access_and_save():
+            pack = FileType.DUNGEON_BIN.deserialize(dungeon_bin, static_data, lazy=lazy)
+            for i in range(ACCESSED_ENTRIES):
+                pack.get_raw(pack.get_filename(i))
+            FileType.DUNGEON_BIN.serialize(pack)
+
+        measure(f"{DUNGEON_BIN} read {ACCESSED_ENTRIES} + save", dungeon_access_and_save)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Please provide a ROM name.", file=sys.stderr)
+        exit(1)
+    main(sys.argv[1])
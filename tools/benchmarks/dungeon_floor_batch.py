@@ -0,0 +1,70 @@
+"""
+Benchmark for the batch dungeon floor generator: Generates floors for a number of seeds for every floor in
+BALANCE/mappa_s.bin on a process pool and reports the time and the floors with the highest invalid generation rate.
+
+Usage: python dungeon_floor_batch.py ROM_NAME [SEEDS] [JOBS]
+"""
+
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ndspy.rom import NintendoDSRom
+
+from skytemple_files.common.dungeon_floor_generator.batch import DungeonFloorBatchGenerator
+from skytemple_files.common.types.file_types import FileType
+
+
+def main(rom_file, seeds, jobs):
+    rom = NintendoDSRom.fromFile(rom_file)
+    mappa = FileType.MAPPA_BIN.deserialize(rom.getFileByName("BALANCE/mappa_s.bin"))
+    n_floors = sum(len(fl) for fl in mappa.floor_lists)
+    print(f"{'floors':<40} {n_floors:10}")
+    print(f"{'seeds per floor':<40} {seeds:10}")
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        start = time.perf_counter()
+        result = DungeonFloorBatchGenerator(executor=executor).mappa_statistics(mappa, range(seeds))
+        elapsed = time.perf_counter() - start
+    print(f"{f'mappa_statistics ({jobs} processes)':<40} {elapsed:10.2f} s")
+
+    floors = [(statistics, i, j) for i, fl in enumerate(result) for j, statistics in enumerate(fl)]
+    floors.sort(key=lambda x: -x[0].invalid_rate)
+    print()
+    print(f"{'floor':<10} {'invalid':>10} {'rooms':>10} {'MH':>10} {'stairs':>10}")
+    for statistics, i, j in floors[:10]:
+        print(
+            f"{f'{i}/{j}':<10} {statistics.invalid_rate:10.2%} {statistics.mean_room_count:10.2f} "
+            f"{statistics.monster_house_rate:10.2%} {statistics.mean_stairs_distance:10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Please provide a ROM name.", file=sys.stderr)
+        exit(1)
+    main(
+        sys.argv[1],
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+        int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count(),
+    )
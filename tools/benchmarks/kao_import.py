@@ -0,0 +1,82 @@
+"""
+Benchmark for re-importing all portraits of a ROM: Exports the portraits of every entry in FONT/kaomado.kao
+as SpriteBot sheets and imports the directory again with Kao.import_many, once in this process and once
+on a process pool. Reports the time for each and checks that both imports give the same result.
+
+Usage: python kao_import.py ROM_NAME [JOBS]
+"""
+
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ndspy.rom import NintendoDSRom
+
+from skytemple_files.graphics.kao._model import Kao
+from skytemple_files.graphics.kao.sprite_bot_sheet import SpriteBotSheet
+
+
+def export_sheets(kao, directory):
+    count = 0
+    for index in range(kao.n_entries()):
+        if any(kao.get(index, subindex) is not None for subindex in range(0, 40, 2)):
+            SpriteBotSheet.create(kao, index).save(os.path.join(directory, f"{index:04}.png"))
+            count += 1
+    return count
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<40} {time.perf_counter() - start:10.2f} s")
+    return result
+
+
+def main(rom_file, jobs):
+    rom = NintendoDSRom.fromFile(rom_file)
+    data = rom.getFileByName("FONT/kaomado.kao")
+    with tempfile.TemporaryDirectory() as directory:
+        sheets = measure("export sheets", lambda: export_sheets(Kao(data), directory))
+        print(f"{'sheets':<40} {sheets:10}")
+
+        kao_serial = Kao(data)
+        imported = measure("import_many", lambda: kao_serial.import_many(directory))
+        print(f"{'portraits':<40} {sum(len(x) for x in imported.values()):10}")
+
+        kao_parallel = Kao(data)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            measure(
+                f"import_many ({jobs} processes)",
+                lambda: kao_parallel.import_many(directory, executor=executor),
+            )
+
+    mismatches = sum(1 for (_, _, a), (_, _, b) in zip(kao_serial, kao_parallel) if (a and a.raw()) != (b and b.raw()))
+    print(f"{'mismatches':<40} {mismatches:10}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Please provide a ROM name.", file=sys.stderr)
+        exit(1)
+    main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count())
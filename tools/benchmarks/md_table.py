@@ -0,0 +1,68 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import sys
+import time
+
+from ndspy.rom import NintendoDSRom
+
+from skytemple_files.common.util import MONSTER_MD
+from skytemple_files.data.md._model import Md
+from skytemple_files.data.md.table import MdTable
+
+ROUNDS = 20
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    print(f"{label:<40} {elapsed * 1000:10.3f} ms")
+    return result
+
+
+def main(rom_file):
+    rom = NintendoDSRom.fromFile(rom_file)
+    data = rom.getFileByName(MONSTER_MD)
+
+    md = measure("Load: Md", lambda: Md(data))
+    table = measure("Load: MdTable", lambda: MdTable.from_bytes(data))
+
+    a = measure(
+        "Filter: Md",
+        lambda: [i for i, e in enumerate(md.entries) if e.type_primary == 10 and e.base_atk > 50],
+    )
+    b = measure(
+        "Filter: MdTable",
+        lambda: table.filter(lambda t, atk: t == 10 and atk > 50, "type_primary", "base_atk"),
+    )
+    assert a == b
+
+    measure("Sort: Md", lambda: sorted(range(len(md)), key=lambda i: md.entries[i].base_hp))
+    measure("Sort: MdTable", lambda: table.sort("base_hp"))
+
+    measure("Save: MdTable", table.to_bytes)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Please provide a ROM name.", file=sys.stderr)
+        exit(1)
+    main(sys.argv[1])
@@ -0,0 +1,72 @@
+"""
+Benchmarks loading the default ppmdu configuration from the XML (cold),
+from the on-disk cache (warm, like a fresh process) and from the in-process memo.
+
+Usage: python ppmdu_config_cache.py [edition] [iterations]
+"""
+
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+
+from skytemple_files.common.ppmdu_config.cache import Pmd2DataCache
+
+
+def timed(label, fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    per_call = (time.perf_counter() - start) / iterations
+    print(f"{label:<40} {per_call * 1000:10.2f} ms")
+    return per_call
+
+
+def main(edition, iterations):
+    with tempfile.TemporaryDirectory() as cache_dir:
+
+        def cold():
+            cache = Pmd2DataCache(cache_dir)
+            cache.clear()
+            cache.get(edition)
+
+        def warm():
+            Pmd2DataCache(cache_dir).get(edition)
+
+        memo_cache = Pmd2DataCache(cache_dir)
+        memo_cache.get(edition)
+
+        def memo():
+            memo_cache.get(edition)
+
+        print(f"Loading {edition}, {iterations} iterations each:")
+        t_cold = timed("cold (parse XML)", cold, iterations)
+        Pmd2DataCache(cache_dir).get(edition)
+        t_warm = timed("warm (on-disk cache)", warm, iterations)
+        t_memo = timed("memo (in-process copy)", memo, iterations)
+        print(f"Speedup warm: {t_cold / t_warm:.1f}x, memo: {t_cold / t_memo:.1f}x")
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if len(sys.argv) > 1 else "EoS_EU",
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
@@ -0,0 +1,97 @@
+"""
+Benchmarks PX compression of the PKDPX, AT3PX and AT4PX compressed assets in a ROM (files, entries of the bin packs in
+MONSTER/ and the portraits in FONT/kaomado.kao): Decompresses all of them and compresses them again with
+PxFastCompressor (used by PxHandler) and, with --reference, with PxCompressor. Reports the throughput in MB/s
+of uncompressed data and checks that both produce the same output.
+
+Usage: python px_compress.py ROM_NAME [--reference]
+"""
+
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import sys
+import time
+
+from ndspy.rom import NintendoDSRom
+
+from skytemple_files.common.types.file_types import FileType
+from skytemple_files.compression.px.compressor import PxCompressor
+from skytemple_files.compression.px.fast_compressor import PxFastCompressor
+
+KAOMADO = "FONT/kaomado.kao"
+
+
+def collect_uncompressed(rom):
+    containers = []
+    for file_id, data in enumerate(rom.files):
+        name = rom.filenames.filenameOf(file_id)
+        if name is None:
+            continue
+        if name == KAOMADO:
+            for _, _, img in FileType.KAO.deserialize(data):
+                if img is not None:
+                    containers.append(img.raw()[0])
+        elif name.startswith("MONSTER/") and name.endswith(".bin"):
+            containers.extend(FileType.BIN_PACK.deserialize(data))
+        else:
+            containers.append(data)
+
+    uncompressed = []
+    for data in containers:
+        data = bytes(data)
+        if data.startswith(FileType.PKDPX.magic_word()):
+            uncompressed.append(FileType.PKDPX.deserialize(data).decompress())
+        elif data.startswith(FileType.AT4PX.magic_word()):
+            uncompressed.append(FileType.AT4PX.deserialize(data).decompress())
+        elif data.startswith(FileType.AT3PX.magic_word()):
+            uncompressed.append(FileType.AT3PX.deserialize(data).decompress())
+    return uncompressed
+
+
+def measure(label, compressor_cls, uncompressed):
+    results = []
+    start = time.perf_counter()
+    for data in uncompressed:
+        results.append(compressor_cls(data).compress())
+    elapsed = time.perf_counter() - start
+    total = sum(len(data) for data in uncompressed)
+    print(f"{label:<40} {elapsed * 1000:10.2f} ms {total / elapsed / 1000 / 1000:10.2f} MB/s")
+    return results
+
+
+def main(rom_file, reference=False):
+    rom = NintendoDSRom.fromFile(rom_file)
+    uncompressed = collect_uncompressed(rom)
+    print(f"{'assets':<40} {len(uncompressed):10}")
+    print(f"{'uncompressed size':<40} {sum(len(data) for data in uncompressed) / 1000 / 1000:10.2f} MB")
+
+    fast = measure("PxFastCompressor", PxFastCompressor, uncompressed)
+    print(f"{'compressed size':<40} {sum(len(data) for _, data in fast) / 1000 / 1000:10.2f} MB")
+    if reference:
+        slow = measure("PxCompressor", PxCompressor, uncompressed)
+        mismatches = sum(1 for a, b in zip(fast, slow) if bytes(a[0]) != bytes(b[0]) or bytes(a[1]) != bytes(b[1]))
+        print(f"{'different outputs':<40} {mismatches:10}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Please provide a ROM name.", file=sys.stderr)
+        exit(1)
+    main(sys.argv[1], "--reference" in sys.argv[2:])
@@ -0,0 +1,99 @@
+"""
+Round-trip benchmark for PX over every PKDPX container in a ROM (files and entries of the bin packs in MONSTER/
+and DUNGEON/dungeon.bin): Decompresses every container, compresses the data again and decompresses the result.
+Reports the time and throughput in MB/s of uncompressed data for each step and checks that the data round-trips.
+
+Usage: python px_roundtrip.py ROM_NAME
+"""
+
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import sys
+import time
+
+from ndspy.rom import NintendoDSRom
+
+from skytemple_files.common.types.file_types import FileType
+from skytemple_files.common.util import DUNGEON_BIN
+
+PKDPX_MAGIC = b"PKDPX"
+
+
+def collect_pkdpx(rom):
+    containers = []
+    for file_id, data in enumerate(rom.files):
+        name = rom.filenames.filenameOf(file_id)
+        if name is None:
+            continue
+        if name == DUNGEON_BIN or (name.startswith("MONSTER/") and name.endswith(".bin")):
+            entries = FileType.BIN_PACK.deserialize(data)
+        else:
+            entries = [data]
+        for entry in entries:
+            entry = bytes(entry)
+            if entry.startswith(PKDPX_MAGIC):
+                containers.append(FileType.PKDPX.deserialize(entry))
+    return containers
+
+
+def measure(label, fn, items, size):
+    start = time.perf_counter()
+    results = [fn(item) for item in items]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:10.2f} ms {size / elapsed / 1000 / 1000:10.2f} MB/s")
+    return results
+
+
+def main(rom_file):
+    rom = NintendoDSRom.fromFile(rom_file)
+    containers = collect_pkdpx(rom)
+    size = sum(container.length_decompressed for container in containers)
+    print(f"{'PKDPX containers':<40} {len(containers):10}")
+    print(f"{'uncompressed size':<40} {size / 1000 / 1000:10.2f} MB")
+
+    uncompressed = measure("decompress", lambda c: c.decompress(), containers, size)
+
+    buffer = bytearray(max((container.length_decompressed for container in containers), default=0))
+
+    def decompress_into(container):
+        return FileType.PX.decompress_into(
+            container.compressed_data[: container.length_compressed - 0x14],
+            container.compression_flags,
+            buffer,
+            length_decompressed=container.length_decompressed,
+        )
+
+    measure("decompress into a shared buffer", decompress_into, containers, size)
+    recompressed = measure("compress", FileType.PKDPX.compress, uncompressed, size)
+    roundtrip = measure("decompress compressed", lambda c: c.decompress(), recompressed, size)
+
+    mismatches = sum(1 for a, b in zip(uncompressed, roundtrip) if bytes(a) != bytes(b))
+    original_size = sum(container.length_compressed for container in containers)
+    recompressed_size = sum(container.length_compressed for container in recompressed)
+    print(f"{'compressed size (original)':<40} {original_size / 1000 / 1000:10.2f} MB")
+    print(f"{'compressed size (recompressed)':<40} {recompressed_size / 1000 / 1000:10.2f} MB")
+    print(f"{'round-trip mismatches':<40} {mismatches:10}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Please provide a ROM name.", file=sys.stderr)
+        exit(1)
+    main(sys.argv[1])
@@ -0,0 +1,80 @@
+"""
+Benchmarks rendering every map in MAP_BG/bg_list.dat with Bma.to_pil (BMA, BPC, BPL and BPAs),
+which is what export_maps does for the map backgrounds. Also renders the chunks of every BPC.
+Uses the Python implementations unless SKYTEMPLE_USE_NATIVE is set.
+
+Usage: python render_maps.py ROM_NAME [--all-frames]
+"""
+
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import sys
+import time
+
+from ndspy.rom import NintendoDSRom
+
+from skytemple_files.common.types.file_types import FileType
+
+SLOWEST_SHOWN = 5
+
+
+def main(rom_file, all_frames=False):
+    rom = NintendoDSRom.fromFile(rom_file)
+    bg_list = FileType.BG_LIST_DAT.deserialize(rom.getFileByName("MAP_BG/bg_list.dat"))
+
+    maps = []
+    for level in bg_list.level:
+        try:
+            maps.append(
+                (level.bpl_name, level.get_bma(rom), level.get_bpc(rom), level.get_bpl(rom), level.get_bpas(rom))
+            )
+        except (FileNotFoundError, ValueError) as ex:
+            print(f"Skipping {level.bpl_name}: {ex}", file=sys.stderr)
+
+    timings = []
+    frames = 0
+    start = time.perf_counter()
+    for name, bma, bpc, bpl, bpas in maps:
+        map_start = time.perf_counter()
+        frames += len(bma.to_pil(bpc, bpl, bpas, False, False, single_frame=not all_frames))
+        timings.append((time.perf_counter() - map_start, name))
+    elapsed_maps = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _, _, bpc, bpl, _ in maps:
+        for layer in range(bpc.number_of_layers):
+            bpc.chunks_to_pil(layer, bpl.palettes)
+    elapsed_chunks = time.perf_counter() - start
+
+    print(f"{'maps rendered':<40} {len(maps):10}")
+    print(f"{'frames rendered':<40} {frames:10}")
+    print(f"{'Bma.to_pil total':<40} {elapsed_maps * 1000:10.2f} ms")
+    print(f"{'Bma.to_pil per map':<40} {elapsed_maps / max(len(maps), 1) * 1000:10.2f} ms")
+    print(f"{'Bpc.chunks_to_pil total':<40} {elapsed_chunks * 1000:10.2f} ms")
+    print("Slowest maps:")
+    for map_elapsed, name in sorted(timings, reverse=True)[:SLOWEST_SHOWN]:
+        print(f"  {name:<38} {map_elapsed * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Please provide a ROM name.", file=sys.stderr)
+        exit(1)
+    main(sys.argv[1], "--all-frames" in sys.argv[2:])
@@ -0,0 +1,70 @@
+#  Copyright 2020-2025 SkyTemple Contributors
+#
+#  This file is part of SkyTemple.
+#
+#  SkyTemple is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  SkyTemple is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with SkyTemple.  If not, see <https://www.gnu.org/licenses/>.
+# mypy: ignore-errors
+from __future__ import annotations
+
+import sys
+import time
+
+from ndspy.rom import NintendoDSRom
+
+from skytemple_files.container.sir0._model import Sir0
+from skytemple_files.container.sir0._writer import Sir0Writer
+from skytemple_files.common.util import read_u32
+from skytemple_files.container.sir0.sir0_util import (
+    decode_sir0_pointer_offsets,
+    encode_sir0_pointer_offset_list,
+)
+
+ROUNDS = 20
+NUMBER_OF_FILES = 10
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    print(f"{label:<50} {elapsed * 1000:10.3f} ms")
+    return result
+
+
+def main(rom_file):
+    rom = NintendoDSRom.fromFile(rom_file)
+    sir0_files = []
+    for file_id, data in enumerate(rom.files):
+        if data[:4] == b"SIR0":
+            sir0_files.append((rom.filenames.filenameOf(file_id) or str(file_id), data))
+    sir0_files.sort(key=lambda f: len(f[1]), reverse=True)
+
+    for name, data in sir0_files[:NUMBER_OF_FILES]:
+        print(f"{name} ({len(data)} bytes)")
+        pointer_offsets = measure(
+            "  Decode pointer offsets",
+            lambda: decode_sir0_pointer_offsets(data, read_u32(data, 0x08)),
+        )
+        print(f"  ({len(pointer_offsets)} pointers)")
+        measure("  Encode pointer offsets", lambda: encode_sir0_pointer_offset_list(pointer_offsets))
+        model = measure("  Unwrap", lambda: Sir0.from_bin(data))
+        measure("  Wrap", lambda: Sir0Writer().write(model))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Please provide a ROM name.", file=sys.stderr)
+        exit(1)
+    main(sys.argv[1])